@@ -0,0 +1,37 @@
+"""
+Backports for older Python versions
+"""
+
+from dataclasses import fields
+from typing import Any, Dict, Type, TypeVar, cast
+
+T = TypeVar("T")
+
+
+def dataclass_slots(cls: Type[T]) -> Type[T]:
+    """
+    Recreate a dataclass with __slots__ for its fields
+
+    Same as @dataclass(slots=True), which needs Python 3.10. Apply it on top
+    of @dataclass:
+
+        @dataclass_slots
+        @dataclass
+        class Point:
+            x: int = 0
+    """
+    field_names = tuple(f.name for f in fields(cls))  # type: ignore[arg-type]
+
+    cls_dict: Dict[str, Any] = dict(cls.__dict__)
+    cls_dict["__slots__"] = field_names
+    # Defaults live in the generated __init__; as class attributes they
+    # would clash with the slots
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    metaclass: Any = type(cls)
+    slotted = cast(Type[T], metaclass(cls.__name__, cls.__bases__, cls_dict))
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
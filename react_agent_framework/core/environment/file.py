@@ -5,12 +5,13 @@ Allows agents to navigate and interact with file system
 """
 
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from react_agent_framework.core.environment.base import (
     BaseEnvironment,
     Action,
     Observation,
 )
+from react_agent_framework.core.environment.file_index import FileIndex
 
 
 class FileEnvironment(BaseEnvironment):
@@ -25,6 +26,9 @@ class FileEnvironment(BaseEnvironment):
         root_directory: str = ".",
         safe_mode: bool = True,
         max_file_size: int = 10 * 1024 * 1024,  # 10MB
+        use_index: bool = True,
+        index_refresh_interval: float = 2.0,
+        index_ignore_dirs: Optional[List[str]] = None,
     ):
         """
         Initialize file environment
@@ -33,12 +37,26 @@ class FileEnvironment(BaseEnvironment):
             root_directory: Root directory for operations
             safe_mode: Restrict operations to safe actions
             max_file_size: Maximum file size to read (bytes)
+            use_index: Serve search/grep from an in-memory file index
+            index_refresh_interval: Minimum seconds between index refreshes
+            index_ignore_dirs: Directory names excluded from the index (e.g. [".git"])
         """
         super().__init__(name="FileEnvironment")
         self.root_directory = os.path.abspath(root_directory)
         self.safe_mode = safe_mode
         self.max_file_size = max_file_size
 
+        # Index is built lazily on the first search
+        self.index: Optional[FileIndex] = (
+            FileIndex(
+                self.root_directory,
+                refresh_interval=index_refresh_interval,
+                ignore_dirs=index_ignore_dirs,
+            )
+            if use_index
+            else None
+        )
+
         self.current_directory = self.root_directory
 
         # Sensitive file patterns
@@ -81,7 +99,8 @@ class FileEnvironment(BaseEnvironment):
         - write: Write file
         - create_dir: Create directory
         - navigate: Change directory
-        - search: Search for files
+        - search: Search for files (glob, or substring with match="substring")
+        - grep: Search file contents
         """
         action_name = action.name.lower()
 
@@ -108,7 +127,14 @@ class FileEnvironment(BaseEnvironment):
 
         elif action_name == "search":
             pattern = action.parameters.get("pattern", "")
-            return self._search_files(pattern)
+            match = action.parameters.get("match", "glob")
+            return self._search_files(pattern, match)
+
+        elif action_name == "grep":
+            pattern = action.parameters.get("pattern", "")
+            regex = action.parameters.get("regex", False)
+            ignore_case = action.parameters.get("ignore_case", False)
+            return self._grep_files(pattern, regex, ignore_case)
 
         else:
             obs = Observation(
@@ -220,6 +246,9 @@ class FileEnvironment(BaseEnvironment):
             with open(full_path, "w", encoding="utf-8") as f:
                 f.write(content)
 
+            if self.index:
+                self.index.invalidate(full_path)
+
             obs = Observation(
                 data={
                     "action": "write",
@@ -245,6 +274,9 @@ class FileEnvironment(BaseEnvironment):
 
             os.makedirs(full_path, exist_ok=True)
 
+            if self.index:
+                self.index.invalidate(full_path)
+
             obs = Observation(
                 data={
                     "action": "create_dir",
@@ -294,23 +326,35 @@ class FileEnvironment(BaseEnvironment):
             )
             return obs
 
-    def _search_files(self, pattern: str) -> Observation:
+    def _search_files(self, pattern: str, match: str = "glob") -> Observation:
         """Search for files matching pattern"""
         try:
             import fnmatch
 
-            matches = []
+            if self.index and self.index.contains(self.current_directory):
+                if match == "substring":
+                    matches = self.index.find(pattern, base=self.current_directory, limit=100)
+                else:
+                    matches = self.index.glob(pattern, base=self.current_directory, limit=100)
+            else:
+                matches = []
 
-            for root, dirs, files in os.walk(self.current_directory):
-                for filename in files:
-                    if fnmatch.fnmatch(filename, pattern):
+                for root, dirs, files in os.walk(self.current_directory):
+                    for filename in files:
                         full_path = os.path.join(root, filename)
                         rel_path = os.path.relpath(full_path, self.current_directory)
-                        matches.append(rel_path)
 
-                # Limit results
-                if len(matches) >= 100:
-                    break
+                        if match == "substring":
+                            matched = pattern.lower() in rel_path.lower()
+                        else:
+                            matched = fnmatch.fnmatch(filename, pattern)
+
+                        if matched:
+                            matches.append(rel_path)
+
+                    # Limit results
+                    if len(matches) >= 100:
+                        break
 
             obs = Observation(
                 data={
@@ -330,28 +374,73 @@ class FileEnvironment(BaseEnvironment):
             )
             return obs
 
+    def _grep_files(
+        self, pattern: str, regex: bool = False, ignore_case: bool = False
+    ) -> Observation:
+        """Search file contents under the current directory"""
+        try:
+            if not pattern:
+                return Observation(
+                    data={"action": "grep", "error": "Empty pattern"},
+                    metadata={"error": True},
+                )
+
+            if self.index and self.index.contains(self.current_directory):
+                index = self.index
+            else:
+                # Outside the indexed root: one-off index of the current directory
+                index = FileIndex(self.current_directory)
+
+            matches = index.grep(
+                pattern,
+                base=self.current_directory,
+                limit=100,
+                regex=regex,
+                ignore_case=ignore_case,
+                include=self._readable,
+            )
+
+            obs = Observation(
+                data={
+                    "action": "grep",
+                    "pattern": pattern,
+                    "matches": matches,
+                    "count": len(matches),
+                }
+            )
+
+            return obs
+
+        except Exception as e:
+            obs = Observation(
+                data={"action": "grep", "error": str(e)},
+                metadata={"error": True},
+            )
+            return obs
+
     def _list_directory(self, path: str) -> List[Dict[str, Any]]:
         """List directory contents with metadata"""
         contents = []
 
         try:
-            for item in os.listdir(path):
-                item_path = os.path.join(path, item)
-                is_dir = os.path.isdir(item_path)
-
-                item_info = {
-                    "name": item,
-                    "type": "directory" if is_dir else "file",
-                    "path": item_path,
-                }
+            # scandir reports entry types without an extra stat per entry
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    is_dir = entry.is_dir()
 
-                if not is_dir:
-                    try:
-                        item_info["size"] = os.path.getsize(item_path)
-                    except (OSError, PermissionError):
-                        item_info["size"] = 0
+                    item_info = {
+                        "name": entry.name,
+                        "type": "directory" if is_dir else "file",
+                        "path": entry.path,
+                    }
 
-                contents.append(item_info)
+                    if not is_dir:
+                        try:
+                            item_info["size"] = entry.stat().st_size
+                        except (OSError, PermissionError):
+                            item_info["size"] = 0
+
+                    contents.append(item_info)
 
         except Exception:
             pass
@@ -365,6 +454,12 @@ class FileEnvironment(BaseEnvironment):
         else:
             return os.path.abspath(os.path.join(self.current_directory, path))
 
+    def _readable(self, filepath: str, size: int) -> bool:
+        """Check whether the read action would return a file's content"""
+        if self.safe_mode and self._is_sensitive_file(filepath):
+            return False
+        return size <= self.max_file_size
+
     def _is_sensitive_file(self, filepath: str) -> bool:
         """Check if file is sensitive"""
         filepath_lower = filepath.lower()
@@ -377,7 +472,7 @@ class FileEnvironment(BaseEnvironment):
 
     def get_available_actions(self) -> List[str]:
         """Get available file actions"""
-        return ["list", "read", "write", "create_dir", "navigate", "search"]
+        return ["list", "read", "write", "create_dir", "navigate", "search", "grep"]
 
     def get_observation_space(self) -> Dict[str, Any]:
         """Describe file observation space"""
@@ -387,7 +482,7 @@ class FileEnvironment(BaseEnvironment):
             "filepath": "File path",
             "content": "File content",
             "size": "File size in bytes",
-            "matches": "Search results",
+            "matches": "Search results (paths, or path/line/text for grep)",
         }
 
     def get_status(self) -> Dict[str, Any]:
@@ -397,4 +492,5 @@ class FileEnvironment(BaseEnvironment):
             "root_directory": self.root_directory,
             "safe_mode": self.safe_mode,
             "steps": self.state.step_count,
+            "index": self.index.get_stats() if self.index else None,
         }
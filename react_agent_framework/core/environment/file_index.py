@@ -0,0 +1,726 @@
+"""
+Incremental file index for FileEnvironment
+
+Keeps a path trie of the workspace in memory so glob and substring
+searches never walk the disk. The trie is refreshed by diffing directory
+mtimes (only directories whose mtime changed are re-listed with scandir),
+and file contents are indexed lazily into a trigram index for grep, keyed
+on the (size, mtime) recorded by that listing. Files edited in place do not
+change their directory's mtime, so a file is stat'ed again before grep
+skips it on its trigrams; callers that modify files can also report them
+with invalidate().
+
+Matching lines are found by scan_files(), which memory-maps each file and
+runs a compiled bytes regex over it; the filesystem.grep tool runs the same
+scanner in worker processes.
+"""
+
+import fnmatch
+import mmap
+import os
+import re
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+# Directories modified this recently may change again within the same
+# mtime tick, so they are re-listed on the next refresh
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Characters with special meaning in regular expressions
+_REGEX_META = set(".^$*+?{}[]\\|()")
+
+# Counted quantifier: {m}, {m,}, {,n} or {m,n}
+_COUNTED_QUANTIFIER = re.compile(r"\{\d*(?:,\d*)?\}")
+
+# Longest line fragment returned per match
+_MAX_LINE_LENGTH = 300
+
+
+@lru_cache(maxsize=32)
+def _compile(pattern: str, flags: int) -> "re.Pattern":
+    """Compile pattern once per process (^ and $ match at line boundaries)"""
+    return re.compile(pattern.encode("utf-8"), flags | re.MULTILINE)
+
+
+def scan_files(
+    paths: List[str],
+    pattern: str,
+    flags: int = 0,
+    max_matches: int = 100,
+    deadline: Optional[float] = None,
+) -> List[Tuple[str, int, str]]:
+    """
+    Find lines matching a regex in files
+
+    Each file is memory-mapped and searched with a compiled bytes regex;
+    binary files are skipped. Safe to run in worker processes.
+
+    Args:
+        paths: Files to search, in order
+        pattern: Regular expression
+        flags: re flags (e.g. re.IGNORECASE)
+        max_matches: Stop after this many matching lines
+        deadline: time.time() after which no further files are opened
+
+    Returns:
+        List of (path, line number, line text), at most max_matches
+    """
+    regex = _compile(pattern, flags)
+    results: List[Tuple[str, int, str]] = []
+
+    for path in paths:
+        if deadline is not None and time.time() > deadline:
+            break
+
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    continue
+
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Skip binary files
+                    if mm.find(b"\0", 0, 8192) >= 0:
+                        continue
+
+                    line_no = 1
+                    counted = 0
+                    last_line_end = -1
+
+                    for match in regex.finditer(mm):
+                        line_start = mm.rfind(b"\n", 0, match.start()) + 1
+                        if line_start <= last_line_end:
+                            # One result per line
+                            continue
+
+                        line_end = mm.find(b"\n", match.end())
+                        line_end = size if line_end < 0 else line_end
+
+                        line_no += mm[counted:line_start].count(b"\n")
+                        counted = line_start
+                        text = mm[line_start : min(line_end, line_start + _MAX_LINE_LENGTH)]
+
+                        results.append(
+                            (path, line_no, text.rstrip(b"\r").decode("utf-8", errors="replace"))
+                        )
+                        last_line_end = line_end
+
+                        if len(results) >= max_matches:
+                            return results
+        except (OSError, ValueError):
+            continue
+
+    return results
+
+
+class _GitIgnore:
+    """Rules from one .gitignore file, applied to paths below its directory"""
+
+    def __init__(self, base_dir: str, lines: List[str]):
+        self.base_dir = base_dir
+        self.rules: List[Tuple["re.Pattern", bool, bool]] = []  # (regex, negate, dir_only)
+
+        for raw in lines:
+            line = raw.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+
+            # Patterns containing a slash are anchored to the .gitignore directory
+            anchored = "/" in line
+            line = line.lstrip("/")
+            if not line:
+                continue
+
+            regex = self._translate(line)
+            if not anchored:
+                regex = "(?:.*/)?" + regex
+            self.rules.append((re.compile(f"^{regex}$"), negate, dir_only))
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        """Translate a gitignore glob to a regex"""
+        parts = []
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if pattern.startswith("**/", i):
+                parts.append("(?:.*/)?")
+                i += 3
+            elif pattern.startswith("**", i):
+                parts.append(".*")
+                i += 2
+            elif char == "*":
+                parts.append("[^/]*")
+                i += 1
+            elif char == "?":
+                parts.append("[^/]")
+                i += 1
+            elif char == "[":
+                end = pattern.find("]", i + 1)
+                if end < 0:
+                    parts.append(re.escape(char))
+                    i += 1
+                else:
+                    body = pattern[i + 1 : end].replace("\\", "\\\\")
+                    if body.startswith("!"):
+                        body = "^" + body[1:]
+                    parts.append(f"[{body}]")
+                    i = end + 1
+            elif char == "\\" and i + 1 < len(pattern):
+                parts.append(re.escape(pattern[i + 1]))
+                i += 2
+            else:
+                parts.append(re.escape(char))
+                i += 1
+        return "".join(parts)
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included, None if no rule applies"""
+        rel_path = path[len(self.base_dir) + 1 :].replace(os.sep, "/")
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negate
+        return result
+
+
+def _is_ignored(path: str, is_dir: bool, ignores: List[_GitIgnore]) -> bool:
+    """Apply .gitignore rules from outermost to innermost"""
+    ignored = False
+    for gitignore in ignores:
+        result = gitignore.match(path, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+class _DirNode:
+    """Directory entry in the path trie"""
+
+    __slots__ = ("children", "files", "mtime_ns", "gitignore")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_DirNode"] = {}
+        self.files: Dict[str, Tuple[int, int]] = {}  # name -> (size, mtime_ns)
+        self.mtime_ns: Optional[int] = None  # None = needs listing
+        self.gitignore: Optional[_GitIgnore] = None
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Distinct trigrams of text"""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _regex_literal(pattern: str) -> str:
+    """
+    Longest literal substring every match of `pattern` must contain
+
+    Conservative: returns "" (no pruning) for alternations and groups.
+    """
+    unescaped = re.sub(r"\\.", "", pattern)
+    if "|" in unescaped or "(" in unescaped:
+        return ""
+
+    runs: List[str] = []
+    current: List[str] = []
+    i = 0
+
+    while i < len(pattern):
+        char = pattern[i]
+        literal: Optional[str] = None
+
+        if char == "\\" and i + 1 < len(pattern):
+            escaped = pattern[i + 1]
+            i += 2
+            if escaped.isalnum():
+                # Character class (\d, \w, ...) or backreference
+                runs.append("".join(current))
+                current = []
+                continue
+            literal = escaped
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            i = len(pattern) if end < 0 else end + 1
+            runs.append("".join(current))
+            current = []
+            continue
+        elif char in _REGEX_META:
+            counted = _COUNTED_QUANTIFIER.match(pattern, i) if char == "{" else None
+            # The digits of a counted quantifier are not text to match
+            i = counted.end() if counted else i + 1
+            runs.append("".join(current))
+            current = []
+            continue
+        else:
+            literal = char
+            i += 1
+
+        # A quantifier may make the preceding character optional
+        quantifier = pattern[i] if i < len(pattern) else ""
+        if quantifier in ("?", "*", "{"):
+            runs.append("".join(current))
+            current = []
+        elif quantifier == "+":
+            current.append(literal)
+            runs.append("".join(current))
+            current = []
+        else:
+            current.append(literal)
+
+    runs.append("".join(current))
+    return max(runs, key=len)
+
+
+class FileIndex:
+    """
+    In-memory index of a directory tree
+
+    Features:
+    - Path trie with directory mtime snapshots
+    - Incremental refresh (only changed directories are re-listed)
+    - Glob and substring path queries served from memory
+    - Trigram index over file contents for grep
+
+    Example:
+        >>> index = FileIndex("./workspace")
+        >>> index.glob("*.py")
+        ['main.py', 'pkg/util.py']
+        >>> index.grep("def main")
+        [{'path': 'main.py', 'line': 3, 'text': 'def main():'}]
+    """
+
+    def __init__(
+        self,
+        root: str,
+        refresh_interval: float = 2.0,
+        max_content_size: int = 1024 * 1024,
+        ignore_dirs: Optional[List[str]] = None,
+        respect_gitignore: bool = False,
+    ):
+        """
+        Initialize file index
+
+        Args:
+            root: Root directory to index
+            refresh_interval: Minimum seconds between automatic refreshes
+            max_content_size: Files larger than this (bytes) are grepped without the trigram index
+            ignore_dirs: Directory names to skip (e.g. [".git", "node_modules"])
+            respect_gitignore: Leave out files ignored by .gitignore files under root
+        """
+        self.root = os.path.abspath(root)
+        self.refresh_interval = refresh_interval
+        self.max_content_size = max_content_size
+        self.ignore_dirs = set(ignore_dirs or [])
+        self.respect_gitignore = respect_gitignore
+
+        self._root_node = _DirNode()
+        self._last_refresh = 0.0
+
+        # Content index: path -> (size, mtime_ns, trigrams), trigram -> paths
+        self._content: Dict[str, Tuple[int, int, Set[str]]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Bring the path trie up to date
+
+        Args:
+            force: Refresh even if refresh_interval has not elapsed
+        """
+        now = time.monotonic()
+        if not force and now - self._last_refresh < self.refresh_interval:
+            return
+
+        self._refresh_dir(self._root_node, self.root, time.time_ns())
+        self._last_refresh = time.monotonic()
+
+    def invalidate(self, path: str) -> None:
+        """
+        Mark a path as changed so the next query re-lists its directory
+
+        Args:
+            path: File or directory that was created, modified or removed
+        """
+        path = os.path.abspath(path)
+        node = self._find_node(os.path.dirname(path))
+        if node is not None:
+            node.mtime_ns = None
+        self._last_refresh = 0.0
+
+    def contains(self, path: str) -> bool:
+        """Check whether path lies inside the indexed root"""
+        path = os.path.abspath(path)
+        return path == self.root or path.startswith(self.root + os.sep)
+
+    def glob(self, pattern: str, base: Optional[str] = None, limit: int = 100) -> List[str]:
+        """
+        Find files matching a glob pattern
+
+        Patterns without "/" match file names; patterns with "/" match the
+        path relative to base.
+
+        Args:
+            pattern: Glob pattern (e.g. "*.py", "src/*/test_*.py")
+            base: Directory to search under (default: root)
+            limit: Maximum results
+
+        Returns:
+            Matching paths relative to base
+        """
+        self.refresh()
+        match_path = "/" in pattern
+        results = []
+
+        for rel_path, name, _ in self._iter_files(base):
+            target = rel_path.replace(os.sep, "/") if match_path else name
+            if fnmatch.fnmatch(target, pattern):
+                results.append(rel_path)
+                if len(results) >= limit:
+                    break
+
+        return results
+
+    def find(self, substring: str, base: Optional[str] = None, limit: int = 100) -> List[str]:
+        """
+        Find files whose relative path contains a substring (case-insensitive)
+
+        Args:
+            substring: Text to look for in paths
+            base: Directory to search under (default: root)
+            limit: Maximum results
+
+        Returns:
+            Matching paths relative to base
+        """
+        self.refresh()
+        needle = substring.lower()
+        results = []
+
+        for rel_path, _, _ in self._iter_files(base):
+            if needle in rel_path.lower():
+                results.append(rel_path)
+                if len(results) >= limit:
+                    break
+
+        return results
+
+    def files(self, base: Optional[str] = None) -> Iterator[Tuple[str, int]]:
+        """
+        Iterate indexed files
+
+        Args:
+            base: Directory to list under (default: root)
+
+        Yields:
+            (absolute path, size in bytes) for each file under base
+        """
+        self.refresh()
+        base_dir = os.path.abspath(base) if base else self.root
+        for rel_path, _, (size, _) in self._iter_files(base_dir):
+            yield os.path.join(base_dir, rel_path), size
+
+    def grep(
+        self,
+        query: str,
+        base: Optional[str] = None,
+        limit: int = 100,
+        regex: bool = False,
+        ignore_case: bool = False,
+        include: Optional[Callable[[str, int], bool]] = None,
+    ) -> List[Dict[str, object]]:
+        """
+        Search file contents
+
+        Candidate files are narrowed with the trigram index, then verified
+        with scan_files().
+
+        Args:
+            query: Literal text, or a regular expression if regex=True
+            base: Directory to search under (default: root)
+            limit: Maximum matching lines
+            regex: Interpret query as a regular expression
+            ignore_case: Case-insensitive matching
+            include: Called with (absolute path, size); files it rejects are
+                neither read nor searched
+
+        Returns:
+            List of {"path", "line", "text"} dicts (path relative to base)
+        """
+        self.refresh()
+        base_dir = os.path.abspath(base) if base else self.root
+
+        # Sync content index for files in scope (large files are searched unindexed),
+        # using the stats recorded by the last listing
+        in_scope = []
+        for rel_path, _, stat in self._iter_files(base_dir):
+            full_path = os.path.join(base_dir, rel_path)
+            if include is not None and not include(full_path, stat[0]):
+                continue
+            indexed = self._sync_content(full_path, *stat)
+            if indexed is not None:
+                in_scope.append((rel_path, full_path, indexed))
+
+        # Narrow candidates with trigrams of the required literal
+        literal = _regex_literal(query) if regex else query
+        required = _trigrams(literal.lower())
+        candidates: Optional[Set[str]] = None
+        for trigram in required:
+            paths = self._postings.get(trigram, set())
+            candidates = set(paths) if candidates is None else candidates & paths
+            if not candidates:
+                break
+
+        rel_paths = {
+            full_path: rel_path
+            for rel_path, full_path, indexed in in_scope
+            if not (
+                indexed
+                and candidates is not None
+                and full_path not in candidates
+                and not self._edited_to_match(full_path, required)
+            )
+        }
+
+        hits = scan_files(
+            list(rel_paths),
+            query if regex else re.escape(query),
+            re.IGNORECASE if ignore_case else 0,
+            limit,
+        )
+        return [{"path": rel_paths[path], "line": line, "text": text} for path, line, text in hits]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get index statistics"""
+        directories = 0
+        files = 0
+        stack = [self._root_node]
+        while stack:
+            node = stack.pop()
+            directories += 1
+            files += len(node.files)
+            stack.extend(node.children.values())
+
+        return {
+            "directories": directories,
+            "files": files,
+            "content_indexed_files": len(self._content),
+            "trigrams": len(self._postings),
+        }
+
+    def _refresh_dir(self, node: _DirNode, path: str, now_ns: int) -> bool:
+        """Refresh one directory and its descendants; False if it vanished"""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return False
+
+        if mtime_ns != node.mtime_ns:
+            self._list_dir(node, path)
+            # Changes within the same mtime tick would go unnoticed
+            node.mtime_ns = mtime_ns if now_ns - mtime_ns > _RACY_WINDOW_NS else None
+
+        for name, child in list(node.children.items()):
+            if not self._refresh_dir(child, os.path.join(path, name), now_ns):
+                self._drop_subtree(child, os.path.join(path, name))
+                del node.children[name]
+
+        return True
+
+    def _list_dir(self, node: _DirNode, path: str) -> None:
+        """Re-list a directory with scandir and diff against the trie"""
+        files: Dict[str, Tuple[int, int]] = {}
+        dirs: Set[str] = set()
+
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.ignore_dirs:
+                                dirs.add(entry.name)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            return
+
+        # Drop removed files and directories
+        for name in node.files.keys() - files.keys():
+            self._drop_content(os.path.join(path, name))
+        for name in node.children.keys() - dirs:
+            self._drop_subtree(node.children.pop(name), os.path.join(path, name))
+
+        for name in dirs - node.children.keys():
+            node.children[name] = _DirNode()
+        node.files = files
+
+        node.gitignore = None
+        if self.respect_gitignore and ".gitignore" in files:
+            try:
+                with open(os.path.join(path, ".gitignore"), "r", errors="ignore") as f:
+                    node.gitignore = _GitIgnore(path, f.readlines())
+            except OSError:
+                pass
+
+    def _drop_subtree(self, node: _DirNode, path: str) -> None:
+        """Remove content index entries for a deleted directory"""
+        for name in node.files:
+            self._drop_content(os.path.join(path, name))
+        for name, child in node.children.items():
+            self._drop_subtree(child, os.path.join(path, name))
+
+    def _find_node(self, path: str) -> Optional[_DirNode]:
+        """Locate the trie node for a directory"""
+        path = os.path.abspath(path)
+        if not self.contains(path):
+            return None
+
+        node = self._root_node
+        rel = os.path.relpath(path, self.root)
+        if rel == ".":
+            return node
+
+        for part in rel.split(os.sep):
+            child = node.children.get(part)
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def _iter_files(self, base: Optional[str]) -> Iterator[Tuple[str, str, Tuple[int, int]]]:
+        """Yield (path relative to base, file name, (size, mtime_ns)) for files under base"""
+        base_dir = os.path.abspath(base) if base else self.root
+        node = self._find_node(base_dir)
+        if node is None:
+            return
+
+        # .gitignore files from root down to base apply below base
+        ignores: List[_GitIgnore] = []
+        if self.respect_gitignore:
+            current = self._root_node
+            parts = os.path.relpath(base_dir, self.root).split(os.sep)
+            for part in [p for p in parts if p != "."] + [""]:
+                if current.gitignore is not None:
+                    ignores.append(current.gitignore)
+                current = current.children.get(part, current)
+
+        stack = [(node, "", ignores)]
+        while stack:
+            current, prefix, ignores = stack.pop()
+            for name in sorted(current.files):
+                rel_path = os.path.join(prefix, name) if prefix else name
+                if ignores and _is_ignored(os.path.join(base_dir, rel_path), False, ignores):
+                    continue
+                yield rel_path, name, current.files[name]
+            for name in sorted(current.children, reverse=True):
+                child = current.children[name]
+                child_prefix = os.path.join(prefix, name) if prefix else name
+                if ignores and _is_ignored(os.path.join(base_dir, child_prefix), True, ignores):
+                    continue
+                child_ignores = ignores + [child.gitignore] if child.gitignore else ignores
+                stack.append((child, child_prefix, child_ignores))
+
+    def _sync_content(self, path: str, size: int, mtime_ns: int) -> Optional[bool]:
+        """
+        Make sure a file's trigrams are current
+
+        Args:
+            path: Absolute file path
+            size: File size recorded in the trie
+            mtime_ns: File mtime recorded in the trie
+
+        Returns:
+            True if indexed, False if searchable but too large to index,
+            None if unreadable or binary
+        """
+        if size > self.max_content_size:
+            self._drop_content(path)
+            try:
+                with open(path, "rb") as f:
+                    return None if b"\0" in f.read(8192) else False
+            except OSError:
+                return None
+
+        entry = self._content.get(path)
+        if entry and entry[0] == size and entry[1] == mtime_ns:
+            return True
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self._drop_content(path)
+            return None
+
+        self._drop_content(path)
+
+        # Skip binary files
+        if b"\0" in data[:8192]:
+            return None
+
+        trigrams = _trigrams(data.decode("utf-8", errors="ignore").lower())
+        self._content[path] = (size, mtime_ns, trigrams)
+        for trigram in trigrams:
+            self._postings.setdefault(trigram, set()).add(path)
+
+        return True
+
+    def _edited_to_match(self, path: str, required: Set[str]) -> bool:
+        """
+        Check a file the trigram index would skip for edits since indexing
+
+        Args:
+            path: Absolute path of an indexed file
+            required: Trigrams every match contains
+
+        Returns:
+            True if the file changed and may now match
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+
+        entry = self._content.get(path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return False
+
+        # Record the new stats so the next listing-based sync keeps the entry
+        node = self._find_node(os.path.dirname(path))
+        name = os.path.basename(path)
+        if node is not None and name in node.files:
+            node.files[name] = (stat.st_size, stat.st_mtime_ns)
+
+        indexed = self._sync_content(path, stat.st_size, stat.st_mtime_ns)
+        if not indexed:
+            # Now too large to index: scan it
+            return indexed is False
+        return required <= self._content[path][2]
+
+    def _drop_content(self, path: str) -> None:
+        """Remove a file from the trigram index"""
+        entry = self._content.pop(path, None)
+        if entry is None:
+            return
+
+        for trigram in entry[2]:
+            paths = self._postings.get(trigram)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self._postings[trigram]
+
+    def __repr__(self) -> str:
+        stats = self.get_stats()
+        return f"FileIndex(root='{self.root}', files={stats['files']}, directories={stats['directories']})"
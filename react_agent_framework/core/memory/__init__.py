@@ -6,6 +6,9 @@ TWO types of memory:
 1. **Chat Memory** - Conversation history (sequential)
    - SimpleChatMemory: In-memory buffer
    - SQLiteChatMemory: SQLite database
+   - TieredChatMemory: In-memory hot window over SQLite
+   - SummaryChatMemory: Rolling summary + recent window
+   - SharedChatMemory: Sessions shared by worker processes (Unix socket server)
 
 2. **Knowledge Memory** - RAG/Semantic search (vector-based)
    - ChromaKnowledgeMemory: ChromaDB vector database
@@ -31,6 +34,10 @@ from react_agent_framework.core.memory.chat import (
     ChatMessage,
     SimpleChatMemory,
     SQLiteChatMemory,
+    TieredChatMemory,
+    SummaryChatMemory,
+    SharedChatMemory,
+    SharedMemoryServer,
 )
 
 # Knowledge memory
@@ -43,12 +50,27 @@ from react_agent_framework.core.memory.knowledge import (
 from react_agent_framework.core.memory.base import BaseMemory, MemoryMessage
 from react_agent_framework.core.memory.simple import SimpleMemory
 
+# Embedding cache shared by the vector memories
+from react_agent_framework.core.memory.embedding_cache import EmbeddingCache
+
+# Compact message representations
+from react_agent_framework.core.memory.compact import (
+    CompactChatMessage,
+    CompactKnowledgeDocument,
+    CompactMemoryMessage,
+    CompactMessage,
+)
+
 __all__ = [
     # Chat memory (new)
     "BaseChatMemory",
     "ChatMessage",
     "SimpleChatMemory",
     "SQLiteChatMemory",
+    "TieredChatMemory",
+    "SummaryChatMemory",
+    "SharedChatMemory",
+    "SharedMemoryServer",
     # Knowledge memory (new)
     "BaseKnowledgeMemory",
     "KnowledgeDocument",
@@ -56,6 +78,13 @@ __all__ = [
     "BaseMemory",
     "MemoryMessage",
     "SimpleMemory",
+    # Embedding cache
+    "EmbeddingCache",
+    # Compact messages
+    "CompactMemoryMessage",
+    "CompactChatMessage",
+    "CompactKnowledgeDocument",
+    "CompactMessage",
 ]
 
 # Optional knowledge memory imports
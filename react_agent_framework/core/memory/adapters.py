@@ -5,6 +5,7 @@ Adapters for backward compatibility between old and new memory systems
 from typing import List, Dict, Any, Optional
 from react_agent_framework.core.memory.base import BaseMemory, MemoryMessage
 from react_agent_framework.core.memory.chat.base import BaseChatMemory, ChatMessage
+from react_agent_framework.core.memory.compact import CompactChatMessage, CompactMemoryMessage
 
 
 class LegacyMemoryAdapter(BaseChatMemory):
@@ -55,6 +56,18 @@ class LegacyMemoryAdapter(BaseChatMemory):
         messages = self.legacy.get_recent(n=n)
         return [self._convert_to_chat_message(msg) for msg in messages]
 
+    def get_context(
+        self,
+        query: Optional[str] = None,
+        max_tokens: int = 2000,
+        max_messages: int = 10,
+        use_search: bool = True,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """Get context using legacy get_context()"""
+        messages = self.legacy.get_context(query, max_tokens=max_tokens, use_search=use_search)
+        return [self._convert_to_chat_message(msg) for msg in messages[-max_messages:]]
+
     def clear(self, session_id: Optional[str] = None) -> None:
         """Clear using legacy clear()"""
         self.legacy.clear(session_id=session_id)
@@ -64,13 +77,13 @@ class LegacyMemoryAdapter(BaseChatMemory):
         return self.legacy.get_stats()
 
     def _convert_to_chat_message(self, msg: MemoryMessage) -> ChatMessage:
-        """Convert MemoryMessage to ChatMessage"""
-        return ChatMessage(
-            content=msg.content,
-            role=msg.role,
-            timestamp=msg.timestamp,
-            session_id=getattr(msg, "session_id", self.session_id),
-            metadata=msg.metadata,
+        """Convert MemoryMessage to ChatMessage (content and metadata are shared, not copied)"""
+        return CompactChatMessage(
+            msg.content,
+            msg.role,
+            msg.timestamp,
+            getattr(msg, "session_id", self.session_id),
+            msg.metadata,
         )
 
 
@@ -122,6 +135,16 @@ class ChatToLegacyAdapter(BaseMemory):
         messages = self.chat.get_recent(n=n)
         return [self._convert_to_memory_message(msg) for msg in messages]
 
+    def get_context(
+        self,
+        query: Optional[str] = None,
+        max_tokens: int = 2000,
+        use_search: bool = True,
+    ) -> List[MemoryMessage]:
+        """Get context using new get_context() (keeps backend-specific context)"""
+        messages = self.chat.get_context(query, max_tokens=max_tokens, use_search=use_search)
+        return [self._convert_to_memory_message(msg) for msg in messages]
+
     def clear(self, session_id: Optional[str] = None) -> None:
         """Clear using new clear()"""
         self.chat.clear(session_id=session_id)
@@ -131,10 +154,5 @@ class ChatToLegacyAdapter(BaseMemory):
         return self.chat.get_stats()
 
     def _convert_to_memory_message(self, msg: ChatMessage) -> MemoryMessage:
-        """Convert ChatMessage to MemoryMessage"""
-        return MemoryMessage(
-            content=msg.content,
-            role=msg.role,
-            timestamp=msg.timestamp,
-            metadata=msg.metadata,
-        )
+        """Convert ChatMessage to MemoryMessage (content and metadata are shared, not copied)"""
+        return CompactMemoryMessage(msg.content, msg.role, msg.timestamp, msg.metadata)
@@ -7,7 +7,11 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
+from react_agent_framework._compat import dataclass_slots
+from react_agent_framework.core.memory.context import ContextAssembler, merge_candidates
 
+
+@dataclass_slots
 @dataclass
 class MemoryMessage:
     """
@@ -73,6 +77,9 @@ class BaseMemory(ABC):
         self.max_messages = max_messages
         self.session_id = session_id or "default"
 
+        # Ranks and packs get_context candidates (assign a ContextAssembler to tune)
+        self.context_assembler = ContextAssembler()
+
     @abstractmethod
     def add(
         self,
@@ -182,22 +189,18 @@ class BaseMemory(ABC):
         Returns:
             List of relevant messages for context
         """
+        # Candidates: recent messages plus search hits (best first), ranked
+        # and packed by the context assembler
+        recent = self.get_recent(n=20)
+        hits: List[MemoryMessage] = []
         if query and use_search:
-            # Get semantically relevant messages
-            messages = self.search(query, top_k=10)
-        else:
-            # Just get recent messages
-            messages = self.get_recent(n=10)
-
-        # Simple token estimation (4 chars ≈ 1 token)
-        total_chars = 0
-        context = []
-
-        for msg in reversed(messages):
-            msg_chars = len(msg.content)
-            if total_chars + msg_chars > max_tokens * 4:
-                break
-            context.insert(0, msg)
-            total_chars += msg_chars
-
-        return context
+            hits = self.search(query, top_k=10)
+
+        candidates, similarities = merge_candidates(recent, hits)
+        return self.context_assembler.assemble(
+            candidates,
+            query=query if use_search else None,
+            max_tokens=max_tokens,
+            max_messages=10,
+            similarities=similarities,
+        )
@@ -0,0 +1,641 @@
+"""
+Benchmark harness for the memory backends
+
+Measures insert throughput, get_recent / search latency, footprint and a
+thread-concurrency sweep for each backend on synthetic corpora, using a
+deterministic fake embedder (no API calls). Results are JSON, so runs on
+different commits can be diffed to catch regressions:
+
+    python -m react_agent_framework.core.memory.benchmark \\
+        --backends simple_memory,sqlite_chat,faiss_knowledge --scales 1k,100k \\
+        --output results.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Synthetic corpus sizes
+SCALES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+
+_VOCABULARY_SIZE = 5000
+_WORDS_PER_TEXT = (8, 40)
+
+
+class FakeEmbedder:
+    """
+    Deterministic bag-of-words embedder
+
+    Each word is hashed to a dimension, so texts sharing words get nearby
+    vectors and search results are meaningful without an embedding API.
+    """
+
+    def __init__(self, dimension: int = 64):
+        """
+        Initialize the embedder
+
+        Args:
+            dimension: Embedding dimension
+        """
+        self.dimension = dimension
+        self._buckets: Dict[str, int] = {}
+
+    def _bucket(self, word: str) -> int:
+        bucket = self._buckets.get(word)
+        if bucket is None:
+            digest = hashlib.md5(word.encode("utf-8")).digest()
+            bucket = self._buckets[word] = int.from_bytes(digest[:4], "little") % self.dimension
+        return bucket
+
+    def embed(self, texts: Sequence[str]) -> Any:
+        """
+        Embed texts
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array of shape (len(texts), dimension), L2-normalized rows
+        """
+        import numpy as np
+
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, self._bucket(word)] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class SyntheticCorpus:
+    """Reproducible texts with a Zipf-like word distribution"""
+
+    def __init__(self, seed: int = 0, num_sessions: int = 100):
+        """
+        Initialize the corpus
+
+        Args:
+            seed: Random seed (same seed, same texts)
+            num_sessions: Sessions the texts are spread over
+        """
+        self.seed = seed
+        self.num_sessions = num_sessions
+        self._words = [f"w{i}" for i in range(_VOCABULARY_SIZE)]
+        self._weights = [1.0 / (rank + 1) for rank in range(_VOCABULARY_SIZE)]
+
+    def texts(self, n: int, offset: int = 0) -> List[str]:
+        """
+        Generate texts
+
+        Args:
+            n: Number of texts
+            offset: Index of the first text (texts are a pure function of seed and index)
+
+        Returns:
+            List of texts
+        """
+        texts = []
+        for i in range(offset, offset + n):
+            rng = random.Random(self.seed * 1_000_003 + i)
+            length = rng.randint(*_WORDS_PER_TEXT)
+            texts.append(" ".join(rng.choices(self._words, self._weights, k=length)))
+        return texts
+
+    def queries(self, n: int) -> List[str]:
+        """Generate n search queries of 2-4 words"""
+        rng = random.Random(self.seed - 1)
+        return [
+            " ".join(rng.choices(self._words, self._weights, k=rng.randint(2, 4))) for _ in range(n)
+        ]
+
+    def session(self, i: int) -> str:
+        """Session of the i-th text"""
+        return f"session-{i % self.num_sessions}"
+
+
+class Backend:
+    """Uniform wrapper over one memory instance"""
+
+    def __init__(
+        self,
+        memory: Any,
+        insert: Callable[[Any, List[str], List[str]], None],
+        recent: Optional[Callable[[Any, int, str], Any]],
+        search: Callable[[Any, str, int, str], Any],
+        path: Optional[Path] = None,
+    ):
+        """
+        Initialize the wrapper
+
+        Args:
+            memory: Memory instance
+            insert: Function (memory, texts, sessions) storing texts
+            recent: Function (memory, n, session_id) returning recent items
+                (None = unsupported)
+            search: Function (memory, query, k, session_id) returning search results
+            path: Directory holding the backend's files (for the disk footprint)
+        """
+        self.memory = memory
+        self.insert = lambda texts, sessions: insert(memory, texts, sessions)
+        self.recent = (lambda n, session_id: recent(memory, n, session_id)) if recent else None
+        self.search = lambda query, k, session_id: search(memory, query, k, session_id)
+        self.path = path
+
+    def close(self) -> None:
+        for name in ("close", "flush"):
+            method = getattr(self.memory, name, None)
+            if method is not None:
+                method()
+                return
+
+
+# Memories that select the session through their session_id attribute are
+# shared by the sweep's threads: switching and using it must not interleave
+_session_lock = threading.Lock()
+
+
+def _add_legacy(memory: Any, texts: List[str], sessions: List[str]) -> None:
+    for text, session_id in zip(texts, sessions):
+        with _session_lock:
+            memory.session_id = session_id
+            memory.add(text, role="user")
+
+
+def _add_chat(memory: Any, texts: List[str], sessions: List[str]) -> None:
+    for text, session_id in zip(texts, sessions):
+        with _session_lock:
+            memory.session_id = session_id
+            memory.add_message(text, role="user")
+
+
+def _add_knowledge(memory: Any, texts: List[str], sessions: List[str]) -> None:
+    memory.add_documents(texts, metadata_list=[{"session": s} for s in sessions], batch_size=1000)
+
+
+def _recent_legacy(memory: Any, n: int, session_id: str) -> Any:
+    with _session_lock:
+        memory.session_id = session_id
+        return memory.get_recent(n)
+
+
+def _recent_chat(memory: Any, n: int, session_id: str) -> Any:
+    return memory.get_recent(n=n, session_id=session_id)
+
+
+def _search_legacy(memory: Any, query: str, k: int, session_id: str) -> Any:
+    with _session_lock:
+        memory.session_id = session_id
+        return memory.search(query, top_k=k)
+
+
+def _search(memory: Any, query: str, k: int, session_id: str) -> Any:
+    return memory.search(query, top_k=k)
+
+
+def _search_chat(memory: Any, query: str, k: int, session_id: str) -> Any:
+    return memory.search_messages(query, limit=k, session_id=session_id)
+
+
+def _simple_memory(path: Path, embedder: FakeEmbedder) -> Backend:
+    from react_agent_framework.core.memory.simple import SimpleMemory
+
+    return Backend(SimpleMemory(max_messages=None), _add_legacy, _recent_legacy, _search_legacy)
+
+
+def _simple_chat(path: Path, embedder: FakeEmbedder) -> Backend:
+    from react_agent_framework.core.memory.chat.simple import SimpleChatMemory
+
+    return Backend(SimpleChatMemory(max_messages=None), _add_chat, _recent_chat, _search_chat)
+
+
+def _sqlite_chat(path: Path, embedder: FakeEmbedder) -> Backend:
+    from react_agent_framework.core.memory.chat.sqlite import SQLiteChatMemory
+
+    memory = SQLiteChatMemory(str(path / "chat.db"), batch_writes=True)
+    return Backend(memory, _add_chat, _recent_chat, _search_chat, path)
+
+
+def _tiered_chat(path: Path, embedder: FakeEmbedder) -> Backend:
+    from react_agent_framework.core.memory.chat.tiered import TieredChatMemory
+
+    memory = TieredChatMemory(db_path=str(path / "chat.db"))
+    return Backend(memory, _add_chat, _recent_chat, _search_chat, path)
+
+
+def _faiss_memory(path: Path, embedder: FakeEmbedder) -> Backend:
+    from react_agent_framework.core.memory.faiss import FAISSMemory
+
+    class BenchmarkFAISSMemory(FAISSMemory):
+        def _get_embedding(self, text):
+            return embedder.embed([text])[0]
+
+    memory = BenchmarkFAISSMemory(
+        index_path=str(path / "faiss"), dimension=embedder.dimension, api_key="benchmark"
+    )
+    return Backend(memory, _add_legacy, _recent_legacy, _search_legacy, path)
+
+
+def _faiss_knowledge(path: Path, embedder: FakeEmbedder) -> Backend:
+    from react_agent_framework.core.memory.knowledge.faiss import FAISSKnowledgeMemory
+
+    class BenchmarkFAISSKnowledgeMemory(FAISSKnowledgeMemory):
+        def _get_embeddings(self, texts):
+            return embedder.embed(texts)
+
+    memory = BenchmarkFAISSKnowledgeMemory(
+        index_path=str(path / "faiss_kb"), dimension=embedder.dimension, api_key="benchmark"
+    )
+    return Backend(memory, _add_knowledge, None, _search, path)
+
+
+def _chroma_embedding_function(embedder: FakeEmbedder) -> Any:
+    """Wrap the fake embedder in ChromaDB's embedding-function interface"""
+    from chromadb.api.types import EmbeddingFunction
+
+    class FakeEmbeddingFunction(EmbeddingFunction):
+        def __init__(self, dimension: int):
+            self.embedder = embedder if dimension == embedder.dimension else FakeEmbedder(dimension)
+
+        def __call__(self, input):
+            return list(self.embedder.embed(list(input)))
+
+        @staticmethod
+        def name() -> str:
+            return "react-agent-benchmark"
+
+        def get_config(self) -> Dict[str, Any]:
+            return {"dimension": self.embedder.dimension}
+
+        @staticmethod
+        def build_from_config(config: Dict[str, Any]) -> "FakeEmbeddingFunction":
+            return FakeEmbeddingFunction(config["dimension"])
+
+    return FakeEmbeddingFunction(embedder.dimension)
+
+
+def _chroma_memory(path: Path, embedder: FakeEmbedder) -> Backend:
+    from react_agent_framework.core.memory.chroma import ChromaMemory
+
+    class BenchmarkChromaMemory(ChromaMemory):
+        def _get_embedding_function(self, func_type, model, api_key):
+            return _chroma_embedding_function(embedder)
+
+    memory = BenchmarkChromaMemory(collection_name="benchmark", persist_directory=str(path))
+    return Backend(memory, _add_legacy, _recent_legacy, _search_legacy, path)
+
+
+def _chroma_knowledge(path: Path, embedder: FakeEmbedder) -> Backend:
+    from react_agent_framework.core.memory.knowledge.chroma import ChromaKnowledgeMemory
+
+    class BenchmarkChromaKnowledgeMemory(ChromaKnowledgeMemory):
+        def _get_embedding_function(self, func_type, model, api_key):
+            return _chroma_embedding_function(embedder)
+
+    memory = BenchmarkChromaKnowledgeMemory(
+        collection_name="benchmark", persist_directory=str(path)
+    )
+    return Backend(memory, _add_knowledge, None, _search, path)
+
+
+# Backend name -> factory(directory, embedder)
+BACKENDS: Dict[str, Callable[[Path, FakeEmbedder], Backend]] = {
+    "simple_memory": _simple_memory,
+    "simple_chat": _simple_chat,
+    "sqlite_chat": _sqlite_chat,
+    "tiered_chat": _tiered_chat,
+    "faiss_memory": _faiss_memory,
+    "chroma_memory": _chroma_memory,
+    "faiss_knowledge": _faiss_knowledge,
+    "chroma_knowledge": _chroma_knowledge,
+}
+
+
+def _latency_stats(samples: List[float]) -> Dict[str, float]:
+    """Latency percentiles in milliseconds"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        return round(ordered[min(int(p * len(ordered)), len(ordered) - 1)] * 1000, 4)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def _timed(samples: List[float], call: Callable[..., Any], *args: Any) -> None:
+    start = time.perf_counter()
+    call(*args)
+    samples.append(time.perf_counter() - start)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process (Linux; None elsewhere)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _disk_bytes(path: Optional[Path]) -> Optional[int]:
+    if path is None:
+        return None
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def _concurrency_sweep(
+    backend: Backend,
+    corpus: SyntheticCorpus,
+    queries: List[str],
+    offset: int,
+    threads: Sequence[int],
+    ops_per_thread: int,
+    write_ratio: float,
+    top_k: int,
+) -> List[Dict[str, Any]]:
+    """Mixed read/write workload at each thread count"""
+    results = []
+    for num_threads in threads:
+        samples: Dict[str, List[float]] = {"insert": [], "get_recent": [], "search": []}
+        lock = threading.Lock()
+        barrier = threading.Barrier(num_threads)
+        errors: List[str] = []
+
+        # Loop state is passed in rather than closed over
+        def worker(
+            worker_id: int,
+            offset: int,
+            barrier: threading.Barrier,
+            samples: Dict[str, List[float]],
+            lock: threading.Lock,
+            errors: List[str],
+        ) -> None:
+            rng = random.Random(worker_id)
+            local: Dict[str, List[float]] = {name: [] for name in samples}
+            texts = corpus.texts(ops_per_thread, offset + worker_id * ops_per_thread)
+            # Each thread plays one conversation
+            session_id = corpus.session(worker_id)
+            recent = backend.recent
+            barrier.wait()
+            try:
+                for i in range(ops_per_thread):
+                    roll = rng.random()
+                    if roll < write_ratio:
+                        _timed(local["insert"], backend.insert, [texts[i]], [session_id])
+                    elif recent is not None and roll < (1 + write_ratio) / 2:
+                        _timed(local["get_recent"], recent, 10, session_id)
+                    else:
+                        query = queries[rng.randrange(len(queries))]
+                        _timed(local["search"], backend.search, query, top_k, session_id)
+            except Exception as e:
+                errors.append(f"{e.__class__.__name__}: {e}")
+            with lock:
+                for name, values in local.items():
+                    samples[name].extend(values)
+
+        workers = [
+            threading.Thread(target=worker, args=(i, offset, barrier, samples, lock, errors))
+            for i in range(num_threads)
+        ]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        offset += num_threads * ops_per_thread
+
+        total = sum(len(values) for values in samples.values())
+        result: Dict[str, Any] = {
+            "threads": num_threads,
+            "ops_per_sec": round(total / elapsed, 2) if elapsed else None,
+        }
+        result.update({name: _latency_stats(values) for name, values in samples.items() if values})
+        if errors:
+            result["errors"] = errors[:5]
+        results.append(result)
+    return results
+
+
+def run_benchmark(
+    backend_name: str,
+    size: int,
+    directory: str,
+    embedder: Optional[FakeEmbedder] = None,
+    seed: int = 0,
+    num_queries: int = 100,
+    top_k: int = 5,
+    insert_batch: int = 1000,
+    threads: Sequence[int] = (1, 2, 4, 8),
+    ops_per_thread: int = 200,
+    write_ratio: float = 0.2,
+) -> Dict[str, Any]:
+    """
+    Benchmark one backend at one corpus size
+
+    Args:
+        backend_name: Key of BACKENDS
+        size: Number of texts to insert
+        directory: Scratch directory for the backend's files
+        embedder: Embedder for vector backends (default: FakeEmbedder())
+        seed: Corpus seed
+        num_queries: get_recent / search calls timed after loading
+        top_k: Results per search
+        insert_batch: Texts per insert call while loading
+        threads: Thread counts of the concurrency sweep (empty = skip)
+        ops_per_thread: Operations per thread in the sweep
+        write_ratio: Share of inserts in the sweep workload
+
+    Returns:
+        Result dictionary (with "skipped" if the backend is unavailable)
+    """
+    embedder = embedder or FakeEmbedder()
+    corpus = SyntheticCorpus(seed=seed)
+    result: Dict[str, Any] = {"backend": backend_name, "size": size}
+
+    path = Path(directory) / f"{backend_name}-{size}"
+    path.mkdir(parents=True, exist_ok=True)
+    rss_before = _rss_bytes()
+    try:
+        backend = BACKENDS[backend_name](path, embedder)
+    except ImportError as e:
+        result["skipped"] = str(e)
+        return result
+
+    try:
+        start = time.perf_counter()
+        for offset in range(0, size, insert_batch):
+            count = min(insert_batch, size - offset)
+            texts = corpus.texts(count, offset)
+            backend.insert(texts, [corpus.session(offset + i) for i in range(count)])
+        if hasattr(backend.memory, "flush"):
+            backend.memory.flush()
+        elapsed = time.perf_counter() - start
+        result["insert"] = {
+            "seconds": round(elapsed, 4),
+            "items_per_sec": round(size / elapsed, 2) if elapsed else None,
+        }
+
+        rss_after = _rss_bytes()
+        result["footprint"] = {
+            "rss_delta_bytes": (
+                rss_after - rss_before if rss_after is not None and rss_before is not None else None
+            ),
+            "disk_bytes": _disk_bytes(backend.path),
+        }
+
+        queries = corpus.queries(num_queries)
+        session_id = corpus.session(0)
+        recent = backend.recent
+        if recent is not None:
+            samples: List[float] = []
+            for _ in range(num_queries):
+                _timed(samples, recent, 10, session_id)
+            result["get_recent"] = _latency_stats(samples)
+
+        samples = []
+        for query in queries:
+            _timed(samples, backend.search, query, top_k, session_id)
+        result["search"] = _latency_stats(samples)
+
+        if threads:
+            result["concurrency"] = _concurrency_sweep(
+                backend, corpus, queries, size, threads, ops_per_thread, write_ratio, top_k
+            )
+    finally:
+        backend.close()
+
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).resolve().parent,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    backends: Sequence[str],
+    scales: Sequence[str],
+    directory: Optional[str] = None,
+    dimension: int = 64,
+    seed: int = 0,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Benchmark several backends at several scales
+
+    Args:
+        backends: Keys of BACKENDS
+        scales: Keys of SCALES (or plain integers as strings)
+        directory: Scratch directory (default: a temporary directory, removed afterwards)
+        dimension: Fake embedding dimension
+        seed: Corpus seed
+        **kwargs: Passed to run_benchmark
+
+    Returns:
+        {"meta": {...environment...}, "results": [...]}
+    """
+    from react_agent_framework import __version__
+
+    unknown = [name for name in backends if name not in BACKENDS]
+    if unknown:
+        raise ValueError(f"Unknown backends: {unknown}. Available: {list(BACKENDS)}")
+
+    embedder = FakeEmbedder(dimension)
+    scratch = directory or tempfile.mkdtemp(prefix="memory-benchmark-")
+    results = []
+    try:
+        for scale in scales:
+            size = SCALES[scale] if scale in SCALES else int(scale)
+            for backend_name in backends:
+                results.append(
+                    run_benchmark(
+                        backend_name, size, scratch, embedder=embedder, seed=seed, **kwargs
+                    )
+                )
+    finally:
+        if directory is None:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(),
+            "version": __version__,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "dimension": dimension,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the memory backends")
+    parser.add_argument(
+        "--backends", default=",".join(BACKENDS), help="Comma-separated backend names"
+    )
+    parser.add_argument("--scales", default="1k", help="Comma-separated: 1k, 100k, 1M or counts")
+    parser.add_argument("--threads", default="1,2,4,8", help="Thread counts ('' = no sweep)")
+    parser.add_argument("--ops-per-thread", type=int, default=200)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--dimension", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--directory", default=None, help="Keep backend files here")
+    parser.add_argument("--output", default=None, help="JSON file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run_suite(
+        backends=[name for name in args.backends.split(",") if name],
+        scales=[scale for scale in args.scales.split(",") if scale],
+        directory=args.directory,
+        dimension=args.dimension,
+        seed=args.seed,
+        num_queries=args.queries,
+        top_k=args.top_k,
+        threads=[int(n) for n in args.threads.split(",") if n],
+        ops_per_thread=args.ops_per_thread,
+        write_ratio=args.write_ratio,
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+In-memory BM25 keyword index and rank fusion for hybrid retrieval
+
+Embeddings retrieve poorly on exact tokens such as error codes and
+identifiers; BM25 over an inverted index covers them. Postings are updated
+incrementally on add/remove, so the index never needs a rebuild.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Item ID type (e.g. int FAISS IDs or str document IDs)
+K = TypeVar("K", bound=Hashable)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens (keeps identifiers like err_404 whole)"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class BM25Index(Generic[K]):
+    """
+    Okapi BM25 over an incrementally maintained inverted index
+
+    Items are identified by any hashable ID (e.g. FAISS ID or document ID).
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize an empty index
+
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization (0 = none, 1 = full)
+        """
+        self.k1 = k1
+        self.b = b
+
+        # term -> {item ID: term frequency}
+        self._postings: Dict[str, Dict[K, int]] = {}
+        # item ID -> (document length, distinct terms)
+        self._items: Dict[K, Tuple[int, Tuple[str, ...]]] = {}
+        self._total_length = 0
+
+    def add(self, item_id: K, text: str) -> None:
+        """Index text under an ID (replaces any previous text for the ID)"""
+        if item_id in self._items:
+            self.remove(item_id)
+
+        counts = Counter(tokenize(text))
+        for term, count in counts.items():
+            self._postings.setdefault(term, {})[item_id] = count
+
+        length = sum(counts.values())
+        self._items[item_id] = (length, tuple(counts))
+        self._total_length += length
+
+    def remove(self, item_id: K) -> None:
+        """Remove an ID from the index (no-op if absent)"""
+        item = self._items.pop(item_id, None)
+        if item is None:
+            return
+
+        length, terms = item
+        for term in terms:
+            posting = self._postings[term]
+            del posting[item_id]
+            if not posting:
+                del self._postings[term]
+        self._total_length -= length
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        accept: Optional[Callable[[K], bool]] = None,
+    ) -> List[Tuple[K, float]]:
+        """
+        Rank items by BM25 score
+
+        Args:
+            query: Keyword query
+            top_k: Number of results
+            accept: Optional predicate restricting which IDs may be returned
+
+        Returns:
+            (ID, score) pairs, best first; items sharing no term are omitted
+        """
+        if not self._items:
+            return []
+
+        num_items = len(self._items)
+        avg_length = self._total_length / num_items or 1.0
+        k1, b = self.k1, self.b
+
+        scores: Dict[K, float] = {}
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+
+            df = len(posting)
+            idf = math.log(1.0 + (num_items - df + 0.5) / (df + 0.5))
+            for item_id, tf in posting.items():
+                length = self._items[item_id][0]
+                norm = k1 * (1.0 - b + b * length / avg_length)
+                scores[item_id] = scores.get(item_id, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+
+        candidates: Iterable[Tuple[K, float]] = scores.items()
+        if accept is not None:
+            candidates = (item for item in candidates if accept(item[0]))
+        return heapq.nlargest(top_k, candidates, key=lambda item: item[1])
+
+    def clear(self) -> None:
+        """Remove all items"""
+        self._postings.clear()
+        self._items.clear()
+        self._total_length = 0
+
+    def __contains__(self, item_id: K) -> bool:
+        return item_id in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[K]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Tuple[K, float]]:
+    """
+    Fuse several rankings with reciprocal rank fusion
+
+    Each ranking contributes weight / (k + rank) to an item's score, so items
+    ranked well by any retriever rise without calibrating raw scores.
+
+    Args:
+        rankings: Ranked ID lists, best first
+        k: Rank smoothing constant (60 is the usual choice)
+        weights: Per-ranking weights (default 1.0 each)
+
+    Returns:
+        (ID, fused score) pairs, best first
+    """
+    weights = weights or [1.0] * len(rankings)
+    fused: Dict[K, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, item_id in enumerate(ranking, start=1):
+            fused[item_id] = fused.get(item_id, 0.0) + weight / (k + rank)
+
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
@@ -8,16 +8,26 @@ Chat memory stores sequential conversation history between:
 Available implementations:
 - SimpleChatMemory: In-memory buffer (no persistence)
 - SQLiteChatMemory: SQLite database (persistent)
+- TieredChatMemory: In-memory hot window over SQLite (fast and persistent)
+- SummaryChatMemory: Rolling LLM summary + recent window (constant prompt size)
+- SharedChatMemory: Client of a SharedMemoryServer shared by worker processes
 - PostgresChatMemory: PostgreSQL database (production, coming soon)
 """
 
 from react_agent_framework.core.memory.chat.base import BaseChatMemory, ChatMessage
 from react_agent_framework.core.memory.chat.simple import SimpleChatMemory
 from react_agent_framework.core.memory.chat.sqlite import SQLiteChatMemory
+from react_agent_framework.core.memory.chat.tiered import TieredChatMemory
+from react_agent_framework.core.memory.chat.summary import SummaryChatMemory
+from react_agent_framework.core.memory.chat.shared import SharedChatMemory, SharedMemoryServer
 
 __all__ = [
     "BaseChatMemory",
     "ChatMessage",
     "SimpleChatMemory",
     "SQLiteChatMemory",
+    "TieredChatMemory",
+    "SummaryChatMemory",
+    "SharedChatMemory",
+    "SharedMemoryServer",
 ]
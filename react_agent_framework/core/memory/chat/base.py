@@ -13,7 +13,11 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
+from react_agent_framework._compat import dataclass_slots
+from react_agent_framework.core.memory.context import ContextAssembler, merge_candidates
 
+
+@dataclass_slots
 @dataclass
 class ChatMessage:
     """
@@ -86,6 +90,9 @@ class BaseChatMemory(ABC):
         self.session_id = session_id or "default"
         self.max_messages = max_messages
 
+        # Ranks and packs get_context candidates (assign a ContextAssembler to tune)
+        self.context_assembler = ContextAssembler()
+
     @abstractmethod
     def add_message(
         self,
@@ -197,28 +204,21 @@ class BaseChatMemory(ABC):
         Returns:
             List of relevant messages for context
         """
-        # If query provided and search enabled, try keyword search first
+        # Candidates: a recent window plus search hits, ranked and packed by
+        # the context assembler
+        recent = self.get_recent(n=max_messages * 2, session_id=session_id)
+        hits: List[ChatMessage] = []
         if query and use_search:
-            messages = self.search_messages(query, limit=max_messages, session_id=session_id)
-            if not messages:
-                # Fall back to recent if search has no results
-                messages = self.get_recent(n=max_messages, session_id=session_id)
-        else:
-            # Just get recent messages
-            messages = self.get_recent(n=max_messages, session_id=session_id)
-
-        # Filter by token limit (simple estimation: 4 chars ≈ 1 token)
-        total_chars = 0
-        context = []
-
-        for msg in reversed(messages):
-            msg_chars = len(msg.content)
-            if total_chars + msg_chars > max_tokens * 4:
-                break
-            context.insert(0, msg)
-            total_chars += msg_chars
-
-        return context
+            hits = self.search_messages(query, limit=max_messages, session_id=session_id)
+
+        candidates, similarities = merge_candidates(recent, hits, ranked=False)
+        return self.context_assembler.assemble(
+            candidates,
+            query=query if use_search else None,
+            max_tokens=max_tokens,
+            max_messages=max_messages,
+            similarities=similarities,
+        )
 
     def search_messages(
         self,
@@ -0,0 +1,510 @@
+"""
+Chat memory shared by the worker processes of one host over a Unix socket
+
+A SharedMemoryServer keeps every session in a SimpleChatMemory inside one
+process (e.g. started next to gunicorn/uvicorn). Workers use SharedChatMemory,
+which forwards each call over a Unix domain socket, so all workers see the same
+conversations at in-memory speed. Each session has a lock on the server:
+operations on a session are serialized, and session_lock() holds it across
+several calls for read-modify-write sequences.
+
+Wire format: 4-byte big-endian length, then a JSON object. Requests are
+{"op": ..., "args": {...}}, replies {"ok": true, "result": ...} or
+{"ok": false, "error": "..."}. Messages travel as
+[content, role, created, session_id, metadata].
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, cast
+
+from react_agent_framework.core.memory.chat.base import BaseChatMemory, ChatMessage
+from react_agent_framework.core.memory.chat.simple import SimpleChatMemory
+from react_agent_framework.core.memory.compact import CompactChatMessage, to_epoch
+
+if TYPE_CHECKING:
+    from react_agent_framework.core.memory.chat.sqlite import SQLiteChatMemory
+
+UNIX_SOCKETS_AVAILABLE = hasattr(socket, "AF_UNIX")
+
+_HEADER = struct.Struct(">I")
+_MAX_FRAME = 64 * 1024 * 1024
+
+
+def _send(sock: socket.socket, payload: Any) -> None:
+    data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(sock: socket.socket) -> Optional[Any]:
+    """Read one frame (None when the peer closed the connection)"""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > _MAX_FRAME:
+        raise ValueError(f"Frame of {size} bytes exceeds the {_MAX_FRAME} byte limit")
+    data = _recv_exact(sock, size)
+    if data is None:
+        return None
+    return json.loads(data.decode("utf-8"))
+
+
+def _encode_message(message: ChatMessage) -> List[Any]:
+    return [
+        message.content,
+        message.role,
+        to_epoch(message.timestamp),
+        message.session_id,
+        message.metadata or None,
+    ]
+
+
+def _decode_message(data: List[Any]) -> CompactChatMessage:
+    content, role, created, session_id, metadata = data
+    return CompactChatMessage(
+        content, role, timestamp=created, session_id=session_id, metadata=metadata
+    )
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """One client connection; session locks it holds are released on disconnect"""
+
+    server: "_UnixServer"
+
+    def handle(self) -> None:
+        owner = self.server.owner
+        held: Dict[str, int] = {}
+        try:
+            while True:
+                try:
+                    request = _recv(self.request)
+                except (OSError, ValueError):
+                    return
+                if request is None:
+                    return
+
+                try:
+                    result = owner._dispatch(request["op"], request.get("args") or {}, held)
+                    reply = {"ok": True, "result": result}
+                except Exception as e:
+                    reply = {"ok": False, "error": f"{e.__class__.__name__}: {e}"}
+
+                try:
+                    _send(self.request, reply)
+                except OSError:
+                    return
+        finally:
+            for session_id, count in held.items():
+                lock = owner._session_lock(session_id)
+                for _ in range(count):
+                    lock.release()
+
+
+if UNIX_SOCKETS_AVAILABLE:
+
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+        owner: "SharedMemoryServer"
+
+
+class SharedMemoryServer:
+    """
+    Serves a SimpleChatMemory to other processes over a Unix socket
+
+    Sessions live in this process; SharedChatMemory clients in any process of
+    the host read and write them. Budgets and spilling work as in
+    SimpleChatMemory.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        max_messages: Optional[int] = 100,
+        max_total_messages: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+        spill_memory: Optional["SQLiteChatMemory"] = None,
+    ):
+        """
+        Initialize the server (call start() or serve_forever() to accept clients)
+
+        Args:
+            socket_path: Filesystem path of the Unix socket
+            max_messages: Maximum messages per session (None = unlimited)
+            max_total_messages: Global message budget across sessions
+            max_total_bytes: Global content byte budget across sessions
+            spill_memory: SQLiteChatMemory receiving evicted sessions
+        """
+        if not UNIX_SOCKETS_AVAILABLE:
+            raise RuntimeError("SharedMemoryServer requires Unix domain sockets")
+
+        self.socket_path = socket_path
+        self.memory = SimpleChatMemory(
+            max_messages=max_messages,
+            max_total_messages=max_total_messages,
+            max_total_bytes=max_total_bytes,
+            spill_memory=spill_memory,
+        )
+
+        self._locks: Dict[str, threading.RLock] = {}
+        self._locks_guard = threading.Lock()
+        self._server: Optional["_UnixServer"] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _session_lock(self, session_id: str) -> threading.RLock:
+        with self._locks_guard:
+            lock = self._locks.get(session_id)
+            if lock is None:
+                lock = self._locks[session_id] = threading.RLock()
+            return lock
+
+    def _dispatch(self, op: str, args: Dict[str, Any], held: Dict[str, int]) -> Any:
+        """Run one request; session operations wait for that session's lock"""
+        memory = self.memory
+
+        if op == "hello":
+            return {"max_messages": memory.max_messages, "pid": os.getpid()}
+        if op == "sessions":
+            return memory.get_sessions()
+
+        session_id = args["session_id"]
+        lock = self._session_lock(session_id)
+
+        if op == "lock":
+            lock.acquire()
+            held[session_id] = held.get(session_id, 0) + 1
+            return None
+        if op == "unlock":
+            if not held.get(session_id):
+                raise RuntimeError(f"Session '{session_id}' is not locked by this client")
+            held[session_id] -= 1
+            if not held[session_id]:
+                del held[session_id]
+            lock.release()
+            return None
+
+        with lock:
+            if op == "add":
+                for data in args["messages"]:
+                    memory.append_message(_decode_message(data))
+                return None
+            if op == "history":
+                messages = memory.get_history(limit=args.get("limit"), session_id=session_id)
+                return [_encode_message(message) for message in messages]
+            if op == "recent":
+                messages = memory.get_recent(n=args.get("n", 10), session_id=session_id)
+                return [_encode_message(message) for message in messages]
+            if op == "search":
+                messages = memory.search_messages(
+                    args["query"], limit=args.get("limit", 10), session_id=session_id
+                )
+                return [_encode_message(message) for message in messages]
+            if op == "clear":
+                memory.clear(session_id=session_id)
+                return None
+            if op == "delete_session":
+                memory.delete_session(session_id)
+                return None
+            if op == "stats":
+                return memory.get_stats(session_id=session_id)
+
+        raise ValueError(f"Unknown operation: {op}")
+
+    def _bind(self) -> "_UnixServer":
+        if self._server is not None:
+            raise RuntimeError("Server is already running")
+
+        # A socket file left by a crashed server would make bind() fail, but
+        # one a live server still accepts on must not be taken over
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except ConnectionRefusedError:
+                os.unlink(self.socket_path)
+            else:
+                raise RuntimeError(f"Another server is listening on {self.socket_path}")
+            finally:
+                probe.close()
+
+        # Create the socket owner-only rather than chmod it after bind()
+        umask = os.umask(0o177)
+        try:
+            server = _UnixServer(self.socket_path, _Handler)
+        finally:
+            os.umask(umask)
+        server.owner = self
+        self._server = server
+        return server
+
+    def start(self) -> "SharedMemoryServer":
+        """Accept clients in a background thread"""
+        server = self._bind()
+        self._thread = threading.Thread(
+            target=server.serve_forever, name="SharedMemoryServer", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Accept clients in the calling thread until stop()"""
+        server = self._bind()
+        try:
+            server.serve_forever()
+        finally:
+            self._close()
+
+    def stop(self) -> None:
+        """Stop accepting clients and remove the socket file"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._close()
+        # Otherwise serve_forever() closes the server when it returns
+
+    def _close(self) -> None:
+        if self._server is None:
+            return
+        self._server.server_close()
+        self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def __enter__(self) -> "SharedMemoryServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        return f"SharedMemoryServer(socket='{self.socket_path}', memory={self.memory!r})"
+
+
+class SharedChatMemory(BaseChatMemory):
+    """
+    Chat memory client of a SharedMemoryServer
+
+    Every worker process (and thread) gets its own connection, reopened
+    automatically after fork, so an instance can be created before gunicorn
+    forks its workers.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        session_id: Optional[str] = None,
+        timeout: Optional[float] = 30.0,
+    ):
+        """
+        Initialize shared chat memory
+
+        Args:
+            socket_path: Unix socket of the SharedMemoryServer
+            session_id: Session identifier
+            timeout: Socket timeout in seconds (None = wait forever)
+        """
+        if not UNIX_SOCKETS_AVAILABLE:
+            raise RuntimeError("SharedChatMemory requires Unix domain sockets")
+
+        super().__init__(session_id=session_id)
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+        self.max_messages = self._call("hello")["max_messages"]
+
+    def _connection(self) -> socket.socket:
+        """Socket of the calling thread (reconnects in forked children)"""
+        local = self._local
+        sock = cast(Optional[socket.socket], getattr(local, "sock", None))
+        if sock is not None and local.pid == os.getpid():
+            return sock
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        local.sock = sock
+        local.pid = os.getpid()
+        return sock
+
+    def _call(self, op: str, **args: Any) -> Any:
+        sock = self._connection()
+        try:
+            _send(sock, {"op": op, "args": args})
+            reply = _recv(sock)
+        except OSError:
+            self._disconnect()
+            raise
+        if reply is None:
+            self._disconnect()
+            raise ConnectionError(f"SharedMemoryServer at {self.socket_path} closed the connection")
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+
+    def _disconnect(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def add_message(
+        self,
+        content: str,
+        role: str = "user",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Add message to the shared chat history"""
+        message = CompactChatMessage(content, role, session_id=self.session_id, metadata=metadata)
+        self._call("add", session_id=self.session_id, messages=[_encode_message(message)])
+
+    def add_messages(self, messages: List[ChatMessage]) -> None:
+        """
+        Add several messages in one round-trip
+
+        Args:
+            messages: Messages to store in the current session
+        """
+        if messages:
+            self._call(
+                "add",
+                session_id=self.session_id,
+                messages=[
+                    [
+                        message.content,
+                        message.role,
+                        to_epoch(message.timestamp),
+                        self.session_id,
+                        message.metadata or None,
+                    ]
+                    for message in messages
+                ],
+            )
+
+    def get_history(
+        self,
+        limit: Optional[int] = None,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """Get chat history in chronological order"""
+        data = self._call("history", session_id=session_id or self.session_id, limit=limit)
+        return [_decode_message(item) for item in data]
+
+    def get_recent(
+        self,
+        n: int = 10,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """Get most recent messages"""
+        data = self._call("recent", session_id=session_id or self.session_id, n=n)
+        return [_decode_message(item) for item in data]
+
+    def search_messages(
+        self,
+        query: str,
+        limit: int = 10,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """Keyword search, run on the server"""
+        data = self._call(
+            "search", session_id=session_id or self.session_id, query=query, limit=limit
+        )
+        return [_decode_message(item) for item in data]
+
+    def clear(self, session_id: Optional[str] = None) -> None:
+        """Clear chat history"""
+        self._call("clear", session_id=session_id or self.session_id)
+
+    def delete_session(self, session_id: str) -> None:
+        """Delete a session from the server"""
+        self._call("delete_session", session_id=session_id)
+
+    def get_sessions(self) -> List[str]:
+        """Get all session IDs on the server"""
+        return cast(List[str], self._call("sessions"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get server memory statistics for the current session"""
+        stats = cast(Dict[str, Any], self._call("stats", session_id=self.session_id))
+        stats["socket_path"] = self.socket_path
+        return stats
+
+    @contextmanager
+    def session_lock(self, session_id: Optional[str] = None) -> Iterator[None]:
+        """
+        Hold a session's lock across several calls of this thread
+
+        Other clients' operations on the session wait until the block exits.
+
+        Args:
+            session_id: Session to lock (None = current session)
+        """
+        target_session = session_id or self.session_id
+        self._call("lock", session_id=target_session)
+        try:
+            yield
+        finally:
+            self._call("unlock", session_id=target_session)
+
+    def close(self) -> None:
+        """Close this thread's connection"""
+        self._disconnect()
+
+    def __len__(self) -> int:
+        """Return number of messages in current session"""
+        return int(self.get_stats()["session_messages"])
+
+    def __repr__(self) -> str:
+        return f"SharedChatMemory(socket='{self.socket_path}', session='{self.session_id}')"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve shared chat memory over a Unix socket")
+    parser.add_argument("socket_path", help="Path of the Unix socket to create")
+    parser.add_argument("--max-messages", type=int, default=100)
+    parser.add_argument("--max-total-messages", type=int, default=None)
+    parser.add_argument("--max-total-bytes", type=int, default=None)
+    parser.add_argument("--spill-db", default=None, help="SQLite file for evicted sessions")
+    args = parser.parse_args()
+
+    spill_memory = None
+    if args.spill_db:
+        from react_agent_framework.core.memory.chat.sqlite import SQLiteChatMemory
+
+        spill_memory = SQLiteChatMemory(args.spill_db)
+
+    server = SharedMemoryServer(
+        args.socket_path,
+        max_messages=args.max_messages,
+        max_total_messages=args.max_total_messages,
+        max_total_bytes=args.max_total_bytes,
+        spill_memory=spill_memory,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,77 @@
 Simple in-memory chat history (no persistence)
 """
 
-from collections import deque
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Set
 
 from react_agent_framework.core.memory.chat.base import BaseChatMemory, ChatMessage
+from react_agent_framework.core.memory.compact import CompactChatMessage
+
+if TYPE_CHECKING:
+    from react_agent_framework.core.memory.chat.sqlite import SQLiteChatMemory
+
+
+class _SessionBuffer:
+    """Messages of one session plus counters kept up to date on every change"""
+
+    __slots__ = ("messages", "num_bytes", "role_counts", "last_used")
+
+    def __init__(self, max_messages: Optional[int]):
+        self.messages: deque = deque(maxlen=max_messages)
+        self.num_bytes = 0
+        self.role_counts: Dict[str, int] = {}
+        self.last_used = time.monotonic()
+
+    def append(self, message: ChatMessage) -> int:
+        """
+        Append a message, dropping the oldest when full
+
+        Returns:
+            Change in the number of stored messages (0 or 1)
+        """
+        dropped = 0
+        if len(self.messages) == self.messages.maxlen:
+            self._forget(self.messages[0])
+            dropped = 1
+
+        self.messages.append(message)
+        self.num_bytes += _message_bytes(message)
+        self.role_counts[message.role] = self.role_counts.get(message.role, 0) + 1
+        return 1 - dropped
+
+    def clear(self) -> None:
+        """Remove all messages"""
+        self.messages.clear()
+        self.num_bytes = 0
+        self.role_counts.clear()
+
+    def _forget(self, message: ChatMessage) -> None:
+        """Update counters for a message about to be dropped"""
+        self.num_bytes -= _message_bytes(message)
+        count = self.role_counts[message.role] - 1
+        if count:
+            self.role_counts[message.role] = count
+        else:
+            del self.role_counts[message.role]
+
+
+class _Shard:
+    """One lock stripe: its sessions in least-recently-used order, plus totals"""
+
+    __slots__ = ("lock", "sessions", "num_messages", "num_bytes")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sessions: "OrderedDict[str, _SessionBuffer]" = OrderedDict()
+        self.num_messages = 0
+        self.num_bytes = 0
+
+
+def _message_bytes(message: ChatMessage) -> int:
+    """Budgeted size of a message (UTF-8 content length)"""
+    return len(message.content.encode("utf-8"))
 
 
 class SimpleChatMemory(BaseChatMemory):
@@ -17,9 +84,13 @@ class SimpleChatMemory(BaseChatMemory):
     - No dependencies
     - Sequential history
     - Simple keyword search
+    - Compact slotted messages (see CompactChatMessage)
+    - Thread-safe: sessions are spread over lock-striped shards
+    - Optional global message/byte budget: least recently used idle sessions
+      are evicted (or spilled to a SQLiteChatMemory and faulted back in)
 
     Limitations:
-    - No persistence (lost on restart)
+    - No persistence (lost on restart) unless spilling
     - No semantic search
     - Limited to in-memory storage
 
@@ -27,23 +98,110 @@ class SimpleChatMemory(BaseChatMemory):
     - Development and testing
     - Simple chatbots
     - Prototyping
+    - Multi-tenant servers (with a global budget)
     """
 
     def __init__(
         self,
         session_id: Optional[str] = None,
-        max_messages: int = 100,
+        max_messages: Optional[int] = 100,
+        max_total_messages: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+        spill_memory: Optional["SQLiteChatMemory"] = None,
+        num_shards: int = 16,
     ):
         """
         Initialize simple chat memory
 
         Args:
             session_id: Session identifier
-            max_messages: Maximum messages to store (default 100)
+            max_messages: Maximum messages to store per session (default 100,
+                None = unlimited)
+            max_total_messages: Messages kept across all sessions (None = unlimited)
+            max_total_bytes: UTF-8 content bytes kept across all sessions
+                (None = unlimited)
+            spill_memory: Where evicted sessions are written; they are loaded
+                back (and removed there) when used again. Sessions it already
+                holds are left alone: never loaded or deleted, and a resident
+                session with the same ID is dropped on eviction instead of
+                being spilled
+            num_shards: Number of lock stripes sessions are spread over
         """
         super().__init__(session_id=session_id, max_messages=max_messages)
-        self._messages: deque = deque(maxlen=max_messages)
-        self._sessions: Dict[str, deque] = {self.session_id: self._messages}
+        self.max_total_messages = max_total_messages
+        self.max_total_bytes = max_total_bytes
+        self.spill_memory = spill_memory
+
+        self._shards = [_Shard() for _ in range(max(num_shards, 1))]
+        self._evict_lock = threading.Lock()
+        self._evicted_sessions = 0
+
+        # Sessions this instance spilled (and may load back and delete), and
+        # those spill_memory held before, which are not ours to touch
+        self._spilled: Set[str] = set()
+        self._foreign: Set[str] = set(spill_memory.get_sessions()) if spill_memory else set()
+        self._spilled_lock = threading.Lock()
+
+        shard = self._shard(self.session_id)
+        with shard.lock:
+            self._buffer(shard, self.session_id)
+
+    def _shard(self, session_id: str) -> _Shard:
+        """Shard owning a session"""
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def _find_buffer(self, shard: _Shard, session_id: str) -> Optional[_SessionBuffer]:
+        """
+        Resident buffer of a session, marked as most recently used
+
+        Must be called with the shard lock held. Spilled sessions are loaded
+        back from spill_memory.
+        """
+        buffer = shard.sessions.get(session_id)
+        if buffer is None:
+            spilled = self._restore(session_id)
+            if spilled is None:
+                return None
+            buffer = self._new_buffer(shard, session_id, spilled)
+        else:
+            shard.sessions.move_to_end(session_id)
+
+        buffer.last_used = time.monotonic()
+        return buffer
+
+    def _buffer(self, shard: _Shard, session_id: str) -> _SessionBuffer:
+        """Like _find_buffer, but a new session gets an empty buffer"""
+        buffer = self._find_buffer(shard, session_id)
+        if buffer is None:
+            buffer = self._new_buffer(shard, session_id, [])
+        return buffer
+
+    def _new_buffer(
+        self, shard: _Shard, session_id: str, messages: List[ChatMessage]
+    ) -> _SessionBuffer:
+        """Make a session resident with the given messages (shard lock held)"""
+        buffer = shard.sessions[session_id] = _SessionBuffer(self.max_messages)
+        for message in messages:
+            shard.num_messages += buffer.append(CompactChatMessage.from_message(message))
+        shard.num_bytes += buffer.num_bytes
+        return buffer
+
+    def _restore(self, session_id: str) -> Optional[List[ChatMessage]]:
+        """Take a spilled session's messages out of spill_memory"""
+        if self.spill_memory is None:
+            return None
+
+        with self._spilled_lock:
+            if session_id not in self._spilled:
+                return None
+            self._spilled.discard(session_id)
+
+        if self.max_messages is None:
+            messages = self.spill_memory.get_history(session_id=session_id)
+        else:
+            messages = self.spill_memory.get_recent(n=self.max_messages, session_id=session_id)
+        self.spill_memory.delete_session(session_id)
+        return messages
 
     def add_message(
         self,
@@ -52,18 +210,83 @@ class SimpleChatMemory(BaseChatMemory):
         metadata: Optional[Dict[str, Any]] = None,
     ) -> None:
         """Add message to chat history"""
-        message = ChatMessage(
-            content=content,
-            role=role,
-            session_id=self.session_id,
-            metadata=metadata or {},
+        self.append_message(
+            CompactChatMessage(
+                content,
+                role,
+                session_id=self.session_id,
+                metadata=metadata,
+            )
         )
 
-        # Get or create session buffer
-        if self.session_id not in self._sessions:
-            self._sessions[self.session_id] = deque(maxlen=self.max_messages)
+    def append_message(self, message: ChatMessage) -> None:
+        """
+        Store an existing message under its own session_id
 
-        self._sessions[self.session_id].append(message)
+        Args:
+            message: Message to store (kept as is; use CompactChatMessage)
+        """
+        session_id = message.session_id
+        shard = self._shard(session_id)
+        with shard.lock:
+            buffer = self._buffer(shard, session_id)
+            num_bytes = buffer.num_bytes
+            shard.num_messages += buffer.append(message)
+            shard.num_bytes += buffer.num_bytes - num_bytes
+
+        if self._over_budget():
+            self._evict(keep=session_id)
+
+    def _total_messages(self) -> int:
+        return sum(shard.num_messages for shard in self._shards)
+
+    def _total_bytes(self) -> int:
+        return sum(shard.num_bytes for shard in self._shards)
+
+    def _over_budget(self) -> bool:
+        """Check the global message and byte budgets"""
+        return (
+            self.max_total_messages is not None and self._total_messages() > self.max_total_messages
+        ) or (self.max_total_bytes is not None and self._total_bytes() > self.max_total_bytes)
+
+    def _evict(self, keep: str) -> None:
+        """Evict least recently used sessions (except keep) until within budget"""
+        # Writers over budget evict one at a time; each re-checks the budget
+        with self._evict_lock:
+            while self._over_budget():
+                # Oldest session of each shard, then the oldest of those
+                victim = None
+                for shard in self._shards:
+                    with shard.lock:
+                        for session_id, buffer in shard.sessions.items():
+                            if session_id not in (keep, self.session_id):
+                                if victim is None or buffer.last_used < victim[2]:
+                                    victim = (shard, session_id, buffer.last_used)
+                                break
+
+                if victim is None:
+                    # Only the active session is left
+                    return
+
+                shard, session_id, _ = victim
+                with shard.lock:
+                    evicted = shard.sessions.pop(session_id, None)
+                    if evicted is None:
+                        continue
+                    shard.num_messages -= len(evicted.messages)
+                    shard.num_bytes -= evicted.num_bytes
+
+                    # Spill before releasing the shard, so a concurrent access
+                    # to the session finds it in spill_memory
+                    if (
+                        self.spill_memory is not None
+                        and evicted.messages
+                        and session_id not in self._foreign
+                    ):
+                        self.spill_memory.add_messages(list(evicted.messages))
+                        with self._spilled_lock:
+                            self._spilled.add(session_id)
+                self._evicted_sessions += 1
 
     def get_history(
         self,
@@ -73,10 +296,12 @@ class SimpleChatMemory(BaseChatMemory):
         """Get chat history in chronological order"""
         target_session = session_id or self.session_id
 
-        if target_session not in self._sessions:
-            return []
-
-        messages = list(self._sessions[target_session])
+        shard = self._shard(target_session)
+        with shard.lock:
+            buffer = self._find_buffer(shard, target_session)
+            if buffer is None:
+                return []
+            messages = list(buffer.messages)
 
         if limit:
             return messages[:limit]
@@ -90,48 +315,66 @@ class SimpleChatMemory(BaseChatMemory):
         """Get most recent messages"""
         target_session = session_id or self.session_id
 
-        if target_session not in self._sessions:
-            return []
+        shard = self._shard(target_session)
+        with shard.lock:
+            buffer = self._find_buffer(shard, target_session)
+            if buffer is None:
+                return []
+            messages = list(buffer.messages)
 
-        messages = list(self._sessions[target_session])
         return messages[-n:] if len(messages) > n else messages
 
     def clear(self, session_id: Optional[str] = None) -> None:
         """Clear chat history"""
         target_session = session_id or self.session_id
 
-        if target_session in self._sessions:
-            self._sessions[target_session].clear()
-
-    def get_stats(self) -> Dict[str, Any]:
-        """Get memory statistics"""
-        session_buffer = self._sessions.get(self.session_id, deque())
+        shard = self._shard(target_session)
+        with shard.lock:
+            buffer = shard.sessions.get(target_session)
+            if buffer is not None:
+                shard.num_messages -= len(buffer.messages)
+                shard.num_bytes -= buffer.num_bytes
+                buffer.clear()
 
-        if not session_buffer:
-            return {
-                "session_messages": 0,
-                "total_messages": sum(len(s) for s in self._sessions.values()),
-                "total_sessions": len(self._sessions),
-                "session_id": self.session_id,
-                "max_messages": self.max_messages,
-            }
-
-        # Count messages by role
-        role_counts: Dict[str, int] = {}
-        for msg in session_buffer:
-            role_counts[msg.role] = role_counts.get(msg.role, 0) + 1
+        self._discard_spilled(target_session)
 
-        return {
-            "session_messages": len(session_buffer),
-            "total_messages": sum(len(s) for s in self._sessions.values()),
-            "total_sessions": len(self._sessions),
-            "session_id": self.session_id,
+    def get_stats(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get memory statistics (session figures for session_id, default current)"""
+        target_session = session_id or self.session_id
+        shard = self._shard(target_session)
+        session_messages = 0
+        with shard.lock:
+            # A spilled session is loaded back, as when it is read
+            buffer = self._find_buffer(shard, target_session)
+            if buffer is not None and buffer.messages:
+                session_messages = len(buffer.messages)
+                role_counts = dict(buffer.role_counts)
+                first = buffer.messages[0].timestamp.isoformat()
+                last = buffer.messages[-1].timestamp.isoformat()
+
+        stats = {
+            "session_messages": session_messages,
+            "total_messages": self._total_messages(),
+            "total_sessions": sum(len(shard.sessions) for shard in self._shards),
+            "session_id": target_session,
             "max_messages": self.max_messages,
-            "role_counts": role_counts,
-            "first_message": session_buffer[0].timestamp.isoformat() if session_buffer else None,
-            "last_message": session_buffer[-1].timestamp.isoformat() if session_buffer else None,
+            "total_bytes": self._total_bytes(),
+            "evicted_sessions": self._evicted_sessions,
+            "spilled_sessions": len(self._spilled),
         }
 
+        if not session_messages:
+            return stats
+
+        stats.update(
+            {
+                "role_counts": role_counts,
+                "first_message": first,
+                "last_message": last,
+            }
+        )
+        return stats
+
     def search_messages(
         self,
         query: str,
@@ -149,15 +392,10 @@ class SimpleChatMemory(BaseChatMemory):
         Returns:
             List of matching messages
         """
-        target_session = session_id or self.session_id
-
-        if target_session not in self._sessions:
-            return []
-
         query_lower = query.lower()
         results = []
 
-        for msg in self._sessions[target_session]:
+        for msg in self.get_history(session_id=session_id):
             if query_lower in msg.content.lower():
                 results.append(msg)
 
@@ -168,12 +406,19 @@ class SimpleChatMemory(BaseChatMemory):
 
     def get_sessions(self) -> List[str]:
         """
-        Get list of all session IDs
+        Get list of all session IDs (resident and spilled)
 
         Returns:
             List of session IDs
         """
-        return list(self._sessions.keys())
+        sessions: List[str] = []
+        for shard in self._shards:
+            with shard.lock:
+                sessions.extend(shard.sessions)
+
+        with self._spilled_lock:
+            sessions.extend(self._spilled.difference(sessions))
+        return sessions
 
     def delete_session(self, session_id: str) -> None:
         """
@@ -182,12 +427,31 @@ class SimpleChatMemory(BaseChatMemory):
         Args:
             session_id: Session to delete
         """
-        if session_id in self._sessions:
-            del self._sessions[session_id]
+        shard = self._shard(session_id)
+        with shard.lock:
+            buffer = shard.sessions.pop(session_id, None)
+            if buffer is not None:
+                shard.num_messages -= len(buffer.messages)
+                shard.num_bytes -= buffer.num_bytes
+
+        self._discard_spilled(session_id)
+
+    def _discard_spilled(self, session_id: str) -> None:
+        """Drop a session's spilled copy, if any"""
+        if self.spill_memory is None:
+            return
+
+        with self._spilled_lock:
+            if session_id not in self._spilled:
+                return
+            self._spilled.discard(session_id)
+        self.spill_memory.delete_session(session_id)
 
     def __len__(self) -> int:
         """Return number of messages in current session"""
-        return len(self._sessions.get(self.session_id, deque()))
+        shard = self._shard(self.session_id)
+        buffer = shard.sessions.get(self.session_id)
+        return len(buffer.messages) if buffer else 0
 
     def __repr__(self) -> str:
         stats = self.get_stats()
@@ -4,8 +4,12 @@ SQLite-based chat memory for persistent conversation history
 
 import sqlite3
 import json
+import queue
+import re
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from react_agent_framework.core.memory.chat.base import BaseChatMemory, ChatMessage
@@ -20,6 +24,9 @@ class SQLiteChatMemory(BaseChatMemory):
     - SQL queries for flexible retrieval
     - Multi-session support
     - Transaction support
+    - Ranked full-text search (SQLite FTS5, bm25) when available
+    - WAL journaling with one connection per thread (readers never block writers)
+    - Optional group commit: a writer thread batches inserts into one transaction
     - No external dependencies (uses stdlib)
 
     Perfect for:
@@ -35,33 +42,102 @@ class SQLiteChatMemory(BaseChatMemory):
         session_id: Optional[str] = None,
         max_messages: Optional[int] = None,
         auto_vacuum: bool = True,
+        batch_writes: bool = False,
+        batch_interval: float = 0.005,
+        max_batch_size: int = 512,
+        busy_timeout: float = 5.0,
     ):
         """
         Initialize SQLite chat memory
 
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file (":memory:" for a private in-memory db)
             session_id: Session identifier
             max_messages: Maximum messages per session (None = unlimited)
-            auto_vacuum: Enable auto-vacuum for database
+            auto_vacuum: Enable incremental auto-vacuum for new databases
+                (free pages are reclaimed on clear/delete_session)
+            batch_writes: Queue add_message calls to a writer thread that
+                commits them in batches (group commit); reads flush first
+            batch_interval: Seconds the writer waits to fill a batch
+            max_batch_size: Maximum messages per batch transaction
+            busy_timeout: Seconds to wait for a database lock
         """
         super().__init__(session_id=session_id, max_messages=max_messages)
 
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout = busy_timeout
+        if str(db_path) == ":memory:":
+            # Connections of this instance share one named in-memory database
+            self._database = f"file:chat_memory_{id(self)}?mode=memory&cache=shared"
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._database = str(self.db_path)
+
+        # One connection per thread; all are tracked (by owning thread) so
+        # close() can close them and connections of finished threads are reclaimed
+        self._local = threading.local()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
 
         # Initialize database
-        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
         self._init_db(auto_vacuum)
 
+        self.batch_writes = batch_writes
+        self.batch_interval = batch_interval
+        self.max_batch_size = max(max_batch_size, 1)
+        self._queue: "queue.Queue[Optional[ChatMessage]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_error: Optional[BaseException] = None
+        # Queued messages not yet committed (by id), for reads that must not
+        # wait for the writer; commits and the reads that merge them with
+        # committed rows hold _pending_lock so nothing is missed or doubled
+        self._pending: Dict[int, ChatMessage] = {}
+        self._pending_lock = threading.Lock()
+        if batch_writes:
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="SQLiteChatMemory-writer", daemon=True
+            )
+            self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection pragmas"""
+        # Each connection is used by one thread; check_same_thread=False only so
+        # close() can close them all from the calling thread
+        conn = sqlite3.connect(
+            self._database, timeout=self.busy_timeout, uri=True, check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous = NORMAL")
+
+        # Threads that have exited can no longer use theirs; close them here
+        # so short-lived threads do not leak a connection each
+        with self._connections_lock:
+            finished = [thread for thread in self._connections if not thread.is_alive()]
+            stale = [self._connections.pop(thread) for thread in finished]
+            self._connections[threading.current_thread()] = conn
+        for old in stale:
+            old.close()
+        return conn
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection of the calling thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
     def _init_db(self, auto_vacuum: bool) -> None:
         """Initialize database schema"""
         cursor = self.conn.cursor()
 
-        # Enable auto-vacuum
+        # Only takes effect on new databases; vacuuming happens on clear instead
+        # of on every commit
         if auto_vacuum:
-            cursor.execute("PRAGMA auto_vacuum = FULL")
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+        # Readers don't block the writer (and vice versa); persists in the file
+        cursor.execute("PRAGMA journal_mode = WAL")
 
         # Create messages table
         cursor.execute("""
@@ -87,7 +163,102 @@ class SQLiteChatMemory(BaseChatMemory):
             ON messages(session_id, role)
         """)
 
+        # Per-session message counts, maintained by triggers, so trimming
+        # to max_messages doesn't COUNT(*) the session on every insert
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'session_counts'"
+        )
+        counts_exist = cursor.fetchone() is not None
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS session_counts (
+                session_id TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS session_counts_insert AFTER INSERT ON messages BEGIN
+                INSERT INTO session_counts (session_id, count) VALUES (new.session_id, 1)
+                ON CONFLICT (session_id) DO UPDATE SET count = count + 1;
+            END
+        """)
+        # Recreated so databases made before emptied sessions were pruned
+        # pick up the DELETE of the zero-count row
+        cursor.execute("DROP TRIGGER IF EXISTS session_counts_delete")
+        cursor.execute("""
+            CREATE TRIGGER session_counts_delete AFTER DELETE ON messages BEGIN
+                UPDATE session_counts SET count = count - 1 WHERE session_id = old.session_id;
+                DELETE FROM session_counts WHERE session_id = old.session_id AND count <= 0;
+            END
+        """)
+        if not counts_exist:
+            # Migration: count messages written before the counters existed
+            cursor.execute("""
+                INSERT INTO session_counts (session_id, count)
+                SELECT session_id, COUNT(*) FROM messages GROUP BY session_id
+            """)
+        cursor.execute("DELETE FROM session_counts WHERE count <= 0")
+
+        self.conn.commit()
+
+        self.fts_enabled = self._init_fts()
+
+    def _init_fts(self) -> bool:
+        """
+        Create the FTS5 index over message content, kept in sync by triggers
+
+        Databases created before the index existed are backfilled once.
+        Returns False if this SQLite build lacks FTS5 (search then falls
+        back to LIKE).
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'")
+        exists = cursor.fetchone() is not None
+
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                    content,
+                    content = 'messages',
+                    content_rowid = 'id'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+                INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+                INSERT INTO messages_fts (messages_fts, rowid, content)
+                VALUES ('delete', old.id, old.content);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE OF content ON messages
+            BEGIN
+                INSERT INTO messages_fts (messages_fts, rowid, content)
+                VALUES ('delete', old.id, old.content);
+                INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+            END
+        """)
+
+        if not exists:
+            # Migration: index messages written before FTS was added
+            cursor.execute("INSERT INTO messages_fts (messages_fts) VALUES ('rebuild')")
+
         self.conn.commit()
+        return True
+
+    @staticmethod
+    def _fts_query(query: str) -> Optional[str]:
+        """Turn free text into an FTS5 query matching words starting with any query word"""
+        words = re.findall(r"\w+", query)
+        if not words:
+            return None
+        return " OR ".join(f'"{word}"*' for word in words)
 
     def add_message(
         self,
@@ -103,25 +274,114 @@ class SQLiteChatMemory(BaseChatMemory):
             metadata=metadata or {},
         )
 
-        cursor = self.conn.cursor()
-        cursor.execute(
+        if self._writer is not None:
+            self._raise_writer_error()
+            self._enqueue([message])
+            return
+
+        self._write_messages(self.conn, [message])
+
+    def add_messages(self, messages: List[ChatMessage]) -> None:
+        """
+        Bulk insert existing messages, keeping their session and timestamp
+
+        Args:
+            messages: Messages to store (any session)
+        """
+        if not messages:
+            return
+
+        if self._writer is not None:
+            self._raise_writer_error()
+            self._enqueue(messages)
+            return
+
+        self._write_messages(self.conn, messages)
+
+    def _enqueue(self, messages: List[ChatMessage]) -> None:
+        """Hand messages to the writer thread"""
+        with self._pending_lock:
+            for message in messages:
+                self._pending[id(message)] = message
+                self._queue.put(message)
+
+    def _write_messages(self, conn: sqlite3.Connection, messages: List[ChatMessage]) -> None:
+        """Insert messages and trim their sessions in one transaction"""
+        with conn:
+            self._insert_messages(conn, messages)
+
+    def _insert_messages(self, conn: sqlite3.Connection, messages: List[ChatMessage]) -> None:
+        """Insert messages and trim their sessions (caller commits)"""
+        conn.executemany(
             """
             INSERT INTO messages (session_id, role, content, timestamp, metadata)
             VALUES (?, ?, ?, ?, ?)
         """,
-            (
-                message.session_id,
-                message.role,
-                message.content,
-                message.timestamp.isoformat(),
-                json.dumps(message.metadata),
-            ),
+            [
+                (
+                    message.session_id,
+                    message.role,
+                    message.content,
+                    message.timestamp.isoformat(),
+                    json.dumps(message.metadata),
+                )
+                for message in messages
+            ],
         )
-        self.conn.commit()
 
         # Check max_messages limit
         if self.max_messages:
-            self._enforce_max_messages()
+            for session_id in {message.session_id for message in messages}:
+                self._enforce_max_messages(conn, session_id)
+
+    def _writer_loop(self) -> None:
+        """Group commit: write queued messages in batched transactions"""
+        conn = self.conn
+        stopping = False
+
+        while not stopping:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_interval
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=max(remaining, 0)))
+                except queue.Empty:
+                    break
+
+            messages = [message for message in batch if message is not None]
+            stopping = len(messages) < len(batch)
+            try:
+                if messages:
+                    self._insert_messages(conn, messages)
+                    with self._pending_lock:
+                        conn.commit()
+                        self._forget_pending(messages)
+            except Exception as e:
+                conn.rollback()
+                with self._pending_lock:
+                    self._forget_pending(messages)
+                self._writer_error = e
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _forget_pending(self, messages: List[ChatMessage]) -> None:
+        """Drop written (or failed) messages from the pending map (lock held)"""
+        for message in messages:
+            self._pending.pop(id(message), None)
+
+    def _raise_writer_error(self) -> None:
+        """Re-raise a failure of the writer thread in the caller"""
+        if self._writer_error is not None:
+            error, self._writer_error = self._writer_error, None
+            raise error
+
+    def flush(self) -> None:
+        """Wait until queued messages are committed (no-op without batch_writes)"""
+        if self._writer is not None:
+            self._queue.join()
+            self._raise_writer_error()
 
     def get_history(
         self,
@@ -129,6 +389,7 @@ class SQLiteChatMemory(BaseChatMemory):
         session_id: Optional[str] = None,
     ) -> List[ChatMessage]:
         """Get chat history in chronological order"""
+        self.flush()
         target_session = session_id or self.session_id
         cursor = self.conn.cursor()
 
@@ -160,6 +421,7 @@ class SQLiteChatMemory(BaseChatMemory):
         session_id: Optional[str] = None,
     ) -> List[ChatMessage]:
         """Get most recent messages"""
+        self.flush()
         target_session = session_id or self.session_id
         cursor = self.conn.cursor()
 
@@ -177,8 +439,47 @@ class SQLiteChatMemory(BaseChatMemory):
 
         return [self._row_to_message(row) for row in cursor.fetchall()]
 
+    def peek_recent(
+        self,
+        n: int = 10,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """
+        Most recent messages, including queued ones, without waiting for the writer
+
+        Args:
+            n: Number of recent messages to return
+            session_id: Get messages for specific session (None = current session)
+
+        Returns:
+            List of recent messages in chronological order
+        """
+        target_session = session_id or self.session_id
+
+        with self._pending_lock:
+            rows = self.conn.execute(
+                """
+                SELECT * FROM messages
+                WHERE session_id = ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            """,
+                (target_session, n),
+            ).fetchall()
+            pending = [
+                message
+                for message in self._pending.values()
+                if message.session_id == target_session
+            ]
+
+        messages = [self._row_to_message(row) for row in reversed(rows)]
+        if pending:
+            messages = sorted(messages + pending, key=lambda message: message.timestamp)
+        return messages[-n:] if n > 0 else []
+
     def clear(self, session_id: Optional[str] = None) -> None:
         """Clear chat history"""
+        self.flush()
         target_session = session_id or self.session_id
         cursor = self.conn.cursor()
 
@@ -187,27 +488,31 @@ class SQLiteChatMemory(BaseChatMemory):
             (target_session,),
         )
         self.conn.commit()
+        self.conn.execute("PRAGMA incremental_vacuum").fetchall()
 
-    def get_stats(self) -> Dict[str, Any]:
-        """Get memory statistics"""
+    def get_stats(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get memory statistics (session figures for session_id, default current)"""
+        target_session = session_id or self.session_id
+        self.flush()
         cursor = self.conn.cursor()
 
-        # Total messages in current session
+        # Total messages in target session
         cursor.execute(
-            "SELECT COUNT(*) as count FROM messages WHERE session_id = ?",
-            (self.session_id,),
+            "SELECT count FROM session_counts WHERE session_id = ?",
+            (target_session,),
         )
-        session_count = cursor.fetchone()["count"]
-
-        # Total messages across all sessions
-        cursor.execute("SELECT COUNT(*) as count FROM messages")
-        total_count = cursor.fetchone()["count"]
+        row = cursor.fetchone()
+        session_count = row["count"] if row else 0
 
-        # Number of unique sessions
-        cursor.execute("SELECT COUNT(DISTINCT session_id) as count FROM messages")
-        session_count_unique = cursor.fetchone()["count"]
+        # Totals across all sessions (emptied sessions have no counter row)
+        cursor.execute(
+            "SELECT COALESCE(SUM(count), 0) as total, COUNT(*) as sessions FROM session_counts"
+        )
+        row = cursor.fetchone()
+        total_count = row["total"]
+        session_count_unique = row["sessions"]
 
-        # Role distribution in current session
+        # Role distribution in target session
         cursor.execute(
             """
             SELECT role, COUNT(*) as count
@@ -215,7 +520,7 @@ class SQLiteChatMemory(BaseChatMemory):
             WHERE session_id = ?
             GROUP BY role
         """,
-            (self.session_id,),
+            (target_session,),
         )
         role_counts = {row["role"]: row["count"] for row in cursor.fetchall()}
 
@@ -226,7 +531,7 @@ class SQLiteChatMemory(BaseChatMemory):
             FROM messages
             WHERE session_id = ?
         """,
-            (self.session_id,),
+            (target_session,),
         )
         row = cursor.fetchone()
 
@@ -234,7 +539,7 @@ class SQLiteChatMemory(BaseChatMemory):
             "session_messages": session_count,
             "total_messages": total_count,
             "total_sessions": session_count_unique,
-            "session_id": self.session_id,
+            "session_id": target_session,
             "max_messages": self.max_messages,
             "db_path": str(self.db_path),
             "role_counts": role_counts,
@@ -249,7 +554,12 @@ class SQLiteChatMemory(BaseChatMemory):
         session_id: Optional[str] = None,
     ) -> List[ChatMessage]:
         """
-        Simple keyword search in messages
+        Keyword search in messages
+
+        With FTS5, returns the `limit` best-ranked (bm25) messages with a
+        word starting with any query word ("err" finds "error"). Without
+        FTS5, or when that finds nothing, returns the most recent messages
+        containing the query as a substring.
 
         Args:
             query: Search query (case-insensitive)
@@ -257,8 +567,17 @@ class SQLiteChatMemory(BaseChatMemory):
             session_id: Search in specific session (None = current session)
 
         Returns:
-            List of matching messages
+            List of matching messages in chronological order
         """
+        if self.fts_enabled:
+            ranked = self.search_with_snippets(query, limit=limit, session_id=session_id)
+            if ranked:
+                messages = [message for message, _ in ranked]
+                messages.sort(key=lambda message: message.timestamp)
+                return messages
+            # Fragments inside words (e.g. "rror") only match as substrings
+
+        self.flush()
         target_session = session_id or self.session_id
         cursor = self.conn.cursor()
 
@@ -276,6 +595,53 @@ class SQLiteChatMemory(BaseChatMemory):
         messages = [self._row_to_message(row) for row in cursor.fetchall()]
         return list(reversed(messages))  # Return in chronological order
 
+    def search_with_snippets(
+        self,
+        query: str,
+        limit: int = 10,
+        session_id: Optional[str] = None,
+        snippet_tokens: int = 16,
+    ) -> List[Tuple[ChatMessage, str]]:
+        """
+        Ranked full-text search with highlighted snippets
+
+        Args:
+            query: Search query
+            limit: Maximum results
+            session_id: Search in specific session (None = current session)
+            snippet_tokens: Approximate snippet length in tokens
+
+        Returns:
+            (message, snippet) pairs, most relevant first; matched words in
+            snippets are wrapped in [brackets]
+        """
+        if not self.fts_enabled:
+            messages = self.search_messages(query, limit=limit, session_id=session_id)
+            return [(message, message.content) for message in reversed(messages)]
+
+        fts_query = self._fts_query(query)
+        if fts_query is None:
+            return []
+
+        self.flush()
+
+        target_session = session_id or self.session_id
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            SELECT m.*, snippet(messages_fts, 0, '[', ']', '...', ?) AS snippet
+            FROM messages_fts
+            JOIN messages m ON m.id = messages_fts.rowid
+            WHERE messages_fts MATCH ?
+            AND m.session_id = ?
+            ORDER BY bm25(messages_fts)
+            LIMIT ?
+        """,
+            (min(max(snippet_tokens, 1), 64), fts_query, target_session, limit),
+        )
+
+        return [(self._row_to_message(row), row["snippet"]) for row in cursor.fetchall()]
+
     def get_sessions(self) -> List[str]:
         """
         Get list of all session IDs
@@ -283,6 +649,7 @@ class SQLiteChatMemory(BaseChatMemory):
         Returns:
             List of session IDs
         """
+        self.flush()
         cursor = self.conn.cursor()
         cursor.execute("SELECT DISTINCT session_id FROM messages ORDER BY session_id")
         return [row["session_id"] for row in cursor.fetchall()]
@@ -294,25 +661,25 @@ class SQLiteChatMemory(BaseChatMemory):
         Args:
             session_id: Session to delete
         """
+        self.flush()
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
         self.conn.commit()
+        self.conn.execute("PRAGMA incremental_vacuum").fetchall()
 
-    def _enforce_max_messages(self) -> None:
-        """Remove oldest messages if over limit"""
-        cursor = self.conn.cursor()
-
-        # Count messages in current session
-        cursor.execute(
-            "SELECT COUNT(*) as count FROM messages WHERE session_id = ?",
-            (self.session_id,),
-        )
-        count = cursor.fetchone()["count"]
+    def _enforce_max_messages(self, conn: sqlite3.Connection, session_id: str) -> None:
+        """Remove oldest messages if over limit (inside the caller's transaction)"""
+        if self.max_messages is None:
+            return
+        row = conn.execute(
+            "SELECT count FROM session_counts WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        count = row["count"] if row else 0
 
         if count > self.max_messages:
             # Delete oldest messages
             to_delete = count - self.max_messages
-            cursor.execute(
+            conn.execute(
                 """
                 DELETE FROM messages
                 WHERE id IN (
@@ -322,9 +689,8 @@ class SQLiteChatMemory(BaseChatMemory):
                     LIMIT ?
                 )
             """,
-                (self.session_id, to_delete),
+                (session_id, to_delete),
             )
-            self.conn.commit()
 
     def _row_to_message(self, row: sqlite3.Row) -> ChatMessage:
         """Convert database row to ChatMessage"""
@@ -339,13 +705,27 @@ class SQLiteChatMemory(BaseChatMemory):
         )
 
     def close(self) -> None:
-        """Close database connection"""
-        self.conn.close()
+        """Flush queued writes, stop the writer thread and close all connections"""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+        with self._connections_lock:
+            connections, self._connections = list(self._connections.values()), {}
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+        self._raise_writer_error()
 
     def __del__(self):
-        """Cleanup: close connection"""
-        if hasattr(self, "conn"):
-            self.conn.close()
+        """Cleanup: close connections"""
+        if hasattr(self, "_connections"):
+            try:
+                self.close()
+            except Exception:
+                pass
 
     def __repr__(self) -> str:
         stats = self.get_stats()
@@ -0,0 +1,370 @@
+"""
+Summarizing chat memory: rolling summary + recent window in a fixed budget
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Union
+
+from react_agent_framework.core.memory.chat.base import BaseChatMemory, ChatMessage
+from react_agent_framework.core.memory.chat.simple import SimpleChatMemory
+from react_agent_framework.core.memory.compact import CompactChatMessage
+
+if TYPE_CHECKING:
+    from react_agent_framework.providers.base import BaseLLMProvider
+
+SUMMARY_PROMPT = """Progressively summarize the conversation below, adding the new lines to the \
+current summary. Keep facts, decisions, names and open questions; drop small talk. \
+Answer with the new summary only, in at most {max_words} words.
+
+Current summary:
+{summary}
+
+New lines of conversation:
+{lines}
+
+New summary:"""
+
+
+class _SessionSummary:
+    """Rolling summary of one session plus the messages not yet folded into it"""
+
+    __slots__ = ("summary", "pending", "summarized", "dropped", "failures", "in_flight")
+
+    def __init__(self, pending: List[ChatMessage]):
+        self.summary = ""
+        self.pending: deque = deque(pending)
+        self.summarized = 0
+        self.dropped = 0
+        self.failures = 0
+        self.in_flight = False
+
+
+class SummaryChatMemory(BaseChatMemory):
+    """
+    Chat memory that keeps a rolling summary of older messages
+
+    Every `summarize_every` messages beyond the recent window, the oldest
+    unsummarized messages are folded into the session summary by a (cheap)
+    LLM, in a background thread. get_context returns the summary followed by
+    the most recent messages, so the prompt size stays constant however long
+    the session grows.
+
+    Messages themselves are stored by the wrapped memory; summaries are kept
+    in memory. If the summarizer keeps failing, unsummarized messages beyond
+    the recent window are dropped from the context instead of piling up.
+    """
+
+    def __init__(
+        self,
+        provider: Union[str, "BaseLLMProvider"] = "gpt-4o-mini",
+        memory: Optional[BaseChatMemory] = None,
+        session_id: Optional[str] = None,
+        summarize_every: int = 10,
+        recent_window: int = 10,
+        max_summary_tokens: int = 300,
+        max_failures: int = 3,
+        background: bool = True,
+        api_key: Optional[str] = None,
+    ):
+        """
+        Initialize summarizing chat memory
+
+        Args:
+            provider: LLM used for summaries (string or BaseLLMProvider instance)
+            memory: Memory storing the messages (default: SimpleChatMemory)
+            session_id: Session identifier
+            summarize_every: Messages folded into the summary per LLM call
+            recent_window: Most recent messages always kept verbatim
+            max_summary_tokens: Approximate summary length limit
+            max_failures: Consecutive summary failures after which messages
+                beyond the recent window are dropped without being summarized
+            background: Summarize in a background thread (False = inline)
+            api_key: API key for the provider
+        """
+        if isinstance(provider, str):
+            from react_agent_framework.providers.factory import create_provider
+
+            provider = create_provider(provider, api_key=api_key)
+
+        self.provider = provider
+        self.memory = memory or SimpleChatMemory(session_id=session_id, max_messages=1000)
+        super().__init__(
+            session_id=session_id or self.memory.session_id,
+            max_messages=self.memory.max_messages,
+        )
+
+        self.summarize_every = max(summarize_every, 1)
+        self.recent_window = max(recent_window, 0)
+        self.max_summary_tokens = max_summary_tokens
+        self.max_failures = max(max_failures, 1)
+
+        self._states: Dict[str, _SessionSummary] = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._scheduled = 0
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="SummaryChatMemory")
+            if background
+            else None
+        )
+        self.last_error: Optional[BaseException] = None
+
+    @property
+    def session_id(self) -> str:
+        return self.memory.session_id
+
+    @session_id.setter
+    def session_id(self, value: str) -> None:
+        self.memory.session_id = value
+
+    def _state(self, session_id: str) -> _SessionSummary:
+        """Summary state of a session (must hold the lock)"""
+        state = self._states.get(session_id)
+        if state is None:
+            # Sessions stored before this instance start without a summary;
+            # their tail is summarized as new messages arrive
+            recent = self.memory.get_recent(
+                n=self.recent_window + self.summarize_every, session_id=session_id
+            )
+            state = self._states[session_id] = _SessionSummary(recent)
+        return state
+
+    def add_message(
+        self,
+        content: str,
+        role: str = "user",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Add message and schedule a summary update when enough have piled up"""
+        session_id = self.session_id
+        with self._lock:
+            # Load the session state before the new message is stored
+            state = self._state(session_id)
+        self.memory.add_message(content, role=role, metadata=metadata)
+
+        with self._lock:
+            state.pending.append(
+                CompactChatMessage(content, role, session_id=session_id, metadata=metadata)
+            )
+            batch = self._next_batch(state)
+
+        if batch:
+            self._schedule(session_id, batch)
+
+    def _next_batch(self, state: _SessionSummary) -> Optional[List[ChatMessage]]:
+        """Claim the next messages to fold, if due (must hold the lock)"""
+        if state.in_flight or len(state.pending) < self.recent_window + self.summarize_every:
+            return None
+
+        state.in_flight = True
+        return [state.pending[i] for i in range(self.summarize_every)]
+
+    def _schedule(self, session_id: str, batch: List[ChatMessage]) -> None:
+        """Fold a batch now or in the background"""
+        if self._executor is None:
+            self._fold(session_id, batch)
+            return
+
+        with self._lock:
+            self._scheduled += 1
+        self._executor.submit(self._run, session_id, batch)
+
+    def _run(self, session_id: str, batch: List[ChatMessage]) -> None:
+        """Background task: fold a batch, then signal flush()"""
+        try:
+            self._fold(session_id, batch)
+        finally:
+            with self._lock:
+                self._scheduled -= 1
+                self._idle.notify_all()
+
+    def _fold(self, session_id: str, batch: List[ChatMessage]) -> None:
+        """Update a session summary with a batch of messages"""
+        with self._lock:
+            current = self._state(session_id).summary
+
+        try:
+            summary = self._summarize(current, batch)
+        except Exception as e:
+            # Keep the messages pending so the next add retries, until the
+            # summarizer has failed too often; then truncate to the recent
+            # window (the wrapped memory still has every message)
+            with self._lock:
+                failed = self._state(session_id)
+                failed.in_flight = False
+                failed.failures += 1
+                if failed.failures >= self.max_failures:
+                    while len(failed.pending) > self.recent_window:
+                        failed.pending.popleft()
+                        failed.dropped += 1
+                    failed.failures = 0
+            self.last_error = e
+            return
+
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is None or not state.pending or state.pending[0] is not batch[0]:
+                # The session was cleared meanwhile
+                return
+            state.summary = summary
+            for _ in batch:
+                state.pending.popleft()
+            state.summarized += len(batch)
+            state.failures = 0
+            state.in_flight = False
+            next_batch = self._next_batch(state)
+
+        if next_batch:
+            self._schedule(session_id, next_batch)
+
+    def _summarize(self, summary: str, messages: List[ChatMessage]) -> str:
+        """Ask the provider for an updated summary"""
+        from react_agent_framework.providers.base import Message
+
+        prompt = SUMMARY_PROMPT.format(
+            max_words=max(self.max_summary_tokens * 3 // 4, 1),
+            summary=summary or "(empty)",
+            lines="\n".join(f"{message.role}: {message.content}" for message in messages),
+        )
+        response = self.provider.generate([Message(role="user", content=prompt)], temperature=0)
+
+        # Enforce the budget even if the model ignores the word limit
+        return response.strip()[: self.max_summary_tokens * 4]
+
+    def get_summary(self, session_id: Optional[str] = None) -> str:
+        """
+        Current rolling summary of a session
+
+        Args:
+            session_id: Session (None = current session)
+
+        Returns:
+            Summary text ("" until the first update)
+        """
+        with self._lock:
+            return self._state(session_id or self.session_id).summary
+
+    def get_context(
+        self,
+        query: Optional[str] = None,
+        max_tokens: int = 2000,
+        max_messages: int = 10,
+        use_search: bool = True,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """
+        Summary of older messages followed by the recent ones, within a budget
+
+        Args:
+            query: Current query (unused; the summary covers older context)
+            max_tokens: Approximate token limit for context (4 chars ≈ 1 token)
+            max_messages: Maximum recent messages to include
+            use_search: Unused
+            session_id: Get context for specific session (None = current session)
+
+        Returns:
+            A system message with the summary (if any), then recent messages
+        """
+        target_session = session_id or self.session_id
+        with self._lock:
+            state = self._state(target_session)
+            summary = state.summary
+            recent = list(state.pending)
+
+        budget = max_tokens * 4
+        context: List[ChatMessage] = []
+        if summary:
+            summary_message = CompactChatMessage(
+                f"Summary of the earlier conversation: {summary}",
+                "system",
+                timestamp=recent[0].timestamp if recent else None,
+                session_id=target_session,
+                metadata={"summary": True},
+            )
+            budget -= len(summary_message.content)
+            context.append(summary_message)
+
+        # Newest first until the budget is spent, then back to chronological order
+        selected = []
+        for message in reversed(recent[-max_messages:] if max_messages else recent):
+            budget -= len(message.content)
+            if budget < 0:
+                break
+            selected.append(message)
+        selected.reverse()
+
+        return context + selected
+
+    def get_history(
+        self,
+        limit: Optional[int] = None,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """Get chat history in chronological order"""
+        return self.memory.get_history(limit=limit, session_id=session_id)
+
+    def get_recent(
+        self,
+        n: int = 10,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """Get most recent messages"""
+        return self.memory.get_recent(n=n, session_id=session_id)
+
+    def search_messages(
+        self,
+        query: str,
+        limit: int = 10,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """Keyword search in the wrapped memory"""
+        return self.memory.search_messages(query, limit=limit, session_id=session_id)
+
+    def clear(self, session_id: Optional[str] = None) -> None:
+        """Clear chat history and the session summary"""
+        target_session = session_id or self.session_id
+        self.flush()
+        with self._lock:
+            self._states.pop(target_session, None)
+        self.memory.clear(session_id=target_session)
+
+    def flush(self) -> None:
+        """Wait for scheduled summary updates to finish"""
+        with self._lock:
+            while self._scheduled:
+                self._idle.wait()
+
+    def close(self) -> None:
+        """Finish pending summaries and stop the background thread"""
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get memory statistics (wrapped memory stats plus summary state)"""
+        stats = self.memory.get_stats()
+        with self._lock:
+            state = self._state(self.session_id)
+            stats.update(
+                {
+                    "summarized_messages": state.summarized,
+                    "pending_messages": len(state.pending),
+                    "dropped_messages": state.dropped,
+                    "summary_chars": len(state.summary),
+                    "summarizing": state.in_flight,
+                }
+            )
+        return stats
+
+    def __len__(self) -> int:
+        """Return number of messages in current session"""
+        return len(self.memory.get_history())
+
+    def __repr__(self) -> str:
+        return (
+            f"SummaryChatMemory(session='{self.session_id}', "
+            f"model='{self.provider.get_model_name()}', memory={self.memory.__class__.__name__})"
+        )
@@ -0,0 +1,317 @@
+"""
+Tiered chat memory: in-memory hot window over a persistent SQLite store
+"""
+
+import threading
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Optional
+
+from react_agent_framework.core.memory.bm25 import BM25Index
+from react_agent_framework.core.memory.chat.base import BaseChatMemory, ChatMessage
+from react_agent_framework.core.memory.chat.sqlite import SQLiteChatMemory
+from react_agent_framework.core.memory.compact import CompactChatMessage
+from react_agent_framework.core.memory.context import merge_candidates
+
+
+class _HotSession:
+    """Recent messages of one session"""
+
+    __slots__ = ("messages", "complete")
+
+    def __init__(self, window: int, messages: List[ChatMessage], complete: bool):
+        self.messages: deque = deque(messages, maxlen=window)
+        # True while the window holds the session's entire stored history
+        self.complete = complete
+
+
+class TieredChatMemory(BaseChatMemory):
+    """
+    Chat memory with a hot in-memory window and a durable SQLite cold store
+
+    Features:
+    - get_recent / get_context served from memory for the last hot_window
+      messages of each session (get_context ranks only the window)
+    - Write-through to SQLiteChatMemory via its writer thread (group commit),
+      so add_message never waits for disk
+    - Older history faulted in from SQLite on demand
+    - Least recently used sessions leave memory (they stay on disk)
+
+    Perfect for:
+    - Production agents that want SimpleChatMemory latency with durability
+    """
+
+    def __init__(
+        self,
+        db_path: str = "./chat_memory.db",
+        session_id: Optional[str] = None,
+        max_messages: Optional[int] = None,
+        hot_window: int = 100,
+        max_hot_sessions: int = 1000,
+        cold_memory: Optional[SQLiteChatMemory] = None,
+    ):
+        """
+        Initialize tiered chat memory
+
+        Args:
+            db_path: SQLite database path (ignored when cold_memory is given)
+            session_id: Session identifier
+            max_messages: Maximum messages per session (None = unlimited)
+            hot_window: Recent messages kept in memory per session
+            max_hot_sessions: Sessions kept in memory (least recently used leave)
+            cold_memory: Existing SQLite store (default: one on db_path with
+                batch_writes=True)
+        """
+        super().__init__(session_id=session_id, max_messages=max_messages)
+
+        if cold_memory is None:
+            cold_memory = SQLiteChatMemory(
+                db_path=db_path,
+                session_id=self.session_id,
+                max_messages=max_messages,
+                batch_writes=True,
+            )
+        self.cold = cold_memory
+
+        self.hot_window = max(hot_window, 1)
+        if max_messages:
+            self.hot_window = min(self.hot_window, max_messages)
+        self.max_hot_sessions = max(max_hot_sessions, 1)
+
+        self._hot: "OrderedDict[str, _HotSession]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def _session(self, session_id: str) -> _HotSession:
+        """Hot window of a session, faulted in from the cold store on first use"""
+        hot = self._hot.get(session_id)
+        if hot is not None:
+            self._hot.move_to_end(session_id)
+            return hot
+
+        # Committed rows plus queued ones, without waiting for the writer; one
+        # extra row tells whether the window covers the whole session
+        messages = self.cold.peek_recent(n=self.hot_window + 1, session_id=session_id)
+        complete = len(messages) <= self.hot_window
+        hot = _HotSession(
+            self.hot_window,
+            [CompactChatMessage.from_message(message) for message in messages],
+            complete,
+        )
+
+        self._hot[session_id] = hot
+        while len(self._hot) > self.max_hot_sessions:
+            self._hot.popitem(last=False)
+        return hot
+
+    def add_message(
+        self,
+        content: str,
+        role: str = "user",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Add message to the hot window and queue it for the cold store"""
+        message = CompactChatMessage(
+            content,
+            role,
+            session_id=self.session_id,
+            metadata=metadata,
+        )
+
+        with self._lock:
+            hot = self._session(self.session_id)
+            if (
+                len(hot.messages) == hot.messages.maxlen
+                and hot.messages.maxlen != self.max_messages
+            ):
+                # The window drops a message the cold store keeps
+                hot.complete = False
+            hot.messages.append(message)
+
+            # Queued under the lock so a concurrent clear() cannot overtake it
+            self.cold.add_messages([message])
+
+    def get_history(
+        self,
+        limit: Optional[int] = None,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """Get chat history in chronological order"""
+        target_session = session_id or self.session_id
+
+        with self._lock:
+            hot = self._session(target_session)
+            if hot.complete:
+                self._hits += 1
+                messages = list(hot.messages)
+                return messages[:limit] if limit else messages
+            self._misses += 1
+
+        return self.cold.get_history(limit=limit, session_id=target_session)
+
+    def get_recent(
+        self,
+        n: int = 10,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """Get most recent messages (from memory unless n exceeds the window)"""
+        target_session = session_id or self.session_id
+
+        with self._lock:
+            hot = self._session(target_session)
+            if n <= len(hot.messages) or hot.complete:
+                self._hits += 1
+                messages = list(hot.messages)
+                return messages[-n:] if len(messages) > n else messages
+            self._misses += 1
+
+        return self.cold.get_recent(n=n, session_id=target_session)
+
+    def search_messages(
+        self,
+        query: str,
+        limit: int = 10,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """
+        Keyword search, hot window first
+
+        The window is ranked with BM25. If it holds the whole session or
+        yields `limit` matches, those are returned; otherwise the cold store's
+        full-text search is used.
+
+        Args:
+            query: Search query
+            limit: Maximum results
+            session_id: Search in specific session (None = current session)
+
+        Returns:
+            List of matching messages in chronological order
+        """
+        target_session = session_id or self.session_id
+
+        with self._lock:
+            hot = self._session(target_session)
+            window = list(hot.messages)
+            complete = hot.complete
+
+        hits = self._search_window(window, query, limit)
+        if complete or len(hits) >= limit:
+            return hits
+
+        return self.cold.search_messages(query, limit=limit, session_id=target_session)
+
+    @staticmethod
+    def _search_window(window: List[ChatMessage], query: str, limit: int) -> List[ChatMessage]:
+        """BM25 matches within a window, in chronological order"""
+        index: BM25Index[int] = BM25Index()
+        for position, message in enumerate(window):
+            index.add(position, message.content)
+        ranked = index.search(query, top_k=limit)
+        return [window[position] for position in sorted(position for position, _ in ranked)]
+
+    def get_context(
+        self,
+        query: Optional[str] = None,
+        max_tokens: int = 2000,
+        max_messages: int = 10,
+        use_search: bool = True,
+        session_id: Optional[str] = None,
+    ) -> List[ChatMessage]:
+        """
+        Get relevant context from the hot window
+
+        Unlike search_messages, this never falls back to the cold store:
+        candidates are the window's most recent messages plus its BM25
+        matches, ranked and packed by the context assembler.
+
+        Args:
+            query: Current query (if provided, may use search)
+            max_tokens: Approximate token limit for context
+            max_messages: Maximum messages to include in context
+            use_search: Use keyword search if a query is provided
+            session_id: Get context for specific session (None = current session)
+
+        Returns:
+            List of relevant messages for context
+        """
+        target_session = session_id or self.session_id
+
+        with self._lock:
+            window = list(self._session(target_session).messages)
+
+        recent = window[-max_messages * 2 :]
+        hits: List[ChatMessage] = []
+        if query and use_search:
+            hits = self._search_window(window, query, max_messages)
+
+        candidates, similarities = merge_candidates(recent, hits, ranked=False)
+        return self.context_assembler.assemble(
+            candidates,
+            query=query if use_search else None,
+            max_tokens=max_tokens,
+            max_messages=max_messages,
+            similarities=similarities,
+        )
+
+    def clear(self, session_id: Optional[str] = None) -> None:
+        """Clear chat history"""
+        target_session = session_id or self.session_id
+
+        with self._lock:
+            self._hot[target_session] = _HotSession(self.hot_window, [], complete=True)
+            self.cold.clear(session_id=target_session)
+
+    def get_sessions(self) -> List[str]:
+        """
+        Get list of all session IDs
+
+        Returns:
+            List of session IDs
+        """
+        return self.cold.get_sessions()
+
+    def delete_session(self, session_id: str) -> None:
+        """
+        Delete entire session
+
+        Args:
+            session_id: Session to delete
+        """
+        with self._lock:
+            self._hot.pop(session_id, None)
+            self.cold.delete_session(session_id)
+
+    def get_stats(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get memory statistics (cold store stats plus hot tier counters)"""
+        stats = self.cold.get_stats(session_id=session_id or self.session_id)
+
+        with self._lock:
+            stats.update(
+                {
+                    "hot_window": self.hot_window,
+                    "hot_sessions": len(self._hot),
+                    "hot_messages": sum(len(hot.messages) for hot in self._hot.values()),
+                    "hot_hits": self._hits,
+                    "hot_misses": self._misses,
+                }
+            )
+        return stats
+
+    def flush(self) -> None:
+        """Wait until queued messages are committed to the cold store"""
+        self.cold.flush()
+
+    def close(self) -> None:
+        """Flush and close the cold store"""
+        self.cold.close()
+
+    def __len__(self) -> int:
+        """Return number of messages in current session"""
+        return int(self.get_stats()["session_messages"])
+
+    def __repr__(self) -> str:
+        return (
+            f"TieredChatMemory(session='{self.session_id}', hot_window={self.hot_window}, "
+            f"db='{self.cold.db_path.name}')"
+        )
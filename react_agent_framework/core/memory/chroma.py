@@ -2,8 +2,12 @@
 ChromaDB vector memory implementation
 """
 
+import sqlite3
+import threading
 import uuid
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple, TYPE_CHECKING, cast
 from datetime import datetime
 
 try:
@@ -16,6 +20,13 @@ except ImportError:
     CHROMA_AVAILABLE = False
 
 from react_agent_framework.core.memory.base import BaseMemory, MemoryMessage
+from react_agent_framework.core.memory.embedding_cache import cached_embedding_function
+
+if TYPE_CHECKING:
+    from react_agent_framework.core.memory.embedding_cache import EmbeddingCache
+
+# Sidecar entries looked up per collection request when reconciling deletes
+_PAGE_SIZE = 1000
 
 
 class ChromaMemory(BaseMemory):
@@ -27,6 +38,13 @@ class ChromaMemory(BaseMemory):
     - Persistent storage
     - Metadata filtering
     - Multiple embedding functions (OpenAI, sentence-transformers, etc)
+    - Recency index: per-session sequence numbers plus a SQLite sidecar index
+      of live message IDs, so get_recent, stats and eviction never scan the session
+
+    Writes and deletes must go through ChromaMemory: messages deleted
+    directly from the collection still count towards get_stats and eviction.
+    Pass reconcile_deletes=True to drop such entries when an instance first
+    loads a session (one ID lookup per indexed message).
     """
 
     def __init__(
@@ -38,6 +56,8 @@ class ChromaMemory(BaseMemory):
         max_messages: Optional[int] = None,
         session_id: Optional[str] = None,
         api_key: Optional[str] = None,
+        embedding_cache: Optional["EmbeddingCache"] = None,
+        reconcile_deletes: bool = False,
     ):
         """
         Initialize ChromaDB memory
@@ -50,6 +70,9 @@ class ChromaMemory(BaseMemory):
             max_messages: Maximum messages to store
             session_id: Session identifier
             api_key: API key for OpenAI embeddings
+            embedding_cache: Cache consulted before calling the embedding function
+            reconcile_deletes: Check the sidecar index for messages deleted
+                directly from the collection when a session is first loaded
         """
         if not CHROMA_AVAILABLE:
             raise ImportError("ChromaDB not installed. Install with: pip install chromadb")
@@ -69,6 +92,10 @@ class ChromaMemory(BaseMemory):
         self.embedding_fn = self._get_embedding_function(
             embedding_function, embedding_model, api_key
         )
+        if embedding_cache is not None:
+            self.embedding_fn = cached_embedding_function(
+                self.embedding_fn, embedding_cache, f"{embedding_function}:{embedding_model or ''}"
+            )
 
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
@@ -77,6 +104,160 @@ class ChromaMemory(BaseMemory):
             metadata={"description": "ReactAgent memory storage"},
         )
 
+        # Sidecar recency index (SQLite next to the collection): per session,
+        # the next sequence number, the oldest live one and the live IDs by
+        # sequence number. Every change touches only that session's rows.
+        self._recency_lock = threading.Lock()
+        self._recency_db = sqlite3.connect(
+            str(Path(persist_directory) / f"{collection_name}.recency.db"),
+            check_same_thread=False,
+            timeout=30.0,
+            isolation_level=None,
+        )
+        self._recency_db.execute("PRAGMA journal_mode = WAL")
+        self._recency_db.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                next_seq INTEGER NOT NULL,
+                oldest_seq INTEGER NOT NULL
+            )
+        """)
+        self._recency_db.execute("""
+            CREATE TABLE IF NOT EXISTS messages (
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                doc_id TEXT NOT NULL,
+                PRIMARY KEY (session_id, seq)
+            ) WITHOUT ROWID
+        """)
+        # Sessions already checked against the collection by this instance
+        self.reconcile_deletes = reconcile_deletes
+        self._reconciled: Set[str] = set()
+        self._session_state(self.session_id)
+
+    @contextmanager
+    def _recency_transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction on the sidecar, serialized across threads and processes"""
+        with self._recency_lock:
+            self._recency_db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._recency_db
+            except BaseException:
+                self._recency_db.execute("ROLLBACK")
+                raise
+            self._recency_db.execute("COMMIT")
+
+    def _read_state(self, session_id: str) -> Optional[Dict[str, int]]:
+        """Sidecar state of a session, None if it has none"""
+        with self._recency_lock:
+            row = self._recency_db.execute(
+                "SELECT next_seq, oldest_seq FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return {"next_seq": row[0], "oldest_seq": row[1]} if row else None
+
+    def _session_state(self, session_id: str) -> Dict[str, int]:
+        """
+        Recency state of a session, rebuilt from the collection if missing
+
+        Sessions written before sequence numbers existed (or whose sidecar
+        was lost) are scanned once; messages without a "seq" are numbered
+        by timestamp. The first time this instance loads a session, messages
+        numbered beyond the sidecar's next_seq (a stale or restored sidecar)
+        are folded back in, so sequence numbers never repeat. With
+        reconcile_deletes, entries whose message was deleted directly from
+        the collection are dropped as well.
+        """
+        state = self._read_state(session_id)
+        if state is None:
+            return self._rebuild_session(session_id)
+
+        if session_id not in self._reconciled:
+            results = self.collection.get(
+                where=self._session_where(session_id, min_seq=state["next_seq"]),
+                include=["metadatas"],
+            )
+            if results["ids"]:
+                metadatas = cast(List[Dict[str, Any]], results["metadatas"])
+                items = sorted(zip(results["ids"], metadatas), key=lambda item: item[1]["seq"])
+                next_seq = items[-1][1]["seq"] + 1
+                with self._recency_transaction() as db:
+                    db.execute(
+                        "UPDATE sessions SET next_seq = MAX(next_seq, ?) WHERE session_id = ?",
+                        (next_seq, session_id),
+                    )
+                    db.executemany(
+                        "INSERT OR REPLACE INTO messages (session_id, seq, doc_id) VALUES (?, ?, ?)",
+                        [(session_id, metadata["seq"], doc_id) for doc_id, metadata in items],
+                    )
+                state = self._read_state(session_id) or state
+            if self.reconcile_deletes:
+                self._drop_deleted(session_id)
+            self._reconciled.add(session_id)
+
+        return state
+
+    def _drop_deleted(self, session_id: str) -> None:
+        """Drop sidecar entries whose message is no longer in the collection"""
+        with self._recency_lock:
+            rows = self._recency_db.execute(
+                "SELECT seq, doc_id FROM messages WHERE session_id = ?", (session_id,)
+            ).fetchall()
+
+        # Look the indexed IDs up page by page rather than listing the session
+        missing: List[int] = []
+        for start in range(0, len(rows), _PAGE_SIZE):
+            page = rows[start : start + _PAGE_SIZE]
+            found = set(self.collection.get(ids=[doc_id for _, doc_id in page], include=[])["ids"])
+            missing.extend(seq for seq, doc_id in page if doc_id not in found)
+        if not missing:
+            return
+
+        with self._recency_transaction() as db:
+            db.executemany(
+                "DELETE FROM messages WHERE session_id = ? AND seq = ?",
+                [(session_id, seq) for seq in missing],
+            )
+            db.execute(
+                "UPDATE sessions SET oldest_seq = COALESCE("
+                "(SELECT MIN(seq) FROM messages WHERE session_id = ?), next_seq"
+                ") WHERE session_id = ?",
+                (session_id, session_id),
+            )
+
+    def _rebuild_session(self, session_id: str) -> Dict[str, int]:
+        """Scan a session's messages into the sidecar"""
+        results = self.collection.get(where={"session_id": session_id}, include=["metadatas"])
+        items = list(zip(results["ids"], cast(List[Dict[str, Any]], results["metadatas"])))
+
+        if all("seq" in metadata for _, metadata in items):
+            items.sort(key=lambda item: item[1]["seq"])
+        else:
+            items.sort(key=lambda item: item[1].get("timestamp", ""))
+            for seq, (_, metadata) in enumerate(items):
+                metadata["seq"] = seq
+            if items:
+                self.collection.update(
+                    ids=[doc_id for doc_id, _ in items],
+                    metadatas=[metadata for _, metadata in items],
+                )
+
+        next_seq = items[-1][1]["seq"] + 1 if items else 0
+        oldest_seq = items[0][1]["seq"] if items else 0
+        with self._recency_transaction() as db:
+            # Another process may have rebuilt the session meanwhile
+            inserted = db.execute(
+                "INSERT OR IGNORE INTO sessions (session_id, next_seq, oldest_seq) "
+                "VALUES (?, ?, ?)",
+                (session_id, next_seq, oldest_seq),
+            ).rowcount
+            if inserted:
+                db.executemany(
+                    "INSERT OR REPLACE INTO messages (session_id, seq, doc_id) VALUES (?, ?, ?)",
+                    [(session_id, metadata["seq"], doc_id) for doc_id, metadata in items],
+                )
+        self._reconciled.add(session_id)
+        return self._read_state(session_id) or {"next_seq": next_seq, "oldest_seq": oldest_seq}
+
     def _get_embedding_function(self, func_type: str, model: Optional[str], api_key: Optional[str]):
         """Get embedding function based on type"""
         if func_type == "openai":
@@ -112,20 +293,50 @@ class ChromaMemory(BaseMemory):
             metadata=metadata or {},
         )
 
+        self._session_state(self.session_id)
+        doc_id = str(uuid.uuid4())
+
+        # Reserve the sequence number (and index entry) before writing, so
+        # concurrent writers and crashes never reuse one
+        with self._recency_transaction() as db:
+            seq = db.execute(
+                "SELECT next_seq FROM sessions WHERE session_id = ?", (self.session_id,)
+            ).fetchone()[0]
+            db.execute(
+                "UPDATE sessions SET next_seq = ? WHERE session_id = ?", (seq + 1, self.session_id)
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO messages (session_id, seq, doc_id) VALUES (?, ?, ?)",
+                (self.session_id, seq, doc_id),
+            )
+
         # Prepare metadata for Chroma
         chroma_metadata = {
             "role": role,
             "timestamp": message.timestamp.isoformat(),
             "session_id": self.session_id,
             **message.metadata,
+            "seq": seq,
         }
 
         # Add to collection
-        self.collection.add(
-            ids=[str(uuid.uuid4())],
-            documents=[content],
-            metadatas=[chroma_metadata],
-        )
+        try:
+            self.collection.add(
+                ids=[doc_id],
+                documents=[content],
+                metadatas=[chroma_metadata],
+            )
+        except Exception:
+            # Give the number back unless another writer has taken a later one
+            with self._recency_transaction() as db:
+                db.execute(
+                    "DELETE FROM messages WHERE session_id = ? AND seq = ?", (self.session_id, seq)
+                )
+                db.execute(
+                    "UPDATE sessions SET next_seq = ? WHERE session_id = ? AND next_seq = ?",
+                    (seq, self.session_id, seq + 1),
+                )
+            raise
 
         # Check max_messages limit
         if self.max_messages:
@@ -152,7 +363,7 @@ class ChromaMemory(BaseMemory):
             Most similar messages
         """
         # Build where filter
-        where_filter = {"session_id": self.session_id}
+        where_filter: Dict[str, Any] = {"session_id": self.session_id}
         if filters:
             where_filter.update(filters)
 
@@ -166,92 +377,113 @@ class ChromaMemory(BaseMemory):
         # Convert to MemoryMessage objects
         messages = []
         if results["documents"] and results["documents"][0]:
+            metadatas = cast(List[List[Dict[str, Any]]], results["metadatas"])
             for i, doc in enumerate(results["documents"][0]):
-                metadata = results["metadatas"][0][i]
-                timestamp_str = metadata.pop("timestamp", None)
-                role = metadata.pop("role", "user")
-                metadata.pop("session_id", None)
+                messages.append(self._to_message(doc, metadatas[0][i]))
 
-                timestamp = (
-                    datetime.fromisoformat(timestamp_str) if timestamp_str else datetime.now()
-                )
+        return messages
 
-                messages.append(
-                    MemoryMessage(
-                        content=doc,
-                        role=role,
-                        timestamp=timestamp,
-                        metadata=metadata,
-                    )
-                )
+    @staticmethod
+    def _records(results: Any) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """(id, document, metadata) rows of a collection.get() result"""
+        return list(
+            zip(
+                results["ids"],
+                cast(List[str], results["documents"]),
+                cast(List[Dict[str, Any]], results["metadatas"]),
+            )
+        )
 
-        return messages
+    def _to_message(self, content: str, metadata: Dict[str, Any]) -> MemoryMessage:
+        """Convert a stored document and its Chroma metadata to a MemoryMessage"""
+        timestamp_str = metadata.pop("timestamp", None)
+        role = metadata.pop("role", "user")
+        metadata.pop("session_id", None)
+        metadata.pop("seq", None)
+
+        timestamp = datetime.fromisoformat(timestamp_str) if timestamp_str else datetime.now()
+
+        return MemoryMessage(
+            content=content,
+            role=role,
+            timestamp=timestamp,
+            metadata=metadata,
+        )
+
+    def _session_where(
+        self, session_id: str, filters: Optional[Dict[str, Any]] = None, min_seq: int = 0
+    ) -> Dict[str, Any]:
+        """Chroma where clause for a session's messages with seq >= min_seq"""
+        conditions = [{"session_id": session_id}, {"seq": {"$gte": min_seq}}]
+        conditions += [{key: value} for key, value in (filters or {}).items()]
+        return {"$and": conditions}
 
     def get_recent(
         self,
         n: int = 10,
         filters: Optional[Dict[str, Any]] = None,
     ) -> List[MemoryMessage]:
-        """Get most recent messages"""
-        # Build where filter
-        where_filter = {"session_id": self.session_id}
-        if filters:
-            where_filter.update(filters)
-
-        # Get all matching messages
-        results = self.collection.get(
-            where=where_filter,
-            limit=n if n else None,
-        )
-
-        # Convert to MemoryMessage objects
-        messages = []
-        if results["documents"]:
-            for i, doc in enumerate(results["documents"]):
-                metadata = results["metadatas"][i]
-                timestamp_str = metadata.pop("timestamp", None)
-                role = metadata.pop("role", "user")
-                metadata.pop("session_id", None)
-
-                timestamp = (
-                    datetime.fromisoformat(timestamp_str) if timestamp_str else datetime.now()
-                )
-
-                messages.append(
-                    MemoryMessage(
-                        content=doc,
-                        role=role,
-                        timestamp=timestamp,
-                        metadata=metadata,
-                    )
-                )
+        """Get most recent messages (oldest first)"""
+        if n <= 0:
+            return []
+
+        state = self._session_state(self.session_id)
+
+        if not filters:
+            # Served from the index: fetch exactly these IDs. A reserved
+            # entry whose write never landed falls back to the window scan.
+            with self._recency_lock:
+                rows = self._recency_db.execute(
+                    "SELECT doc_id FROM messages WHERE session_id = ? ORDER BY seq DESC LIMIT ?",
+                    (self.session_id, n),
+                ).fetchall()
+            if len(rows) == n:
+                ids = [row[0] for row in reversed(rows)]
+                records = self._records(self.collection.get(ids=ids))
+                if len(records) == n:
+                    by_id = {doc_id: (doc, metadata) for doc_id, doc, metadata in records}
+                    return [self._to_message(*by_id[doc_id]) for doc_id in ids]
+
+        # Widen a window of the latest sequence numbers until it holds n matches
+        window = n
+        while True:
+            min_seq = max(state["oldest_seq"], state["next_seq"] - window)
+            records = self._records(
+                self.collection.get(where=self._session_where(self.session_id, filters, min_seq))
+            )
+            if len(records) >= n or min_seq <= state["oldest_seq"]:
+                break
+            window *= 4
 
-        # Sort by timestamp and return most recent
-        messages.sort(key=lambda x: x.timestamp)
-        return messages[-n:] if len(messages) > n else messages
+        records.sort(key=lambda record: record[2]["seq"])
+        return [self._to_message(doc, metadata) for _, doc, metadata in records[-n:]]
 
     def clear(self, session_id: Optional[str] = None) -> None:
         """Clear messages from session"""
         target_session = session_id or self.session_id
 
+        # Sequence numbers keep increasing so they never repeat within a session
+        self._session_state(target_session)
+
         # Delete all documents with this session_id
-        results = self.collection.get(
-            where={"session_id": target_session},
-        )
+        self.collection.delete(where={"session_id": target_session})
 
-        if results["ids"]:
-            self.collection.delete(ids=results["ids"])
+        with self._recency_transaction() as db:
+            db.execute(
+                "UPDATE sessions SET oldest_seq = next_seq WHERE session_id = ?", (target_session,)
+            )
+            db.execute("DELETE FROM messages WHERE session_id = ?", (target_session,))
 
     def get_stats(self) -> Dict[str, Any]:
         """Get memory statistics"""
         total_count = self.collection.count()
 
-        # Get session messages
-        session_results = self.collection.get(
-            where={"session_id": self.session_id},
-        )
-
-        session_count = len(session_results["ids"]) if session_results["ids"] else 0
+        # Session messages are the live entries in the sidecar index
+        self._session_state(self.session_id)
+        with self._recency_lock:
+            session_count = self._recency_db.execute(
+                "SELECT COUNT(*) FROM messages WHERE session_id = ?", (self.session_id,)
+            ).fetchone()[0]
 
         return {
             "total_messages": total_count,
@@ -264,25 +496,41 @@ class ChromaMemory(BaseMemory):
 
     def _remove_oldest(self, n: int) -> None:
         """Remove n oldest messages"""
-        results = self.collection.get(
-            where={"session_id": self.session_id},
-        )
+        if n <= 0:
+            return
 
-        if not results["ids"]:
+        # Sequence numbers can have gaps (failed writes, direct deletes), so
+        # take the n lowest live entries rather than a range
+        self._session_state(self.session_id)
+        with self._recency_lock:
+            rows = self._recency_db.execute(
+                "SELECT seq, doc_id FROM messages WHERE session_id = ? ORDER BY seq LIMIT ?",
+                (self.session_id, n),
+            ).fetchall()
+        if not rows:
             return
 
-        # Sort by timestamp
-        items = list(zip(results["ids"], results["metadatas"], results["documents"]))
-        items.sort(key=lambda x: x[1].get("timestamp", ""))
+        self.collection.delete(ids=[doc_id for _, doc_id in rows])
 
-        # Delete oldest n items
-        ids_to_delete = [item[0] for item in items[:n]]
-        if ids_to_delete:
-            self.collection.delete(ids=ids_to_delete)
+        with self._recency_transaction() as db:
+            db.executemany(
+                "DELETE FROM messages WHERE session_id = ? AND seq = ?",
+                [(self.session_id, seq) for seq, _ in rows],
+            )
+            db.execute(
+                "UPDATE sessions SET oldest_seq = COALESCE("
+                "(SELECT MIN(seq) FROM messages WHERE session_id = ?), next_seq"
+                ") WHERE session_id = ?",
+                (self.session_id, self.session_id),
+            )
 
     def delete_collection(self) -> None:
         """Delete entire collection (use with caution!)"""
         self.client.delete_collection(self.collection_name)
+        with self._recency_transaction() as db:
+            db.execute("DELETE FROM sessions")
+            db.execute("DELETE FROM messages")
+        self._reconciled.clear()
 
     def __repr__(self) -> str:
         stats = self.get_stats()
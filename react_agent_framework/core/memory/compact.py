@@ -0,0 +1,244 @@
+"""
+Compact message representations
+
+The dataclasses used by the memory layers (MemoryMessage, ChatMessage,
+KnowledgeDocument) and the multi-agent Message are slotted, but each instance
+still holds a ``metadata`` dict even when it is empty and, for the memory
+layers, a ``datetime``. Buffers holding many messages use the subclasses
+below instead:
+
+- Timestamps stored as epoch-seconds floats; ``timestamp`` is derived on access
+- ``metadata`` is only allocated when non-empty or first accessed
+
+They are real subclasses of the dataclass they replace: fields can be
+assigned, and ``dataclasses.replace``/``asdict``, ``to_dict()`` and equality
+with the plain dataclass work as usual.
+"""
+
+import time
+import uuid
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+from react_agent_framework.core.memory.base import MemoryMessage
+from react_agent_framework.core.memory.chat.base import ChatMessage
+from react_agent_framework.core.memory.knowledge.base import KnowledgeDocument
+from react_agent_framework.multi_agent.communication.message import (
+    Message,
+    MessagePriority,
+    MessageType,
+)
+
+Timestamp = Union[datetime, float, int, None]
+
+
+def to_epoch(timestamp: Timestamp) -> float:
+    """Convert a datetime (or epoch seconds, or None for now) to epoch seconds"""
+    if timestamp is None:
+        return time.time()
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+class _LazyMetadata:
+    """Metadata allocated on first use, and equality with the dataclass"""
+
+    __slots__ = ()
+
+    # Dataclass the compact class derives from (equality compares its fields)
+    _record_type: Any = object
+
+    # Slot declared by the concrete classes (a second base with non-empty
+    # __slots__ would conflict with the dataclass layout)
+    _metadata: Optional[Dict[str, Any]]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Metadata dict, allocated on first access"""
+        if self._metadata is None:
+            self._metadata = {}  # type: ignore[misc]
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]) -> None:
+        self._metadata = value  # type: ignore[misc]
+
+    @property
+    def has_metadata(self) -> bool:
+        """Check for metadata without allocating a dict"""
+        return bool(self._metadata)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, self._record_type):
+            return NotImplemented
+        return all(
+            getattr(self, f.name) == getattr(other, f.name) for f in fields(self._record_type)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class _EpochTimestamp(_LazyMetadata):
+    """Timestamp kept as epoch seconds"""
+
+    __slots__ = ()
+
+    # Slot declared by the concrete classes
+    _created: float
+
+    @property
+    def created(self) -> float:
+        """Creation time in epoch seconds"""
+        return self._created
+
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time as a naive local datetime (like datetime.now())"""
+        return datetime.fromtimestamp(self._created)
+
+    @timestamp.setter
+    def timestamp(self, value: Timestamp) -> None:
+        self._created = to_epoch(value)  # type: ignore[misc]
+
+
+class CompactMemoryMessage(_EpochTimestamp, MemoryMessage):
+    """MemoryMessage with an epoch timestamp and lazily allocated metadata"""
+
+    __slots__ = ("_created", "_metadata")
+    _record_type = MemoryMessage
+
+    def __init__(
+        self,
+        content: str,
+        role: str = "user",
+        timestamp: Timestamp = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.content = content
+        self.role = role
+        self._created = to_epoch(timestamp)
+        self._metadata = metadata or None
+
+    @classmethod
+    def from_message(cls, message: MemoryMessage) -> "CompactMemoryMessage":
+        """Compact copy of a MemoryMessage"""
+        return cls(message.content, message.role, message.timestamp, message.metadata)
+
+
+class CompactChatMessage(_EpochTimestamp, ChatMessage):
+    """ChatMessage with an epoch timestamp and lazily allocated metadata"""
+
+    __slots__ = ("_created", "_metadata")
+    _record_type = ChatMessage
+
+    def __init__(
+        self,
+        content: str,
+        role: str = "user",
+        timestamp: Timestamp = None,
+        session_id: str = "default",
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.content = content
+        self.role = role
+        self._created = to_epoch(timestamp)
+        self.session_id = session_id
+        self._metadata = metadata or None
+
+    @classmethod
+    def from_message(cls, message: ChatMessage) -> "CompactChatMessage":
+        """Compact copy of a ChatMessage"""
+        return cls(
+            message.content,
+            message.role,
+            message.timestamp,
+            message.session_id,
+            message.metadata,
+        )
+
+
+class CompactKnowledgeDocument(_EpochTimestamp, KnowledgeDocument):
+    """KnowledgeDocument with an epoch timestamp and lazily allocated metadata"""
+
+    __slots__ = ("_created", "_metadata")
+    _record_type = KnowledgeDocument
+
+    def __init__(
+        self,
+        content: str,
+        doc_id: Optional[str] = None,
+        timestamp: Timestamp = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        embedding: Optional[List[float]] = None,
+    ):
+        self.content = content
+        self.doc_id = doc_id
+        self._created = to_epoch(timestamp)
+        self._metadata = metadata or None
+        self.embedding = embedding
+
+    @classmethod
+    def from_document(cls, document: KnowledgeDocument) -> "CompactKnowledgeDocument":
+        """Compact copy of a KnowledgeDocument"""
+        return cls(
+            document.content,
+            document.doc_id,
+            document.timestamp,
+            document.metadata,
+            document.embedding,
+        )
+
+
+class CompactMessage(_LazyMetadata, Message):
+    """Multi-agent Message with lazily allocated metadata"""
+
+    __slots__ = ("_metadata",)
+    _record_type = Message
+
+    def __init__(
+        self,
+        sender: str,
+        receiver: str,
+        message_type: MessageType,
+        content: Any,
+        message_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        metadata: Optional[Dict[str, Any]] = None,
+        reply_to: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        expires_at: Optional[float] = None,
+    ):
+        self.sender = sender
+        self.receiver = receiver
+        self.message_type = message_type
+        self.content = content
+        self.message_id = message_id or f"msg-{uuid.uuid4().hex[:12]}"
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.priority = priority
+        self._metadata = metadata or None
+        self.reply_to = reply_to
+        self.conversation_id = conversation_id
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_message(cls, message: Message) -> "CompactMessage":
+        """Compact copy of a Message"""
+        return cls(
+            message.sender,
+            message.receiver,
+            message.message_type,
+            message.content,
+            message.message_id,
+            message.timestamp,
+            message.priority,
+            message.metadata,
+            message.reply_to,
+            message.conversation_id,
+            message.expires_at,
+        )
+
+    def __repr__(self) -> str:
+        return "Compact" + super().__repr__()
@@ -0,0 +1,170 @@
+"""
+Relevance-ranked context assembly shared by all memory backends
+
+Candidates (e.g. recent messages plus search hits) are scored by a weighted
+mix of recency, BM25 keyword relevance to the query and an optional
+retrieval/vector similarity, then packed greedily into the token budget,
+best first, using a heap. The selection is returned in chronological order.
+"""
+
+import heapq
+import math
+from typing import Any, Callable, Hashable, List, Optional, Sequence, Tuple
+
+from react_agent_framework.core.memory.bm25 import BM25Index
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (4 chars ≈ 1 token), as used across the memory modules"""
+    return (len(text) + 3) // 4
+
+
+class ContextAssembler:
+    """
+    Score candidate messages and pack the best into a token budget
+
+    Works with any message type that has a ``content`` attribute
+    (MemoryMessage, ChatMessage, KnowledgeDocument, ...).
+    """
+
+    def __init__(
+        self,
+        recency_weight: float = 0.4,
+        keyword_weight: float = 0.4,
+        similarity_weight: float = 0.2,
+        recency_half_life: float = 10.0,
+        token_counter: Callable[[str], int] = estimate_tokens,
+    ):
+        """
+        Initialize the assembler
+
+        Args:
+            recency_weight: Weight of recency (1.0 for the newest candidate,
+                halving every recency_half_life candidates)
+            keyword_weight: Weight of BM25 relevance to the query (normalized)
+            similarity_weight: Weight of caller-provided similarities
+                (e.g. vector similarity or search rank, in [0, 1])
+            recency_half_life: Candidates after which recency halves
+            token_counter: Function counting the tokens of a text
+        """
+        self.recency_weight = recency_weight
+        self.keyword_weight = keyword_weight
+        self.similarity_weight = similarity_weight
+        self.recency_half_life = max(recency_half_life, 1e-9)
+        self.token_counter = token_counter
+
+    def score(
+        self,
+        candidates: Sequence[Any],
+        query: Optional[str] = None,
+        similarities: Optional[Sequence[float]] = None,
+    ) -> List[float]:
+        """
+        Relevance score of each candidate
+
+        Args:
+            candidates: Messages in chronological order (oldest first)
+            query: Current query (enables keyword scoring)
+            similarities: Optional per-candidate similarity in [0, 1]
+
+        Returns:
+            One score per candidate (higher is better)
+        """
+        n = len(candidates)
+        decay = math.log(2) / self.recency_half_life
+        scores = [self.recency_weight * math.exp(-decay * (n - 1 - i)) for i in range(n)]
+
+        if query and self.keyword_weight:
+            index: BM25Index[int] = BM25Index()
+            for i, candidate in enumerate(candidates):
+                index.add(i, candidate.content)
+            ranked = index.search(query, top_k=n)
+            if ranked:
+                best = ranked[0][1]
+                for i, value in ranked:
+                    scores[i] += self.keyword_weight * value / best
+
+        if similarities is not None and self.similarity_weight:
+            for i, value in enumerate(similarities):
+                scores[i] += self.similarity_weight * value
+
+        return scores
+
+    def assemble(
+        self,
+        candidates: Sequence[Any],
+        query: Optional[str] = None,
+        max_tokens: int = 2000,
+        max_messages: Optional[int] = None,
+        similarities: Optional[Sequence[float]] = None,
+    ) -> List[Any]:
+        """
+        Select the best candidates that fit the budget
+
+        Args:
+            candidates: Messages in chronological order (oldest first)
+            query: Current query (enables keyword scoring)
+            max_tokens: Token budget for the selected messages
+            max_messages: Maximum messages to select (None = no limit)
+            similarities: Optional per-candidate similarity in [0, 1]
+
+        Returns:
+            Selected messages in chronological order
+        """
+        if not candidates:
+            return []
+
+        scores = self.score(candidates, query=query, similarities=similarities)
+
+        # Max-heap on score; ties favour newer candidates
+        heap: List[Tuple[float, int]] = [(-score, -i) for i, score in enumerate(scores)]
+        heapq.heapify(heap)
+
+        limit = len(candidates) if max_messages is None else max_messages
+        selected = [False] * len(candidates)
+        remaining = max_tokens
+        count = 0
+        while heap and count < limit and remaining > 0:
+            _, i = heapq.heappop(heap)
+            cost = self.token_counter(candidates[-i].content)
+            if cost <= remaining:
+                selected[-i] = True
+                remaining -= cost
+                count += 1
+
+        return [candidate for candidate, keep in zip(candidates, selected) if keep]
+
+
+def _message_key(message: Any) -> Hashable:
+    return (message.timestamp, message.role, message.content)
+
+
+def merge_candidates(
+    recent: Sequence[Any],
+    hits: Sequence[Any],
+    ranked: bool = True,
+    key: Callable[[Any], Hashable] = _message_key,
+) -> Tuple[List[Any], List[float]]:
+    """
+    Merge recent messages and search hits into one candidate list
+
+    Args:
+        recent: Recent messages, chronological
+        hits: Search results
+        ranked: Hits are ordered best first (otherwise every hit scores 1.0)
+        key: Identity of a message across the two lists
+
+    Returns:
+        (candidates in chronological order, similarity per candidate derived
+        from its search rank: 1.0 for the best hit, 0.0 for non-hits)
+    """
+    rank_score = {
+        key(hit): 1.0 - rank / len(hits) if ranked else 1.0 for rank, hit in enumerate(hits)
+    }
+
+    merged = {key(message): message for message in recent}
+    for hit in hits:
+        merged.setdefault(key(hit), hit)
+
+    candidates = sorted(merged.values(), key=lambda m: m.timestamp)
+    return candidates, [rank_score.get(key(message), 0.0) for message in candidates]
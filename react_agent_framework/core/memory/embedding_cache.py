@@ -0,0 +1,312 @@
+"""
+Persistent embedding cache shared by the vector memories
+
+Vectors are stored in SQLite keyed by sha256(model + text), so a text is
+embedded once per model however often it is added or searched, across
+sessions, memories and processes sharing the cache file. The least recently
+used entries are evicted beyond ``max_entries``.
+
+Recency stamps are wall-clock microseconds, so processes sharing the file
+order their entries consistently. Cache hits only record their stamp in
+memory; the stamps are written in one transaction with the next store, every
+_TOUCH_BATCH hits, or on close, so lookups stay read-only.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None  # type: ignore
+
+# Keys per SQLite lookup (stays under the bound-parameter limit)
+_LOOKUP_BATCH = 500
+
+# Deferred last_used updates written in one transaction
+_TOUCH_BATCH = 1000
+
+
+def _key(model: str, text: str) -> bytes:
+    return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache with LRU eviction
+
+    Example:
+        ```python
+        cache = EmbeddingCache("./embeddings.db")
+        memory = FAISSKnowledgeMemory(index_path="./kb", embedding_cache=cache)
+        ```
+    """
+
+    def __init__(self, path: str = "./embedding_cache.db", max_entries: Optional[int] = 100_000):
+        """
+        Open or create a cache
+
+        Args:
+            path: SQLite file (":memory:" for a private in-memory cache)
+            max_entries: Vectors kept before the least recently used are
+                evicted (None = unlimited)
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy not installed. Install with: pip install numpy")
+
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30.0)
+        self._init_db()
+
+        # Latest recency stamp handed out, and hits not yet written back
+        self._last_stamp = 0
+        self._touched: Dict[bytes, int] = {}
+        self._count = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _init_db(self) -> None:
+        """Initialize database schema"""
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key BLOB PRIMARY KEY,
+                model TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used INTEGER NOT NULL
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)"
+        )
+        self.conn.commit()
+
+    def get_many(self, texts: Sequence[str], model: str) -> List[Optional["np.ndarray"]]:
+        """
+        Look up cached vectors
+
+        Args:
+            texts: Texts to look up
+            model: Embedding model the vectors must come from
+
+        Returns:
+            One float32 vector per text, None where it is not cached
+        """
+        keys = [_key(model, text) for text in texts]
+        found: Dict[bytes, bytes] = {}
+
+        with self._lock:
+            unique = list(dict.fromkeys(keys))
+            for start in range(0, len(unique), _LOOKUP_BATCH):
+                batch = unique[start : start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                )
+                found.update(rows.fetchall())
+
+            if found:
+                stamp = self._stamp()
+                self._touched.update(dict.fromkeys(found, stamp))
+                if len(self._touched) >= _TOUCH_BATCH:
+                    self._write_touches()
+                    self.conn.commit()
+
+            hits = sum(key in found for key in keys)
+            self.hits += hits
+            self.misses += len(keys) - hits
+
+        return [
+            np.frombuffer(found[key], dtype=np.float32) if key in found else None for key in keys
+        ]
+
+    def put_many(self, texts: Sequence[str], model: str, vectors: Any) -> None:
+        """
+        Store vectors
+
+        Args:
+            texts: Embedded texts
+            model: Embedding model that produced the vectors
+            vectors: One vector per text (array or nested lists)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            self._write_touches()
+            stamp = self._stamp()
+            rows = [
+                (_key(model, text), model, vector.tobytes(), stamp)
+                for text, vector in zip(texts, vectors)
+            ]
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, model, vector, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._count += self.conn.total_changes - before
+            self._evict()
+            self.conn.commit()
+
+    def embed(
+        self,
+        texts: Sequence[str],
+        model: str,
+        embed_fn: Callable[[List[str]], Any],
+    ) -> "np.ndarray":
+        """
+        Embed texts, calling embed_fn only for those not cached
+
+        Args:
+            texts: Texts to embed
+            model: Embedding model (part of the cache key)
+            embed_fn: Embeds a list of texts (e.g. one API request)
+
+        Returns:
+            float32 array with one row per text
+        """
+        cached = self.get_many(texts, model)
+        missing = list(dict.fromkeys(text for text, v in zip(texts, cached) if v is None))
+
+        by_text: Dict[str, "np.ndarray"] = {}
+        if missing:
+            computed = np.asarray(embed_fn(missing), dtype=np.float32)
+            self.put_many(missing, model, computed)
+            by_text = dict(zip(missing, computed))
+        vectors = [by_text[text] if v is None else v for text, v in zip(texts, cached)]
+
+        if not vectors:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.vstack(vectors)
+
+    def _stamp(self) -> int:
+        """Recency stamp: wall-clock microseconds, increasing within this process"""
+        self._last_stamp = max(time.time_ns() // 1000, self._last_stamp + 1)
+        return self._last_stamp
+
+    def _write_touches(self) -> None:
+        """Write deferred last_used updates of cache hits (must hold the lock)"""
+        if self._touched:
+            self.conn.executemany(
+                "UPDATE embeddings SET last_used = MAX(last_used, ?) WHERE key = ?",
+                [(stamp, key) for key, stamp in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries beyond max_entries (must hold the lock)"""
+        if self.max_entries is None or self._count <= self.max_entries:
+            return
+
+        # Other processes may share the file; recount before evicting
+        self._count = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = self._count - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self._count -= excess
+
+    def clear(self) -> None:
+        """Remove all cached vectors"""
+        with self._lock:
+            self._touched.clear()
+            self.conn.execute("DELETE FROM embeddings")
+            self.conn.commit()
+            self._count = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": self._count,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "path": self.path,
+            }
+
+    def close(self) -> None:
+        """Write deferred recency updates and close the database"""
+        with self._lock:
+            self._write_touches()
+            self.conn.commit()
+            self.conn.close()
+
+    def __len__(self) -> int:
+        return int(self._count)
+
+    def __repr__(self) -> str:
+        return f"EmbeddingCache(path='{self.path}', entries={self._count})"
+
+
+def cached_embedding_function(function: Any, cache: EmbeddingCache, model: str) -> Any:
+    """
+    Wrap a ChromaDB embedding function so it consults the cache first
+
+    Name and configuration are those of the wrapped function, so existing
+    collections accept the wrapper. Pass the wrapper every time the
+    collection is opened: ChromaDB rebuilds functions from a collection's
+    config without the cache.
+
+    Args:
+        function: ChromaDB embedding function
+        cache: Embedding cache
+        model: Cache key identifying the function's model
+
+    Returns:
+        ChromaDB embedding function
+    """
+    from chromadb.api.types import EmbeddingFunction
+
+    class CachedEmbeddingFunction(EmbeddingFunction):
+        def __init__(self):
+            self.function = function
+
+        def __call__(self, input):
+            return list(cache.embed(list(input), model, lambda texts: function(texts)))
+
+        @staticmethod
+        def name():
+            return function.name()
+
+        @staticmethod
+        def build_from_config(config):
+            # ChromaDB registers this class under the wrapped name when it saves
+            # a collection config, and rebuilds other collections' functions
+            # through it: hand back the plain function, not this cache
+            return type(function).build_from_config(config)
+
+        def get_config(self):
+            return function.get_config()
+
+        def is_legacy(self):
+            return function.is_legacy()
+
+        def default_space(self):
+            return function.default_space()
+
+        def supported_spaces(self):
+            return function.supported_spaces()
+
+    return CachedEmbeddingFunction()
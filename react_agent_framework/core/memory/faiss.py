@@ -3,12 +3,15 @@ FAISS vector memory implementation for high-performance similarity search
 """
 
 import json
+import uuid
 from pathlib import Path
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from typing import List, Dict, Any, Optional, TYPE_CHECKING, cast
 
 if TYPE_CHECKING:
     import numpy as np
 
+    from react_agent_framework.core.memory.embedding_cache import EmbeddingCache
+
 try:
     import faiss
     import numpy as np
@@ -16,10 +19,12 @@ try:
     FAISS_AVAILABLE = True
 except ImportError:
     FAISS_AVAILABLE = False
-    faiss = None
+    faiss = None  # type: ignore
     np = None  # type: ignore
 
 from react_agent_framework.core.memory.base import BaseMemory, MemoryMessage
+from react_agent_framework.core.memory import faiss_index
+from react_agent_framework.core.memory.vector_store import VectorStore
 
 
 class FAISSMemory(BaseMemory):
@@ -29,11 +34,15 @@ class FAISSMemory(BaseMemory):
     Features:
     - Very fast similarity search
     - Support for large-scale datasets
-    - Multiple index types (Flat, IVF, HNSW)
-    - Persistent storage
+    - Multiple index types (Flat, HNSW, IVF, IVFPQ, IVFSQ), IVF trained automatically
+    - Append-only persistent storage (mmap'd vectors, SQLite metadata,
+      periodic index checkpoints)
     - Requires manual embedding generation
     """
 
+    # Trained empty index for IVF types
+    TRAINED_FILE = "index.trained.faiss"
+
     def __init__(
         self,
         index_path: str = "./faiss_index",
@@ -43,6 +52,14 @@ class FAISSMemory(BaseMemory):
         max_messages: Optional[int] = None,
         session_id: Optional[str] = None,
         api_key: Optional[str] = None,
+        checkpoint_interval: int = 1000,
+        nlist: int = 100,
+        nprobe: int = 8,
+        ef_search: int = 64,
+        pq_m: Optional[int] = None,
+        min_train_vectors: Optional[int] = None,
+        embedding_cache: Optional["EmbeddingCache"] = None,
+        vector_dtype: str = "float32",
     ):
         """
         Initialize FAISS memory
@@ -50,11 +67,21 @@ class FAISSMemory(BaseMemory):
         Args:
             index_path: Directory to save index and metadata
             dimension: Embedding dimension (1536 for OpenAI, 384 for MiniLM)
-            index_type: FAISS index type ("Flat", "IVF", "HNSW")
+            index_type: FAISS index type ("Flat", "HNSW", "IVF", "IVFPQ", "IVFSQ")
             embedding_model: OpenAI embedding model
             max_messages: Maximum messages to store
             session_id: Session identifier
             api_key: OpenAI API key
+            checkpoint_interval: Changes between FAISS index checkpoints
+            nlist: Number of IVF lists
+            nprobe: IVF lists searched per query
+            ef_search: HNSW search candidate list size
+            pq_m: PQ sub-quantizers for IVFPQ (default: derived from dimension)
+            min_train_vectors: Messages needed before IVF types are trained
+                (default: 39 * nlist); until then search is exact
+            embedding_cache: Cache consulted before calling the embedding API
+            vector_dtype: Storage type of the persisted vectors ("float32",
+                "float16" or "int8" with a per-vector scale)
         """
         if not FAISS_AVAILABLE:
             raise ImportError(
@@ -64,11 +91,21 @@ class FAISSMemory(BaseMemory):
         super().__init__(max_messages=max_messages, session_id=session_id)
 
         self.index_path = Path(index_path)
-        self.index_path.mkdir(parents=True, exist_ok=True)
 
         self.dimension = dimension
         self.index_type = index_type
         self.embedding_model = embedding_model
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.pq_m = pq_m
+        self.min_train_vectors = max(
+            min_train_vectors or faiss_index.min_train_vectors(index_type, nlist),
+            nlist,
+            256 if index_type == "IVFPQ" else 0,
+        )
+        # Trained empty index that IVF types are cloned from (None until trained)
+        self._trained_template: Optional["faiss.Index"] = None
 
         # Initialize OpenAI client for embeddings
         if not api_key:
@@ -79,42 +116,81 @@ class FAISSMemory(BaseMemory):
         from openai import OpenAI
 
         self.openai_client = OpenAI(api_key=api_key)
+        self.embedding_cache = embedding_cache
 
         # Create or load FAISS index
         self.index = self._create_index()
 
-        # Store messages and metadata separately
+        # Store messages and metadata separately, oldest first
         self.messages: List[MemoryMessage] = []
 
+        # FAISS integer ID (row in the vector store) of each message in self.messages
+        self._message_ids: List[int] = []
+        self._messages_by_id: Dict[int, MemoryMessage] = {}
+
+        # Nothing is written to disk until the client above is set up
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        self.store = VectorStore(
+            str(self.index_path),
+            dimension,
+            checkpoint_interval=checkpoint_interval,
+            dtype=vector_dtype,
+        )
+
         # Load existing data if available
         self._load()
 
     def _create_index(self):
-        """Create FAISS index based on type"""
-        if self.index_type == "Flat":
-            # Exact search, slower but accurate
-            return faiss.IndexFlatL2(self.dimension)
+        """Create FAISS index based on type, storing our integer IDs"""
+        if self._trained_template is not None:
+            index = faiss.clone_index(self._trained_template)
+        elif faiss_index.needs_training(self.index_type):
+            # Exact search until there are enough vectors to train on
+            index = faiss_index.create_index(self.dimension, "Flat")
+        else:
+            index = faiss_index.create_index(
+                self.dimension, self.index_type, nlist=self.nlist, pq_m=self.pq_m
+            )
 
-        elif self.index_type == "IVF":
-            # Inverted file index, faster for large datasets
-            quantizer = faiss.IndexFlatL2(self.dimension)
-            return faiss.IndexIVFFlat(quantizer, self.dimension, 100)
+        faiss_index.configure_search(index, nprobe=self.nprobe, ef_search=self.ef_search)
+        return index
 
-        elif self.index_type == "HNSW":
-            # Hierarchical Navigable Small World, very fast
-            return faiss.IndexHNSWFlat(self.dimension, 32)
+    def _maybe_train(self) -> None:
+        """Train IVF index types once enough vectors are stored"""
+        if self._trained_template is not None or not faiss_index.needs_training(self.index_type):
+            return
+        if len(self._message_ids) < self.min_train_vectors:
+            return
 
-        else:
-            raise ValueError(f"Unknown index type: {self.index_type}")
+        template = faiss_index.create_index(
+            self.dimension, self.index_type, nlist=self.nlist, pq_m=self.pq_m
+        )
+        rows = faiss_index.training_rows(template, self._message_ids)
+        faiss_index.train_index(template, self.store.vectors(rows))
+        faiss.write_index(template, str(self.index_path / self.TRAINED_FILE))
+        self._trained_template = template
+
+        self._rebuild_index()
+        self._save()
 
     def _get_embedding(self, text: str) -> "np.ndarray":
-        """Generate embedding for text using OpenAI"""
+        """Generate embedding for text (from the cache if present)"""
+        if self.embedding_cache is not None:
+            vectors = self.embedding_cache.embed(
+                [text], self.embedding_model, self._request_embeddings
+            )
+        else:
+            vectors = self._request_embeddings([text])
+        return cast("np.ndarray", vectors[0])
+
+    def _request_embeddings(self, texts: List[str]) -> "np.ndarray":
+        """Generate embeddings for texts in one OpenAI request"""
         response = self.openai_client.embeddings.create(
-            input=text,
+            input=texts,
             model=self.embedding_model,
         )
-        embedding = np.array(response.data[0].embedding, dtype=np.float32)
-        return embedding
+        data = sorted(response.data, key=lambda item: item.index)
+        return np.array([item.embedding for item in data], dtype=np.float32)
 
     def add(
         self,
@@ -135,18 +211,21 @@ class FAISSMemory(BaseMemory):
         # Generate embedding
         embedding = self._get_embedding(content)
 
-        # Add to FAISS index
-        self.index.add(embedding.reshape(1, -1))
+        # Persist, then add to FAISS index under the stored row
+        faiss_id = self.store.append(embedding, [(uuid.uuid4().hex, message.to_dict())])[0]
+        self.index.add_with_ids(embedding.reshape(1, -1), np.array([faiss_id], dtype=np.int64))
 
         # Store message
         self.messages.append(message)
+        self._message_ids.append(faiss_id)
+        self._messages_by_id[faiss_id] = message
 
         # Check max_messages limit
         if self.max_messages and len(self.messages) > self.max_messages:
             self._remove_oldest()
 
-        # Auto-save
-        self._save()
+        self._maybe_train()
+        self._maybe_save()
 
     def search(
         self,
@@ -172,15 +251,15 @@ class FAISSMemory(BaseMemory):
         query_embedding = self._get_embedding(query)
 
         # Search in FAISS
-        distances, indices = self.index.search(
+        distances, ids = self.index.search(
             query_embedding.reshape(1, -1), min(top_k * 2, len(self.messages))
         )
 
         # Get messages
         results = []
-        for idx in indices[0]:
-            if idx >= 0 and idx < len(self.messages):
-                msg = self.messages[idx]
+        for faiss_id in ids[0]:
+            msg = self._messages_by_id.get(int(faiss_id))
+            if msg is not None:
 
                 # Apply filters
                 if filters:
@@ -224,17 +303,16 @@ class FAISSMemory(BaseMemory):
         """Clear messages from session"""
         target_session = session_id or self.session_id
 
-        # Filter out messages from target session
-        new_messages = []
-        for msg in self.messages:
-            if msg.metadata.get("session_id") != target_session:
-                new_messages.append(msg)
+        # Find messages from target session
+        positions = [
+            i
+            for i, msg in enumerate(self.messages)
+            if msg.metadata.get("session_id") == target_session
+        ]
 
-        # Rebuild index if messages were removed
-        if len(new_messages) != len(self.messages):
-            self.messages = new_messages
-            self._rebuild_index()
-            self._save()
+        if positions:
+            self._remove_messages(positions)
+            self._maybe_save()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get memory statistics"""
@@ -250,6 +328,11 @@ class FAISSMemory(BaseMemory):
             "index_type": self.index_type,
             "max_messages": self.max_messages,
             "index_path": str(self.index_path),
+            "stored_vectors": self.store.num_rows,
+            "dead_vectors": self.store.dead_rows(),
+            "vector_dtype": self.store.dtype,
+            "trained": not faiss_index.needs_training(self.index_type)
+            or self._trained_template is not None,
         }
 
     def _matches_filters(self, message: MemoryMessage, filters: Dict[str, Any]) -> bool:
@@ -278,45 +361,103 @@ class FAISSMemory(BaseMemory):
                     oldest_idx = i
 
         if oldest_idx is not None:
-            self.messages.pop(oldest_idx)
+            self._remove_messages([oldest_idx])
+
+    def _remove_messages(self, positions: List[int]) -> None:
+        """Remove messages and their vectors by position in self.messages"""
+        removed = set(positions)
+        faiss_ids = [self._message_ids[i] for i in positions]
+
+        self.messages = [msg for i, msg in enumerate(self.messages) if i not in removed]
+        self._message_ids = [fid for i, fid in enumerate(self._message_ids) if i not in removed]
+        for faiss_id in faiss_ids:
+            del self._messages_by_id[faiss_id]
+
+        self.store.delete_rows(faiss_ids)
+
+        if self.index_type == "HNSW":
+            # HNSW graphs don't support removal
             self._rebuild_index()
+        else:
+            self.index.remove_ids(np.array(faiss_ids, dtype=np.int64))
 
     def _rebuild_index(self) -> None:
-        """Rebuild FAISS index from messages"""
-        self.index = self._create_index()
+        """Rebuild FAISS index from stored vectors"""
+        self.index = self.store.build_index(self._create_index, self._message_ids)
 
-        if self.messages:
-            embeddings = []
-            for msg in self.messages:
-                emb = self._get_embedding(msg.content)
-                embeddings.append(emb)
+    def compact(self) -> None:
+        """
+        Reclaim the stored vectors of removed messages
+
+        Rewrites the vector file with live rows only, renumbers the FAISS IDs
+        and rebuilds the index. Runs automatically at checkpoints once dead
+        rows make up half of the vector file.
+        """
+        mapping = self.store.compact()
 
-            embeddings_array = np.vstack(embeddings)
-            self.index.add(embeddings_array)
+        self._message_ids = [mapping[faiss_id] for faiss_id in self._message_ids]
+        self._messages_by_id = dict(zip(self._message_ids, self.messages))
+
+        self._rebuild_index()
+        self.store.checkpoint(self.index)
 
     def _save(self) -> None:
-        """Save index and messages to disk"""
-        # Save FAISS index
-        faiss.write_index(self.index, str(self.index_path / "index.faiss"))
+        """Checkpoint the FAISS index (messages are persisted as they are added)"""
+        if self.store.needs_compaction():
+            self.compact()
+        else:
+            self.store.checkpoint(self.index)
 
-        # Save messages
-        messages_data = [msg.to_dict() for msg in self.messages]
-        with open(self.index_path / "messages.json", "w") as f:
-            json.dump(messages_data, f, indent=2)
+    def _maybe_save(self) -> None:
+        """Checkpoint once enough changes accumulated"""
+        if self.store.checkpoint_due():
+            self._save()
+
+    def close(self) -> None:
+        """Checkpoint the index and close the store"""
+        self._save()
+        self.store.close()
 
     def _load(self) -> None:
-        """Load index and messages from disk"""
-        index_file = self.index_path / "index.faiss"
+        """Load messages and index from disk"""
+        trained_file = self.index_path / self.TRAINED_FILE
+        if faiss_index.needs_training(self.index_type) and trained_file.exists():
+            self._trained_template = faiss.read_index(str(trained_file))
+
+        if self.store.is_empty():
+            self._migrate_json()
+
+        for faiss_id, _, data in self.store.records():
+            message = MemoryMessage.from_dict(data)
+            self.messages.append(message)
+            self._message_ids.append(faiss_id)
+            self._messages_by_id[faiss_id] = message
+
+        self.index = self.store.load_index(self._create_index, self._message_ids)
+        faiss_index.configure_search(self.index, nprobe=self.nprobe, ef_search=self.ef_search)
+
+        # Checkpoint predates training: move to the trained index
+        if self._trained_template is not None and not isinstance(
+            faiss_index.inner_index(self.index), faiss.IndexIVF
+        ):
+            self._rebuild_index()
+
+        self._maybe_train()
+
+    def _migrate_json(self) -> None:
+        """Import messages saved in the old JSON format (re-embeds them)"""
         messages_file = self.index_path / "messages.json"
+        if not messages_file.exists():
+            return
+
+        with open(messages_file, "r") as f:
+            messages_data = json.load(f)
 
-        if index_file.exists() and messages_file.exists():
-            # Load FAISS index
-            self.index = faiss.read_index(str(index_file))
+        if messages_data:
+            embeddings = np.vstack([self._get_embedding(data["content"]) for data in messages_data])
+            self.store.append(embeddings, [(uuid.uuid4().hex, data) for data in messages_data])
 
-            # Load messages
-            with open(messages_file, "r") as f:
-                messages_data = json.load(f)
-                self.messages = [MemoryMessage.from_dict(data) for data in messages_data]
+        messages_file.rename(messages_file.with_suffix(".json.migrated"))
 
     def __repr__(self) -> str:
         stats = self.get_stats()
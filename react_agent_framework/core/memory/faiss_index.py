@@ -0,0 +1,366 @@
+"""
+FAISS index construction, training and tuning for FAISS-backed memories
+
+Index types:
+- "Flat": exact search
+- "HNSW": graph search, no training (tune with ef_search)
+- "IVF": inverted lists over full vectors (tune with nlist/nprobe)
+- "IVFPQ": IVF with product-quantized vectors (~dimension/pq_m times smaller)
+- "IVFSQ": IVF with 8-bit scalar-quantized vectors (4x smaller)
+
+IVF variants need training on a sample of vectors before use. Until enough
+vectors exist, memories search an exact Flat index and switch over once
+trained (see ``train_index``).
+
+Flat and HNSW indexes are wrapped in IndexIDMap2 to store caller-chosen
+integer IDs. IVF types keep the IDs in their inverted lists themselves:
+IndexIDMap's remove_ids assumes the wrapped index renumbers its vectors
+like a flat array, which IVF lists don't, and aborts the process.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+try:
+    import faiss
+    import numpy as np
+
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+    faiss = None  # type: ignore
+    np = None  # type: ignore
+
+INDEX_TYPES = ("Flat", "HNSW", "IVF", "IVFPQ", "IVFSQ")
+COMPRESSED_INDEX_TYPES = ("IVFPQ", "IVFSQ")
+
+# Vectors used for training, per IVF list (FAISS warns below 39 per centroid)
+TRAIN_POINTS_PER_LIST = 39
+MAX_TRAIN_POINTS_PER_LIST = 256
+
+
+def needs_training(index_type: str) -> bool:
+    """Check whether an index type must be trained before adding vectors"""
+    return index_type.startswith("IVF")
+
+
+def is_compressed(index_type: str) -> bool:
+    """Check whether an index type stores lossy codes instead of the vectors"""
+    return index_type in COMPRESSED_INDEX_TYPES
+
+
+def default_pq_m(dimension: int) -> int:
+    """Largest usual number of PQ sub-quantizers that divides the dimension"""
+    for pq_m in (64, 48, 32, 24, 16, 12, 8, 4, 2, 1):
+        if dimension % pq_m == 0:
+            return pq_m
+    return 1
+
+
+def min_train_vectors(index_type: str, nlist: int = 100) -> int:
+    """Number of vectors needed before an index type is trained"""
+    if not needs_training(index_type):
+        return 0
+
+    minimum = nlist * TRAIN_POINTS_PER_LIST
+    if index_type == "IVFPQ":
+        # 8-bit PQ codebooks have 256 centroids per sub-quantizer
+        minimum = max(minimum, 256)
+    return minimum
+
+
+def create_index(
+    dimension: int,
+    index_type: str = "Flat",
+    nlist: int = 100,
+    hnsw_m: int = 32,
+    pq_m: Optional[int] = None,
+):
+    """
+    Create an empty index that stores caller-chosen integer IDs
+
+    Args:
+        dimension: Embedding dimension
+        index_type: One of INDEX_TYPES
+        nlist: Number of IVF lists
+        hnsw_m: HNSW graph degree
+        pq_m: PQ sub-quantizers for IVFPQ (must divide dimension)
+
+    Returns:
+        FAISS index accepting add_with_ids (untrained for IVF types)
+    """
+    index: Any
+    if index_type == "Flat":
+        # Exact search, slower but accurate
+        index = faiss.IndexFlatL2(dimension)
+
+    elif index_type == "HNSW":
+        # Hierarchical Navigable Small World, very fast
+        index = faiss.IndexHNSWFlat(dimension, hnsw_m)
+
+    elif index_type == "IVF":
+        # Inverted file index, faster for large datasets
+        quantizer = faiss.IndexFlatL2(dimension)
+        index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+
+    elif index_type == "IVFPQ":
+        pq_m = pq_m or default_pq_m(dimension)
+        if dimension % pq_m:
+            raise ValueError(f"pq_m ({pq_m}) must divide the dimension ({dimension})")
+        quantizer = faiss.IndexFlatL2(dimension)
+        index = faiss.IndexIVFPQ(quantizer, dimension, nlist, pq_m, 8)
+
+    elif index_type == "IVFSQ":
+        quantizer = faiss.IndexFlatL2(dimension)
+        index = faiss.IndexIVFScalarQuantizer(
+            quantizer, dimension, nlist, faiss.ScalarQuantizer.QT_8bit
+        )
+
+    else:
+        raise ValueError(f"Unknown index type: {index_type}. Use one of: {', '.join(INDEX_TYPES)}")
+
+    if needs_training(index_type):
+        # IVF lists store the IDs natively
+        return index
+    return faiss.IndexIDMap2(index)
+
+
+def inner_index(index: Any) -> Any:
+    """The index doing the search, unwrapped from IndexIDMap2 if wrapped"""
+    return faiss.downcast_index(index.index) if hasattr(index, "id_map") else index
+
+
+def index_ids(index: Any) -> "np.ndarray":
+    """
+    IDs of all vectors in an index from create_index
+
+    Args:
+        index: ID-mapped or IVF index
+
+    Returns:
+        int64 array of the stored IDs
+    """
+    if hasattr(index, "id_map"):
+        return faiss.vector_to_array(index.id_map)
+
+    inner = inner_index(index)
+    invlists = inner.invlists
+    ids = [
+        faiss.rev_swig_ptr(invlists.get_ids(i), invlists.list_size(i)).copy()
+        for i in range(inner.nlist)
+        if invlists.list_size(i)
+    ]
+    return np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+
+
+def configure_search(index, nprobe: Optional[int] = None, ef_search: Optional[int] = None) -> None:
+    """
+    Set search-time parameters where the index supports them
+
+    Args:
+        index: FAISS index (ID-mapped or not)
+        nprobe: IVF lists visited per query (higher = better recall, slower)
+        ef_search: HNSW candidate list size (higher = better recall, slower)
+    """
+    inner = inner_index(index)
+
+    if nprobe is not None and hasattr(inner, "nprobe"):
+        inner.nprobe = min(nprobe, inner.nlist)
+    if ef_search is not None and hasattr(inner, "hnsw"):
+        inner.hnsw.efSearch = ef_search
+
+
+def filtered_search_parameters(
+    index,
+    ids: "np.ndarray",
+    nprobe: Optional[int] = None,
+    ef_search: Optional[int] = None,
+    exclude: bool = False,
+):
+    """
+    Search parameters restricting a search to the given IDs
+
+    Args:
+        index: Index from create_index that will be searched
+        ids: Allowed IDs (excluded IDs if exclude=True)
+        nprobe: IVF lists visited per query
+        ef_search: HNSW candidate list size
+        exclude: Search every ID except the given ones
+
+    Returns:
+        SearchParameters of the type the inner index expects
+    """
+    batch = faiss.IDSelectorBatch(np.ascontiguousarray(ids, dtype=np.int64))
+    selector = faiss.IDSelectorNot(batch) if exclude else batch
+    inner = inner_index(index)
+
+    # FAISS's bundled stubs predate the keyword arguments of SearchParameters
+    # and lack SearchParametersHNSW
+    swig: Any = faiss
+    params: Any
+    if isinstance(inner, faiss.IndexIVF):
+        params = swig.SearchParametersIVF(sel=selector, nprobe=min(nprobe or 1, inner.nlist))
+    elif isinstance(inner, faiss.IndexHNSW):
+        params = swig.SearchParametersHNSW(sel=selector, efSearch=ef_search or 16)
+    else:
+        params = swig.SearchParameters(sel=selector)
+
+    # Keep the selectors alive as long as the parameters
+    params.selector_ref = (selector, batch)
+    return params
+
+
+def exact_search(queries: "np.ndarray", vectors: "np.ndarray", ids: "np.ndarray", k: int):
+    """
+    Brute-force L2 search over a small candidate set
+
+    Args:
+        queries: Query vector or matrix (one query per row)
+        vectors: Candidate vectors, one row per ID
+        ids: Candidate IDs
+        k: Number of results per query
+
+    Returns:
+        (distances, ids) shaped like index.search output
+    """
+    queries = np.asarray(queries, dtype=np.float32).reshape(-1, vectors.shape[1])
+    vectors = np.asarray(vectors, dtype=np.float32)
+    distances = (
+        (queries**2).sum(axis=1)[:, None]
+        - 2.0 * queries @ vectors.T
+        + (vectors**2).sum(axis=1)[None, :]
+    )
+    np.maximum(distances, 0.0, out=distances)
+
+    k = min(k, len(ids))
+    if k < len(ids):
+        top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    else:
+        top = np.broadcast_to(np.arange(len(ids)), distances.shape)
+    order = np.argsort(np.take_along_axis(distances, top, axis=1), axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    return np.take_along_axis(distances, top, axis=1), np.asarray(ids)[top]
+
+
+def training_rows(index, rows: Sequence[int], seed: int = 1234) -> "np.ndarray":
+    """
+    Sample the rows an index is trained on
+
+    Callers fetch only the sampled vectors instead of the whole store.
+
+    Args:
+        index: Untrained index from create_index
+        rows: Candidate rows
+        seed: Sampling seed
+
+    Returns:
+        Sorted subset of rows (all of them if there are few)
+    """
+    candidates = np.asarray(rows, dtype=np.int64)
+    inner = inner_index(index)
+    max_points = getattr(inner, "nlist", 1) * MAX_TRAIN_POINTS_PER_LIST
+
+    if len(candidates) > max_points:
+        rng = np.random.default_rng(seed)
+        return np.sort(rng.choice(candidates, max_points, replace=False))
+    return candidates
+
+
+def train_index(index, vectors: "np.ndarray", seed: int = 1234) -> None:
+    """
+    Train an empty index on a sample of vectors
+
+    Args:
+        index: Untrained index from create_index
+        vectors: Candidate training vectors (sampled if there are many)
+        seed: Sampling seed
+    """
+    sample = training_rows(index, range(len(vectors)), seed)
+    if len(sample) < len(vectors):
+        vectors = vectors[sample]
+
+    index.train(np.ascontiguousarray(vectors, dtype=np.float32))
+
+
+def index_size_bytes(index) -> int:
+    """Serialized size of an index"""
+    return int(faiss.serialize_index(index).size)
+
+
+def benchmark_index_configs(
+    vectors: "np.ndarray",
+    configs: List[Dict[str, Any]],
+    queries: Optional["np.ndarray"] = None,
+    num_queries: int = 100,
+    top_k: int = 10,
+    seed: int = 1234,
+) -> List[Dict[str, Any]]:
+    """
+    Measure recall and latency of index configurations on a corpus
+
+    Recall@top_k is measured against exact (Flat) search.
+
+    Args:
+        vectors: Corpus vectors
+        configs: Index configurations, e.g.
+            [{"index_type": "IVF", "nlist": 256, "nprobe": 8},
+             {"index_type": "HNSW", "ef_search": 64}]
+        queries: Query vectors (default: sample of the corpus)
+        num_queries: Queries sampled from the corpus when queries is None
+        top_k: Neighbors per query
+        seed: Sampling seed
+
+    Returns:
+        One result per config with recall, query latency, build time and size
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    dimension = vectors.shape[1]
+    top_k = min(top_k, len(vectors))
+
+    if queries is None:
+        rng = np.random.default_rng(seed)
+        picks = rng.choice(len(vectors), min(num_queries, len(vectors)), replace=False)
+        queries = vectors[picks]
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+
+    exact = faiss.IndexFlatL2(dimension)
+    exact.add(vectors)
+    _, truth = exact.search(queries, top_k)
+
+    ids = np.arange(len(vectors), dtype=np.int64)
+    results = []
+    for config in configs:
+        params = dict(config)
+        nprobe = params.pop("nprobe", None)
+        ef_search = params.pop("ef_search", None)
+        index_type = params.get("index_type", "Flat")
+
+        start = time.perf_counter()
+        index = create_index(dimension, **params)
+        if needs_training(index_type):
+            train_index(index, vectors, seed=seed)
+        index.add_with_ids(vectors, ids)
+        build_seconds = time.perf_counter() - start
+
+        configure_search(index, nprobe=nprobe, ef_search=ef_search)
+
+        # One query at a time, as memories search
+        start = time.perf_counter()
+        found = np.vstack([index.search(query.reshape(1, -1), top_k)[1] for query in queries])
+        latency_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        hits = sum(len(set(f) & set(t)) for f, t in zip(found.tolist(), truth.tolist()))
+        results.append(
+            {
+                "config": dict(config),
+                "recall": hits / (len(queries) * top_k),
+                "latency_ms": latency_ms,
+                "build_seconds": build_seconds,
+                "size_bytes": index_size_bytes(index),
+            }
+        )
+
+    return results
@@ -15,10 +15,18 @@ from react_agent_framework.core.memory.knowledge.base import (
     BaseKnowledgeMemory,
     KnowledgeDocument,
 )
+from react_agent_framework.core.memory.knowledge.ingestion import (
+    Deduplicator,
+    IngestionPipeline,
+    TextChunker,
+)
 
 __all__ = [
     "BaseKnowledgeMemory",
     "KnowledgeDocument",
+    "IngestionPipeline",
+    "TextChunker",
+    "Deduplicator",
 ]
 
 # Optional imports for vector databases
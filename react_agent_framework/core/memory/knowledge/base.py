@@ -9,12 +9,22 @@ Knowledge memory stores documents and enables semantic search for:
 This is different from chat memory, which stores conversation history sequentially.
 """
 
+import hashlib
+import json
+import os
+import uuid
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Deque, Iterable, Tuple
 
+from react_agent_framework._compat import dataclass_slots
+from react_agent_framework.core.memory.knowledge import ingestion as chunking
 
+
+@dataclass_slots
 @dataclass
 class KnowledgeDocument:
     """
@@ -76,6 +86,7 @@ class BaseKnowledgeMemory(ABC):
         self,
         collection_name: str = "knowledge",
         max_documents: Optional[int] = None,
+        ingestion: Optional[chunking.IngestionPipeline] = None,
     ):
         """
         Initialize knowledge memory
@@ -83,9 +94,12 @@ class BaseKnowledgeMemory(ABC):
         Args:
             collection_name: Name for the knowledge collection
             max_documents: Maximum number of documents to store (None = unlimited)
+            ingestion: Optional chunking/dedup stage applied before embedding;
+                documents are then stored as chunks (see expand)
         """
         self.collection_name = collection_name
         self.max_documents = max_documents
+        self.ingestion = ingestion
 
     @abstractmethod
     def add_document(
@@ -177,27 +191,265 @@ class BaseKnowledgeMemory(ABC):
         self,
         documents: List[str],
         metadata_list: Optional[List[Dict[str, Any]]] = None,
+        doc_ids: Optional[List[str]] = None,
+        batch_size: int = 100,
+        max_workers: int = 1,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        checkpoint_file: Optional[str] = None,
     ) -> List[str]:
         """
         Add multiple documents at once
 
+        Documents are processed in batches: each batch is embedded in one call
+        (up to max_workers batches concurrently) and written in one call.
+        Backends without a bulk path fall back to add_document.
+
         Args:
             documents: List of document contents
             metadata_list: Optional list of metadata dicts (same length as documents)
+            doc_ids: Optional list of document IDs (same length as documents)
+            batch_size: Documents per embedding/write batch
+            max_workers: Batches embedded concurrently
+            progress_callback: Called as progress_callback(done, total) after each batch
+            checkpoint_file: Records progress so an interrupted load can be resumed
+                by calling again with the same documents and checkpoint_file
 
         Returns:
-            List of document IDs
+            List of document IDs, one per document. With an ingestion pipeline
+            these are parent IDs; a document that was empty or whose chunks
+            were all dropped as duplicates keeps its ID, but nothing is stored
+            under it (get_document returns None)
         """
         if metadata_list and len(metadata_list) != len(documents):
             raise ValueError("metadata_list must have same length as documents")
+        if doc_ids and len(doc_ids) != len(documents):
+            raise ValueError("doc_ids must have same length as documents")
+
+        if self.ingestion is not None:
+            return self._ingest_chunks(
+                self.ingestion,
+                documents,
+                metadata_list,
+                doc_ids,
+                batch_size=batch_size,
+                max_workers=max_workers,
+                progress_callback=progress_callback,
+                checkpoint_file=checkpoint_file,
+            )
+
+        return self._write_documents(
+            documents,
+            metadata_list,
+            doc_ids,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            progress_callback=progress_callback,
+            checkpoint_file=checkpoint_file,
+        )
+
+    def _ingest_chunks(
+        self,
+        ingestion: chunking.IngestionPipeline,
+        documents: List[str],
+        metadata_list: Optional[List[Dict[str, Any]]],
+        doc_ids: Optional[List[str]],
+        **write_options: Any,
+    ) -> List[str]:
+        """Chunk and deduplicate documents, then write the chunks"""
+        checkpoint_file = write_options.get("checkpoint_file")
+        source = self._ingest_fingerprint(documents, doc_ids) if checkpoint_file else None
+        # A checkpoint of this input means its chunks were already replaced and
+        # partly written; deleting them again would lose the completed batches
+        resuming = bool(
+            checkpoint_file
+            and self._load_ingest_checkpoint(checkpoint_file).get("source") == source
+        )
 
-        doc_ids = []
-        for i, content in enumerate(documents):
-            metadata = metadata_list[i] if metadata_list else None
-            doc_id = self.add_document(content, metadata=metadata)
-            doc_ids.append(doc_id)
+        if doc_ids:
+            if not resuming:
+                # Replace previous versions of these documents
+                for parent_id in doc_ids:
+                    self.delete(filters={chunking.PARENT_ID_KEY: parent_id})
+        elif checkpoint_file:
+            # Same deterministic IDs as _write_documents, so resumed loads match
+            fingerprint = self._ingest_fingerprint(documents, None)
+            doc_ids = [
+                str(uuid.uuid5(uuid.NAMESPACE_OID, f"{fingerprint}:{i}"))
+                for i in range(len(documents))
+            ]
+        else:
+            doc_ids = [str(uuid.uuid4()) for _ in documents]
+
+        if not ingestion.seeded:
+            ingestion.seed(self._stored_documents())
+
+        contents, metadatas, chunk_ids = ingestion.process(
+            documents,
+            [(metadata_list[i] if metadata_list else None) or {} for i in range(len(documents))],
+            doc_ids,
+            exists=lambda item_id: self.get_document(item_id) is not None,
+        )
+        if checkpoint_file and not resuming:
+            # Old versions are gone: start over, and resume from here from now on
+            self._write_ingest_checkpoint(
+                checkpoint_file, self._ingest_fingerprint(contents, chunk_ids), 0, source
+            )
+        self._write_documents(
+            contents, metadatas, chunk_ids, checkpoint_source=source, **write_options
+        )
+        return list(doc_ids)
 
-        return doc_ids
+    def _write_documents(
+        self,
+        documents: List[str],
+        metadata_list: Optional[List[Dict[str, Any]]],
+        doc_ids: Optional[List[str]],
+        batch_size: int = 100,
+        max_workers: int = 1,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        checkpoint_file: Optional[str] = None,
+        checkpoint_source: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Embed and write documents in batches (see add_documents)
+
+        checkpoint_source identifies the input the documents were derived
+        from (the chunked documents) and is kept in the checkpoint.
+        """
+        total = len(documents)
+        start = 0
+
+        if checkpoint_file:
+            fingerprint = self._ingest_fingerprint(documents, doc_ids)
+            start = self._read_ingest_checkpoint(checkpoint_file, fingerprint)
+            if not doc_ids:
+                # Deterministic IDs so a resumed load returns the same IDs
+                doc_ids = [
+                    str(uuid.uuid5(uuid.NAMESPACE_OID, f"{fingerprint}:{i}")) for i in range(total)
+                ]
+
+        if not doc_ids:
+            doc_ids = [str(uuid.uuid4()) for _ in range(total)]
+
+        batches = [(i, min(i + batch_size, total)) for i in range(start, total, max(batch_size, 1))]
+
+        def write(batch_start: int, batch_end: int, embeddings: Future) -> None:
+            self._add_batch(
+                documents[batch_start:batch_end],
+                [
+                    (metadata_list[i] if metadata_list else None) or {}
+                    for i in range(batch_start, batch_end)
+                ],
+                doc_ids[batch_start:batch_end],
+                embeddings.result(),
+            )
+
+            if checkpoint_file:
+                self._write_ingest_checkpoint(
+                    checkpoint_file, fingerprint, batch_end, checkpoint_source
+                )
+            if progress_callback:
+                progress_callback(batch_end, total)
+
+        max_workers = max(max_workers, 1)
+        pending: Deque[Tuple[int, int, Future]] = deque()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # Embeddings run up to max_workers batches ahead; writes happen in order here
+            for batch_start, batch_end in batches:
+                future = pool.submit(self._embed_batch, documents[batch_start:batch_end])
+                pending.append((batch_start, batch_end, future))
+                if len(pending) > max_workers:
+                    write(*pending.popleft())
+
+            while pending:
+                write(*pending.popleft())
+
+        self._finish_batches()
+
+        if checkpoint_file and os.path.exists(checkpoint_file):
+            os.remove(checkpoint_file)
+
+        return list(doc_ids)
+
+    def _embed_batch(self, contents: List[str]) -> Any:
+        """
+        Embed a batch of documents (hook for bulk add_documents)
+
+        Runs on worker threads. Returns None by default, for backends that
+        embed inside _add_batch.
+        """
+        return None
+
+    def _add_batch(
+        self,
+        contents: List[str],
+        metadatas: List[Dict[str, Any]],
+        doc_ids: List[str],
+        embeddings: Any,
+    ) -> None:
+        """
+        Write a batch of documents (hook for bulk add_documents)
+
+        Existing documents with the same IDs are replaced, so replaying a
+        batch after an interruption is safe. Default adds one by one.
+        """
+        for content, metadata, doc_id in zip(contents, metadatas, doc_ids):
+            self.add_document(content, metadata=metadata, doc_id=doc_id)
+
+    def _finish_batches(self) -> None:
+        """Called once after bulk add_documents (e.g. to persist or trim)"""
+        pass
+
+    def _stored_documents(self) -> Iterable[Tuple[str, str]]:
+        """
+        Stored (doc_id, content) pairs, used to seed deduplication
+
+        Returns nothing by default; override so duplicates of documents
+        stored before a restart are detected.
+        """
+        return ()
+
+    def _ingest_fingerprint(self, documents: List[str], doc_ids: Optional[List[str]]) -> str:
+        """Identify an input set so a checkpoint isn't applied to different input"""
+        digest = hashlib.sha256(str(len(documents)).encode())
+        for content in documents:
+            digest.update(hashlib.sha256(content.encode()).digest())
+        for doc_id in doc_ids or []:
+            digest.update(doc_id.encode() + b"\0")
+        return digest.hexdigest()
+
+    def _load_ingest_checkpoint(self, checkpoint_file: str) -> Dict[str, Any]:
+        """Contents of a checkpoint file (empty if missing or unreadable)"""
+        try:
+            with open(checkpoint_file, "r") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return checkpoint if isinstance(checkpoint, dict) else {}
+
+    def _read_ingest_checkpoint(self, checkpoint_file: str, fingerprint: str) -> int:
+        """Number of documents already added by an interrupted load"""
+        checkpoint = self._load_ingest_checkpoint(checkpoint_file)
+        if checkpoint.get("fingerprint") != fingerprint:
+            return 0
+        return int(checkpoint.get("completed", 0))
+
+    def _write_ingest_checkpoint(
+        self,
+        checkpoint_file: str,
+        fingerprint: str,
+        completed: int,
+        source: Optional[str] = None,
+    ) -> None:
+        """Atomically record ingestion progress"""
+        checkpoint: Dict[str, Any] = {"fingerprint": fingerprint, "completed": completed}
+        if source is not None:
+            checkpoint["source"] = source
+        tmp_file = f"{checkpoint_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_file, checkpoint_file)
 
     def search_with_scores(
         self,
@@ -222,3 +474,73 @@ class BaseKnowledgeMemory(ABC):
         """
         documents = self.search(query, top_k, filters)
         return [(doc, 1.0) for doc in documents]
+
+    def search_many(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[KnowledgeDocument]]:
+        """
+        Search several queries at once (e.g. sub-questions of a plan)
+
+        Args:
+            queries: Search queries
+            top_k: Number of results per query
+            filters: Metadata filters applied to every query
+
+        Returns:
+            Most relevant documents for each query, in query order
+
+        Note:
+            Default implementation searches one query at a time.
+            Override in subclasses to batch embedding and index work.
+        """
+        return [self.search(query, top_k, filters) for query in queries]
+
+    def expand(self, document: KnowledgeDocument) -> KnowledgeDocument:
+        """
+        Reassemble the parent document of a chunk returned by search
+
+        Chunks are stitched by their character offsets, so overlaps appear
+        once. Chunks dropped as duplicates of other documents are elided
+        ("..."). Documents that aren't chunks are returned unchanged.
+
+        Args:
+            document: Chunk from search
+
+        Returns:
+            Parent document (doc_id = parent ID, chunk metadata removed)
+        """
+        parent_id = document.metadata.get(chunking.PARENT_ID_KEY)
+        if parent_id is None:
+            return document
+
+        count = int(document.metadata.get(chunking.CHUNK_COUNT_KEY, 1))
+        chunks = [
+            chunk
+            for chunk in (self.get_document(chunking.chunk_id(parent_id, i)) for i in range(count))
+            if chunk is not None
+        ]
+        chunks.sort(key=lambda chunk: int(chunk.metadata[chunking.CHUNK_START_KEY]))
+
+        parts = []
+        position = 0
+        for chunk in chunks:
+            start = int(chunk.metadata[chunking.CHUNK_START_KEY])
+            end = int(chunk.metadata[chunking.CHUNK_END_KEY])
+            if start > position:
+                parts.append(" ... ")
+            if end > position:
+                parts.append(chunk.content[max(position - start, 0) :])
+                position = end
+
+        metadata = {
+            key: value for key, value in document.metadata.items() if key not in chunking.CHUNK_KEYS
+        }
+        return KnowledgeDocument(
+            content="".join(parts),
+            doc_id=parent_id,
+            timestamp=chunks[0].timestamp if chunks else document.timestamp,
+            metadata=metadata,
+        )
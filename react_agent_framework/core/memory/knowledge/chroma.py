@@ -3,7 +3,7 @@ ChromaDB knowledge memory implementation for RAG and semantic search
 """
 
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional, TYPE_CHECKING
 from datetime import datetime
 
 try:
@@ -15,10 +15,25 @@ try:
 except ImportError:
     CHROMA_AVAILABLE = False
 
+from react_agent_framework.core.memory.bm25 import BM25Index, reciprocal_rank_fusion
+from react_agent_framework.core.memory.embedding_cache import cached_embedding_function
 from react_agent_framework.core.memory.knowledge.base import (
     BaseKnowledgeMemory,
     KnowledgeDocument,
 )
+from react_agent_framework.core.memory.knowledge.ingestion import (
+    PARENT_ID_KEY,
+    IngestionPipeline,
+)
+
+if TYPE_CHECKING:
+    from react_agent_framework.core.memory.embedding_cache import EmbeddingCache
+
+# Documents read per collection page when scanning stored documents
+_PAGE_SIZE = 1000
+
+# BM25 candidates fetched per wanted result when a filter is post-applied
+_FILTER_OVERSAMPLE = 4
 
 
 class ChromaKnowledgeMemory(BaseKnowledgeMemory):
@@ -29,6 +44,7 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
     - Semantic search using vector embeddings
     - Persistent storage
     - Metadata filtering
+    - Optional hybrid BM25 + vector search (reciprocal rank fusion)
     - Multiple embedding functions (OpenAI, sentence-transformers, etc)
 
     Perfect for:
@@ -45,6 +61,10 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
         embedding_model: Optional[str] = None,
         max_documents: Optional[int] = None,
         api_key: Optional[str] = None,
+        hybrid_search: bool = False,
+        rrf_k: int = 60,
+        ingestion: Optional[IngestionPipeline] = None,
+        embedding_cache: Optional["EmbeddingCache"] = None,
     ):
         """
         Initialize ChromaDB knowledge memory
@@ -56,13 +76,20 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
             embedding_model: Model name for embeddings
             max_documents: Maximum documents to store
             api_key: API key for OpenAI embeddings
+            hybrid_search: Fuse BM25 keyword ranking with vector ranking in
+                search (better for error codes, identifiers and rare terms)
+            rrf_k: Reciprocal rank fusion constant for hybrid search
+            ingestion: Optional chunking/dedup stage applied before embedding
+            embedding_cache: Cache consulted before calling the embedding function
         """
         if not CHROMA_AVAILABLE:
             raise ImportError(
                 "ChromaDB not installed. Install with: pip install react-agent-framework[knowledge-chroma]"
             )
 
-        super().__init__(collection_name=collection_name, max_documents=max_documents)
+        super().__init__(
+            collection_name=collection_name, max_documents=max_documents, ingestion=ingestion
+        )
 
         self.persist_directory = persist_directory
 
@@ -76,6 +103,10 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
         self.embedding_fn = self._get_embedding_function(
             embedding_function, embedding_model, api_key
         )
+        if embedding_cache is not None:
+            self.embedding_fn = cached_embedding_function(
+                self.embedding_fn, embedding_cache, f"{embedding_function}:{embedding_model or ''}"
+            )
 
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
@@ -84,9 +115,16 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
             metadata={"description": "Knowledge base for RAG", "type": "knowledge"},
         )
 
-    def _get_embedding_function(
-        self, func_type: str, model: Optional[str], api_key: Optional[str]
-    ):
+        # Keyword index over document content (hybrid search only), rebuilt
+        # page by page from the persisted collection and kept in sync on writes
+        self.rrf_k = rrf_k
+        self.bm25: Optional[BM25Index[str]] = None
+        if hybrid_search:
+            self.bm25 = BM25Index[str]()
+            for doc_id, content in self._stored_documents():
+                self.bm25.add(doc_id, content)
+
+    def _get_embedding_function(self, func_type: str, model: Optional[str], api_key: Optional[str]):
         """Get embedding function based on type"""
         if func_type == "openai":
             if not api_key:
@@ -114,7 +152,10 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
         metadata: Optional[Dict[str, Any]] = None,
         doc_id: Optional[str] = None,
     ) -> str:
-        """Add document to knowledge base"""
+        """Add document to knowledge base (as chunks if an ingestion pipeline is set)"""
+        if self.ingestion is not None:
+            return self.add_documents([content], [metadata or {}], [doc_id] if doc_id else None)[0]
+
         if not doc_id:
             doc_id = str(uuid.uuid4())
 
@@ -130,6 +171,8 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
             documents=[content],
             metadatas=[chroma_metadata],
         )
+        if self.bm25 is not None:
+            self.bm25.add(doc_id, content)
 
         # Check max_documents limit
         if self.max_documents:
@@ -139,6 +182,53 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
 
         return doc_id
 
+    def _embed_batch(self, contents: List[str]) -> List[Any]:
+        """Embed a batch for bulk add_documents"""
+        return list(self.embedding_fn(contents))
+
+    def _add_batch(
+        self,
+        contents: List[str],
+        metadatas: List[Dict[str, Any]],
+        doc_ids: List[str],
+        embeddings: List[Any],
+    ) -> None:
+        """Write a batch with pre-computed embeddings (upsert, so replays are safe)"""
+        timestamp = datetime.now().isoformat()
+        chroma_metadatas = [{"timestamp": timestamp, **metadata} for metadata in metadatas]
+
+        # Chroma rejects writes larger than its max batch size
+        max_batch = getattr(self.client, "get_max_batch_size", lambda: len(doc_ids))()
+        for start in range(0, len(doc_ids), max(max_batch, 1)):
+            end = start + max_batch
+            self.collection.upsert(
+                ids=doc_ids[start:end],
+                documents=contents[start:end],
+                metadatas=chroma_metadatas[start:end],
+                embeddings=embeddings[start:end],
+            )
+
+        if self.bm25 is not None:
+            for doc_id, content in zip(doc_ids, contents):
+                self.bm25.add(doc_id, content)
+
+    def _finish_batches(self) -> None:
+        """Trim to max_documents once after a bulk load"""
+        if self.max_documents:
+            count = self.collection.count()
+            if count > self.max_documents:
+                self._remove_oldest(count - self.max_documents)
+
+    def _stored_documents(self) -> Iterable[tuple[str, str]]:
+        """Stored (doc_id, content) pairs, read page by page from the collection"""
+        offset = 0
+        while True:
+            page = self.collection.get(include=["documents"], limit=_PAGE_SIZE, offset=offset)
+            yield from zip(page["ids"], page["documents"] or [])
+            if len(page["ids"]) < _PAGE_SIZE:
+                return
+            offset += _PAGE_SIZE
+
     def search(
         self,
         query: str,
@@ -156,6 +246,9 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
         Returns:
             Most similar documents
         """
+        if self.bm25 is not None:
+            return [doc for doc, _ in self.search_with_scores(query, top_k, filters)]
+
         # Build where filter
         where_filter = filters or {}
 
@@ -189,6 +282,57 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
 
         return documents
 
+    def search_many(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[KnowledgeDocument]]:
+        """
+        Search several queries with one collection query
+
+        Args:
+            queries: Search queries
+            top_k: Number of results per query
+            filters: Metadata filters applied to every query
+
+        Returns:
+            Most similar documents for each query, in query order
+        """
+        if not queries:
+            return []
+        if self.bm25 is not None:
+            return [self.search(query, top_k, filters) for query in queries]
+
+        # Chroma embeds all query texts in one call
+        results = self.collection.query(
+            query_texts=queries,
+            n_results=top_k,
+            where=filters or None,
+        )
+
+        all_documents = []
+        for i in range(len(queries)):
+            documents = []
+            for doc_id, content, metadata in zip(
+                results["ids"][i], results["documents"][i], results["metadatas"][i]
+            ):
+                timestamp_str = metadata.pop("timestamp", None)
+                timestamp = (
+                    datetime.fromisoformat(timestamp_str) if timestamp_str else datetime.now()
+                )
+                documents.append(
+                    KnowledgeDocument(
+                        content=content,
+                        doc_id=doc_id,
+                        timestamp=timestamp,
+                        metadata=metadata,
+                    )
+                )
+            all_documents.append(documents)
+
+        return all_documents
+
     def delete(
         self,
         doc_id: Optional[str] = None,
@@ -198,15 +342,22 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
         Delete documents
 
         Args:
-            doc_id: Delete specific document by ID
+            doc_id: Delete specific document by ID (a chunked document's
+                parent ID deletes all its chunks)
             filters: Delete documents matching filters
 
         Returns:
             Number of documents deleted
         """
         if doc_id:
+            if not self.collection.get(ids=[doc_id], include=[])["ids"]:
+                # Chunked documents are stored as their chunks only
+                return self.delete(filters={PARENT_ID_KEY: doc_id})
+
             # Delete specific document
             self.collection.delete(ids=[doc_id])
+            if self.bm25 is not None:
+                self.bm25.remove(doc_id)
             return 1
 
         if filters:
@@ -214,15 +365,21 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
             results = self.collection.get(where=filters)
             if results["ids"]:
                 self.collection.delete(ids=results["ids"])
+                if self.bm25 is not None:
+                    for deleted_id in results["ids"]:
+                        self.bm25.remove(deleted_id)
                 return len(results["ids"])
 
         return 0
 
     def get_document(self, doc_id: str) -> Optional[KnowledgeDocument]:
-        """Get document by ID"""
+        """Get document by ID (a chunked document's parent ID returns it expanded)"""
         results = self.collection.get(ids=[doc_id])
 
         if not results["ids"]:
+            chunk_ids = self.collection.get(where={PARENT_ID_KEY: doc_id}, limit=1, include=[])
+            if chunk_ids["ids"]:
+                return self.expand(self.get_document(chunk_ids["ids"][0]))
             return None
 
         content = results["documents"][0]
@@ -247,6 +404,8 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
             embedding_function=self.embedding_fn,
             metadata={"description": "Knowledge base for RAG", "type": "knowledge"},
         )
+        if self.bm25 is not None:
+            self.bm25.clear()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get knowledge base statistics"""
@@ -257,6 +416,7 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
             "collection_name": self.collection_name,
             "max_documents": self.max_documents,
             "persist_directory": self.persist_directory,
+            "hybrid_search": self.bm25 is not None,
         }
 
     def search_with_scores(
@@ -274,8 +434,12 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
             filters: Metadata filters
 
         Returns:
-            List of (document, distance) tuples
+            List of (document, distance) tuples, or (document, fused score)
+            tuples (higher is better) when hybrid_search is enabled
         """
+        if self.bm25 is not None:
+            return self._search_hybrid(self.bm25, query, top_k, filters)
+
         where_filter = filters or {}
 
         results = self.collection.query(
@@ -307,6 +471,59 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
 
         return documents_with_scores
 
+    def _search_hybrid(
+        self,
+        bm25: BM25Index[str],
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[tuple[KnowledgeDocument, float]]:
+        """Fuse vector and BM25 rankings of a deeper candidate list"""
+        num_candidates = max(top_k * 4, 20)
+
+        vector_results = self.collection.query(
+            query_texts=[query],
+            n_results=num_candidates,
+            where=filters or None,
+        )
+        vector_ranking = vector_results["ids"][0] if vector_results["ids"] else []
+
+        if filters:
+            # Post-filter a deeper BM25 list by ID rather than resolving the
+            # filter over the whole collection
+            keyword_candidates = [
+                doc_id for doc_id, _ in bm25.search(query, num_candidates * _FILTER_OVERSAMPLE)
+            ]
+            allowed = set()
+            if keyword_candidates:
+                allowed = set(
+                    self.collection.get(ids=keyword_candidates, where=filters, include=[])["ids"]
+                )
+            keyword_ranking = [doc_id for doc_id in keyword_candidates if doc_id in allowed]
+            keyword_ranking = keyword_ranking[:num_candidates]
+        else:
+            keyword_ranking = [doc_id for doc_id, _ in bm25.search(query, num_candidates)]
+
+        fused = reciprocal_rank_fusion([vector_ranking, keyword_ranking], k=self.rrf_k)[:top_k]
+        if not fused:
+            return []
+
+        # Fetch the winners in one round trip
+        found = self.collection.get(ids=[doc_id for doc_id, _ in fused])
+        documents = {}
+        for doc_id, content, metadata in zip(found["ids"], found["documents"], found["metadatas"]):
+            timestamp_str = metadata.pop("timestamp", None)
+            documents[doc_id] = KnowledgeDocument(
+                content=content,
+                doc_id=doc_id,
+                timestamp=(
+                    datetime.fromisoformat(timestamp_str) if timestamp_str else datetime.now()
+                ),
+                metadata=metadata,
+            )
+
+        return [(documents[doc_id], score) for doc_id, score in fused if doc_id in documents]
+
     def _remove_oldest(self, n: int) -> None:
         """Remove n oldest documents"""
         results = self.collection.get()
@@ -322,6 +539,9 @@ class ChromaKnowledgeMemory(BaseKnowledgeMemory):
         ids_to_delete = [item[0] for item in items[:n]]
         if ids_to_delete:
             self.collection.delete(ids=ids_to_delete)
+            if self.bm25 is not None:
+                for doc_id in ids_to_delete:
+                    self.bm25.remove(doc_id)
 
     def delete_collection(self) -> None:
         """Delete entire collection (use with caution!)"""
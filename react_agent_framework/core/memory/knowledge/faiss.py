@@ -4,12 +4,25 @@ FAISS knowledge memory implementation for high-performance RAG
 
 import json
 import uuid
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from typing import (
+    Callable,
+    Iterable,
+    List,
+    Dict,
+    Any,
+    Optional,
+    Set,
+    TYPE_CHECKING,
+    cast,
+)
 
 if TYPE_CHECKING:
     import numpy as np
 
+    from react_agent_framework.core.memory.embedding_cache import EmbeddingCache
+
 try:
     import faiss
     import numpy as np
@@ -17,13 +30,30 @@ try:
     FAISS_AVAILABLE = True
 except ImportError:
     FAISS_AVAILABLE = False
-    faiss = None
+    faiss = None  # type: ignore
     np = None  # type: ignore
 
 from react_agent_framework.core.memory.knowledge.base import (
     BaseKnowledgeMemory,
     KnowledgeDocument,
 )
+from react_agent_framework.core.memory.knowledge.ingestion import (
+    PARENT_ID_KEY,
+    IngestionPipeline,
+)
+from react_agent_framework.core.memory import faiss_index
+from react_agent_framework.core.memory import compact
+from react_agent_framework.core.memory.bm25 import BM25Index, reciprocal_rank_fusion
+from react_agent_framework.core.memory.metadata_index import MetadataIndex
+from react_agent_framework.core.memory.vector_store import VectorStore
+
+# Deleted HNSW vectors stay in the graph, excluded at search time, until they
+# exceed this fraction of the index; then the index is rebuilt
+_MAX_TOMBSTONE_FRACTION = 0.2
+
+# Default candidates per result re-scored from the stored vectors for
+# compressed (IVFPQ / IVFSQ) indexes
+_COMPRESSED_RERANK_FACTOR = 4
 
 
 class FAISSKnowledgeMemory(BaseKnowledgeMemory):
@@ -33,8 +63,14 @@ class FAISSKnowledgeMemory(BaseKnowledgeMemory):
     Features:
     - Very fast similarity search
     - Support for large-scale datasets
-    - Multiple index types (Flat, IVF, HNSW)
-    - Persistent storage
+    - Multiple index types (Flat, HNSW, IVF, IVFPQ, IVFSQ), IVF trained automatically
+    - Stable integer IDs (IndexIDMap2, native for IVF) for O(1) lookup and
+      in-place deletes
+      (HNSW deletes are tombstoned and compacted by periodic rebuilds)
+    - Exact metadata-filtered search (inverted index + FAISS IDSelector)
+    - Optional hybrid BM25 + vector search (reciprocal rank fusion)
+    - Append-only persistent storage (mmap'd vectors, SQLite metadata,
+      periodic index checkpoints)
 
     Perfect for:
     - Large-scale RAG applications
@@ -42,6 +78,9 @@ class FAISSKnowledgeMemory(BaseKnowledgeMemory):
     - Research and experimentation
     """
 
+    # Trained empty index for IVF types
+    TRAINED_FILE = "index.trained.faiss"
+
     def __init__(
         self,
         index_path: str = "./faiss_kb",
@@ -51,6 +90,19 @@ class FAISSKnowledgeMemory(BaseKnowledgeMemory):
         collection_name: str = "knowledge",
         max_documents: Optional[int] = None,
         api_key: Optional[str] = None,
+        checkpoint_interval: int = 1000,
+        nlist: int = 100,
+        nprobe: int = 8,
+        ef_search: int = 64,
+        pq_m: Optional[int] = None,
+        min_train_vectors: Optional[int] = None,
+        exact_filter_threshold: int = 20000,
+        hybrid_search: bool = False,
+        rrf_k: int = 60,
+        ingestion: Optional[IngestionPipeline] = None,
+        embedding_cache: Optional["EmbeddingCache"] = None,
+        vector_dtype: str = "float32",
+        rerank_factor: Optional[int] = None,
     ):
         """
         Initialize FAISS knowledge memory
@@ -58,18 +110,42 @@ class FAISSKnowledgeMemory(BaseKnowledgeMemory):
         Args:
             index_path: Directory to save index and metadata
             dimension: Embedding dimension (1536 for OpenAI, 384 for MiniLM)
-            index_type: FAISS index type ("Flat", "IVF", "HNSW")
+            index_type: FAISS index type ("Flat", "HNSW", "IVF", "IVFPQ", "IVFSQ")
             embedding_model: OpenAI embedding model
             collection_name: Name for the knowledge collection
             max_documents: Maximum documents to store
             api_key: OpenAI API key
+            checkpoint_interval: Changes between FAISS index checkpoints
+            nlist: Number of IVF lists
+            nprobe: IVF lists searched per query
+            ef_search: HNSW search candidate list size
+            pq_m: PQ sub-quantizers for IVFPQ (default: derived from dimension)
+            min_train_vectors: Documents needed before IVF types are trained
+                (default: 39 * nlist); until then search is exact
+            exact_filter_threshold: Filtered searches matching at most this many
+                documents are brute-forced over their stored vectors; larger
+                matches search the index restricted to the matching IDs
+            hybrid_search: Fuse BM25 keyword ranking with vector ranking in
+                search (better for error codes, identifiers and rare terms)
+            rrf_k: Reciprocal rank fusion constant for hybrid search
+            ingestion: Optional chunking/dedup stage applied before embedding
+            embedding_cache: Cache consulted before calling the embedding API
+            vector_dtype: Storage type of the persisted vectors ("float32",
+                "float16" or "int8" with a per-vector scale)
+            rerank_factor: Fetch top_k * rerank_factor index candidates and
+                re-score them exactly from the stored vectors (default: 4 for
+                the compressed "IVFPQ" / "IVFSQ" index types, 1 otherwise).
+                Other index types hold the full vectors, so re-scoring them
+                from a float16 / int8 store can make results worse
         """
         if not FAISS_AVAILABLE:
             raise ImportError(
                 "FAISS not installed. Install with: pip install react-agent-framework[knowledge-faiss]"
             )
 
-        super().__init__(collection_name=collection_name, max_documents=max_documents)
+        super().__init__(
+            collection_name=collection_name, max_documents=max_documents, ingestion=ingestion
+        )
 
         self.index_path = Path(index_path)
         self.index_path.mkdir(parents=True, exist_ok=True)
@@ -77,6 +153,25 @@ class FAISSKnowledgeMemory(BaseKnowledgeMemory):
         self.dimension = dimension
         self.index_type = index_type
         self.embedding_model = embedding_model
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.pq_m = pq_m
+        self.exact_filter_threshold = exact_filter_threshold
+        self.hybrid_search = hybrid_search
+        self.rrf_k = rrf_k
+        if rerank_factor is None:
+            rerank_factor = (
+                _COMPRESSED_RERANK_FACTOR if faiss_index.is_compressed(index_type) else 1
+            )
+        self.rerank_factor = max(rerank_factor, 1)
+        self.min_train_vectors = max(
+            min_train_vectors or faiss_index.min_train_vectors(index_type, nlist),
+            nlist,
+            256 if index_type == "IVFPQ" else 0,
+        )
+        # Trained empty index that IVF types are cloned from (None until trained)
+        self._trained_template: Optional[Any] = None
 
         # Initialize OpenAI client for embeddings
         if not api_key:
@@ -87,42 +182,89 @@ class FAISSKnowledgeMemory(BaseKnowledgeMemory):
         from openai import OpenAI
 
         self.openai_client = OpenAI(api_key=api_key)
+        self.embedding_cache = embedding_cache
 
         # Create or load FAISS index
         self.index = self._create_index()
 
-        # Store documents separately
+        # Store documents separately, in insertion order (oldest first)
         self.documents: Dict[str, KnowledgeDocument] = {}
 
+        # FAISS integer ID (row in the vector store) <-> document ID
+        self._id_to_doc: Dict[int, str] = {}
+        self._doc_to_id: Dict[str, int] = {}
+
+        # Deleted IDs still in an HNSW graph, and search parameters excluding them
+        self._tombstones: Set[int] = set()
+        self._tombstone_params = None
+
+        # Metadata key/value -> FAISS IDs, for pre-filtered search
+        self.metadata_index = MetadataIndex()
+
+        # Keyword index over document content (hybrid search only)
+        self.bm25: Optional[BM25Index[int]] = BM25Index() if hybrid_search else None
+
+        self.store = VectorStore(
+            str(self.index_path),
+            dimension,
+            checkpoint_interval=checkpoint_interval,
+            dtype=vector_dtype,
+        )
+
         # Load existing data if available
         self._load()
 
     def _create_index(self):
-        """Create FAISS index based on type"""
-        if self.index_type == "Flat":
-            # Exact search, slower but accurate
-            return faiss.IndexFlatL2(self.dimension)
+        """Create FAISS index based on type, storing our integer IDs"""
+        if self._trained_template is not None:
+            index = faiss.clone_index(self._trained_template)
+        elif faiss_index.needs_training(self.index_type):
+            # Exact search until there are enough vectors to train on
+            index = faiss_index.create_index(self.dimension, "Flat")
+        else:
+            index = faiss_index.create_index(
+                self.dimension, self.index_type, nlist=self.nlist, pq_m=self.pq_m
+            )
 
-        elif self.index_type == "IVF":
-            # Inverted file index, faster for large datasets
-            quantizer = faiss.IndexFlatL2(self.dimension)
-            return faiss.IndexIVFFlat(quantizer, self.dimension, 100)
+        faiss_index.configure_search(index, nprobe=self.nprobe, ef_search=self.ef_search)
+        return index
 
-        elif self.index_type == "HNSW":
-            # Hierarchical Navigable Small World, very fast
-            return faiss.IndexHNSWFlat(self.dimension, 32)
+    def _maybe_train(self) -> None:
+        """Train IVF index types once enough vectors are stored"""
+        if self._trained_template is not None or not faiss_index.needs_training(self.index_type):
+            return
+        if len(self._id_to_doc) < self.min_train_vectors:
+            return
 
-        else:
-            raise ValueError(f"Unknown index type: {self.index_type}")
+        template = faiss_index.create_index(
+            self.dimension, self.index_type, nlist=self.nlist, pq_m=self.pq_m
+        )
+        rows = faiss_index.training_rows(template, list(self._id_to_doc))
+        faiss_index.train_index(template, self.store.vectors(rows))
+        faiss.write_index(template, str(self.index_path / self.TRAINED_FILE))
+        self._trained_template = template
+
+        self._rebuild_index()
+        self._save()
 
     def _get_embedding(self, text: str) -> "np.ndarray":
         """Generate embedding for text using OpenAI"""
+        return cast("np.ndarray", self._get_embeddings([text])[0])
+
+    def _get_embeddings(self, texts: List[str]) -> "np.ndarray":
+        """Generate embeddings for several texts (cached ones are not requested)"""
+        if self.embedding_cache is not None:
+            return self.embedding_cache.embed(texts, self.embedding_model, self._request_embeddings)
+        return self._request_embeddings(texts)
+
+    def _request_embeddings(self, texts: List[str]) -> "np.ndarray":
+        """Generate embeddings for several texts in one OpenAI request"""
         response = self.openai_client.embeddings.create(
-            input=text,
+            input=texts,
             model=self.embedding_model,
         )
-        embedding = np.array(response.data[0].embedding, dtype=np.float32)
-        return embedding
+        data = sorted(response.data, key=lambda item: item.index)
+        return np.array([item.embedding for item in data], dtype=np.float32)
 
     def add_document(
         self,
@@ -130,36 +272,79 @@ class FAISSKnowledgeMemory(BaseKnowledgeMemory):
         metadata: Optional[Dict[str, Any]] = None,
         doc_id: Optional[str] = None,
     ) -> str:
-        """Add document to knowledge base"""
+        """Add document to knowledge base (as chunks if an ingestion pipeline is set)"""
+        if self.ingestion is not None:
+            return self.add_documents([content], [metadata or {}], [doc_id] if doc_id else None)[0]
+
         if not doc_id:
             doc_id = str(uuid.uuid4())
+        elif doc_id in self.documents:
+            # Replace existing document
+            self._remove_documents([doc_id])
 
         # Generate embedding
         embedding = self._get_embedding(content)
 
-        # Create document
-        document = KnowledgeDocument(
-            content=content,
-            doc_id=doc_id,
-            metadata=metadata or {},
-            embedding=embedding.tolist(),
-        )
+        # Create document (the vector is kept by the store only)
+        document = compact.CompactKnowledgeDocument(content, doc_id, metadata=metadata)
 
-        # Add to FAISS index
-        self.index.add(embedding.reshape(1, -1))
+        # Persist, then add to FAISS index under the stored row
+        faiss_id = self.store.append(embedding, [(doc_id, self._record(document))])[0]
+        self.index.add_with_ids(embedding.reshape(1, -1), np.array([faiss_id], dtype=np.int64))
 
         # Store document
-        self.documents[doc_id] = document
+        self._index_document(faiss_id, doc_id, document)
 
         # Check max_documents limit
         if self.max_documents and len(self.documents) > self.max_documents:
             self._remove_oldest()
 
-        # Auto-save
-        self._save()
+        self._maybe_train()
+        self._maybe_save()
 
         return doc_id
 
+    def _embed_batch(self, contents: List[str]) -> "np.ndarray":
+        """Embed a batch for bulk add_documents"""
+        return self._get_embeddings(contents)
+
+    def _add_batch(
+        self,
+        contents: List[str],
+        metadatas: List[Dict[str, Any]],
+        doc_ids: List[str],
+        embeddings: "np.ndarray",
+    ) -> None:
+        """Write a batch with one store append and one index add"""
+        existing = [doc_id for doc_id in doc_ids if doc_id in self.documents]
+        if existing:
+            self._remove_documents(existing)
+
+        documents = [
+            compact.CompactKnowledgeDocument(content, doc_id, metadata=metadata)
+            for content, metadata, doc_id in zip(contents, metadatas, doc_ids)
+        ]
+
+        faiss_ids = self.store.append(
+            embeddings, [(doc_id, self._record(doc)) for doc_id, doc in zip(doc_ids, documents)]
+        )
+        self.index.add_with_ids(embeddings, np.array(faiss_ids, dtype=np.int64))
+
+        for faiss_id, doc_id, document in zip(faiss_ids, doc_ids, documents):
+            self._index_document(faiss_id, doc_id, document)
+
+    def _finish_batches(self) -> None:
+        """Trim to max_documents and checkpoint once after a bulk load"""
+        if self.max_documents and len(self.documents) > self.max_documents:
+            excess = len(self.documents) - self.max_documents
+            self._remove_documents(list(islice(self.documents, excess)))
+        self._maybe_train()
+        self._save()
+
+    def _stored_documents(self) -> Iterable[tuple[str, str]]:
+        """Stored (doc_id, content) pairs, used to seed deduplication"""
+        return [(doc_id, doc.content) for doc_id, doc in self.documents.items()]
+
     def search(
         self,
         query: str,
@@ -177,37 +362,7 @@ class FAISSKnowledgeMemory(BaseKnowledgeMemory):
         Returns:
             Most similar documents
         """
-        if len(self.documents) == 0:
-            return []
-
-        # Generate query embedding
-        query_embedding = self._get_embedding(query)
-
-        # Search in FAISS
-        distances, indices = self.index.search(
-            query_embedding.reshape(1, -1), min(top_k * 2, len(self.documents))
-        )
-
-        # Get documents
-        doc_ids = list(self.documents.keys())
-        results = []
-
-        for idx in indices[0]:
-            if idx >= 0 and idx < len(doc_ids):
-                doc_id = doc_ids[idx]
-                doc = self.documents[doc_id]
-
-                # Apply filters
-                if filters:
-                    if not self._matches_filters(doc, filters):
-                        continue
-
-                results.append(doc)
-
-                if len(results) >= top_k:
-                    break
-
-        return results
+        return [doc for doc, _ in self.search_with_scores(query, top_k, filters)]
 
     def delete(
         self,
@@ -218,7 +373,8 @@ class FAISSKnowledgeMemory(BaseKnowledgeMemory):
         Delete documents
 
         Args:
-            doc_id: Delete specific document by ID
+            doc_id: Delete specific document by ID (a chunked document's
+                parent ID deletes all its chunks)
             filters: Delete documents matching filters
 
         Returns:
@@ -226,38 +382,67 @@ class FAISSKnowledgeMemory(BaseKnowledgeMemory):
         """
         if doc_id:
             if doc_id in self.documents:
-                del self.documents[doc_id]
-                self._rebuild_index()
-                self._save()
+                self._remove_documents([doc_id])
+                self._maybe_save()
                 return 1
-            return 0
+            # Chunked documents are stored as their chunks only
+            filters = {PARENT_ID_KEY: doc_id}
 
         if filters:
-            to_delete = []
-            for doc_id, doc in self.documents.items():
-                if self._matches_filters(doc, filters):
-                    to_delete.append(doc_id)
-
-            for doc_id in to_delete:
-                del self.documents[doc_id]
+            to_delete = [
+                self._id_to_doc[faiss_id] for faiss_id in self.metadata_index.match(filters)
+            ]
 
             if to_delete:
-                self._rebuild_index()
-                self._save()
+                self._remove_documents(to_delete)
+                self._maybe_save()
 
             return len(to_delete)
 
         return 0
 
     def get_document(self, doc_id: str) -> Optional[KnowledgeDocument]:
-        """Get document by ID"""
-        return self.documents.get(doc_id)
+        """Get document by ID (a chunked document's parent ID returns it expanded)"""
+        document = self.documents.get(doc_id)
+        if document is None:
+            chunk_ids = self.metadata_index.match({PARENT_ID_KEY: doc_id})
+            if chunk_ids:
+                return self.expand(self.documents[self._id_to_doc[next(iter(chunk_ids))]])
+        return document
+
+    def get_embedding(self, doc_id: str) -> Optional["np.ndarray"]:
+        """
+        Stored embedding of a document
+
+        Args:
+            doc_id: Document ID
+
+        Returns:
+            float32 vector (dequantized for compact stores), or None if unknown
+        """
+        faiss_id = self._doc_to_id.get(doc_id)
+        if faiss_id is None:
+            return None
+        return cast("np.ndarray", self.store.vectors([faiss_id])[0])
 
     def clear(self) -> None:
         """Clear all documents from knowledge base"""
         self.documents.clear()
+        self._id_to_doc.clear()
+        self._doc_to_id.clear()
+        self.metadata_index.clear()
+        if self.bm25 is not None:
+            self.bm25.clear()
+        self._clear_tombstones()
+
+        # Retrain on the next corpus
+        self._trained_template = None
+        trained_file = self.index_path / self.TRAINED_FILE
+        if trained_file.exists():
+            trained_file.unlink()
+
         self.index = self._create_index()
-        self._save()
+        self.store.clear()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get knowledge base statistics"""
@@ -268,8 +453,62 @@ class FAISSKnowledgeMemory(BaseKnowledgeMemory):
             "index_type": self.index_type,
             "max_documents": self.max_documents,
             "index_path": str(self.index_path),
+            "stored_vectors": self.store.num_rows,
+            "dead_vectors": self.store.dead_rows(),
+            "vector_dtype": self.store.dtype,
+            "vector_bytes": self.store.vector_bytes(),
+            "rerank_factor": self.rerank_factor,
+            "hybrid_search": self.hybrid_search,
+            "tombstones": len(self._tombstones),
+            "trained": not faiss_index.needs_training(self.index_type)
+            or self._trained_template is not None,
         }
 
+    def benchmark_index(
+        self,
+        configs: Optional[List[Dict[str, Any]]] = None,
+        num_queries: int = 100,
+        top_k: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Measure recall vs latency of index settings on the stored documents
+
+        Queries are sampled from the stored vectors and recall@top_k is
+        measured against exact search. Use the results to pick index_type,
+        nlist, nprobe and ef_search for this corpus.
+
+        Args:
+            configs: Index configurations (default: a small grid over
+                IVF nprobe, HNSW ef_search and the quantized IVF variants)
+            num_queries: Number of sampled queries
+            top_k: Neighbors per query
+
+        Returns:
+            One dict per config: config, recall, latency_ms, build_seconds, size_bytes
+        """
+        vectors = np.asarray(self.store.vectors(list(self._id_to_doc)))
+        if len(vectors) == 0:
+            return []
+
+        if configs is None:
+            nlist = max(1, min(self.nlist, len(vectors) // faiss_index.TRAIN_POINTS_PER_LIST))
+            configs = [{"index_type": "Flat"}]
+            configs += [
+                {"index_type": "HNSW", "ef_search": ef_search} for ef_search in (16, 64, 256)
+            ]
+            configs += [
+                {"index_type": "IVF", "nlist": nlist, "nprobe": nprobe}
+                for nprobe in (1, 4, 16, 64)
+                if nprobe <= nlist
+            ]
+            configs += [{"index_type": "IVFSQ", "nlist": nlist, "nprobe": min(16, nlist)}]
+            if len(vectors) >= 256:
+                configs += [{"index_type": "IVFPQ", "nlist": nlist, "nprobe": min(16, nlist)}]
+
+        return faiss_index.benchmark_index_configs(
+            vectors, configs, num_queries=num_queries, top_k=top_k
+        )
+
     def search_with_scores(
         self,
         query: str,
@@ -285,108 +524,340 @@ class FAISSKnowledgeMemory(BaseKnowledgeMemory):
             filters: Metadata filters
 
         Returns:
-            List of (document, distance) tuples
+            List of (document, distance) tuples, or (document, fused score)
+            tuples (higher is better) when hybrid_search is enabled
         """
-        if len(self.documents) == 0:
+        return self._search_batch([query], top_k, filters)[0]
+
+    def search_many(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[KnowledgeDocument]]:
+        """
+        Search several queries with one embedding request and one index search
+
+        Args:
+            queries: Search queries
+            top_k: Number of results per query
+            filters: Metadata filters applied to every query
+
+        Returns:
+            Most similar documents for each query, in query order
+        """
+        return [
+            [doc for doc, _ in results] for results in self._search_batch(queries, top_k, filters)
+        ]
+
+    def _search_batch(
+        self,
+        queries: List[str],
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[tuple[KnowledgeDocument, float]]]:
+        """Scored search for a batch of queries"""
+        if not queries:
             return []
+        if len(self.documents) == 0:
+            return [[] for _ in queries]
 
-        # Generate query embedding
-        query_embedding = self._get_embedding(query)
+        # Generate all query embeddings in one request
+        query_embeddings = self._get_embeddings(queries)
 
-        # Search in FAISS
-        distances, indices = self.index.search(
-            query_embedding.reshape(1, -1), min(top_k * 2, len(self.documents))
-        )
+        if self.bm25 is None:
+            return self._search_vectors(query_embeddings, top_k, filters)
 
-        # Get documents with scores
-        doc_ids = list(self.documents.keys())
-        results = []
+        # Hybrid: fuse a deeper vector candidate list with BM25 per query
+        num_candidates = max(top_k * 4, 20)
+        accept = self.metadata_index.match(filters).__contains__ if filters else None
+        return [
+            self._fuse_keyword_ranking(query, vector_results, top_k, num_candidates, accept)
+            for query, vector_results in zip(
+                queries, self._search_vectors(query_embeddings, num_candidates, filters)
+            )
+        ]
 
-        for i, idx in enumerate(indices[0]):
-            if idx >= 0 and idx < len(doc_ids):
-                doc_id = doc_ids[idx]
-                doc = self.documents[doc_id]
-                distance = float(distances[0][i])
+    def _fuse_keyword_ranking(
+        self,
+        query: str,
+        vector_results: List[tuple[KnowledgeDocument, float]],
+        top_k: int,
+        num_candidates: int,
+        accept: Optional[Callable[[int], bool]] = None,
+    ) -> List[tuple[KnowledgeDocument, float]]:
+        """Fuse vector results with the BM25 ranking of a query"""
+        if self.bm25 is None:
+            return vector_results[:top_k]
+
+        vector_ranking = [self._doc_to_id[cast(str, doc.doc_id)] for doc, _ in vector_results]
+        keyword_ranking = [
+            faiss_id for faiss_id, _ in self.bm25.search(query, num_candidates, accept=accept)
+        ]
+
+        fused = reciprocal_rank_fusion([vector_ranking, keyword_ranking], k=self.rrf_k)
+        return [
+            (self.documents[self._id_to_doc[faiss_id]], score) for faiss_id, score in fused[:top_k]
+        ]
+
+    def _search_vector(
+        self,
+        query_embedding: "np.ndarray",
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[tuple[KnowledgeDocument, float]]:
+        """Search by embedding, restricted to documents matching filters"""
+        return self._search_vectors(query_embedding.reshape(1, -1), top_k, filters)[0]
 
-                # Apply filters
-                if filters:
-                    if not self._matches_filters(doc, filters):
-                        continue
+    def _search_vectors(
+        self,
+        query_embeddings: "np.ndarray",
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[tuple[KnowledgeDocument, float]]]:
+        """Search a matrix of query embeddings (one row per query) in one call"""
+        queries = np.ascontiguousarray(query_embeddings, dtype=np.float32)
 
-                results.append((doc, distance))
+        if filters:
+            # Resolve filters to IDs first, so selective filters still return top_k
+            candidates = self.metadata_index.match(filters)
+            if not candidates:
+                return [[] for _ in queries]
+
+            candidate_ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            if len(candidate_ids) <= self.exact_filter_threshold:
+                distances, ids = faiss_index.exact_search(
+                    queries, self.store.vectors(candidate_ids), candidate_ids, top_k
+                )
+            else:
+                params = faiss_index.filtered_search_parameters(
+                    self.index, candidate_ids, nprobe=self.nprobe, ef_search=self.ef_search
+                )
+                distances, ids = self.index.search(
+                    queries, min(top_k * self._rerank_factor(), len(candidate_ids)), params=params
+                )
+                distances, ids = self._rerank(queries, distances, ids, top_k)
+        else:
+            distances, ids = self.index.search(
+                queries,
+                min(top_k * self._rerank_factor(), len(self.documents)),
+                params=self._live_search_parameters(),
+            )
+            distances, ids = self._rerank(queries, distances, ids, top_k)
 
-                if len(results) >= top_k:
-                    break
+        # Get documents with scores
+        results = []
+        for row_ids, row_distances in zip(ids, distances):
+            row = []
+            for faiss_id, distance in zip(row_ids, row_distances):
+                doc_id = self._id_to_doc.get(int(faiss_id))
+                if doc_id is not None:
+                    row.append((self.documents[doc_id], float(distance)))
+            results.append(row)
 
         return results
 
-    def _matches_filters(self, document: KnowledgeDocument, filters: Dict[str, Any]) -> bool:
-        """Check if document matches filters"""
-        for key, value in filters.items():
-            if key not in document.metadata:
-                return False
-            if document.metadata[key] != value:
-                return False
-        return True
+    def _rerank_factor(self) -> int:
+        """Candidates fetched per result (1 while an IVF type still searches exactly)"""
+        if faiss_index.needs_training(self.index_type) and self._trained_template is None:
+            return 1
+        return self.rerank_factor
+
+    def _rerank(
+        self, queries: "np.ndarray", distances: "np.ndarray", ids: "np.ndarray", top_k: int
+    ):
+        """Re-score index candidates exactly against the stored vectors"""
+        if self._rerank_factor() == 1:
+            return distances, ids
+
+        reranked_distances, reranked_ids = [], []
+        for query, row_ids in zip(queries, ids):
+            candidates = row_ids[row_ids >= 0]
+            row_distances, row_ids = faiss_index.exact_search(
+                query, self.store.vectors(candidates), candidates, top_k
+            )
+            reranked_distances.append(row_distances[0])
+            reranked_ids.append(row_ids[0])
+        return reranked_distances, reranked_ids
+
+    def _index_document(self, faiss_id: int, doc_id: str, document: KnowledgeDocument) -> None:
+        """Register a stored document in the in-memory lookups"""
+        self.documents[doc_id] = document
+        self._id_to_doc[faiss_id] = doc_id
+        self._doc_to_id[doc_id] = faiss_id
+        self.metadata_index.add(faiss_id, document.metadata)
+        if self.bm25 is not None:
+            self.bm25.add(faiss_id, document.content)
 
     def _remove_oldest(self) -> None:
         """Remove oldest document"""
         if not self.documents:
             return
 
-        # Find oldest document
-        oldest_id = min(self.documents.keys(), key=lambda k: self.documents[k].timestamp)
+        # Documents are kept in insertion order
+        oldest_id = next(iter(self.documents))
+        self._remove_documents([oldest_id])
+
+    def _remove_documents(self, doc_ids: List[str]) -> None:
+        """Remove documents and their vectors by document ID"""
+        faiss_ids = []
+        for doc_id in doc_ids:
+            document = self.documents.pop(doc_id, None)
+            faiss_id = self._doc_to_id.pop(doc_id, None)
+            if faiss_id is not None and document is not None:
+                del self._id_to_doc[faiss_id]
+                self.metadata_index.remove(faiss_id, document.metadata)
+                if self.bm25 is not None:
+                    self.bm25.remove(faiss_id)
+                faiss_ids.append(faiss_id)
+
+        if not faiss_ids:
+            return
 
-        del self.documents[oldest_id]
-        self._rebuild_index()
+        self.store.delete(doc_ids)
+
+        if self.index_type == "HNSW":
+            # HNSW graphs don't support removal: tombstone, rebuild once they pile up
+            self._tombstones.update(faiss_ids)
+            self._tombstone_params = None
+            self._maybe_compact()
+        else:
+            self.index.remove_ids(np.array(faiss_ids, dtype=np.int64))
+
+    def _live_search_parameters(self):
+        """Search parameters excluding tombstoned IDs (None if there are none)"""
+        if not self._tombstones:
+            return None
+        if self._tombstone_params is None:
+            self._tombstone_params = faiss_index.filtered_search_parameters(
+                self.index,
+                np.fromiter(self._tombstones, dtype=np.int64, count=len(self._tombstones)),
+                ef_search=self.ef_search,
+                exclude=True,
+            )
+        return self._tombstone_params
+
+    def _maybe_compact(self) -> None:
+        """Rebuild the index once tombstones exceed their share of it"""
+        if len(self._tombstones) > _MAX_TOMBSTONE_FRACTION * self.index.ntotal:
+            self._rebuild_index()
+
+    def _clear_tombstones(self) -> None:
+        self._tombstones.clear()
+        self._tombstone_params = None
 
     def _rebuild_index(self) -> None:
-        """Rebuild FAISS index from documents"""
-        self.index = self._create_index()
+        """Rebuild FAISS index from stored vectors"""
+        self.index = self.store.build_index(self._create_index, list(self._id_to_doc))
+        self._clear_tombstones()
+
+    def _record(self, document: KnowledgeDocument) -> Dict[str, Any]:
+        """Metadata record for a document (the vector is stored separately)"""
+        data = document.to_dict()
+        data.pop("embedding", None)
+        return data
+
+    def compact(self) -> None:
+        """
+        Reclaim the stored vectors of deleted and replaced documents
+
+        Rewrites the vector file with live rows only, renumbers the FAISS IDs
+        and rebuilds the index. Runs automatically at checkpoints once dead
+        rows make up half of the vector file.
+        """
+        mapping = self.store.compact()
+
+        documents = [
+            (mapping[self._doc_to_id[doc_id]], doc_id, doc)
+            for doc_id, doc in self.documents.items()
+        ]
+        self.documents.clear()
+        self._id_to_doc.clear()
+        self._doc_to_id.clear()
+        self.metadata_index.clear()
+        if self.bm25 is not None:
+            self.bm25.clear()
+        for faiss_id, doc_id, document in documents:
+            self._index_document(faiss_id, doc_id, document)
 
-        if self.documents:
-            embeddings = []
-            for doc in self.documents.values():
-                if doc.embedding:
-                    embeddings.append(np.array(doc.embedding, dtype=np.float32))
-                else:
-                    # Re-generate embedding if missing
-                    emb = self._get_embedding(doc.content)
-                    embeddings.append(emb)
-                    doc.embedding = emb.tolist()
-
-            if embeddings:
-                embeddings_array = np.vstack(embeddings)
-                self.index.add(embeddings_array)
+        self._rebuild_index()
+        self.store.checkpoint(self.index)
 
     def _save(self) -> None:
-        """Save index and documents to disk"""
-        # Save FAISS index
-        faiss.write_index(self.index, str(self.index_path / "index.faiss"))
+        """Checkpoint the FAISS index (documents are persisted as they are added)"""
+        if self.store.needs_compaction():
+            self.compact()
+        else:
+            self.store.checkpoint(self.index)
 
-        # Save documents
-        documents_data = {
-            doc_id: doc.to_dict() for doc_id, doc in self.documents.items()
-        }
-        with open(self.index_path / "documents.json", "w") as f:
-            json.dump(documents_data, f, indent=2)
+    def _maybe_save(self) -> None:
+        """Checkpoint once enough changes accumulated"""
+        if self.store.checkpoint_due():
+            self._save()
+
+    def close(self) -> None:
+        """Checkpoint the index and close the store"""
+        self._save()
+        self.store.close()
 
     def _load(self) -> None:
-        """Load index and documents from disk"""
-        index_file = self.index_path / "index.faiss"
+        """Load documents and index from disk"""
+        trained_file = self.index_path / self.TRAINED_FILE
+        if faiss_index.needs_training(self.index_type) and trained_file.exists():
+            self._trained_template = faiss.read_index(str(trained_file))
+
+        if self.store.is_empty():
+            self._migrate_json()
+
+        for faiss_id, doc_id, data in self.store.records():
+            document = compact.CompactKnowledgeDocument.from_document(
+                KnowledgeDocument.from_dict(data)
+            )
+            self._index_document(faiss_id, doc_id, document)
+
+        self.index = self.store.load_index(
+            self._create_index, list(self._id_to_doc), keep_stale=self.index_type == "HNSW"
+        )
+        faiss_index.configure_search(self.index, nprobe=self.nprobe, ef_search=self.ef_search)
+
+        # Deletes since the checkpoint that the HNSW graph still holds
+        if self.index_type == "HNSW":
+            indexed = faiss_index.index_ids(self.index).tolist()
+            self._tombstones = set(indexed).difference(self._id_to_doc)
+            self._maybe_compact()
+
+        # Checkpoint predates training: move to the trained index
+        if self._trained_template is not None and not isinstance(
+            faiss_index.inner_index(self.index), faiss.IndexIVF
+        ):
+            self._rebuild_index()
+
+        self._maybe_train()
+
+    def _migrate_json(self) -> None:
+        """Import documents saved in the old JSON format"""
         documents_file = self.index_path / "documents.json"
+        if not documents_file.exists():
+            return
+
+        with open(documents_file, "r") as f:
+            documents_data = json.load(f)
+
+        records = []
+        embeddings = []
+        for doc_id, data in documents_data.items():
+            document = KnowledgeDocument.from_dict(data)
+            document.doc_id = doc_id
+            if document.embedding:
+                embeddings.append(np.array(document.embedding, dtype=np.float32))
+            else:
+                embeddings.append(self._get_embedding(document.content))
+            records.append((doc_id, self._record(document)))
+
+        if records:
+            self.store.append(np.vstack(embeddings), records)
 
-        if index_file.exists() and documents_file.exists():
-            # Load FAISS index
-            self.index = faiss.read_index(str(index_file))
-
-            # Load documents
-            with open(documents_file, "r") as f:
-                documents_data = json.load(f)
-                self.documents = {
-                    doc_id: KnowledgeDocument.from_dict(data)
-                    for doc_id, data in documents_data.items()
-                }
+        documents_file.rename(documents_file.with_suffix(".json.migrated"))
 
     def __repr__(self) -> str:
         stats = self.get_stats()
@@ -0,0 +1,412 @@
+"""
+Chunking and deduplication stage for knowledge ingestion
+
+Long documents embed poorly as a single vector and waste context when
+retrieved whole. An IngestionPipeline splits documents into token-sized,
+overlapping chunks and drops chunks that exactly or nearly duplicate text
+already stored, before anything is embedded.
+
+Each chunk is stored as its own document with ID ``<parent_id>#<index>`` and
+metadata pointing back to its parent, so search returns chunks and
+``BaseKnowledgeMemory.expand`` reassembles the parent on demand.
+"""
+
+import hashlib
+import random
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Chunk metadata keys
+PARENT_ID_KEY = "parent_id"
+CHUNK_INDEX_KEY = "chunk_index"
+CHUNK_COUNT_KEY = "chunk_count"
+CHUNK_START_KEY = "chunk_start"
+CHUNK_END_KEY = "chunk_end"
+CONTENT_HASH_KEY = "content_hash"
+
+CHUNK_KEYS = (
+    PARENT_ID_KEY,
+    CHUNK_INDEX_KEY,
+    CHUNK_COUNT_KEY,
+    CHUNK_START_KEY,
+    CHUNK_END_KEY,
+    CONTENT_HASH_KEY,
+)
+
+# Words with their trailing whitespace; joining all pieces gives back the text
+_PIECE_RE = re.compile(r"\s*\S+\s*|\s+")
+
+# Mersenne prime for MinHash permutations (products of 31-bit values fit in 64 bits)
+_MINHASH_PRIME = (1 << 31) - 1
+
+
+def chunk_id(parent_id: str, index: int) -> str:
+    """Document ID of a parent's chunk"""
+    return f"{parent_id}#{index}"
+
+
+def content_hash(text: str) -> str:
+    """sha256 of text with whitespace normalized"""
+    return hashlib.sha256(" ".join(text.split()).encode()).hexdigest()
+
+
+class TextChunker:
+    """
+    Token-aware chunker with overlap
+
+    Text is split on word boundaries into chunks of at most chunk_size
+    tokens, each starting chunk_overlap tokens before the previous one
+    ended. Tokens are counted with tiktoken when installed, otherwise one
+    token per word.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 512,
+        chunk_overlap: int = 64,
+        encoding_name: Optional[str] = "cl100k_base",
+    ):
+        """
+        Initialize chunker
+
+        Args:
+            chunk_size: Maximum tokens per chunk
+            chunk_overlap: Tokens repeated between consecutive chunks
+            encoding_name: tiktoken encoding for counting tokens
+                (None = count words)
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be between 0 and chunk_size - 1")
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self._encoding = None
+        if encoding_name and TIKTOKEN_AVAILABLE:
+            self._encoding = tiktoken.get_encoding(encoding_name)
+
+    def _count_tokens(self, pieces: List[str]) -> List[int]:
+        """Token count of each piece"""
+        if self._encoding is None:
+            return [1 if piece.strip() else 0 for piece in pieces]
+        return [len(tokens) for tokens in self._encoding.encode_ordinary_batch(pieces)]
+
+    def split(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Split text into chunks
+
+        Args:
+            text: Text to split
+
+        Returns:
+            (start, end, chunk text) per chunk, with character offsets into text
+        """
+        pieces = _PIECE_RE.findall(text)
+        if not pieces:
+            return []
+
+        counts = self._count_tokens(pieces)
+        offsets = [0]
+        for piece in pieces:
+            offsets.append(offsets[-1] + len(piece))
+
+        chunks = []
+        start = 0
+        while start < len(pieces):
+            # Extend until the next piece would overflow (always take at least one)
+            end = start + 1
+            tokens = counts[start]
+            while end < len(pieces) and tokens + counts[end] <= self.chunk_size:
+                tokens += counts[end]
+                end += 1
+
+            chunks.append((offsets[start], offsets[end], text[offsets[start] : offsets[end]]))
+            if end == len(pieces):
+                break
+
+            # Back up by chunk_overlap tokens, but always make progress
+            next_start = end
+            overlap = 0
+            while next_start - 1 > start and overlap + counts[next_start - 1] <= self.chunk_overlap:
+                next_start -= 1
+                overlap += counts[next_start]
+            start = next_start
+
+        return chunks
+
+
+@dataclass
+class TextFingerprint:
+    """Exact hash and MinHash signature of a text"""
+
+    content_hash: str
+    signature: Tuple[int, ...]
+
+
+class Deduplicator:
+    """
+    Exact (sha256) and near-duplicate (MinHash + LSH) text detection
+
+    Near duplicates are texts whose word-shingle Jaccard similarity, as
+    estimated from their MinHash signatures, is at least the threshold.
+    Candidates are found through LSH band buckets, so lookups don't scan
+    all known texts.
+    """
+
+    def __init__(
+        self,
+        near_duplicate_threshold: Optional[float] = 0.9,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 5,
+        seed: int = 1234,
+    ):
+        """
+        Initialize deduplicator
+
+        Args:
+            near_duplicate_threshold: Minimum estimated Jaccard similarity of
+                near duplicates (None = exact duplicates only)
+            num_perm: MinHash permutations (signature length)
+            bands: LSH bands (must divide num_perm)
+            shingle_size: Words per shingle
+            seed: Permutation seed
+        """
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, _MINHASH_PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, _MINHASH_PRIME) for _ in range(num_perm)]
+
+        self._by_hash: Dict[str, str] = {}
+        self._hashes: Dict[str, str] = {}
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+
+    def _shingles(self, text: str) -> List[int]:
+        """32-bit hashes of the word shingles of text"""
+        words = text.lower().split()
+        size = min(self.shingle_size, len(words)) or 1
+        shingles = {" ".join(words[i : i + size]) for i in range(max(len(words) - size + 1, 1))}
+        return [
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little")
+            % _MINHASH_PRIME
+            for s in shingles
+        ]
+
+    def _signature(self, text: str) -> Tuple[int, ...]:
+        """MinHash signature of text"""
+        shingles = self._shingles(text)
+
+        if NUMPY_AVAILABLE:
+            x = np.array(shingles, dtype=np.uint64)[:, None]
+            a = np.array(self._a, dtype=np.uint64)[None, :]
+            b = np.array(self._b, dtype=np.uint64)[None, :]
+            return tuple(int(v) for v in ((x * a + b) % _MINHASH_PRIME).min(axis=0))
+
+        return tuple(
+            min((a * x + b) % _MINHASH_PRIME for x in shingles) for a, b in zip(self._a, self._b)
+        )
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        rows = self.num_perm // self.bands
+        for band in range(self.bands):
+            yield band, signature[band * rows : (band + 1) * rows]
+
+    def fingerprint(self, text: str) -> TextFingerprint:
+        """Compute the exact hash and (if near-duplicate detection is on) signature"""
+        signature: Tuple[int, ...] = ()
+        if self.near_duplicate_threshold is not None:
+            signature = self._signature(text)
+        return TextFingerprint(content_hash(text), signature)
+
+    def find_duplicate(
+        self,
+        fingerprint: TextFingerprint,
+        exists: Optional[Callable[[str], bool]] = None,
+    ) -> Optional[str]:
+        """
+        Find a known text that duplicates a fingerprint
+
+        Args:
+            fingerprint: Fingerprint of the new text
+            exists: Optional check that a known ID is still stored; stale IDs
+                are forgotten
+
+        Returns:
+            ID of the duplicate, or None
+        """
+        item_id = self._by_hash.get(fingerprint.content_hash)
+        if item_id is not None:
+            if exists is None or exists(item_id):
+                return item_id
+            self.remove(item_id)
+
+        threshold = self.near_duplicate_threshold
+        if not fingerprint.signature or threshold is None:
+            return None
+
+        seen = set()
+        for key in self._band_keys(fingerprint.signature):
+            for candidate in self._buckets.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+
+                other = self._signatures[candidate]
+                matches = sum(1 for x, y in zip(fingerprint.signature, other) if x == y)
+                if matches / self.num_perm >= threshold:
+                    if exists is None or exists(candidate):
+                        return candidate
+
+        return None
+
+    def add(self, item_id: str, fingerprint: TextFingerprint) -> None:
+        """Remember a stored text"""
+        self._by_hash[fingerprint.content_hash] = item_id
+        self._hashes[item_id] = fingerprint.content_hash
+        if fingerprint.signature:
+            self._signatures[item_id] = fingerprint.signature
+            for key in self._band_keys(fingerprint.signature):
+                self._buckets.setdefault(key, []).append(item_id)
+
+    def remove(self, item_id: str) -> None:
+        """Forget a text"""
+        hash_value = self._hashes.pop(item_id, None)
+        if hash_value is not None and self._by_hash.get(hash_value) == item_id:
+            del self._by_hash[hash_value]
+
+        signature = self._signatures.pop(item_id, None)
+        if signature is not None:
+            for key in self._band_keys(signature):
+                bucket = self._buckets.get(key)
+                if bucket and item_id in bucket:
+                    bucket.remove(item_id)
+                    if not bucket:
+                        del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+class IngestionPipeline:
+    """
+    Chunk and deduplicate documents before they are embedded
+
+    Example:
+        >>> pipeline = IngestionPipeline(TextChunker(chunk_size=256, chunk_overlap=32))
+        >>> memory = FAISSKnowledgeMemory(index_path="./kb", ingestion=pipeline)
+        >>> memory.add_document(long_text, doc_id="manual")
+        >>> chunk = memory.search("reset the device")[0]
+        >>> memory.expand(chunk).doc_id
+        'manual'
+    """
+
+    def __init__(
+        self,
+        chunker: Optional[TextChunker] = None,
+        deduplicator: Optional[Deduplicator] = None,
+        deduplicate: bool = True,
+    ):
+        """
+        Initialize pipeline
+
+        Args:
+            chunker: Chunker (default: TextChunker())
+            deduplicator: Deduplicator (default: Deduplicator() if deduplicate)
+            deduplicate: Drop duplicate chunks
+        """
+        self.chunker = chunker or TextChunker()
+        self.deduplicator = deduplicator or (Deduplicator() if deduplicate else None)
+        self.seeded = False
+
+    def seed(self, documents: Iterable[Tuple[str, str]]) -> None:
+        """
+        Register already stored chunks for deduplication
+
+        Args:
+            documents: (doc_id, content) pairs
+        """
+        if self.deduplicator is not None:
+            for doc_id, content in documents:
+                self.deduplicator.add(doc_id, self.deduplicator.fingerprint(content))
+        self.seeded = True
+
+    def process(
+        self,
+        documents: List[str],
+        metadata_list: List[Dict[str, Any]],
+        parent_ids: List[str],
+        exists: Optional[Callable[[str], bool]] = None,
+    ) -> Tuple[List[str], List[Dict[str, Any]], List[str]]:
+        """
+        Turn documents into deduplicated chunks
+
+        Args:
+            documents: Document contents
+            metadata_list: Metadata per document (copied onto its chunks)
+            parent_ids: Document IDs
+            exists: Check that a previously seen chunk is still stored
+
+        Returns:
+            (contents, metadatas, doc_ids) of the chunks to embed and store
+        """
+        contents: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        doc_ids: List[str] = []
+        added = set()
+
+        def known(item_id: str) -> bool:
+            return item_id in added or exists is None or exists(item_id)
+
+        for document, metadata, parent_id in zip(documents, metadata_list, parent_ids):
+            chunks = self.chunker.split(document)
+            for index, (start, end, text) in enumerate(chunks):
+                item_id = chunk_id(parent_id, index)
+                if self.deduplicator is not None:
+                    fingerprint = self.deduplicator.fingerprint(text)
+                    if self.deduplicator.find_duplicate(fingerprint, known) is not None:
+                        continue
+                    self.deduplicator.add(item_id, fingerprint)
+                    text_hash = fingerprint.content_hash
+                else:
+                    text_hash = content_hash(text)
+
+                added.add(item_id)
+                contents.append(text)
+                doc_ids.append(item_id)
+                metadatas.append(
+                    {
+                        **metadata,
+                        PARENT_ID_KEY: parent_id,
+                        CHUNK_INDEX_KEY: index,
+                        CHUNK_COUNT_KEY: len(chunks),
+                        CHUNK_START_KEY: start,
+                        CHUNK_END_KEY: end,
+                        CONTENT_HASH_KEY: text_hash,
+                    }
+                )
+
+        return contents, metadatas, doc_ids
@@ -0,0 +1,81 @@
+"""
+Inverted index from metadata key/value pairs to integer IDs
+
+Used by vector memories to resolve metadata filters to the exact set of
+matching IDs before the vector search, instead of filtering candidates
+afterwards.
+"""
+
+import json
+from typing import Any, Dict, Hashable, Set, Tuple, cast
+
+
+def _value_key(value: Any) -> Hashable:
+    """Hashable key for a metadata value (unhashable values use canonical JSON)"""
+    try:
+        hash(value)
+        return cast(Hashable, value)
+    except TypeError:
+        return ("__json__", json.dumps(value, sort_keys=True, default=str))
+
+
+class MetadataIndex:
+    """
+    Postings of (key, value) -> set of IDs
+
+    Filters are equality matches on every key (same semantics as
+    ``_matches_filters``), resolved by intersecting postings smallest first.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[Tuple[str, Hashable], Set[int]] = {}
+
+    def add(self, item_id: int, metadata: Dict[str, Any]) -> None:
+        """Index an item's metadata"""
+        for key, value in metadata.items():
+            self._postings.setdefault((key, _value_key(value)), set()).add(item_id)
+
+    def remove(self, item_id: int, metadata: Dict[str, Any]) -> None:
+        """Remove an item's metadata from the index"""
+        for key, value in metadata.items():
+            posting_key = (key, _value_key(value))
+            posting = self._postings.get(posting_key)
+            if posting is not None:
+                posting.discard(item_id)
+                if not posting:
+                    del self._postings[posting_key]
+
+    def match(self, filters: Dict[str, Any]) -> Set[int]:
+        """
+        IDs whose metadata matches all filters
+
+        Args:
+            filters: Metadata key/value pairs
+
+        Returns:
+            Set of matching IDs (a new set, safe to modify)
+        """
+        postings = []
+        for key, value in filters.items():
+            posting = self._postings.get((key, _value_key(value)))
+            if not posting:
+                return set()
+            postings.append(posting)
+
+        if not postings:
+            return set()
+
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    def clear(self) -> None:
+        """Remove all postings"""
+        self._postings.clear()
+
+    def __len__(self) -> int:
+        return len(self._postings)
@@ -5,6 +5,8 @@ Simple in-memory storage (no persistence)
 from collections import deque
 from typing import List, Dict, Any, Optional
 from react_agent_framework.core.memory.base import BaseMemory, MemoryMessage
+from react_agent_framework.core.memory.bm25 import BM25Index
+from react_agent_framework.core.memory.compact import CompactMemoryMessage
 
 
 class SimpleMemory(BaseMemory):
@@ -13,8 +15,9 @@ class SimpleMemory(BaseMemory):
 
     - No persistence (data lost when program ends)
     - Fast access
-    - Sequential search (no semantic search)
+    - BM25 keyword search (no semantic search)
     - Good for short sessions
+    - Messages stored compactly (see CompactMemoryMessage)
     """
 
     def __init__(
@@ -32,6 +35,11 @@ class SimpleMemory(BaseMemory):
         super().__init__(max_messages=max_messages, session_id=session_id)
         self._messages: deque = deque(maxlen=max_messages)
 
+        # Keyword index keyed by sequence number: the message with sequence
+        # number n is at position n - (self._next_seq - len(self._messages))
+        self._bm25: BM25Index[int] = BM25Index()
+        self._next_seq = 0
+
     def add(
         self,
         content: str,
@@ -39,12 +47,14 @@ class SimpleMemory(BaseMemory):
         metadata: Optional[Dict[str, Any]] = None,
     ) -> None:
         """Add message to memory"""
-        message = MemoryMessage(
-            content=content,
-            role=role,
-            metadata=metadata or {},
-        )
+        message = CompactMemoryMessage(content, role, metadata=metadata)
+        if self._messages.maxlen is not None and len(self._messages) == self._messages.maxlen:
+            # The deque is about to drop its oldest message
+            self._bm25.remove(self._next_seq - len(self._messages))
+
         self._messages.append(message)
+        self._bm25.add(self._next_seq, content)
+        self._next_seq += 1
 
     def search(
         self,
@@ -53,7 +63,9 @@ class SimpleMemory(BaseMemory):
         filters: Optional[Dict[str, Any]] = None,
     ) -> List[MemoryMessage]:
         """
-        Search messages (simple keyword matching)
+        Search messages by keyword relevance (BM25)
+
+        Queries without any whole-word match fall back to substring matching.
 
         Args:
             query: Search query
@@ -61,8 +73,20 @@ class SimpleMemory(BaseMemory):
             filters: Metadata filters
 
         Returns:
-            Messages containing query keywords
+            Messages containing query keywords, most relevant first
         """
+        first_seq = self._next_seq - len(self._messages)
+
+        accept = None
+        if filters:
+
+            def accept(seq: int) -> bool:
+                return self._matches_filters(self._messages[seq - first_seq], filters)
+
+        ranked = self._bm25.search(query, top_k, accept=accept)
+        if ranked:
+            return [self._messages[seq - first_seq] for seq, _ in ranked]
+
         query_lower = query.lower()
         results = []
 
@@ -98,6 +122,7 @@ class SimpleMemory(BaseMemory):
     def clear(self, session_id: Optional[str] = None) -> None:
         """Clear all messages"""
         self._messages.clear()
+        self._bm25.clear()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get memory statistics"""
@@ -117,13 +142,13 @@ class SimpleMemory(BaseMemory):
             "roles": self._get_role_counts(),
         }
 
-    def _matches_filters(self, message: MemoryMessage, filters: Dict[str, Any]) -> bool:
+    def _matches_filters(self, message: CompactMemoryMessage, filters: Dict[str, Any]) -> bool:
         """Check if message matches filters"""
         for key, value in filters.items():
             if key == "role":
                 if message.role != value:
                     return False
-            elif key in message.metadata:
+            elif message.has_metadata and key in message.metadata:
                 if message.metadata[key] != value:
                     return False
             else:
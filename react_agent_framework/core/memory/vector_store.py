@@ -0,0 +1,532 @@
+"""
+Append-only on-disk storage for FAISS-backed memories
+
+Layout of a store directory:
+- vectors.f32: float32 embedding matrix, one row per record, append-only
+  (memory-mapped for reads); vectors.f16 or vectors.i8 plus vectors.scale
+  (one float32 scale per row) for compact stores
+- metadata.db: SQLite table of records (row, key, JSON data)
+- index.ckpt.faiss: periodic checkpoint of the FAISS index
+
+The FAISS ID of a record is its row in the vector file, so an index can
+always be rebuilt or caught up from the vector file alone. Inserts cost
+one vector append and one small SQLite insert; the index is written only
+every ``checkpoint_interval`` changes.
+
+Deleted records leave their vector row behind. compact() rewrites the
+vector file with the live rows only and renumbers them, so callers remap
+their FAISS IDs and rebuild the index afterwards.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    Rows = Union[Sequence[int], np.ndarray]
+
+try:
+    import faiss
+    import numpy as np
+
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+    faiss = None  # type: ignore
+    np = None  # type: ignore
+
+from react_agent_framework.core.memory import faiss_index
+
+# Rows added to an index per batch when rebuilding from the vector file
+_REBUILD_BATCH = 65536
+
+# Share of dead rows in the vector file above which it is compacted
+_COMPACT_FRACTION = 0.5
+
+# Vector storage types: name -> (file suffix, bytes per element)
+VECTOR_DTYPES = {"float32": ("f32", 4), "float16": ("f16", 2), "int8": ("i8", 1)}
+
+
+class VectorStore:
+    """
+    Append-only vector and metadata storage
+
+    Records are identified by a string key (document ID) and an integer row.
+    Deleted records keep their vector row until the store is compacted or
+    cleared.
+
+    Vectors can be kept as float32, float16 (2x smaller) or int8 with a
+    float32 scale per vector (~4x smaller); reads always return float32.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    SCALES_FILE = "vectors.scale"
+    METADATA_FILE = "metadata.db"
+    CHECKPOINT_FILE = "index.ckpt.faiss"
+
+    def __init__(
+        self,
+        path: str,
+        dimension: int,
+        checkpoint_interval: int = 1000,
+        dtype: str = "float32",
+        compact_fraction: float = _COMPACT_FRACTION,
+    ):
+        """
+        Open or create a store
+
+        Args:
+            path: Store directory
+            dimension: Embedding dimension
+            checkpoint_interval: Changes between FAISS index checkpoints
+            dtype: Vector storage type ("float32", "float16" or "int8")
+            compact_fraction: Share of dead rows above which needs_compaction()
+                is true
+        """
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(
+                f"Unknown vector dtype: {dtype}. Use one of: {', '.join(VECTOR_DTYPES)}"
+            )
+
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dimension = dimension
+        self.checkpoint_interval = checkpoint_interval
+        self.dtype = dtype
+        self.compact_fraction = compact_fraction
+
+        suffix, item_bytes = VECTOR_DTYPES[dtype]
+        self._lock = threading.RLock()
+        self._row_bytes = dimension * item_bytes
+        self._vectors_path = self.path / f"vectors.{suffix}"
+        self._scales_path = self.path / self.SCALES_FILE if dtype == "int8" else None
+        self._checkpoint_path = self.path / self.CHECKPOINT_FILE
+        self._mmap: Optional["np.memmap"] = None
+        self._scales: Optional["np.memmap"] = None
+        self._changes = 0
+
+        self.conn = sqlite3.connect(str(self.path / self.METADATA_FILE), check_same_thread=False)
+        self._init_db()
+        self._recover_compaction()
+        self.num_rows = self._recover_vectors()
+
+    def _init_db(self) -> None:
+        """Initialize database schema"""
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                row INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                data TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS store_meta (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+        stored_dimension = self._get_meta("dimension")
+        if stored_dimension is None:
+            self._set_meta("dimension", str(self.dimension))
+            self.conn.commit()
+        elif int(stored_dimension) != self.dimension:
+            raise ValueError(
+                f"Store at {self.path} has dimension {stored_dimension}, not {self.dimension}"
+            )
+
+        stored_dtype = self._get_meta("dtype")
+        if stored_dtype is None:
+            # Stores created before compact vectors hold float32 only
+            legacy_vectors = self.path / self.VECTORS_FILE
+            has_vectors = legacy_vectors.exists() and legacy_vectors.stat().st_size > 0
+            stored_dtype = "float32" if has_vectors else self.dtype
+            self._set_meta("dtype", stored_dtype)
+            self.conn.commit()
+        if stored_dtype != self.dtype:
+            raise ValueError(f"Store at {self.path} holds {stored_dtype} vectors, not {self.dtype}")
+
+    def _recover_vectors(self) -> int:
+        """Drop a partially written trailing row left by a crash; return row count"""
+        files = [(self._vectors_path, self._row_bytes)]
+        if self._scales_path is not None:
+            files.append((self._scales_path, 4))
+
+        for path, _ in files:
+            if not path.exists():
+                path.touch()
+
+        rows = min(path.stat().st_size // row_bytes for path, row_bytes in files)
+        for path, row_bytes in files:
+            if path.stat().st_size != rows * row_bytes:
+                with open(path, "r+b") as f:
+                    f.truncate(rows * row_bytes)
+        return rows
+
+    def _vector_files(self) -> List[Path]:
+        """Vector file and, for int8 stores, the scales file"""
+        return [self._vectors_path] + ([self._scales_path] if self._scales_path else [])
+
+    def _recover_compaction(self) -> None:
+        """Finish a compaction interrupted after its rows were renumbered"""
+        if self._get_meta("compacting") is not None:
+            self._finish_compaction()
+        else:
+            # Interrupted before the renumbering: the old files are still valid
+            for path in self._vector_files():
+                path.with_name(path.name + ".tmp").unlink(missing_ok=True)
+
+    def _get_meta(self, name: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM store_meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, name: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO store_meta (name, value) VALUES (?, ?)", (name, value)
+        )
+
+    def is_empty(self) -> bool:
+        """Check whether the store has ever been written"""
+        return self.num_rows == 0 and self._get_meta("checkpoint_rows") is None
+
+    def append(
+        self, vectors: "np.ndarray", records: Sequence[Tuple[str, Dict[str, Any]]]
+    ) -> List[int]:
+        """
+        Append records and their vectors
+
+        Args:
+            vectors: float32 matrix with one row per record
+            records: (key, data) pairs; data must be JSON serializable
+
+        Returns:
+            Row (FAISS ID) of each record
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dimension)
+        if len(vectors) != len(records):
+            raise ValueError("vectors and records must have the same length")
+        data, scales = self._encode(vectors)
+
+        with self._lock:
+            start = self.num_rows
+            rows = list(range(start, start + len(records)))
+
+            # Vectors first: rows without a metadata record are ignored on load
+            with open(self._vectors_path, "ab") as f:
+                f.write(data.tobytes())
+            if scales is not None and self._scales_path is not None:
+                with open(self._scales_path, "ab") as f:
+                    f.write(scales.tobytes())
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO records (row, key, data) VALUES (?, ?, ?)",
+                [
+                    (row, key, json.dumps(data, separators=(",", ":")))
+                    for row, (key, data) in zip(rows, records)
+                ],
+            )
+            self.conn.commit()
+
+            self.num_rows += len(records)
+            self._changes += len(records)
+            return rows
+
+    def dead_rows(self) -> int:
+        """Vector rows no live record refers to (reclaimed by compact())"""
+        with self._lock:
+            live: int = self.conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+            return self.num_rows - live
+
+    def needs_compaction(self) -> bool:
+        """Check whether dead rows exceed compact_fraction of the vector file"""
+        return self.num_rows > 0 and self.dead_rows() > self.compact_fraction * self.num_rows
+
+    def compact(self) -> Dict[int, int]:
+        """
+        Rewrite the vector file with only the live rows
+
+        Live rows are renumbered densely in their current order. The index
+        checkpoint is dropped, since its IDs no longer match: callers remap
+        their FAISS IDs, rebuild the index and checkpoint it.
+
+        Returns:
+            New row of every live record, keyed by its old row
+        """
+        with self._lock:
+            live = np.fromiter(
+                (row for (row,) in self.conn.execute("SELECT row FROM records ORDER BY row")),
+                dtype=np.int64,
+            )
+            mapping = {int(old): new for new, old in enumerate(live)}
+            if len(live) == self.num_rows:
+                return mapping
+
+            # New files next to the old ones; the old ones stay valid until the
+            # renumbering below is committed
+            matrix, scales = self._matrix()
+            stored = [matrix] if scales is None else [matrix, scales]
+            for path, data in zip(self._vector_files(), stored):
+                with open(path.with_name(path.name + ".tmp"), "wb") as f:
+                    for start in range(0, len(live), _REBUILD_BATCH):
+                        batch = live[start : start + _REBUILD_BATCH]
+                        f.write(np.ascontiguousarray(data[batch]).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            # Ascending order: a record only ever moves to a row that is free
+            self.conn.executemany(
+                "UPDATE records SET row = ? WHERE row = ?",
+                [(new, old) for old, new in mapping.items() if old != new],
+            )
+            self.conn.execute("DELETE FROM store_meta WHERE name = 'checkpoint_rows'")
+            self._set_meta("compacting", "1")
+            self.conn.commit()
+
+            self._finish_compaction()
+            self.num_rows = len(live)
+            self._changes = 0
+            return mapping
+
+    def _finish_compaction(self) -> None:
+        """Swap in the compacted vector files (must hold the lock, or be opening)"""
+        self._mmap = None
+        self._scales = None
+        for path in self._vector_files():
+            tmp_path = path.with_name(path.name + ".tmp")
+            if tmp_path.exists():
+                os.replace(tmp_path, path)
+        self._checkpoint_path.unlink(missing_ok=True)
+
+        self.conn.execute("DELETE FROM store_meta WHERE name = 'compacting'")
+        self.conn.commit()
+
+    def delete(self, keys: Sequence[str]) -> None:
+        """Delete records by key"""
+        with self._lock:
+            self.conn.executemany("DELETE FROM records WHERE key = ?", [(key,) for key in keys])
+            self.conn.commit()
+            self._changes += len(keys)
+
+    def delete_rows(self, rows: Sequence[int]) -> None:
+        """Delete records by row"""
+        with self._lock:
+            self.conn.executemany(
+                "DELETE FROM records WHERE row = ?", [(int(row),) for row in rows]
+            )
+            self.conn.commit()
+            self._changes += len(rows)
+
+    def records(self) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        """Iterate live records as (row, key, data), oldest first"""
+        cursor = self.conn.execute("SELECT row, key, data FROM records ORDER BY row")
+        for row, key, data in cursor:
+            yield row, key, json.loads(data)
+
+    def _encode(self, vectors: "np.ndarray") -> Tuple["np.ndarray", Optional["np.ndarray"]]:
+        """Convert float32 vectors to the storage type (plus int8 scales)"""
+        if self.dtype == "float16":
+            return vectors.astype(np.float16), None
+        if self.dtype == "int8":
+            # Symmetric per-vector scale: the largest component maps to 127
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            codes = np.rint(vectors / scales[:, None]).clip(-127, 127).astype(np.int8)
+            return codes, scales.astype(np.float32)
+        return vectors, None
+
+    def vectors(self, rows: Optional["Rows"] = None) -> "np.ndarray":
+        """
+        Get vectors by row
+
+        Args:
+            rows: Rows to fetch (None = all rows; a memory-mapped view for float32
+                stores, but a full float32 copy for compact ones)
+
+        Returns:
+            float32 matrix
+        """
+        with self._lock:
+            if self.num_rows == 0:
+                return np.empty((0, self.dimension), dtype=np.float32)
+            matrix, scales = self._matrix()
+
+        selection: Union[slice, "np.ndarray"]
+        if rows is None:
+            if self.dtype == "float32":
+                return matrix
+            selection = slice(None)
+        else:
+            selection = np.asarray(rows, dtype=np.int64)
+
+        vectors = np.asarray(matrix[selection], dtype=np.float32)
+        if scales is not None:
+            vectors *= scales[selection][:, None]
+        return vectors
+
+    def _matrix(self) -> Tuple["np.memmap", Optional["np.memmap"]]:
+        """Memory-mapped stored vectors and scales (must hold the lock; num_rows > 0)"""
+        if self._mmap is None or len(self._mmap) != self.num_rows:
+            self._mmap = np.memmap(
+                self._vectors_path,
+                dtype=self.dtype,
+                mode="r",
+                shape=(self.num_rows, self.dimension),
+            )
+            if self._scales_path is not None:
+                self._scales = np.memmap(
+                    self._scales_path, dtype=np.float32, mode="r", shape=(self.num_rows,)
+                )
+        return self._mmap, self._scales
+
+    def iter_vectors(
+        self, rows: "Rows", batch_size: int = _REBUILD_BATCH
+    ) -> Iterator[Tuple["np.ndarray", "np.ndarray"]]:
+        """
+        Iterate vectors in batches, so compact stores are never decoded whole
+
+        Args:
+            rows: Rows to fetch
+            batch_size: Rows per batch
+
+        Yields:
+            (rows, float32 matrix) per batch
+        """
+        selected = np.asarray(rows, dtype=np.int64)
+        for start in range(0, len(selected), batch_size):
+            batch = selected[start : start + batch_size]
+            yield batch, self.vectors(batch)
+
+    def vector_bytes(self) -> int:
+        """Disk size of the stored vectors (and scales)"""
+        size = self._vectors_path.stat().st_size
+        if self._scales_path is not None:
+            size += self._scales_path.stat().st_size
+        return size
+
+    def clear(self) -> None:
+        """Delete all records, vectors and checkpoints"""
+        with self._lock:
+            self._mmap = None
+            self._scales = None
+            self.conn.execute("DELETE FROM records")
+            self.conn.execute("DELETE FROM store_meta WHERE name = 'checkpoint_rows'")
+            self.conn.commit()
+
+            with open(self._vectors_path, "wb"):
+                pass
+            if self._scales_path is not None:
+                with open(self._scales_path, "wb"):
+                    pass
+            if self._checkpoint_path.exists():
+                self._checkpoint_path.unlink()
+
+            self.num_rows = 0
+            self._changes = 0
+
+    def checkpoint_due(self) -> bool:
+        """Check whether enough changes accumulated for a checkpoint"""
+        return self._changes >= self.checkpoint_interval
+
+    def maybe_checkpoint(self, index) -> None:
+        """Checkpoint the index if enough changes accumulated"""
+        if self.checkpoint_due():
+            self.checkpoint(index)
+
+    def checkpoint(self, index) -> None:
+        """Write the FAISS index to disk atomically"""
+        with self._lock:
+            tmp_path = self._checkpoint_path.with_suffix(".tmp")
+            faiss.write_index(index, str(tmp_path))
+            os.replace(tmp_path, self._checkpoint_path)
+
+            self._set_meta("checkpoint_rows", str(self.num_rows))
+            self.conn.commit()
+            self._changes = 0
+
+    def build_index(self, create_index: Callable[[], Any], rows: Sequence[int]):
+        """
+        Build a new index from stored vectors
+
+        Args:
+            create_index: Factory for an empty ID-mapped index
+            rows: Rows to add
+
+        Returns:
+            Index containing the given rows
+        """
+        index = create_index()
+        for batch, vectors in self.iter_vectors(rows):
+            index.add_with_ids(vectors, batch)
+        return index
+
+    def load_index(
+        self, create_index: Callable[[], Any], live_rows: Sequence[int], keep_stale: bool = False
+    ):
+        """
+        Load the last index checkpoint and catch it up with the log
+
+        Rows added after the checkpoint are added to the index and rows
+        deleted since are removed. Indexes that don't support removal are
+        rebuilt instead, unless keep_stale is set.
+
+        Args:
+            create_index: Factory for an empty ID-mapped index
+            live_rows: Rows of all live records
+            keep_stale: Leave deleted rows in indexes that don't support
+                removal (the caller excludes them at search time)
+
+        Returns:
+            Index containing the live rows (and, with keep_stale, possibly
+            deleted ones)
+        """
+        checkpoint = self._get_meta("checkpoint_rows")
+        if checkpoint is None or not self._checkpoint_path.exists():
+            return self.build_index(create_index, live_rows)
+
+        checkpoint_rows = int(checkpoint)
+        # The SWIG wrapper accepts arrays where FAISS's stubs expect IDSelectors
+        index: Any = faiss.read_index(str(self._checkpoint_path))
+
+        live = np.asarray(live_rows, dtype=np.int64)
+        indexed = faiss_index.index_ids(index)
+        stale = np.setdiff1d(indexed, live, assume_unique=True)
+        if len(stale):
+            try:
+                index.remove_ids(stale)
+            except RuntimeError:
+                # e.g. HNSW graphs don't support removal
+                if not keep_stale:
+                    return self.build_index(create_index, live_rows)
+
+        new_rows = live[live >= checkpoint_rows]
+        for batch, vectors in self.iter_vectors(new_rows):
+            index.add_with_ids(vectors, batch)
+
+        self._changes = len(stale) + len(new_rows)
+        return index
+
+    def close(self) -> None:
+        """Close the metadata database"""
+        with self._lock:
+            self._mmap = None
+            self._scales = None
+            self.conn.close()
@@ -11,6 +11,8 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 from datetime import datetime
 
+from react_agent_framework._compat import dataclass_slots
+
 
 class MessageType(str, Enum):
     """Types of messages between agents."""
@@ -56,6 +58,7 @@ class MessagePriority(int, Enum):
     CRITICAL = 4
 
 
+@dataclass_slots
 @dataclass
 class Message:
     """
@@ -83,6 +86,10 @@ class Message:
         ... )
         >>> print(msg.message_id)
         msg-...
+
+    Instances have no per-instance __dict__. Large queues can hold
+    CompactMessage (react_agent_framework.core.memory), a subclass that only
+    allocates metadata when it is used.
     """
 
     sender: str
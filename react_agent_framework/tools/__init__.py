@@ -11,6 +11,9 @@ from react_agent_framework.tools.filesystem import (
     WriteFile,
     ListDirectory,
     DeleteFile,
+    Grep,
+    ReadFiles,
+    WriteFiles,
 )
 from react_agent_framework.tools.computation import Calculator, CodeExecutor, Shell
 
@@ -26,6 +29,9 @@ __all__ = [
     "WriteFile",
     "ListDirectory",
     "DeleteFile",
+    "Grep",
+    "ReadFiles",
+    "WriteFiles",
     # Computation tools
     "Calculator",
     "CodeExecutor",
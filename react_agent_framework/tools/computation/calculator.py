@@ -3,106 +3,275 @@ Calculator tool for mathematical operations
 """
 
 import ast
+import json
+import math
 import operator
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple, Union
 from react_agent_framework.tools.base import BaseTool
 from react_agent_framework.tools.registry import register_tool
 
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None  # type: ignore
+
+# Supported operators
+OPERATORS: Dict[type, Callable[..., Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+    ast.Mod: operator.mod,
+    ast.FloorDiv: operator.floordiv,
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau, "inf": math.inf}
+
+# Element-wise functions: name -> (scalar implementation, NumPy function name)
+FUNCTIONS = {
+    "sqrt": (math.sqrt, "sqrt"),
+    "exp": (math.exp, "exp"),
+    "log": (math.log, "log"),
+    "log10": (math.log10, "log10"),
+    "log2": (math.log2, "log2"),
+    "sin": (math.sin, "sin"),
+    "cos": (math.cos, "cos"),
+    "tan": (math.tan, "tan"),
+    "asin": (math.asin, "arcsin"),
+    "acos": (math.acos, "arccos"),
+    "atan": (math.atan, "arctan"),
+    "sinh": (math.sinh, "sinh"),
+    "cosh": (math.cosh, "cosh"),
+    "tanh": (math.tanh, "tanh"),
+    "abs": (abs, "abs"),
+    "floor": (math.floor, "floor"),
+    "ceil": (math.ceil, "ceil"),
+    "round": (lambda x, ndigits=0: round(x, int(ndigits)), "round"),
+    "min": (min, "minimum"),
+    "max": (max, "maximum"),
+}
+
+# Reductions over a whole array (vectorized mode only)
+REDUCTIONS = {
+    "sum": "sum",
+    "mean": "mean",
+    "std": "std",
+    "var": "var",
+    "prod": "prod",
+}
+
+# Compiled expression: (namespace) -> value
+Compiled = Callable[[Dict[str, Any]], Any]
+
+# Values bound to a variable (an array when NumPy is available)
+Values = Union[List[float], "np.ndarray"]
+
+
+def _compile_node(node: ast.AST) -> Compiled:
+    """
+    Compile an AST node into a closure
+
+    Args:
+        node: AST node to compile
+
+    Returns:
+        Function evaluating the node against a namespace of variables and functions
+
+    Raises:
+        ValueError: If expression is invalid or unsafe
+    """
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            value = float(node.value)
+            return lambda ns: value
+        raise ValueError(f"Unsupported constant type: {type(node.value)}")
+
+    elif isinstance(node, ast.BinOp):
+        op_type = type(node.op)
+        if op_type not in OPERATORS:
+            raise ValueError(f"Unsupported operator: {op_type.__name__}")
+
+        op = OPERATORS[op_type]
+        left = _compile_node(node.left)
+        right = _compile_node(node.right)
+        return lambda ns: op(left(ns), right(ns))
+
+    elif isinstance(node, ast.UnaryOp):
+        unary_type = type(node.op)
+        if unary_type not in OPERATORS:
+            raise ValueError(f"Unsupported unary operator: {unary_type.__name__}")
+
+        op = OPERATORS[unary_type]
+        operand = _compile_node(node.operand)
+        return lambda ns: op(operand(ns))
+
+    elif isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda ns: value
+
+        def lookup(ns):
+            if name not in ns:
+                raise ValueError(f"Unknown name: {name}")
+            return ns[name]
+
+        return lookup
+
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise ValueError("Only simple function calls are supported, e.g. sqrt(x)")
+
+        name = node.func.id
+        if name not in FUNCTIONS and name not in REDUCTIONS:
+            raise ValueError(f"Unsupported function: {name}")
+        if not node.args:
+            raise ValueError(f"Function {name} requires arguments")
+
+        args = [_compile_node(arg) for arg in node.args]
+        key = f"fn:{name}"
+        return lambda ns: ns[key](*[arg(ns) for arg in args])
+
+    else:
+        raise ValueError(f"Unsupported expression type: {type(node).__name__}")
+
+
+@lru_cache(maxsize=512)
+def _compile(expression: str) -> Tuple[Compiled, Tuple[str, ...]]:
+    """
+    Parse and compile an expression, cached by expression string
+
+    Returns:
+        Compiled expression and the free variable names it references
+    """
+    tree = ast.parse(expression, mode="eval")
+    compiled = _compile_node(tree.body)
+
+    names = sorted(
+        {
+            node.id
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Name)
+            and node.id not in CONSTANTS
+            and node.id not in FUNCTIONS
+            and node.id not in REDUCTIONS
+        }
+    )
+    return compiled, tuple(names)
+
+
+def _scalar_reduction(name: str) -> Callable:
+    """Reductions have no meaning on scalars"""
+
+    def reduce(*args):
+        raise ValueError(f"{name}() requires vectorized mode with NumPy installed")
+
+    return reduce
+
+
+def _scalar_namespace() -> Dict[str, Any]:
+    """Namespace for scalar evaluation"""
+    ns = {f"fn:{name}": func for name, (func, _) in FUNCTIONS.items()}
+    ns.update({f"fn:{name}": _scalar_reduction(name) for name in REDUCTIONS})
+    return ns
+
+
+def _numpy_namespace() -> Dict[str, Any]:
+    """Namespace for vectorized evaluation"""
+    ns = {}
+    for name, (_, np_name) in FUNCTIONS.items():
+        ufunc = getattr(np, np_name)
+        if name == "round":
+            ns[f"fn:{name}"] = lambda x, ndigits=0: np.round(x, int(ndigits))
+        elif name in ("min", "max"):
+            # min(x) reduces an array, min(x, y) is element-wise
+            reducer = np.min if name == "min" else np.max
+
+            def func(*args, ufunc=ufunc, reducer=reducer):
+                if len(args) == 1:
+                    return reducer(args[0])
+                result = args[0]
+                for arg in args[1:]:
+                    result = ufunc(result, arg)
+                return result
+
+            ns[f"fn:{name}"] = func
+        else:
+            ns[f"fn:{name}"] = ufunc
+    ns.update({f"fn:{name}": getattr(np, np_name) for name, np_name in REDUCTIONS.items()})
+    return ns
+
 
 @register_tool
 class Calculator(BaseTool):
     """
     Safe mathematical calculator
 
-    Evaluates mathematical expressions safely without exec()
+    Evaluates mathematical expressions safely without exec(). Parsed
+    expressions are compiled once and cached, and can be evaluated over
+    arrays of values in a single call (vectorized with NumPy if installed).
     """
 
     name = "calculator"
     description = (
-        "Evaluate mathematical expressions. Input: expression (e.g., '2 + 2', '10 * (5 + 3)')"
+        "Evaluate mathematical expressions. Input: expression (e.g., '2 + 2', '10 * (5 + 3)', "
+        "'sqrt(2) * pi'). Evaluate over many values with variables: "
+        "'x**2 + y|||x=1:1000|||y=0.5' or 'x * y|||x=[1, 2]|||y=[3, 4]' "
+        "(ranges are start:stop[:step], stop exclusive). "
+        "Reductions: sum, mean, std, var, prod, min(x), max(x)"
     )
     category = "computation"
 
     # Supported operators
-    OPERATORS = {
-        ast.Add: operator.add,
-        ast.Sub: operator.sub,
-        ast.Mult: operator.mul,
-        ast.Div: operator.truediv,
-        ast.Pow: operator.pow,
-        ast.Mod: operator.mod,
-        ast.FloorDiv: operator.floordiv,
-        ast.UAdd: operator.pos,
-        ast.USub: operator.neg,
-    }
-
-    def __init__(self, **kwargs):
-        """Initialize calculator tool"""
-        super().__init__(**kwargs)
+    OPERATORS = OPERATORS
 
-    def _evaluate_node(self, node: ast.AST) -> float:
+    def __init__(self, max_elements: int = 1_000_000, max_output_items: int = 20, **kwargs):
         """
-        Safely evaluate AST node
+        Initialize calculator tool
 
         Args:
-            node: AST node to evaluate
-
-        Returns:
-            Numeric result
-
-        Raises:
-            ValueError: If expression is invalid or unsafe
+            max_elements: Maximum number of values per variable in vectorized mode
+            max_output_items: Array results longer than this are summarized
         """
-        if isinstance(node, ast.Constant):
-            if isinstance(node.value, (int, float)):
-                return float(node.value)
-            raise ValueError(f"Unsupported constant type: {type(node.value)}")
-
-        elif isinstance(node, ast.BinOp):
-            left = self._evaluate_node(node.left)
-            right = self._evaluate_node(node.right)
-            op_type = type(node.op)
-
-            if op_type not in self.OPERATORS:
-                raise ValueError(f"Unsupported operator: {op_type.__name__}")
-
-            return self.OPERATORS[op_type](left, right)
-
-        elif isinstance(node, ast.UnaryOp):
-            operand = self._evaluate_node(node.operand)
-            op_type = type(node.op)
-
-            if op_type not in self.OPERATORS:
-                raise ValueError(f"Unsupported unary operator: {op_type.__name__}")
-
-            return self.OPERATORS[op_type](operand)
-
-        else:
-            raise ValueError(f"Unsupported expression type: {type(node).__name__}")
+        super().__init__(**kwargs)
+        self.max_elements = max_elements
+        self.max_output_items = max_output_items
+        self._scalar_ns = _scalar_namespace()
+        self._numpy_ns = _numpy_namespace() if NUMPY_AVAILABLE else None
 
     def execute(self, input_text: str) -> str:
         """
         Execute calculator
 
         Args:
-            input_text: Mathematical expression
+            input_text: Mathematical expression, optionally followed by
+                "|||name=values" variable bindings
 
         Returns:
             Calculation result or error message
         """
-        expression = input_text.strip()
+        expression, *bindings = [part.strip() for part in input_text.split("|||")]
 
         try:
-            # Parse expression into AST
-            tree = ast.parse(expression, mode="eval")
+            # Parse and compile, or reuse the cached compiled expression
+            compiled, names = _compile(expression)
 
-            # Evaluate safely
-            result = self._evaluate_node(tree.body)
+            if not bindings and not names:
+                return self._format_number(compiled(self._scalar_ns))
 
-            # Format result
-            if result == int(result):
-                return str(int(result))
-            else:
-                return f"{result:.10g}"  # Remove trailing zeros
+            variables = self._parse_bindings(bindings)
+            missing = [name for name in names if name not in variables]
+            if missing:
+                return f"Error: Unbound variable(s): {', '.join(missing)}"
+
+            return self._evaluate_vectorized(compiled, variables)
 
         except SyntaxError:
             return f"Error: Invalid mathematical expression: {expression}"
@@ -112,3 +281,119 @@ class Calculator(BaseTool):
             return "Error: Division by zero"
         except Exception as e:
             return f"Error calculating expression: {str(e)}"
+
+    def _parse_bindings(self, bindings: List[str]) -> Dict[str, Values]:
+        """Parse "name=start:stop[:step]" and "name=[v1, v2, ...]" bindings"""
+        variables = {}
+
+        for binding in bindings:
+            name, sep, spec = binding.partition("=")
+            name, spec = name.strip(), spec.strip()
+            if not sep or not name.isidentifier():
+                raise ValueError(f"Invalid variable binding: {binding}")
+            if name in CONSTANTS or name in FUNCTIONS or name in REDUCTIONS:
+                raise ValueError(f"Cannot rebind reserved name: {name}")
+
+            if spec.startswith("["):
+                try:
+                    values = json.loads(spec)
+                except json.JSONDecodeError:
+                    raise ValueError(f"Invalid value list for {name}")
+                if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+                    raise ValueError(f"Value list for {name} must contain numbers")
+                values = [float(v) for v in values]
+            else:
+                values = self._parse_range(name, spec)
+
+            if len(values) == 0:
+                raise ValueError(f"No values for {name}")
+            if len(values) > self.max_elements:
+                raise ValueError(
+                    f"Too many values for {name}: {len(values)}. Max: {self.max_elements}"
+                )
+            variables[name] = values
+
+        return variables
+
+    def _parse_range(self, name: str, spec: str) -> Values:
+        """Parse "start:stop[:step]" (stop exclusive) or a single number"""
+        try:
+            parts = [float(part) for part in spec.split(":")]
+        except ValueError:
+            raise ValueError(f"Invalid range for {name}: {spec}")
+
+        if len(parts) == 1:
+            return parts
+        if len(parts) not in (2, 3):
+            raise ValueError(f"Invalid range for {name}: {spec}")
+
+        start, stop = parts[0], parts[1]
+        step = parts[2] if len(parts) == 3 else 1.0
+        if step == 0:
+            raise ValueError(f"Range step for {name} cannot be zero")
+
+        count = max(math.ceil((stop - start) / step), 0)
+        if count > self.max_elements:
+            raise ValueError(f"Too many values for {name}: {count}. Max: {self.max_elements}")
+
+        if NUMPY_AVAILABLE:
+            return start + np.arange(count) * step
+        return [start + i * step for i in range(count)]
+
+    def _evaluate_vectorized(
+        self, compiled: Compiled, variables: Dict[str, Values]
+    ) -> str:
+        """Evaluate a compiled expression over variable arrays"""
+        lengths = {len(values) for values in variables.values() if len(values) > 1}
+        if len(lengths) > 1:
+            raise ValueError("Variables must have the same number of values (or a single value)")
+
+        if self._numpy_ns is not None:
+            ns = dict(self._numpy_ns)
+            for name, values in variables.items():
+                ns[name] = np.asarray(values, dtype=float) if len(values) > 1 else values[0]
+            # Division by zero and overflow yield inf/nan per element, reported in the summary
+            with np.errstate(all="ignore"):
+                result = compiled(ns)
+            if np.ndim(result) == 0:
+                return self._format_number(float(result))
+            return self._format_array(np.asarray(result, dtype=float).tolist())
+
+        # Pure-Python fallback: evaluate element by element
+        size = max(lengths) if lengths else 1
+        ns = dict(self._scalar_ns)
+        results = []
+        for i in range(size):
+            for name, values in variables.items():
+                ns[name] = values[i] if len(values) > 1 else values[0]
+            results.append(compiled(ns))
+
+        if size == 1:
+            return self._format_number(results[0])
+        return self._format_array(results)
+
+    def _format_number(self, result: float) -> str:
+        """Format a scalar result"""
+        if math.isfinite(result) and result == int(result):
+            return str(int(result))
+        return f"{result:.10g}"  # Remove trailing zeros
+
+    def _format_array(self, results: List[float]) -> str:
+        """Format an array result, summarizing long arrays"""
+        if len(results) <= self.max_output_items:
+            return "[" + ", ".join(self._format_number(r) for r in results) + "]"
+
+        finite = [r for r in results if math.isfinite(r)]
+        head = ", ".join(self._format_number(r) for r in results[:5])
+        tail = ", ".join(self._format_number(r) for r in results[-3:])
+        summary = [f"{len(results)} values: [{head}, ..., {tail}]"]
+        if finite:
+            summary.append(
+                f"sum={self._format_number(math.fsum(finite))}, "
+                f"mean={self._format_number(math.fsum(finite) / len(finite))}, "
+                f"min={self._format_number(min(finite))}, "
+                f"max={self._format_number(max(finite))}"
+            )
+        if len(finite) < len(results):
+            summary.append(f"{len(results) - len(finite)} non-finite value(s)")
+        return "\n".join(summary)
@@ -6,5 +6,16 @@ from react_agent_framework.tools.filesystem.read import ReadFile
 from react_agent_framework.tools.filesystem.write import WriteFile
 from react_agent_framework.tools.filesystem.list import ListDirectory
 from react_agent_framework.tools.filesystem.delete import DeleteFile
+from react_agent_framework.tools.filesystem.grep import Grep
+from react_agent_framework.tools.filesystem.read_batch import ReadFiles
+from react_agent_framework.tools.filesystem.write_batch import WriteFiles
 
-__all__ = ["ReadFile", "WriteFile", "ListDirectory", "DeleteFile"]
+__all__ = [
+    "ReadFile",
+    "WriteFile",
+    "ListDirectory",
+    "DeleteFile",
+    "Grep",
+    "ReadFiles",
+    "WriteFiles",
+]
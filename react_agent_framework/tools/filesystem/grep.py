@@ -0,0 +1,313 @@
+"""
+Grep tool for searching file contents
+"""
+
+import os
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set
+from react_agent_framework.core.environment.file_index import FileIndex, scan_files
+from react_agent_framework.tools.base import BaseTool
+from react_agent_framework.tools.registry import register_tool
+
+# Files searched per worker task
+_BATCH_SIZE = 64
+
+# Directory indexes kept between searches
+_MAX_INDEXES = 8
+
+
+@dataclass
+class GrepMatch:
+    """A matching line"""
+
+    path: str
+    line: int
+    text: str
+
+
+@register_tool
+class Grep(BaseTool):
+    """
+    Search file contents with a regular expression
+
+    Directory trees are listed through a FileIndex (kept between calls, so
+    repeated searches only re-list changed directories) and scanned in
+    parallel worker processes with its mmap scanner. Honors .gitignore files,
+    and stops at the result limit or deadline. Format: pattern|||path|||option...
+    """
+
+    name = "grep"
+    description = (
+        'Search file contents with a regex. Input: "pattern|||path" (path defaults to '
+        'current directory). Options: glob=*.py, ignore_case=true (e.g. "def main|||src|||glob=*.py")'
+    )
+    category = "filesystem"
+
+    def __init__(
+        self,
+        safe_mode: bool = True,
+        max_results: int = 100,
+        timeout: float = 10.0,
+        max_workers: Optional[int] = None,
+        max_file_size_mb: int = 100,
+        respect_gitignore: bool = True,
+        **kwargs,
+    ):
+        """
+        Initialize grep tool
+
+        Args:
+            safe_mode: If True, skips sensitive files
+            max_results: Maximum matching lines returned
+            timeout: Search deadline in seconds
+            max_workers: Worker processes (default: CPU count, 1 = in-process)
+            max_file_size_mb: Files larger than this are skipped
+            respect_gitignore: Skip files ignored by .gitignore
+        """
+        super().__init__(**kwargs)
+        self.safe_mode = safe_mode
+        self.max_results = max_results
+        self.timeout = timeout
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
+        self.respect_gitignore = respect_gitignore
+
+        # Worker pool is created on first parallel search and reused
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._indexes: "OrderedDict[str, FileIndex]" = OrderedDict()
+
+        # Sensitive patterns to block in safe mode
+        self.blocked_patterns = [
+            ".ssh",
+            ".env",
+            "password",
+            "credentials",
+            ".key",
+            "private",
+            "secret",
+        ]
+
+    def validate_input(self, input_text: str) -> bool:
+        """Validate pattern and path"""
+        if not input_text or not input_text.split("|||")[0]:
+            return False
+
+        parts = input_text.split("|||")
+        if self.safe_mode and len(parts) > 1:
+            path_lower = parts[1].strip().lower()
+            for pattern in self.blocked_patterns:
+                if pattern in path_lower:
+                    return False
+
+        return True
+
+    def execute(self, input_text: str) -> str:
+        """
+        Search file contents
+
+        Args:
+            input_text: Format "pattern|||path|||option..."
+
+        Returns:
+            Matching lines as "path:line: text" or error message
+        """
+        parts = input_text.split("|||")
+        pattern = parts[0]
+        search_path = parts[1].strip() if len(parts) > 1 and parts[1].strip() else "."
+
+        options: Dict[str, str] = {}
+        for raw in parts[2:]:
+            key, _, value = raw.partition("=")
+            options[key.strip().lower()] = value.strip()
+
+        unknown = set(options) - {"glob", "ignore_case"}
+        if unknown:
+            return f"Error: Unknown option(s): {', '.join(sorted(unknown))}. Available: glob, ignore_case"
+
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            return f"Error: Invalid regex: {str(e)}"
+
+        root = Path(search_path).expanduser().resolve()
+        if not root.exists():
+            return f"Error: Path not found: {search_path}"
+
+        start = time.time()
+        stats: Dict[str, object] = {}
+        try:
+            matches = list(
+                self.stream(
+                    pattern,
+                    str(root),
+                    glob=options.get("glob"),
+                    ignore_case=options.get("ignore_case", "").lower() in ("1", "true", "yes"),
+                    stats=stats,
+                )
+            )
+        except PermissionError:
+            return f"Error: Permission denied: {search_path}"
+        except Exception as e:
+            return f"Error searching files: {str(e)}"
+
+        elapsed = time.time() - start
+        if not matches:
+            result = f"No matches for /{pattern}/ ({stats.get('files', 0)} files searched in {elapsed:.2f}s)"
+        else:
+            base = root if root.is_dir() else root.parent
+            files = len({m.path for m in matches})
+            lines = [
+                f"{os.path.relpath(m.path, base)}:{m.line}: {m.text.strip()}"
+                for m in sorted(matches, key=lambda m: (m.path, m.line))
+            ]
+            result = (
+                f"Found {len(matches)} match(es) in {files} file(s) "
+                f"({stats.get('files', 0)} files searched in {elapsed:.2f}s)\n" + "\n".join(lines)
+            )
+
+        if stats.get("limit_reached"):
+            result += f"\n[limit reached: showing first {self.max_results} matches]"
+        if stats.get("timed_out"):
+            result += f"\n[deadline of {self.timeout}s reached: results may be incomplete]"
+
+        return result
+
+    def stream(
+        self,
+        pattern: str,
+        path: str = ".",
+        glob: Optional[str] = None,
+        ignore_case: bool = False,
+        stats: Optional[Dict[str, object]] = None,
+    ) -> Iterator[GrepMatch]:
+        """
+        Yield matches as worker batches complete
+
+        Args:
+            pattern: Regular expression
+            path: File or directory to search
+            glob: Only search file names matching this glob
+            ignore_case: Case-insensitive matching
+            stats: Optional dict filled with files/limit_reached/timed_out
+
+        Yields:
+            GrepMatch objects (in completion order, not file order)
+        """
+        stats = stats if stats is not None else {}
+        deadline = time.time() + self.timeout
+        flags = re.IGNORECASE if ignore_case else 0
+
+        files = list(self._collect_files(os.path.abspath(path), glob))
+        stats.update({"files": len(files), "limit_reached": False, "timed_out": False})
+
+        batches = [files[i : i + _BATCH_SIZE] for i in range(0, len(files), _BATCH_SIZE)]
+        emitted = 0
+
+        # Batches ask for one match beyond the limit, so the limit is only
+        # reported when something was actually left out
+        if self.max_workers <= 1 or len(batches) <= 1:
+            # Small searches are not worth the inter-process overhead
+            for batch in batches:
+                for hit in scan_files(
+                    batch, pattern, flags, self.max_results - emitted + 1, deadline
+                ):
+                    if emitted >= self.max_results:
+                        stats["limit_reached"] = True
+                        return
+                    emitted += 1
+                    yield GrepMatch(*hit)
+                if time.time() > deadline:
+                    stats["timed_out"] = True
+                    return
+            return
+
+        pool = self._get_pool()
+        pending: Set[Future] = {
+            pool.submit(scan_files, batch, pattern, flags, self.max_results + 1, deadline)
+            for batch in batches
+        }
+
+        try:
+            while pending:
+                done, pending = wait(
+                    pending,
+                    timeout=max(deadline - time.time(), 0),
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    stats["timed_out"] = True
+                    return
+
+                for future in done:
+                    for hit in future.result():
+                        if emitted >= self.max_results:
+                            stats["limit_reached"] = True
+                            return
+                        emitted += 1
+                        yield GrepMatch(*hit)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        """Shut down worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Get or create the worker pool"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def _collect_files(self, root: str, glob: Optional[str]) -> Iterator[str]:
+        """List root through its index, skipping sensitive, oversized and non-matching files"""
+        import fnmatch
+
+        if os.path.isfile(root):
+            # A file named directly gets the same checks as ReadFile
+            if self.safe_mode and self._is_sensitive(root):
+                return
+            if os.path.getsize(root) > self.max_file_size_bytes:
+                return
+            yield root
+            return
+
+        index = self._get_index(root)
+        index.refresh(force=True)
+        for path, size in index.files():
+            if glob and not fnmatch.fnmatch(os.path.basename(path), glob):
+                continue
+            if self.safe_mode and self._is_sensitive(os.path.relpath(path, root)):
+                continue
+            if size > self.max_file_size_bytes:
+                continue
+            yield path
+
+    def _get_index(self, root: str) -> FileIndex:
+        """Get or create the index of a directory (least recently used are dropped)"""
+        index = self._indexes.get(root)
+        if index is None:
+            index = FileIndex(root, ignore_dirs=[".git"], respect_gitignore=self.respect_gitignore)
+            self._indexes[root] = index
+            if len(self._indexes) > _MAX_INDEXES:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(root)
+        return index
+
+    def _is_sensitive(self, path: str) -> bool:
+        """Check path against blocked patterns"""
+        path_lower = path.lower()
+        return any(pattern in path_lower for pattern in self.blocked_patterns)
+
+    def __del__(self):
+        """Cleanup: stop worker processes"""
+        if getattr(self, "_pool", None) is not None:
+            self.close()
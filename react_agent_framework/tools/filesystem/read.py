@@ -2,10 +2,61 @@
 Read file tool
 """
 
+import mmap
+import re
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from react_agent_framework.tools.base import BaseTool
 from react_agent_framework.tools.registry import register_tool
 
+# Block size used when scanning memory-mapped files for newlines
+_SCAN_CHUNK = 1024 * 1024
+
+
+def _format_size(size_bytes: int) -> str:
+    """Format byte count for excerpt headers"""
+    if size_bytes < 1024:
+        return f"{size_bytes}B"
+    elif size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.1f}KB"
+    elif size_bytes < 1024 * 1024 * 1024:
+        return f"{size_bytes / 1024 / 1024:.1f}MB"
+    return f"{size_bytes / 1024 / 1024 / 1024:.2f}GB"
+
+
+def _line_offset(mm: mmap.mmap, line_no: int) -> int:
+    """Byte offset where 1-based line `line_no` starts (file size if past EOF)"""
+    remaining = line_no - 1
+    pos = 0
+    size = len(mm)
+
+    while remaining > 0 and pos < size:
+        chunk = mm[pos : pos + _SCAN_CHUNK]
+        newlines = chunk.count(b"\n")
+        if newlines < remaining:
+            remaining -= newlines
+            pos += len(chunk)
+            continue
+
+        # Target line starts inside this chunk
+        idx = -1
+        for _ in range(remaining):
+            idx = chunk.find(b"\n", idx + 1)
+        return pos + idx + 1
+
+    return pos if remaining == 0 else size
+
+
+def _count_lines(mm: mmap.mmap, start: int, end: int) -> int:
+    """Count newlines in mm[start:end] without copying the whole range"""
+    total = 0
+    pos = start
+    while pos < end:
+        stop = min(pos + _SCAN_CHUNK, end)
+        total += mm[pos:stop].count(b"\n")
+        pos = stop
+    return total
+
 
 @register_tool
 class ReadFile(BaseTool):
@@ -13,23 +64,46 @@ class ReadFile(BaseTool):
     Read contents from a file
 
     Safe mode prevents reading sensitive files
+
+    Small files are returned whole. Ranged reads memory-map the file and return
+    a bounded excerpt plus a continuation cursor, so large logs can be paged
+    through without loading them. Format: path|||option|||option...
     """
 
     name = "read"
-    description = "Read contents from a file. Input: file path"
+    description = (
+        "Read contents from a file. Input: file path. For large files add options "
+        'separated by "|||": lines=START-END, bytes=START-END, head=N, tail=N, '
+        "grep=REGEX (with context=N), cursor=OFFSET to continue a previous excerpt "
+        '(e.g. "app.log|||tail=100", "app.log|||grep=ERROR \\d+|||context=2")'
+    )
     category = "filesystem"
 
-    def __init__(self, safe_mode: bool = True, max_size_mb: int = 10, **kwargs):
+    # Options accepted after the path
+    OPTIONS = ("lines", "bytes", "head", "tail", "grep", "context", "cursor")
+
+    def __init__(
+        self,
+        safe_mode: bool = True,
+        max_size_mb: int = 10,
+        max_excerpt_kb: int = 16,
+        max_matches: int = 50,
+        **kwargs,
+    ):
         """
         Initialize read file tool
 
         Args:
             safe_mode: If True, prevents reading sensitive files
-            max_size_mb: Maximum file size in MB
+            max_size_mb: Maximum file size in MB returned whole (larger files are excerpted)
+            max_excerpt_kb: Maximum excerpt size in KB for ranged reads
+            max_matches: Maximum regex matches returned per grep call
         """
         super().__init__(**kwargs)
         self.safe_mode = safe_mode
         self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.max_excerpt_bytes = max_excerpt_kb * 1024
+        self.max_matches = max_matches
 
         # Sensitive patterns to block in safe mode
         self.blocked_patterns = [
@@ -47,8 +121,12 @@ class ReadFile(BaseTool):
         if not input_text or not input_text.strip():
             return False
 
+        file_path = input_text.split("|||")[0].strip()
+        if not file_path:
+            return False
+
         if self.safe_mode:
-            path_lower = input_text.lower()
+            path_lower = file_path.lower()
             for pattern in self.blocked_patterns:
                 if pattern in path_lower:
                     return False
@@ -60,38 +138,275 @@ class ReadFile(BaseTool):
         Read file contents
 
         Args:
-            input_text: File path
+            input_text: File path, optionally followed by "|||"-separated options
+
+        Returns:
+            File contents, a bounded excerpt, or error message
+        """
+        return self.read(input_text)[1]
+
+    def read(self, input_text: str) -> Tuple[bool, str]:
+        """
+        Read file contents, reporting success separately
+
+        File contents may themselves start with "Error", so callers that need
+        to know whether the read worked use this instead of execute().
+
+        Args:
+            input_text: File path, optionally followed by "|||"-separated options
 
         Returns:
-            File contents or error message
+            Tuple of (success, contents or error message)
         """
-        file_path = input_text.strip()
+        parts = input_text.split("|||")
+        file_path = parts[0].strip()
+
+        try:
+            options = self._parse_options(parts[1:])
+        except ValueError as e:
+            return False, f"Error: {str(e)}"
 
         try:
             path = Path(file_path).expanduser().resolve()
 
             # Check if file exists
             if not path.exists():
-                return f"Error: File not found: {file_path}"
+                return False, f"Error: File not found: {file_path}"
 
             # Check if it's a file
             if not path.is_file():
-                return f"Error: Not a file: {file_path}"
+                return False, f"Error: Not a file: {file_path}"
 
             # Check file size
             file_size = path.stat().st_size
-            if file_size > self.max_size_bytes:
-                return f"Error: File too large ({file_size / 1024 / 1024:.2f} MB). Max: {self.max_size_bytes / 1024 / 1024} MB"
+            if options or file_size > self.max_size_bytes:
+                return True, self._read_excerpt(path, file_path, file_size, options)
 
             # Read file
             with open(path, "r", encoding="utf-8") as f:
                 content = f.read()
 
-            return content
+            return True, content
 
         except UnicodeDecodeError:
-            return f"Error: Cannot read file (binary or unsupported encoding): {file_path}"
+            return False, f"Error: Cannot read file (binary or unsupported encoding): {file_path}"
         except PermissionError:
-            return f"Error: Permission denied: {file_path}"
+            return False, f"Error: Permission denied: {file_path}"
+        except ValueError as e:
+            return False, f"Error: {str(e)}"
         except Exception as e:
-            return f"Error reading file: {str(e)}"
+            return False, f"Error reading file: {str(e)}"
+
+    def _parse_options(self, raw_options) -> Dict[str, str]:
+        """Parse "key=value" options following the path"""
+        options: Dict[str, str] = {}
+        for raw in raw_options:
+            if not raw.strip():
+                continue
+            if "=" not in raw:
+                raise ValueError(f"Invalid option '{raw.strip()}'. Use key=value")
+
+            key, value = raw.split("=", 1)
+            key = key.strip().lower()
+            if key not in self.OPTIONS:
+                raise ValueError(f"Unknown option '{key}'. Available: {', '.join(self.OPTIONS)}")
+
+            # Regex patterns keep surrounding whitespace significant
+            options[key] = value if key == "grep" else value.strip()
+
+            if key in ("head", "tail", "context", "cursor"):
+                if not options[key].isdigit():
+                    raise ValueError(f"Option '{key}' expects a non-negative integer")
+
+        return options
+
+    def _parse_range(self, value: str, name: str) -> Tuple[int, Optional[int]]:
+        """Parse "START-END" (END optional) into integers"""
+        start_str, _, end_str = value.partition("-")
+        try:
+            start = int(start_str) if start_str.strip() else 0
+            end = int(end_str) if end_str.strip() else None
+        except ValueError:
+            raise ValueError(f"Invalid {name} range '{value}'. Use START-END")
+
+        if start < 0 or (end is not None and end < start):
+            raise ValueError(f"Invalid {name} range '{value}'")
+
+        return start, end
+
+    def _read_excerpt(
+        self, path: Path, file_path: str, file_size: int, options: Dict[str, str]
+    ) -> str:
+        """Serve a bounded excerpt from a memory-mapped file"""
+        if file_size == 0:
+            return f"[{file_path}: empty file]"
+
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if "grep" in options:
+                    return self._grep(mm, file_path, options)
+
+                first_line: Optional[int] = None
+                last_line: Optional[int] = None
+
+                if "lines" in options:
+                    start_line, end_line = self._parse_range(options["lines"], "lines")
+                    start_line = max(start_line, 1)
+                    start = _line_offset(mm, start_line)
+                    end = _line_offset(mm, end_line + 1) if end_line is not None else file_size
+                    first_line, last_line = start_line, end_line
+
+                elif "bytes" in options:
+                    start, end_byte = self._parse_range(options["bytes"], "bytes")
+                    start = min(start, file_size)
+                    end = min(end_byte + 1, file_size) if end_byte is not None else file_size
+
+                elif "head" in options:
+                    start = 0
+                    end = _line_offset(mm, int(options["head"]) + 1)
+                    first_line = 1
+
+                elif "tail" in options:
+                    n = int(options["tail"])
+                    end = file_size
+                    # Ignore the trailing newline when counting back
+                    pos = end - 1 if mm[end - 1 : end] == b"\n" else end
+                    for _ in range(n):
+                        pos = mm.rfind(b"\n", 0, pos)
+                        if pos < 0:
+                            break
+                    start = pos + 1 if pos >= 0 else 0
+
+                else:
+                    start = min(int(options.get("cursor", 0)), file_size)
+                    end = file_size
+
+                return self._render_window(
+                    mm, file_path, file_size, start, end, first_line, last_line
+                )
+
+    def _render_window(
+        self,
+        mm: mmap.mmap,
+        file_path: str,
+        file_size: int,
+        start: int,
+        end: int,
+        first_line: Optional[int] = None,
+        last_line: Optional[int] = None,
+    ) -> str:
+        """Render mm[start:end] capped to the excerpt budget with a continuation cursor"""
+        start = min(start, file_size)
+        end = min(max(end, start), file_size)
+
+        if start == end:
+            header = f"[{file_path}: empty range at byte {start} of {_format_size(file_size)}"
+            if first_line is not None and first_line > 1:
+                # Only a start line past the end of the file selects nothing
+                line_count = _count_lines(mm, 0, file_size) + (0 if mm[-1:] == b"\n" else 1)
+                header += f", file ends at line {line_count}"
+            return header + "]"
+
+        stop = min(end, start + self.max_excerpt_bytes)
+
+        # Cut on a line boundary when the window is truncated
+        if stop < end:
+            newline = mm.rfind(b"\n", start, stop)
+            if newline >= start:
+                stop = newline + 1
+
+        text = mm[start:stop].decode("utf-8", errors="replace")
+
+        header = f"[{file_path}: bytes {start}-{max(stop - 1, start)} of {_format_size(file_size)}"
+        if first_line is not None:
+            # A final line without a trailing newline still counts
+            line_count = text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+            shown_last = first_line + line_count - 1
+            header += f", lines {first_line}-{shown_last}"
+            if last_line is not None and stop == end and shown_last < last_line:
+                header += f" (clamped from {first_line}-{last_line}: end of file)"
+        header += "]"
+
+        result = header + "\n" + text
+        if stop < end:
+            range_end = "" if end >= file_size else str(end - 1)
+            result += (
+                f"\n[truncated: {end - stop} more bytes. "
+                f'Continue with "{file_path}|||bytes={stop}-{range_end}"]'
+            )
+        return result
+
+    def _grep(self, mm: mmap.mmap, file_path: str, options: Dict[str, str]) -> str:
+        """Return regex-matched line windows with a continuation cursor"""
+        try:
+            regex = re.compile(options["grep"].encode("utf-8"))
+        except re.error as e:
+            raise ValueError(f"Invalid regex: {str(e)}")
+
+        context = int(options.get("context", 0))
+        size = len(mm)
+        cursor = min(int(options.get("cursor", 0)), size)
+
+        # Line numbers are tracked incrementally between matches
+        line_no = 1 + _count_lines(mm, 0, cursor)
+        counted_to = cursor
+
+        blocks: List[str] = []
+        used = 0
+        matches = 0
+        last_end = cursor
+        next_cursor: Optional[int] = None
+
+        for match in regex.finditer(mm, cursor):
+            line_start = mm.rfind(b"\n", 0, match.start()) + 1
+            if line_start < last_end:
+                # Match falls inside a window that was already emitted
+                continue
+
+            # Expand to surrounding context lines
+            window_start = line_start
+            for _ in range(context):
+                if window_start == 0:
+                    break
+                window_start = mm.rfind(b"\n", 0, window_start - 1) + 1
+            window_start = max(window_start, last_end)
+
+            window_end = mm.find(b"\n", match.end())
+            window_end = size if window_end < 0 else window_end + 1
+            for _ in range(context):
+                if window_end >= size:
+                    break
+                nxt = mm.find(b"\n", window_end)
+                window_end = size if nxt < 0 else nxt + 1
+
+            block_bytes = window_end - window_start
+            if blocks and used + block_bytes > self.max_excerpt_bytes:
+                next_cursor = window_start
+                break
+
+            line_no += _count_lines(mm, counted_to, window_start)
+            counted_to = window_start
+
+            block_stop = min(window_end, window_start + self.max_excerpt_bytes)
+            text = mm[window_start:block_stop].decode("utf-8", errors="replace")
+            blocks.append(f"--- line {line_no} (byte {window_start}) ---\n{text.rstrip(chr(10))}")
+            used += block_bytes
+            matches += 1
+            last_end = window_end
+
+            if matches >= self.max_matches:
+                next_cursor = window_end
+                break
+
+        if not blocks:
+            scope = "" if cursor == 0 else f" after byte {cursor}"
+            return f"[{file_path}: no matches for /{options['grep']}/{scope}]"
+
+        result = f"[{file_path}: {matches} match(es) for /{options['grep']}/]\n" + "\n".join(blocks)
+        if next_cursor is not None and next_cursor < size:
+            context_opt = f"|||context={context}" if context else ""
+            result += (
+                f"\n[more matches may follow. Continue with "
+                f'"{file_path}|||grep={options["grep"]}{context_opt}|||cursor={next_cursor}"]'
+            )
+        return result
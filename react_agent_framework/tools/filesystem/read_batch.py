@@ -0,0 +1,172 @@
+"""
+Batch read file tool
+"""
+
+import glob
+import itertools
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+from react_agent_framework.tools.base import BaseTool
+from react_agent_framework.tools.registry import register_tool
+from react_agent_framework.tools.filesystem.read import ReadFile
+
+
+@register_tool
+class ReadFiles(BaseTool):
+    """
+    Read several files in one call
+
+    Paths may be globs. Files are read concurrently with bounded threads and
+    returned as one size-capped observation with per-file status.
+    """
+
+    name = "read_batch"
+    description = (
+        "Read several files at once. Input: JSON list of paths or globs, or one path per line "
+        '(e.g. ["src/*.py", "README.md"]). Each path may carry filesystem.read options '
+        '(e.g. "app.log|||tail=50")'
+    )
+    category = "filesystem"
+
+    def __init__(
+        self,
+        safe_mode: bool = True,
+        max_files: int = 50,
+        max_total_kb: int = 64,
+        max_workers: int = 8,
+        **kwargs,
+    ):
+        """
+        Initialize batch read tool
+
+        Args:
+            safe_mode: If True, prevents reading sensitive files
+            max_files: Maximum files read per call
+            max_total_kb: Maximum size of the combined observation in KB
+            max_workers: Maximum concurrent reads
+        """
+        super().__init__(**kwargs)
+        self.safe_mode = safe_mode
+        self.max_files = max_files
+        self.max_total_chars = max_total_kb * 1024
+        self.max_workers = max_workers
+
+        # Per-file reads go through ReadFile for its checks and excerpting
+        self.reader = ReadFile(safe_mode=safe_mode, max_excerpt_kb=max_total_kb)
+
+    def validate_input(self, input_text: str) -> bool:
+        """Validate input is not empty"""
+        return bool(input_text and input_text.strip())
+
+    def execute(self, input_text: str) -> str:
+        """
+        Read files
+
+        Args:
+            input_text: JSON list or newline-separated paths/globs
+
+        Returns:
+            Combined file contents with per-file headers
+        """
+        try:
+            entries = self._parse_entries(input_text)
+        except ValueError as e:
+            return f"Error: {str(e)}"
+
+        if not entries:
+            return "Error: No files matched"
+
+        # Expansion stops one entry past the cap, so only overflow is known
+        skipped = len(entries) > self.max_files
+        entries = entries[: self.max_files]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(entries))) as pool:
+            results = list(pool.map(self._read_one, entries))
+
+        ok_count = sum(1 for _, ok, _ in results if ok)
+        header = f"Read {ok_count} of {len(results)} file(s)"
+        if ok_count < len(results):
+            header += f" ({len(results) - ok_count} failed)"
+        if skipped:
+            header += f"; more files skipped (max {self.max_files} per call)"
+
+        # Share the size budget fairly; short files hand their leftover to the rest
+        sections = []
+        remaining = self.max_total_chars
+        for i, (entry, ok, content) in enumerate(results):
+            budget = remaining // (len(results) - i)
+            status = f"ok, {len(content)} chars" if ok else "error"
+            body = content
+
+            if len(body) > budget:
+                body = body[:budget] + (
+                    f"\n[truncated: {len(content) - budget} more chars. "
+                    f"Read individually with filesystem.read]"
+                )
+
+            remaining -= min(len(content), budget)
+            sections.append(f"=== {entry} ({status}) ===\n{body}")
+
+        return header + "\n\n" + "\n\n".join(sections)
+
+    def _parse_entries(self, input_text: str) -> List[str]:
+        """Parse and expand the list of paths (at most max_files + 1 entries)"""
+        text = input_text.strip()
+
+        if text.startswith("["):
+            try:
+                raw_entries = json.loads(text)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON list: {str(e)}")
+            if not all(isinstance(entry, str) for entry in raw_entries):
+                raise ValueError("JSON list must contain path strings")
+        else:
+            raw_entries = text.splitlines()
+            if len(raw_entries) == 1 and "," in raw_entries[0] and "|||" not in raw_entries[0]:
+                raw_entries = raw_entries[0].split(",")
+
+        entries: List[str] = []
+        seen = set()
+        for raw in raw_entries:
+            path, sep, options = raw.strip().partition("|||")
+            path = path.strip()
+            if not path:
+                continue
+
+            if any(char in path for char in "*?["):
+                # Don't list a huge tree only to keep the first max_files
+                matches = (
+                    match for match in glob.iglob(path, recursive=True) if not os.path.isdir(match)
+                )
+                expanded = sorted(itertools.islice(matches, self.max_files + 1))
+            else:
+                expanded = [path]
+
+            for match in expanded:
+                entry = f"{match}{sep}{options}"
+                if entry not in seen:
+                    seen.add(entry)
+                    entries.append(entry)
+            if len(entries) > self.max_files:
+                break
+
+        return entries
+
+    def _read_one(self, entry: str) -> Tuple[str, bool, str]:
+        """Read one file through ReadFile"""
+        if not self.reader.validate_input(entry):
+            return entry, False, "Error: Access denied or invalid path"
+
+        # Files larger than the whole budget are excerpted instead of loaded
+        if "|||" not in entry:
+            try:
+                if os.path.getsize(os.path.expanduser(entry)) > self.max_total_chars:
+                    ok, content = self.reader.read(f"{entry}|||bytes=0-")
+                    return entry, ok, content
+            except OSError:
+                pass
+
+        ok, content = self.reader.read(entry)
+        return entry, ok, content
@@ -3,6 +3,7 @@ Write file tool
 """
 
 from pathlib import Path
+from typing import Optional
 from react_agent_framework.tools.base import BaseTool
 from react_agent_framework.tools.registry import register_tool
 
@@ -20,7 +21,7 @@ class WriteFile(BaseTool):
     description = 'Write contents to a file. Input: "path|||content" (use ||| separator)'
     category = "filesystem"
 
-    def __init__(self, safe_mode: bool = True, sandbox_dir: str = None, **kwargs):
+    def __init__(self, safe_mode: bool = True, sandbox_dir: Optional[str] = None, **kwargs):
         """
         Initialize write file tool
 
@@ -0,0 +1,130 @@
+"""
+Batch write file tool
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from react_agent_framework.tools.base import BaseTool
+from react_agent_framework.tools.registry import register_tool
+from react_agent_framework.tools.filesystem.write import WriteFile
+
+
+@register_tool
+class WriteFiles(BaseTool):
+    """
+    Write several files in one call
+
+    Files are written concurrently with bounded threads. Each write goes
+    through WriteFile, so safe mode and sandbox restrictions still apply.
+    """
+
+    name = "write_batch"
+    description = (
+        'Write several files at once. Input: JSON object {"path": "content", ...} '
+        'or JSON list [{"path": "...", "content": "..."}, ...]'
+    )
+    category = "filesystem"
+
+    def __init__(
+        self,
+        safe_mode: bool = True,
+        sandbox_dir: Optional[str] = None,
+        max_files: int = 50,
+        max_workers: int = 8,
+        **kwargs,
+    ):
+        """
+        Initialize batch write tool
+
+        Args:
+            safe_mode: If True, prevents writing to sensitive locations
+            sandbox_dir: If set, restricts writes to this directory
+            max_files: Maximum files written per call
+            max_workers: Maximum concurrent writes
+        """
+        super().__init__(**kwargs)
+        self.safe_mode = safe_mode
+        self.max_files = max_files
+        self.max_workers = max_workers
+
+        self.writer = WriteFile(safe_mode=safe_mode, sandbox_dir=sandbox_dir)
+
+    def validate_input(self, input_text: str) -> bool:
+        """Validate input looks like JSON"""
+        return bool(input_text) and input_text.strip()[:1] in ("{", "[")
+
+    def execute(self, input_text: str) -> str:
+        """
+        Write files
+
+        Args:
+            input_text: JSON object mapping paths to contents, or list of path/content objects
+
+        Returns:
+            Per-file status summary
+        """
+        try:
+            files = self._parse_files(input_text)
+        except ValueError as e:
+            return f"Error: {str(e)}"
+
+        if not files:
+            return "Error: No files to write"
+        if len(files) > self.max_files:
+            return f"Error: Too many files ({len(files)}). Max: {self.max_files} per call"
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(files))) as pool:
+            results = list(pool.map(self._write_one, files))
+
+        ok_count = sum(1 for _, ok, _ in results if ok)
+        lines = [f"Wrote {ok_count} of {len(results)} file(s)"]
+        for path, ok, message in results:
+            lines.append(f"- {path}: {'ok' if ok else 'error'} ({message})")
+
+        return "\n".join(lines)
+
+    def _parse_files(self, input_text: str) -> List[Tuple[str, str]]:
+        """Parse (path, content) pairs"""
+        try:
+            data = json.loads(input_text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {str(e)}")
+
+        if isinstance(data, dict):
+            items = list(data.items())
+        elif isinstance(data, list):
+            items = []
+            for item in data:
+                if not isinstance(item, dict) or "path" not in item:
+                    raise ValueError('List items must be {"path": ..., "content": ...}')
+                items.append((item["path"], item.get("content", "")))
+        else:
+            raise ValueError("Input must be a JSON object or list")
+
+        files = []
+        seen = set()
+        for path, content in items:
+            if not isinstance(path, str) or not isinstance(content, str):
+                raise ValueError("Paths and contents must be strings")
+            path = path.strip()
+            if path in seen:
+                raise ValueError(f"Duplicate path: {path}")
+            seen.add(path)
+            files.append((path, content))
+
+        return files
+
+    def _write_one(self, file: Tuple[str, str]) -> Tuple[str, bool, str]:
+        """Write one file through WriteFile"""
+        path, content = file
+        write_input = f"{path}|||{content}"
+
+        if not self.writer.validate_input(write_input):
+            return path, False, "access denied"
+
+        result = self.writer.execute(write_input)
+        if result.startswith("Error"):
+            return path, False, result.replace("Error: ", "", 1)
+
+        return path, True, f"{len(content)} characters"
@@ -2,6 +2,7 @@
 Pytest configuration and shared fixtures
 """
 
+import hashlib
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from typing import List
@@ -105,6 +106,49 @@ def sample_objectives():
     ]
 
 
+@pytest.fixture
+def fake_embedder():
+    """Deterministic bag-of-words embedder: texts sharing words get nearby vectors"""
+    np = pytest.importorskip("numpy")
+
+    def embed(text: str, dimension: int = 32):
+        vector = np.zeros(dimension, dtype=np.float32)
+        for word in text.lower().split():
+            digest = hashlib.md5(word.encode()).digest()
+            vector[digest[0] % dimension] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    return embed
+
+
+@pytest.fixture
+def chroma_embedding_function(fake_embedder):
+    """ChromaDB embedding function backed by the fake embedder"""
+    pytest.importorskip("chromadb")
+    from chromadb.api.types import EmbeddingFunction
+
+    class FakeEmbeddingFunction(EmbeddingFunction):
+        def __init__(self):
+            pass
+
+        def __call__(self, input):
+            return [fake_embedder(text) for text in input]
+
+        @staticmethod
+        def name():
+            return "fake-embedder"
+
+        def get_config(self):
+            return {}
+
+        @staticmethod
+        def build_from_config(config):
+            return FakeEmbeddingFunction()
+
+    return FakeEmbeddingFunction()
+
+
 @pytest.fixture(autouse=True)
 def reset_environment():
     """Reset environment between tests"""
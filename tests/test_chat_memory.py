@@ -0,0 +1,526 @@
+"""
+Test chat memory classes
+"""
+
+import multiprocessing
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+
+import pytest
+
+from react_agent_framework.core.memory.chat import (
+    SharedChatMemory,
+    SharedMemoryServer,
+    SimpleChatMemory,
+    SQLiteChatMemory,
+    SummaryChatMemory,
+    TieredChatMemory,
+)
+from react_agent_framework.providers.base import BaseLLMProvider
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "chat.db")
+
+
+@pytest.fixture
+def shared_server():
+    # Unix socket paths are limited to ~100 bytes, so avoid the long tmp_path
+    with tempfile.TemporaryDirectory() as directory:
+        with SharedMemoryServer(f"{directory}/memory.sock", max_messages=50) as server:
+            yield server
+
+
+class TestSQLiteChatMemory:
+    """Test SQLiteChatMemory"""
+
+    def test_ranked_search_and_snippets(self, db_path):
+        """Test FTS search ranks matches and returns highlighted snippets"""
+        memory = SQLiteChatMemory(db_path=db_path, session_id="s1")
+        if not memory.fts_enabled:
+            pytest.skip("SQLite built without FTS5")
+
+        memory.add_message("deploy failed with error E1042 during migration")
+        memory.add_message("the weather is nice today", role="assistant")
+        memory.add_message("E1042 E1042 again, E1042 is a quota error")
+        other = SQLiteChatMemory(db_path=db_path, session_id="s2")
+        other.add_message("E1042 in another session")
+
+        ranked = memory.search_with_snippets("e1042", limit=5)
+        assert [message.content for message, _ in ranked] == [
+            "E1042 E1042 again, E1042 is a quota error",
+            "deploy failed with error E1042 during migration",
+        ]
+        assert "[E1042]" in ranked[1][1]
+
+        # search_messages keeps chronological order for get_context
+        assert [m.content for m in memory.search_messages("quota migration")] == [
+            "deploy failed with error E1042 during migration",
+            "E1042 E1042 again, E1042 is a quota error",
+        ]
+        assert memory.search_messages("???") == []
+
+        # Partial words match as prefixes, or as substrings when no word starts with them
+        assert len(memory.search_messages("err")) == 2
+        assert [m.content for m in memory.search_messages("eathe")] == ["the weather is nice today"]
+
+    def test_index_follows_deletes_and_trimming(self, db_path):
+        """Test the FTS index is kept in sync by triggers"""
+        memory = SQLiteChatMemory(db_path=db_path, session_id="s1", max_messages=2)
+        if not memory.fts_enabled:
+            pytest.skip("SQLite built without FTS5")
+
+        memory.add_message("alpha message")
+        memory.add_message("beta message")
+        memory.add_message("gamma message")
+
+        assert memory.search_messages("alpha") == []
+        assert len(memory.search_messages("message")) == 2
+
+        memory.clear()
+        assert memory.search_messages("gamma") == []
+
+    def test_backfills_existing_database(self, db_path):
+        """Test databases created before FTS are indexed on open"""
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                metadata TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute(
+            "INSERT INTO messages (session_id, role, content, timestamp, metadata)"
+            " VALUES ('s1', 'user', 'legacy message about kubernetes', '2024-01-01T00:00:00', '{}')"
+        )
+        conn.commit()
+        conn.close()
+
+        memory = SQLiteChatMemory(db_path=db_path, session_id="s1")
+        if not memory.fts_enabled:
+            pytest.skip("SQLite built without FTS5")
+
+        results = memory.search_messages("kubernetes")
+        assert [m.content for m in results] == ["legacy message about kubernetes"]
+
+    def test_wal_and_thread_local_connections(self, db_path):
+        """Test WAL journaling and one connection per thread"""
+        memory = SQLiteChatMemory(db_path=db_path, session_id="s1")
+        assert memory.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        connections = []
+
+        def worker(n):
+            connections.append(memory.conn)
+            for i in range(20):
+                memory.add_message(f"thread {n} message {i}")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(conn) for conn in connections}) == 4
+        assert memory.get_stats()["session_messages"] == 80
+        memory.close()
+
+    def test_connections_of_finished_threads_are_closed(self, db_path):
+        """Test short-lived threads do not each leave an open connection behind"""
+        memory = SQLiteChatMemory(db_path=db_path, session_id="s1")
+        connections = []
+
+        for n in range(5):
+            thread = threading.Thread(target=lambda: connections.append(memory.conn))
+            thread.start()
+            thread.join()
+
+        # Opening a connection reclaims the finished threads' ones
+        assert len(memory._connections) == 2
+        for conn in connections[:-1]:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+        assert memory.conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 0
+        memory.close()
+
+    def test_batched_writes_and_trimming(self, db_path):
+        """Test group commit keeps read-your-writes and the per-session limit"""
+        memory = SQLiteChatMemory(
+            db_path=db_path, session_id="s1", max_messages=5, batch_writes=True
+        )
+        for i in range(12):
+            memory.add_message(f"message {i}")
+
+        assert [m.content for m in memory.get_history()] == [f"message {i}" for i in range(7, 12)]
+        assert memory.get_stats()["session_messages"] == 5
+        memory.close()
+
+        reopened = SQLiteChatMemory(db_path=db_path, session_id="s1", max_messages=5)
+        reopened.add_message("message 12")
+        assert len(reopened.get_history()) == 5
+        assert reopened.get_history()[0].content == "message 8"
+
+    def test_stats_come_from_session_counts(self, db_path):
+        """Test totals read the counters and emptied sessions drop their counter row"""
+        memory = SQLiteChatMemory(db_path=db_path, session_id="s1")
+        memory.add_conversation("hello", "hi")
+        for session in ("s2", "s3"):
+            memory.session_id = session
+            memory.add_message(f"in {session}")
+        memory.session_id = "s1"
+        memory.delete_session("s2")
+        memory.clear(session_id="s3")
+
+        stats = memory.get_stats()
+        assert (stats["total_messages"], stats["total_sessions"]) == (2, 1)
+        rows = memory.conn.execute("SELECT session_id FROM session_counts").fetchall()
+        assert [row["session_id"] for row in rows] == ["s1"]
+        memory.close()
+
+        # Databases whose trigger left zero-count rows are repaired on open
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO session_counts (session_id, count) VALUES ('stale', 0)")
+        conn.commit()
+        conn.close()
+        reopened = SQLiteChatMemory(db_path=db_path, session_id="s1")
+        assert reopened.get_stats()["total_sessions"] == 1
+        reopened.close()
+
+    def test_in_memory_database(self):
+        """Test ':memory:' databases are shared by the instance's connections"""
+        memory = SQLiteChatMemory(db_path=":memory:", session_id="s1")
+        thread = threading.Thread(target=memory.add_message, args=("from a thread",))
+        thread.start()
+        thread.join()
+
+        assert [m.content for m in memory.get_history()] == ["from a thread"]
+
+
+class TestSimpleChatMemory:
+    """Test SimpleChatMemory shards, budgets and eviction"""
+
+    @staticmethod
+    def _fill(memory, sessions, per_session):
+        for s in sessions:
+            memory.session_id = s
+            for i in range(per_session):
+                memory.add_message(f"{s} message {i}", role="user" if i % 2 else "assistant")
+
+    def test_global_budget_evicts_least_recently_used(self):
+        """Test idle sessions are evicted oldest first and counters stay exact"""
+        memory = SimpleChatMemory(session_id="s0", max_messages=5, max_total_messages=12)
+        self._fill(memory, ["s0", "s1", "s2"], 4)
+
+        # Touch s0 so that s1 is the least recently used session
+        memory.get_recent(session_id="s0")
+        self._fill(memory, ["s3"], 4)
+
+        assert sorted(memory.get_sessions()) == ["s0", "s2", "s3"]
+        assert memory.get_recent(session_id="s1") == []
+
+        stats = memory.get_stats()
+        assert stats["total_messages"] == 12
+        assert stats["evicted_sessions"] == 1
+        assert stats["role_counts"] == {"user": 2, "assistant": 2}
+        assert stats["total_bytes"] == sum(
+            len(m.content) for s in memory.get_sessions() for m in memory.get_history(session_id=s)
+        )
+
+    def test_evicted_sessions_spill_and_fault_back_in(self, db_path):
+        """Test spilled sessions are read back from SQLite when used again"""
+        spill = SQLiteChatMemory(db_path=db_path)
+        memory = SimpleChatMemory(max_messages=5, max_total_messages=8, spill_memory=spill)
+        self._fill(memory, ["a", "b", "c"], 4)
+
+        assert spill.get_sessions() == ["a"]
+        assert memory.get_stats()["spilled_sessions"] == 1
+
+        assert memory.get_stats(session_id="a")["session_messages"] == 4
+        history = memory.get_history(session_id="a")
+        assert [m.content for m in history] == [f"a message {i}" for i in range(4)]
+        assert "a" not in spill.get_sessions()
+
+    def test_existing_spill_sessions_are_left_alone(self, db_path):
+        """Test sessions already in spill_memory are neither loaded nor deleted"""
+        spill = SQLiteChatMemory(db_path=db_path, session_id="a")
+        spill.add_message("kept")
+        memory = SimpleChatMemory(max_messages=5, max_total_messages=8, spill_memory=spill)
+
+        assert memory.get_history(session_id="a") == []
+        self._fill(memory, ["a", "b", "c"], 4)
+
+        assert [m.content for m in spill.get_history(session_id="a")] == ["kept"]
+        assert memory.get_stats()["spilled_sessions"] == 0
+
+    def test_concurrent_sessions(self):
+        """Test counters stay consistent under concurrent writers"""
+        memory = SimpleChatMemory(max_messages=10, max_total_messages=200, num_shards=4)
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(100):
+                    memory.session_id = f"t{n}-{i % 10}"
+                    memory.add_message(f"message {i}")
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        stats = memory.get_stats()
+        stored = sum(len(memory.get_history(session_id=s)) for s in memory.get_sessions())
+        assert stats["total_messages"] == stored <= 200
+
+
+class TestTieredChatMemory:
+    """Test TieredChatMemory"""
+
+    def test_hot_window_and_fault_in(self, db_path):
+        """Test recent reads come from memory and older history from SQLite"""
+        memory = TieredChatMemory(db_path=db_path, session_id="s1", hot_window=5)
+        for i in range(12):
+            memory.add_message(f"message {i}")
+
+        assert [m.content for m in memory.get_recent(3)] == [f"message {i}" for i in range(9, 12)]
+        assert memory.get_stats()["hot_hits"] == 1
+
+        # Beyond the window: served by the cold store
+        assert [m.content for m in memory.get_recent(8)][0] == "message 4"
+        assert len(memory.get_history()) == 12
+        memory.close()
+
+        reopened = TieredChatMemory(db_path=db_path, session_id="s1", hot_window=20)
+        assert [m.content for m in reopened.get_history()] == [f"message {i}" for i in range(12)]
+        assert reopened.get_stats()["hot_misses"] == 0
+        reopened.close()
+
+    def test_search_falls_back_to_cold_store(self, db_path):
+        """Test matches older than the window are found in SQLite"""
+        memory = TieredChatMemory(db_path=db_path, session_id="s1", hot_window=3)
+        memory.add_message("the quota was exceeded")
+        for i in range(5):
+            memory.add_message(f"filler {i}")
+        memory.add_message("quota raised")
+
+        assert [m.content for m in memory.search_messages("quota", limit=1)] == ["quota raised"]
+        assert [m.content for m in memory.search_messages("quota")] == [
+            "the quota was exceeded",
+            "quota raised",
+        ]
+
+        memory.clear()
+        assert memory.get_recent() == []
+        assert memory.cold.get_recent(session_id="s1") == []
+        memory.close()
+
+    def test_fault_in_and_context_never_flush(self, db_path, monkeypatch):
+        """Test evicted sessions come back with queued messages, without waiting for the writer"""
+        cold = SQLiteChatMemory(db_path=db_path, batch_writes=True, batch_interval=0.5)
+        memory = TieredChatMemory(session_id="s1", max_hot_sessions=1, cold_memory=cold)
+        memory.add_message("the quota was exceeded")
+        memory.session_id = "s2"
+        memory.add_message("other session")
+
+        def no_flush():
+            raise AssertionError("flushed")
+
+        monkeypatch.setattr(cold, "flush", no_flush)
+        memory.session_id = "s1"
+        memory.add_message("filler")
+
+        assert [m.content for m in memory.get_recent(5)] == ["the quota was exceeded", "filler"]
+        context = memory.get_context("quota", max_messages=1)
+        assert [m.content for m in context] == ["the quota was exceeded"]
+
+        monkeypatch.undo()
+        memory.close()
+        assert len(cold.get_history(session_id="s1")) == 2
+
+    def test_stats_leave_shared_cold_store_session_alone(self, db_path):
+        """Test stats read the tiered session without switching the cold store's session"""
+        cold = SQLiteChatMemory(db_path=db_path, session_id="cold")
+        cold.add_message("cold message")
+        memory = TieredChatMemory(session_id="s1", cold_memory=cold)
+        memory.add_conversation("hello", "hi")
+
+        stats = memory.get_stats()
+        assert (stats["session_id"], stats["session_messages"]) == ("s1", 2)
+        assert memory.get_stats(session_id="cold")["session_messages"] == 1
+        assert cold.session_id == "cold"
+        assert cold.get_stats()["session_messages"] == 1
+
+
+class _ListingProvider(BaseLLMProvider):
+    """Summarizer stub: appends the new lines' contents to the summary"""
+
+    def __init__(self):
+        super().__init__(model="stub")
+        self.calls = 0
+
+    def generate(self, messages, temperature=0, **kwargs):
+        self.calls += 1
+        prompt = messages[0].content
+        summary = prompt.split("Current summary:\n")[1].split("\n\n")[0]
+        lines = prompt.split("New lines of conversation:\n")[1].split("\n\nNew summary:")[0]
+        contents = [line.split(": ", 1)[1] for line in lines.splitlines()]
+        return ",".join(([] if summary == "(empty)" else [summary]) + contents)
+
+    def get_model_name(self):
+        return self.model
+
+
+class TestSummaryChatMemory:
+    """Test SummaryChatMemory"""
+
+    def test_rolling_summary_keeps_context_size_constant(self):
+        """Test older messages are folded into the summary every K messages"""
+        provider = _ListingProvider()
+        memory = SummaryChatMemory(provider, summarize_every=5, recent_window=5)
+        for i in range(23):
+            memory.add_message(f"m{i}")
+        memory.flush()
+
+        assert provider.calls == 3
+        assert memory.get_summary() == ",".join(f"m{i}" for i in range(15))
+
+        context = memory.get_context(max_tokens=1000)
+        assert context[0].role == "system" and context[0].metadata == {"summary": True}
+        assert [m.content for m in context[1:]] == [f"m{i}" for i in range(15, 23)]
+        assert len(memory.get_history()) == 23
+
+        for i in range(23, 60):
+            memory.add_message(f"m{i}")
+        memory.flush()
+        assert len(memory.get_context(max_tokens=1000)) <= 1 + 5 + 5 - 1
+        memory.close()
+
+    def test_inline_summaries_and_clear(self):
+        """Test background=False summarizes synchronously and clear resets"""
+        provider = _ListingProvider()
+        memory = SummaryChatMemory(provider, summarize_every=2, recent_window=1, background=False)
+        for i in range(4):
+            memory.add_message(f"m{i}")
+
+        assert memory.get_summary() == "m0,m1"
+        assert memory.get_stats()["pending_messages"] == 2
+
+        memory.clear()
+        assert memory.get_summary() == ""
+        assert memory.get_context() == []
+
+    def test_failing_summarizer_does_not_grow_pending(self):
+        """Test repeated summarizer errors truncate to the recent window"""
+        provider = _ListingProvider()
+        provider.generate = lambda *args, **kwargs: 1 / 0
+        memory = SummaryChatMemory(
+            provider, summarize_every=1, recent_window=2, max_failures=3, background=False
+        )
+        for i in range(50):
+            memory.add_message(f"m{i}")
+
+        stats = memory.get_stats()
+        assert stats["pending_messages"] <= 2 + 1 + 3
+        assert stats["dropped_messages"] + stats["pending_messages"] == 50
+        assert isinstance(memory.last_error, ZeroDivisionError)
+        assert [m.content for m in memory.get_context()][-2:] == ["m48", "m49"]
+        assert len(memory.get_history()) == 50
+
+        # A recovered summarizer picks up where the truncation left off
+        del provider.generate
+        memory.add_message("m50")
+        assert memory.get_summary()
+        assert memory.get_stats()["pending_messages"] == 2
+
+
+def _add_from_worker(socket_path, worker):
+    memory = SharedChatMemory(socket_path, session_id="shared")
+    for i in range(5):
+        memory.add_message(f"worker{worker} message {i}")
+
+
+class TestSharedChatMemory:
+    """Test SharedChatMemory"""
+
+    def test_workers_share_sessions(self, shared_server):
+        """Test messages written by other processes are visible to every client"""
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_add_from_worker, args=(shared_server.socket_path, worker))
+            for worker in range(3)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+            assert process.exitcode == 0
+
+        memory = SharedChatMemory(shared_server.socket_path, session_id="shared")
+        assert len(memory) == 15
+        assert memory.max_messages == 50
+        assert len(memory.search_messages("worker1")) == 5
+        assert "shared" in memory.get_sessions()
+
+        memory.add_message("reply", role="assistant", metadata={"step": 1})
+        last = memory.get_recent(n=1)[0]
+        assert (last.content, last.role, last.metadata) == ("reply", "assistant", {"step": 1})
+
+        memory.clear()
+        assert memory.get_history() == []
+
+    def test_session_lock_serializes_clients(self, shared_server):
+        """Test other clients wait while a session is locked"""
+        first = SharedChatMemory(shared_server.socket_path, session_id="s")
+        second = SharedChatMemory(shared_server.socket_path, session_id="s")
+        written = threading.Event()
+
+        def write():
+            second.add_message("from second")
+            written.set()
+
+        with first.session_lock():
+            first.add_message("from first")
+            thread = threading.Thread(target=write)
+            thread.start()
+            assert not written.wait(0.2)
+            assert [m.content for m in first.get_history()] == ["from first"]
+
+        thread.join(timeout=5)
+        assert [m.content for m in first.get_history()] == ["from first", "from second"]
+
+        # Locks held by a client that disconnects are released
+        with pytest.raises(RuntimeError):
+            first._call("unlock", session_id="s")
+        first._call("lock", session_id="s")
+        first.close()
+        second.add_message("after disconnect")
+        assert len(second) == 3
+
+    def test_socket_ownership(self, shared_server):
+        """Test the socket is owner-only and a live server's socket is not taken over"""
+        assert os.stat(shared_server.socket_path).st_mode & 0o777 == 0o600
+        with pytest.raises(RuntimeError):
+            SharedMemoryServer(shared_server.socket_path).start()
+        assert SharedChatMemory(shared_server.socket_path).get_sessions() is not None
+
+        # A socket file left behind by a dead server is replaced
+        directory = os.path.dirname(shared_server.socket_path)
+        stale_path = os.path.join(directory, "stale.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(stale_path)
+        stale.close()
+        with SharedMemoryServer(stale_path):
+            assert SharedChatMemory(stale_path).get_history() == []
@@ -0,0 +1,127 @@
+"""
+Test environments
+"""
+
+import os
+import time
+
+import pytest
+from react_agent_framework.core.environment import FileEnvironment, Action
+from react_agent_framework.core.environment.file_index import FileIndex
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Small source tree"""
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "src" / "main.py").write_text("def main():\n    return 1\n")
+    (tmp_path / "src" / "pkg" / "util.py").write_text("import os\nERROR_CODE = 42\n")
+    (tmp_path / "docs" / "README.md").write_text("Project readme\n")
+    return tmp_path
+
+
+class TestFileIndex:
+    """Test FileIndex"""
+
+    def test_glob_and_find(self, workspace):
+        """Test path queries are served from the index"""
+        index = FileIndex(str(workspace))
+
+        assert index.glob("*.py") == ["src/main.py", "src/pkg/util.py"]
+        assert index.glob("src/pkg/*.py") == ["src/pkg/util.py"]
+        assert index.find("READ") == ["docs/README.md"]
+
+    def test_refresh_picks_up_changes(self, workspace):
+        """Test added and removed files are seen after a refresh"""
+        index = FileIndex(str(workspace))
+        assert len(index.glob("*.py")) == 2
+
+        (workspace / "src" / "new.py").write_text("x = 1\n")
+        (workspace / "src" / "main.py").unlink()
+        index.refresh(force=True)
+
+        assert index.glob("*.py") == ["src/new.py", "src/pkg/util.py"]
+
+    def test_grep(self, workspace):
+        """Test literal and regex content search"""
+        index = FileIndex(str(workspace))
+
+        matches = index.grep("ERROR_CODE")
+        assert matches == [{"path": "src/pkg/util.py", "line": 2, "text": "ERROR_CODE = 42"}]
+
+        matches = index.grep(r"def \w+\(", regex=True)
+        assert [m["path"] for m in matches] == ["src/main.py"]
+
+        # Reported content changes are re-indexed
+        (workspace / "src" / "main.py").write_text("def main():\n    raise ERROR_CODE\n")
+        index.invalidate(str(workspace / "src" / "main.py"))
+        assert len(index.grep("error_code", ignore_case=True)) == 2
+
+    def test_grep_sees_external_edits(self, workspace):
+        """Test files edited in place without invalidate() are not pruned on stale trigrams"""
+        # Old enough that directory listings are trusted
+        past = time.time() - 60
+        for path in [workspace, *workspace.rglob("*")]:
+            os.utime(path, (past, past))
+
+        index = FileIndex(str(workspace), refresh_interval=0)
+        assert index.grep("ERROR_CODE", base=str(workspace / "src"))[0]["path"] == "pkg/util.py"
+
+        # Rewriting a file in place leaves its directory's mtime unchanged
+        (workspace / "src" / "main.py").write_text("def main():\n    raise ERROR_CODE\n")
+        matches = index.grep("raise ERROR_CODE")
+        assert matches == [{"path": "src/main.py", "line": 2, "text": "    raise ERROR_CODE"}]
+        assert len(index.grep("ERROR_CODE")) == 2
+
+    def test_grep_counted_quantifiers(self, workspace):
+        """Test {m,n} quantifiers do not become required literals"""
+        (workspace / "hash.txt").write_text("commit " + "ab12" * 10 + "\n")
+        index = FileIndex(str(workspace))
+
+        assert [m["path"] for m in index.grep("[0-9a-f]{32,64}", regex=True)] == ["hash.txt"]
+        assert [m["path"] for m in index.grep(r"commit \w{40}", regex=True)] == ["hash.txt"]
+        assert index.grep("ab{0}12", regex=True) == []
+
+
+class TestFileEnvironment:
+    """Test FileEnvironment"""
+
+    def test_search_and_grep_actions(self, workspace):
+        """Test search and grep actions, with and without the index"""
+        for use_index in (True, False):
+            env = FileEnvironment(str(workspace), use_index=use_index)
+            env.reset()
+
+            obs = env.step(Action("search", {"pattern": "*.md"}))
+            assert obs.data["matches"] == ["docs/README.md"]
+
+            obs = env.step(Action("grep", {"pattern": "readme", "ignore_case": True}))
+            assert obs.data["count"] == 1
+
+    def test_write_invalidates_index(self, workspace):
+        """Test files written through the environment are searchable immediately"""
+        env = FileEnvironment(str(workspace))
+        env.reset()
+        env.step(Action("search", {"pattern": "*.py"}))
+
+        env.step(Action("write", {"filepath": "src/extra.py", "content": "y = 2\n"}))
+        obs = env.step(Action("search", {"pattern": "extra", "match": "substring"}))
+
+        assert obs.data["matches"] == ["src/extra.py"]
+
+    def test_grep_follows_read_rules(self, workspace):
+        """Test grep skips sensitive and oversized files like read does"""
+        (workspace / ".env").write_text("API_KEY=secret\n")
+        (workspace / "big.txt").write_text("API_KEY " * 100)
+
+        env = FileEnvironment(str(workspace), max_file_size=100)
+        env.reset()
+        assert env.step(Action("read", {"filepath": ".env"})).metadata["error"]
+        obs = env.step(Action("grep", {"pattern": "API_KEY"}))
+        assert obs.data["matches"] == []
+
+        env = FileEnvironment(str(workspace), safe_mode=False)
+        env.reset()
+        obs = env.step(Action("grep", {"pattern": "API_KEY"}))
+        assert sorted(m["path"] for m in obs.data["matches"]) == [".env", "big.txt"]
@@ -0,0 +1,909 @@
+"""
+Test knowledge memory classes
+"""
+
+import json
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from react_agent_framework.core.memory.embedding_cache import EmbeddingCache  # noqa: E402
+from react_agent_framework.core.memory.knowledge import (  # noqa: E402
+    Deduplicator,
+    FAISSKnowledgeMemory,
+    IngestionPipeline,
+    TextChunker,
+)
+
+DIMENSION = 32
+
+
+@pytest.fixture
+def make_faiss_memory(tmp_path, monkeypatch, fake_embedder):
+    """Factory for FAISSKnowledgeMemory instances using the fake embedder"""
+    pytest.importorskip("faiss")
+    pytest.importorskip("openai")
+    monkeypatch.setattr(
+        FAISSKnowledgeMemory,
+        "_get_embeddings",
+        lambda self, texts: np.vstack([fake_embedder(text, DIMENSION) for text in texts]),
+    )
+
+    def make(**kwargs):
+        kwargs.setdefault("index_path", str(tmp_path / "kb"))
+        kwargs.setdefault("dimension", DIMENSION)
+        return FAISSKnowledgeMemory(api_key="test", **kwargs)
+
+    return make
+
+
+@pytest.fixture
+def make_chroma_memory(tmp_path, monkeypatch, chroma_embedding_function):
+    """Factory for ChromaKnowledgeMemory instances using the fake embedder"""
+    from react_agent_framework.core.memory.knowledge.chroma import ChromaKnowledgeMemory
+
+    monkeypatch.setattr(
+        ChromaKnowledgeMemory,
+        "_get_embedding_function",
+        lambda self, func_type, model, api_key: chroma_embedding_function,
+    )
+
+    def make(**kwargs):
+        kwargs.setdefault("persist_directory", str(tmp_path / "chroma_kb"))
+        return ChromaKnowledgeMemory(**kwargs)
+
+    return make
+
+
+class TestFAISSKnowledgeMemory:
+    """Test FAISSKnowledgeMemory"""
+
+    def test_search_after_delete(self, make_faiss_memory):
+        """Test deleting a document doesn't shift results onto other documents"""
+        memory = make_faiss_memory()
+        memory.add_document("python programming language", doc_id="py")
+        memory.add_document("java virtual machine", doc_id="java")
+        memory.add_document("rust ownership borrow checker", doc_id="rust")
+
+        assert memory.delete(doc_id="py") == 1
+
+        results = memory.search("java virtual machine", top_k=1)
+        assert [doc.doc_id for doc in results] == ["java"]
+        assert memory.index.ntotal == 2
+
+    def test_delete_by_filters_and_replace(self, make_faiss_memory):
+        """Test filtered deletes and re-adding an existing ID"""
+        memory = make_faiss_memory()
+        memory.add_document("alpha one", metadata={"group": "a"}, doc_id="1")
+        memory.add_document("alpha two", metadata={"group": "a"}, doc_id="2")
+        memory.add_document("beta three", metadata={"group": "b"}, doc_id="3")
+
+        assert memory.delete(filters={"group": "a"}) == 2
+        memory.add_document("beta three updated", metadata={"group": "b"}, doc_id="3")
+
+        assert memory.index.ntotal == 1
+        assert memory.get_document("3").content == "beta three updated"
+
+    def test_max_documents_evicts_oldest(self, make_faiss_memory):
+        """Test the oldest document is evicted when over the limit"""
+        memory = make_faiss_memory(max_documents=2)
+        for i in range(3):
+            memory.add_document(f"document number {i}", doc_id=str(i))
+
+        assert list(memory.documents) == ["1", "2"]
+        assert memory.index.ntotal == 2
+
+    def test_hnsw_deletes_are_tombstoned(self, make_faiss_memory):
+        """Test HNSW deletes are excluded at search time and compacted in bulk"""
+        memory = make_faiss_memory(index_type="HNSW")
+        for i in range(10):
+            memory.add_document(f"topic{i} words", doc_id=str(i))
+
+        memory.delete(doc_id="3")
+        assert memory.index.ntotal == 10
+        results = memory.search("topic3 words", top_k=9)
+        assert len(results) == 9
+        assert "3" not in [doc.doc_id for doc in results]
+
+        # Tombstones survive a checkpoint and reload
+        memory.close()
+        memory = make_faiss_memory(index_type="HNSW")
+        assert memory.get_stats()["tombstones"] == 1
+        assert "3" not in [doc.doc_id for doc in memory.search("topic3 words", top_k=9)]
+
+        # Past the tombstone share the index is rebuilt without them
+        memory.delete(doc_id="4")
+        memory.delete(doc_id="5")
+        assert memory.index.ntotal == 7
+        assert memory.get_stats()["tombstones"] == 0
+
+    @pytest.mark.parametrize("index_type", ["Flat", "HNSW"])
+    def test_reload_keeps_id_mapping(self, make_faiss_memory, index_type):
+        """Test IDs survive a save/load round trip"""
+        memory = make_faiss_memory(index_type=index_type)
+        memory.add_document("python programming language", doc_id="py")
+        memory.add_document("java virtual machine", doc_id="java")
+        memory.delete(doc_id="py")
+        memory.add_document("go goroutines channels", doc_id="go")
+
+        reloaded = make_faiss_memory(index_type=index_type)
+
+        assert reloaded.search("go goroutines channels", top_k=1)[0].doc_id == "go"
+        assert reloaded.search("java virtual machine", top_k=1)[0].doc_id == "java"
+
+    def test_reload_replays_changes_after_checkpoint(self, make_faiss_memory):
+        """Test changes made after the last checkpoint are recovered on load"""
+        memory = make_faiss_memory(checkpoint_interval=3)
+        for i in range(5):
+            memory.add_document(f"topic{i} words", doc_id=str(i))
+        memory.delete(doc_id="0")
+
+        # Checkpoint covers the first 3 adds; the rest is caught up from the log
+        reloaded = make_faiss_memory(checkpoint_interval=3)
+
+        assert reloaded.index.ntotal == 4
+        assert reloaded.get_document("0") is None
+        assert reloaded.search("topic4 words", top_k=1)[0].doc_id == "4"
+
+    def test_appends_do_not_rewrite_files(self, make_faiss_memory, tmp_path):
+        """Test each add appends one vector row instead of rewriting the store"""
+        memory = make_faiss_memory()
+        memory.add_document("first document")
+        memory.add_document("second document")
+
+        vectors_file = tmp_path / "kb" / "vectors.f32"
+        assert vectors_file.stat().st_size == 2 * DIMENSION * 4
+        assert not (tmp_path / "kb" / "index.ckpt.faiss").exists()
+
+        memory.close()
+        assert (tmp_path / "kb" / "index.ckpt.faiss").exists()
+
+    @pytest.mark.parametrize("vector_dtype", ["float32", "int8"])
+    def test_eviction_compacts_vector_file(self, make_faiss_memory, tmp_path, vector_dtype):
+        """Test evicted and replaced vectors are reclaimed and IDs stay consistent"""
+        memory = make_faiss_memory(
+            max_documents=4, checkpoint_interval=1000, vector_dtype=vector_dtype, hybrid_search=True
+        )
+        for i in range(20):
+            memory.add_document(f"topic{i} words", doc_id=str(i), metadata={"n": i % 2})
+        memory.add_document("topic19 replaced", doc_id="19", metadata={"n": 1})
+        assert memory.get_stats()["dead_vectors"] == 17
+
+        vectors_file = next((tmp_path / "kb").glob("vectors.[fi]*"))
+        size = vectors_file.stat().st_size
+        memory.compact()
+        assert memory.store.num_rows == 4
+        assert memory.get_stats()["dead_vectors"] == 0
+        assert vectors_file.stat().st_size == size * 4 // 21
+
+        assert memory.search("topic17 words", top_k=1)[0].doc_id == "17"
+        matches = memory.search("topic", top_k=4, filters={"n": 1})
+        assert sorted(doc.doc_id for doc in matches) == ["17", "19"]
+        assert memory.get_document("19").content == "topic19 replaced"
+        np.testing.assert_allclose(
+            memory.get_embedding("16"), memory._get_embedding("topic16 words"), atol=0.02
+        )
+
+        memory.close()
+        reloaded = make_faiss_memory(vector_dtype=vector_dtype)
+        assert list(reloaded.documents) == ["16", "17", "18", "19"]
+        assert reloaded.search("topic18 words", top_k=1)[0].doc_id == "18"
+
+    def test_interrupted_compaction_is_finished_on_open(self, make_faiss_memory, monkeypatch):
+        """Test a compaction interrupted after renumbering completes on the next open"""
+        from react_agent_framework.core.memory.vector_store import VectorStore
+
+        memory = make_faiss_memory(max_documents=2)
+        for i in range(6):
+            memory.add_document(f"topic{i} words", doc_id=str(i))
+
+        # Crash right after the renumbering is committed
+        finish = VectorStore._finish_compaction
+        monkeypatch.setattr(VectorStore, "_finish_compaction", lambda self: None)
+        memory.store.compact()
+        memory.store.close()
+        monkeypatch.setattr(VectorStore, "_finish_compaction", finish)
+
+        reloaded = make_faiss_memory()
+        assert reloaded.store.num_rows == 2
+        assert reloaded.search("topic5 words", top_k=1)[0].doc_id == "5"
+        assert reloaded.search("topic4 words", top_k=1)[0].doc_id == "4"
+
+    def test_recovers_from_partial_vector_write(self, make_faiss_memory, tmp_path):
+        """Test a torn trailing vector row is dropped on load"""
+        memory = make_faiss_memory()
+        memory.add_document("python programming language", doc_id="py")
+        memory.store.close()
+
+        with open(tmp_path / "kb" / "vectors.f32", "ab") as f:
+            f.write(b"\x00" * 10)
+
+        reloaded = make_faiss_memory()
+        assert reloaded.store.num_rows == 1
+        reloaded.add_document("java virtual machine", doc_id="java")
+        assert reloaded.search("java virtual machine", top_k=1)[0].doc_id == "java"
+
+    def test_migrates_json_documents(self, make_faiss_memory, tmp_path, fake_embedder):
+        """Test documents saved in the old JSON format are imported"""
+        kb_path = tmp_path / "kb"
+        kb_path.mkdir()
+        embedding = fake_embedder("legacy document", DIMENSION).tolist()
+        with open(kb_path / "documents.json", "w") as f:
+            json.dump({"old": {"content": "legacy document", "embedding": embedding}}, f)
+
+        memory = make_faiss_memory()
+
+        assert memory.search("legacy document", top_k=1)[0].doc_id == "old"
+        assert not (kb_path / "documents.json").exists()
+
+
+class TestFilteredSearch:
+    """Test metadata pre-filtered search"""
+
+    @pytest.fixture
+    def memory(self, make_faiss_memory, request):
+        memory = make_faiss_memory(**getattr(request, "param", {}))
+        texts = [f"word{i} word{i * 7 % 50} shared" for i in range(300)]
+        metadata = [{"group": i % 100, "tags": ["x", str(i % 2)]} for i in range(300)]
+        memory.add_documents(texts, metadata_list=metadata, doc_ids=[str(i) for i in range(300)])
+        return memory
+
+    @pytest.mark.parametrize(
+        "memory",
+        [{}, {"exact_filter_threshold": 0}, {"index_type": "HNSW", "exact_filter_threshold": 0}],
+        indirect=True,
+    )
+    def test_selective_filter_returns_top_k(self, memory):
+        """Test a filter matching 1% of documents still returns top_k matches"""
+        results = memory.search_with_scores("word7 shared", top_k=3, filters={"group": 7})
+
+        assert sorted(doc.doc_id for doc, _ in results) == ["107", "207", "7"]
+        assert results[0][0].doc_id == "7"
+        assert [score for _, score in results] == sorted(score for _, score in results)
+
+    def test_combined_and_unhashable_filters(self, memory):
+        """Test filters on several keys and list values are intersected"""
+        results = memory.search("shared", top_k=10, filters={"group": 8, "tags": ["x", "0"]})
+        assert sorted(doc.doc_id for doc in results) == ["108", "208", "8"]
+
+        assert memory.search("shared", filters={"group": 8, "tags": ["x", "1"]}) == []
+        assert memory.search("shared", filters={"group": "missing"}) == []
+
+    def test_index_follows_deletes_and_reload(self, memory, make_faiss_memory):
+        """Test the metadata index is kept in sync with deletes and rebuilt on load"""
+        assert memory.delete(filters={"group": 5}) == 3
+        memory.add_document("word5 shared", metadata={"group": 5}, doc_id="new")
+
+        reloaded = make_faiss_memory()
+        results = reloaded.search("word5 shared", top_k=5, filters={"group": 5})
+        assert [doc.doc_id for doc in results] == ["new"]
+
+
+class TestSearchMany:
+    """Test batched multi-query search"""
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{}, {"hybrid_search": True}, {"index_type": "HNSW"}],
+    )
+    def test_matches_single_searches(self, make_faiss_memory, monkeypatch, kwargs):
+        """Test one embedding call returns the same results as separate searches"""
+        memory = make_faiss_memory(**kwargs)
+        texts = [f"word{i} word{i * 7 % 50} shared" for i in range(100)]
+        memory.add_documents(texts, metadata_list=[{"even": i % 2 == 0} for i in range(100)])
+        queries = [texts[3], texts[42], "word7 shared"]
+
+        expected = [memory.search(query, top_k=4, filters={"even": True}) for query in queries]
+        embed_calls = []
+        original = memory._get_embeddings
+        monkeypatch.setattr(
+            memory, "_get_embeddings", lambda texts: embed_calls.append(texts) or original(texts)
+        )
+
+        results = memory.search_many(queries, top_k=4, filters={"even": True})
+
+        assert embed_calls == [queries]
+        assert [[doc.doc_id for doc in docs] for docs in results] == [
+            [doc.doc_id for doc in docs] for docs in expected
+        ]
+        assert memory.search_many([]) == []
+
+
+class TestHybridSearch:
+    """Test BM25 + vector hybrid search"""
+
+    def test_keyword_match_found_by_fusion(self, make_faiss_memory):
+        """Test an exact identifier is retrieved even when embeddings miss it"""
+        memory = make_faiss_memory(hybrid_search=True)
+        texts = [f"word{i} word{i * 7 % 50} shared" for i in range(200)]
+        memory.add_documents(texts, doc_ids=[str(i) for i in range(200)])
+        memory.add_document("deploy failed with ERR_QUOTA_9137", doc_id="quota")
+
+        query = "what does ERR_QUOTA_9137 mean"
+        vector_only = memory._search_vector(memory._get_embedding(query), 5)
+        results = memory.search_with_scores(query, top_k=5)
+
+        assert "quota" not in [doc.doc_id for doc, _ in vector_only]
+        assert "quota" in [doc.doc_id for doc, _ in results]
+        assert [score for _, score in results] == sorted(
+            (score for _, score in results), reverse=True
+        )
+
+    def test_keyword_index_follows_changes(self, make_faiss_memory):
+        """Test filters, deletes and reloads keep the keyword index in sync"""
+        memory = make_faiss_memory(hybrid_search=True)
+        memory.add_document("ticket ABC-123 reopened", metadata={"team": "a"}, doc_id="1")
+        memory.add_document("ticket ABC-123 closed", metadata={"team": "b"}, doc_id="2")
+
+        results = memory.search("abc 123", top_k=5, filters={"team": "b"})
+        assert [doc.doc_id for doc in results] == ["2"]
+
+        memory.delete(doc_id="2")
+        reloaded = make_faiss_memory(hybrid_search=True)
+        assert len(reloaded.bm25) == 1
+        assert [doc.doc_id for doc in reloaded.search("closed", top_k=5)] == ["1"]
+
+
+class TestBulkIngestion:
+    """Test bulk add_documents"""
+
+    def test_batches_and_progress(self, make_faiss_memory, monkeypatch):
+        """Test documents are embedded and written per batch with progress reports"""
+        memory = make_faiss_memory()
+        embed_calls = []
+        original = memory._get_embeddings
+        monkeypatch.setattr(
+            memory,
+            "_get_embeddings",
+            lambda texts: embed_calls.append(len(texts)) or original(texts),
+        )
+        progress = []
+
+        doc_ids = memory.add_documents(
+            [f"document about topic{i}" for i in range(25)],
+            metadata_list=[{"n": i} for i in range(25)],
+            batch_size=10,
+            max_workers=2,
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+
+        assert sorted(embed_calls) == [5, 10, 10]
+        assert progress == [(10, 25), (20, 25), (25, 25)]
+        assert len(doc_ids) == 25 and memory.index.ntotal == 25
+        assert memory.get_document(doc_ids[7]).metadata == {"n": 7}
+        assert memory.search("document about topic7", top_k=1)[0].doc_id == doc_ids[7]
+        assert (memory.index_path / "index.ckpt.faiss").exists()
+
+    def test_resume_after_interruption(self, make_faiss_memory, monkeypatch, tmp_path):
+        """Test an interrupted load resumes from its checkpoint with the same IDs"""
+        memory = make_faiss_memory()
+        documents = [f"document about topic{i}" for i in range(30)]
+        checkpoint = str(tmp_path / "ingest.json")
+
+        original = FAISSKnowledgeMemory._add_batch
+        calls = []
+
+        def failing_add_batch(self, *args):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("interrupted")
+            return original(self, *args)
+
+        monkeypatch.setattr(FAISSKnowledgeMemory, "_add_batch", failing_add_batch)
+        with pytest.raises(RuntimeError):
+            memory.add_documents(documents, batch_size=10, checkpoint_file=checkpoint)
+        assert memory.index.ntotal == 10
+
+        progress = []
+        doc_ids = memory.add_documents(
+            documents,
+            batch_size=10,
+            checkpoint_file=checkpoint,
+            progress_callback=lambda done, total: progress.append(done),
+        )
+
+        assert progress == [20, 30]
+        assert memory.index.ntotal == 30
+        assert memory.search("document about topic3", top_k=1)[0].doc_id == doc_ids[3]
+        assert not (tmp_path / "ingest.json").exists()
+
+    def test_max_documents_applied_once(self, make_faiss_memory):
+        """Test the document limit keeps the newest documents after a bulk load"""
+        memory = make_faiss_memory(max_documents=5)
+        doc_ids = memory.add_documents([f"doc {i}" for i in range(12)], batch_size=4)
+
+        assert list(memory.documents) == doc_ids[-5:]
+        assert memory.index.ntotal == 5
+
+
+class TestEmbeddingCache:
+    """Test the persistent embedding cache"""
+
+    def test_texts_are_embedded_once(self, tmp_path, monkeypatch, fake_embedder):
+        """Test repeated documents and queries are served from the cache"""
+        pytest.importorskip("faiss")
+        pytest.importorskip("openai")
+        requested = []
+        monkeypatch.setattr(
+            FAISSKnowledgeMemory,
+            "_request_embeddings",
+            lambda self, texts: requested.extend(texts)
+            or np.vstack([fake_embedder(text, DIMENSION) for text in texts]),
+        )
+        cache_path = str(tmp_path / "embeddings.db")
+        memory = FAISSKnowledgeMemory(
+            index_path=str(tmp_path / "kb"),
+            dimension=DIMENSION,
+            api_key="test",
+            embedding_cache=EmbeddingCache(cache_path),
+        )
+
+        memory.add_documents(["alpha beta", "gamma delta", "alpha beta"])
+        memory.add_document("gamma delta")
+        assert memory.search("alpha beta", top_k=1)[0].content == "alpha beta"
+        memory.search("alpha beta", top_k=1)
+
+        assert requested == ["alpha beta", "gamma delta"]
+        assert memory.embedding_cache.get_stats()["hits"] == 3
+
+        reopened = EmbeddingCache(cache_path)
+        assert len(reopened) == 2
+        assert reopened.get_many(["gamma delta"], memory.embedding_model)[0] is not None
+
+    def test_lru_eviction_and_model_keys(self):
+        """Test the least recently used vectors are evicted and models don't mix"""
+        cache = EmbeddingCache(":memory:", max_entries=2)
+        cache.put_many(["a", "b"], "model", [[1.0, 0.0], [0.0, 1.0]])
+        cache.get_many(["a"], "model")
+        cache.put_many(["c"], "model", [[1.0, 1.0]])
+
+        vectors = cache.get_many(["a", "b", "c"], "model")
+        assert [vector is not None for vector in vectors] == [True, False, True]
+        assert vectors[2].tolist() == [1.0, 1.0]
+        assert cache.get_many(["a"], "other-model") == [None]
+        assert len(cache) == 2
+
+    def test_hits_are_read_only_and_stamps_shared(self, tmp_path):
+        """Test lookups defer their writes and recency is comparable across instances"""
+        path = str(tmp_path / "embeddings.db")
+        reader = EmbeddingCache(path)
+        writer = EmbeddingCache(path, max_entries=2)
+        writer.put_many(["a", "b"], "model", [[1.0, 0.0], [0.0, 1.0]])
+
+        changes = reader.conn.total_changes
+        assert reader.get_many(["a"], "model")[0] is not None
+        assert reader.conn.total_changes == changes
+        reader.close()
+
+        # The other instance's hit on "a" makes "b" the least recently used
+        writer.put_many(["c"], "model", [[1.0, 1.0]])
+        vectors = writer.get_many(["a", "b", "c"], "model")
+        assert [vector is not None for vector in vectors] == [True, False, True]
+
+    def test_chroma_embedding_function_wrapper(self, make_chroma_memory, chroma_embedding_function):
+        """Test the ChromaDB wrapper embeds each text once and keeps the function's identity"""
+        from react_agent_framework.core.memory.embedding_cache import cached_embedding_function
+
+        cache = EmbeddingCache(":memory:")
+        wrapped = cached_embedding_function(chroma_embedding_function, cache, "fake")
+        assert wrapped.name() == "fake-embedder"
+
+        first = wrapped(["alpha beta", "gamma"])
+        second = wrapped(["gamma", "alpha beta"])
+        assert np.allclose(first[0], second[1])
+        assert cache.get_stats()["misses"] == 2 and cache.get_stats()["hits"] == 2
+
+        memory = make_chroma_memory(embedding_cache=cache)
+        memory.add_document("alpha beta", doc_id="a")
+        assert memory.search("alpha beta", top_k=1)[0].doc_id == "a"
+        assert cache.get_stats()["hits"] >= 3
+
+
+class TestCompactVectors:
+    """Test float16/int8 vector storage and re-ranking"""
+
+    @pytest.mark.parametrize("vector_dtype,item_bytes", [("float16", 2), ("int8", 1)])
+    def test_quantized_store(self, make_faiss_memory, fake_embedder, vector_dtype, item_bytes):
+        """Test compact stores keep no per-document lists and survive a reload"""
+        memory = make_faiss_memory(vector_dtype=vector_dtype)
+        texts = [f"word{i} word{i * 7 % 50} shared" for i in range(50)]
+        doc_ids = memory.add_documents(texts)
+
+        assert memory.get_document(doc_ids[3]).embedding is None
+        np.testing.assert_allclose(
+            memory.get_embedding(doc_ids[3]), fake_embedder(texts[3], DIMENSION), atol=0.01
+        )
+        scale_bytes = 4 if vector_dtype == "int8" else 0
+        assert memory.get_stats()["vector_bytes"] == 50 * (DIMENSION * item_bytes + scale_bytes)
+        memory.close()
+
+        reloaded = make_faiss_memory(vector_dtype=vector_dtype)
+        assert reloaded.search(texts[7], top_k=1)[0].content == texts[7]
+        with pytest.raises(ValueError):
+            make_faiss_memory(vector_dtype="float32")
+
+    def test_rerank_from_compact_store(self, make_faiss_memory):
+        """Test compressed-index candidates are re-scored exactly"""
+        memory = make_faiss_memory(
+            index_type="IVFPQ",
+            nlist=4,
+            nprobe=4,
+            pq_m=4,
+            vector_dtype="int8",
+            rerank_factor=8,
+        )
+        texts = [f"word{i} word{i * 7 % 50} shared" for i in range(300)]
+        memory.add_documents(texts)
+        assert memory.get_stats()["trained"]
+
+        # Distances match an exact search over the stored (int8) vectors
+        from react_agent_framework.core.memory import faiss_index
+
+        rows = np.array(sorted(memory._id_to_doc), dtype=np.int64)
+        for query in ("word3 word99 other", "word120 shared", texts[11]):
+            results = memory.search_with_scores(query, top_k=3)
+            expected, _ = faiss_index.exact_search(
+                memory._get_embedding(query), memory.store.vectors(rows), rows, 3
+            )
+            np.testing.assert_allclose(
+                [distance for _, distance in results], expected[0], rtol=1e-4, atol=1e-5
+            )
+
+    def test_rerank_defaults_to_compressed_indexes(self, make_faiss_memory, tmp_path):
+        """Test only compressed indexes re-rank by default"""
+        assert make_faiss_memory(index_type="IVFPQ").rerank_factor == 4
+
+        # Full-precision HNSW distances are not replaced by int8 re-scoring
+        memory = make_faiss_memory(
+            index_path=str(tmp_path / "hnsw"), index_type="HNSW", vector_dtype="int8"
+        )
+        assert memory.rerank_factor == 1
+        texts = [f"word{i} word{i * 7 % 50} shared" for i in range(50)]
+        memory.add_documents(texts)
+        query = memory._get_embedding(texts[5]).reshape(1, -1)
+        distances, _ = memory.index.search(query, 3)
+        results = memory.search_with_scores(texts[5], top_k=3)
+        np.testing.assert_allclose([distance for _, distance in results], distances[0])
+
+    def test_store_reads_in_batches(self, make_faiss_memory):
+        """Test vectors are read in batches and training fetches only a sample"""
+        from react_agent_framework.core.memory import faiss_index
+
+        memory = make_faiss_memory(vector_dtype="int8")
+        memory.add_documents([f"word{i} shared" for i in range(10)])
+        rows = np.arange(10)
+        batches = list(memory.store.iter_vectors(rows, batch_size=4))
+        assert [len(batch) for batch, _ in batches] == [4, 4, 2]
+        np.testing.assert_array_equal(
+            np.vstack([vectors for _, vectors in batches]), memory.store.vectors(rows)
+        )
+
+        index = faiss_index.create_index(DIMENSION, "IVF", nlist=2)
+        sample = faiss_index.training_rows(index, np.arange(10_000))
+        assert len(sample) == 2 * faiss_index.MAX_TRAIN_POINTS_PER_LIST
+        assert np.all(np.diff(sample) > 0)
+
+
+class TestIngestionPipeline:
+    """Test chunking and deduplication before embedding"""
+
+    def test_chunker_overlap_and_offsets(self):
+        """Test chunks respect the size, overlap and map back to the text"""
+        text = " ".join(f"w{i}" for i in range(25)) + "\n"
+        chunks = TextChunker(chunk_size=10, chunk_overlap=3, encoding_name=None).split(text)
+
+        assert [len(chunk.split()) for _, _, chunk in chunks] == [10, 10, 10, 4]
+        assert chunks[1][2].split()[:3] == chunks[0][2].split()[-3:]
+        assert all(text[start:end] == chunk for start, end, chunk in chunks)
+
+    def test_deduplicator_exact_and_near(self):
+        """Test exact and near-duplicate texts are detected"""
+        dedup = Deduplicator(near_duplicate_threshold=0.7)
+        base = " ".join(f"token{i}" for i in range(60))
+        dedup.add("a", dedup.fingerprint(base))
+
+        assert dedup.find_duplicate(dedup.fingerprint("  " + base.replace(" ", "\n"))) == "a"
+        assert dedup.find_duplicate(dedup.fingerprint(base + " extra")) == "a"
+        assert dedup.find_duplicate(dedup.fingerprint("something else entirely")) is None
+        assert dedup.find_duplicate(dedup.fingerprint(base), exists=lambda item: False) is None
+        assert len(dedup) == 0
+
+    def test_chunks_search_and_expand(self, make_faiss_memory, monkeypatch):
+        """Test chunks are searched, expanded to the parent and duplicates not embedded"""
+        pipeline = IngestionPipeline(TextChunker(chunk_size=8, chunk_overlap=2, encoding_name=None))
+        memory = make_faiss_memory(ingestion=pipeline)
+        manual = " ".join(f"step{i}" for i in range(30))
+
+        assert memory.add_document(manual, metadata={"kind": "manual"}, doc_id="manual") == "manual"
+        assert memory.get_document("manual#0").metadata["parent_id"] == "manual"
+
+        chunk = memory.search("step17 step18", top_k=1)[0]
+        assert chunk.doc_id.startswith("manual#")
+        parent = memory.expand(chunk)
+        assert parent.doc_id == "manual"
+        assert parent.content == manual
+        assert parent.metadata == {"kind": "manual"}
+
+        embedded = []
+        original = memory._get_embeddings
+        monkeypatch.setattr(
+            memory, "_get_embeddings", lambda texts: embedded.extend(texts) or original(texts)
+        )
+        assert memory.add_documents([manual, "brand new text"], doc_ids=["copy", "new"]) == [
+            "copy",
+            "new",
+        ]
+        assert embedded == ["brand new text"]
+        # A document dropped entirely as a duplicate keeps its ID but stores nothing
+        assert memory.get_document("copy") is None
+
+        # Re-adding a document replaces its chunks
+        memory.add_document("short replacement", doc_id="manual")
+        assert memory.expand(memory.get_document("manual#0")).content == "short replacement"
+        assert memory.get_document("manual#1") is None
+
+        # Parent IDs resolve to their chunks
+        guide = " ".join(f"part{i}" for i in range(30))
+        memory.add_document(guide, doc_id="guide")
+        assert memory.get_document("guide").content == guide
+        assert memory.delete(doc_id="guide") == 5
+        assert memory.get_document("guide") is None
+        assert memory.get_document("guide#0") is None
+        assert memory.delete(doc_id="guide") == 0
+
+    @pytest.mark.parametrize("deduplicate", [True, False])
+    def test_resume_with_doc_ids(self, make_faiss_memory, monkeypatch, tmp_path, deduplicate):
+        """Test a resumed chunked load keeps the chunks written before the interruption"""
+        pipeline = IngestionPipeline(
+            TextChunker(chunk_size=8, chunk_overlap=2, encoding_name=None),
+            deduplicate=deduplicate,
+        )
+        memory = make_faiss_memory(ingestion=pipeline)
+        documents = [" ".join(f"{name}{i}" for i in range(50)) for name in ("alpha", "beta")]
+        checkpoint = str(tmp_path / "ingest.json")
+
+        # A previous version of "a" is replaced
+        memory.add_document("old version of a", doc_id="a")
+
+        original = FAISSKnowledgeMemory._add_batch
+        calls = []
+
+        def failing_add_batch(self, *args):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("interrupted")
+            return original(self, *args)
+
+        monkeypatch.setattr(FAISSKnowledgeMemory, "_add_batch", failing_add_batch)
+        with pytest.raises(RuntimeError):
+            memory.add_documents(
+                documents, doc_ids=["a", "b"], batch_size=4, checkpoint_file=checkpoint
+            )
+
+        memory.add_documents(
+            documents, doc_ids=["a", "b"], batch_size=4, checkpoint_file=checkpoint
+        )
+        assert len(memory.documents) == 16
+        assert memory.expand(memory.get_document("a#0")).content == documents[0]
+        assert memory.expand(memory.get_document("b#7")).content == documents[1]
+        assert not (tmp_path / "ingest.json").exists()
+
+
+class TestIndexTraining:
+    """Test IVF training and tuning"""
+
+    @pytest.mark.parametrize("index_type", ["IVF", "IVFSQ", "IVFPQ"])
+    def test_trains_once_enough_vectors(self, make_faiss_memory, index_type):
+        """Test IVF types search exactly until trained, then switch to the trained index"""
+        faiss = pytest.importorskip("faiss")
+        from react_agent_framework.core.memory import faiss_index
+
+        memory = make_faiss_memory(index_type=index_type, nlist=4, min_train_vectors=40)
+        texts = [f"word{i} word{i * 7 % 50} shared" for i in range(300)]
+
+        memory.add_documents(texts[:20])
+        assert not memory.get_stats()["trained"]
+        assert memory.search(texts[5], top_k=1)[0].content == texts[5]
+
+        memory.add_documents(texts[20:])
+        assert memory.get_stats()["trained"]
+        assert memory.index.ntotal == 300
+        assert isinstance(faiss_index.inner_index(memory.index), faiss.IndexIVF)
+
+        # Reload keeps the trained index and search parameters
+        reloaded = make_faiss_memory(index_type=index_type, nlist=4, nprobe=4)
+        assert reloaded.get_stats()["trained"]
+        assert faiss_index.inner_index(reloaded.index).nprobe == 4
+        assert texts[123] in [doc.content for doc in reloaded.search(texts[123], top_k=5)]
+
+    @pytest.mark.parametrize("index_type", ["IVF", "IVFPQ"])
+    def test_deletes_and_evicts_after_training(self, make_faiss_memory, index_type):
+        """Test a trained IVF index removes deleted, evicted and stale IDs"""
+        from react_agent_framework.core.memory import faiss_index
+
+        memory = make_faiss_memory(
+            index_type=index_type, nlist=4, min_train_vectors=40, max_documents=300
+        )
+        texts = [f"word{i} word{i * 7 % 50} shared" for i in range(320)]
+        memory.add_documents(texts, doc_ids=[str(i) for i in range(320)])
+        assert memory.get_stats()["trained"]
+
+        # Eviction removed the oldest 20
+        assert memory.index.ntotal == 300
+        assert memory.delete(doc_id="100") == 1
+        assert memory.delete(doc_id="101") == 1
+        assert memory.delete(filters={"missing": 1}) == 0
+        memory.add_document("one more document", doc_id="new")
+        assert memory.index.ntotal == 299
+        assert "100" not in [doc.doc_id for doc in memory.search(texts[100], top_k=5)]
+
+        # Deletes after the checkpoint are removed from it on reload
+        reloaded = make_faiss_memory(index_type=index_type, nlist=4, min_train_vectors=40)
+        assert reloaded.index.ntotal == 299
+        indexed = set(faiss_index.index_ids(reloaded.index).tolist())
+        assert indexed == set(reloaded._id_to_doc)
+
+    def test_benchmark_index(self, make_faiss_memory):
+        """Test the benchmark reports recall and latency per config"""
+        memory = make_faiss_memory()
+        memory.add_documents([f"word{i} word{i * 3 % 40} topic{i % 9}" for i in range(400)])
+
+        results = memory.benchmark_index(num_queries=20, top_k=5)
+
+        flat = results[0]
+        assert flat["config"] == {"index_type": "Flat"}
+        assert flat["recall"] == 1.0
+        assert {"latency_ms", "build_seconds", "size_bytes"} <= set(flat)
+        assert any(r["config"]["index_type"] == "IVFPQ" for r in results)
+
+
+class TestChromaKnowledgeMemory:
+    """Test ChromaKnowledgeMemory (if available)"""
+
+    def test_hybrid_search_with_filters(self, make_chroma_memory, monkeypatch):
+        """Test filters are applied to keyword candidates by ID and reopening rebuilds BM25"""
+        from react_agent_framework.core.memory.knowledge import chroma
+
+        monkeypatch.setattr(chroma, "_PAGE_SIZE", 2)
+        memory = make_chroma_memory(hybrid_search=True)
+        for i in range(5):
+            memory.add_document(f"filler text number {i}", metadata={"team": "a"}, doc_id=f"f{i}")
+        memory.add_document("ticket ABC-123 reopened", metadata={"team": "a"}, doc_id="1")
+        memory.add_document("ticket ABC-123 closed", metadata={"team": "b"}, doc_id="2")
+
+        collection_type = type(memory.collection)
+        gets = []
+        original_get = collection_type.get
+        monkeypatch.setattr(
+            collection_type,
+            "get",
+            lambda self, *args, **kwargs: gets.append(kwargs)
+            or original_get(self, *args, **kwargs),
+        )
+
+        results = memory.search_with_scores("abc 123", top_k=5, filters={"team": "b"})
+        assert [doc.doc_id for doc, _ in results] == ["2"]
+        assert all("ids" in call for call in gets if call.get("where"))
+
+        memory.delete(doc_id="2")
+        reopened = make_chroma_memory(hybrid_search=True)
+        assert len(reopened.bm25) == 6
+        assert reopened.search("abc 123", top_k=1)[0].doc_id == "1"
+
+    def test_search_many_matches_single_searches(self, make_chroma_memory, monkeypatch):
+        """Test one collection query returns the same results as separate searches"""
+        memory = make_chroma_memory()
+        texts = [f"word{i} word{i * 7 % 50} shared" for i in range(60)]
+        memory.add_documents(texts, metadata_list=[{"even": i % 2 == 0} for i in range(60)])
+        queries = [texts[3], texts[42], "word7 shared"]
+
+        expected = [memory.search(query, top_k=4, filters={"even": True}) for query in queries]
+        collection_type = type(memory.collection)
+        query_calls = []
+        original_query = collection_type.query
+        monkeypatch.setattr(
+            collection_type,
+            "query",
+            lambda self, *args, **kwargs: query_calls.append(kwargs)
+            or original_query(self, *args, **kwargs),
+        )
+
+        results = memory.search_many(queries, top_k=4, filters={"even": True})
+
+        assert [call["query_texts"] for call in query_calls] == [queries]
+        assert [[doc.doc_id for doc in docs] for docs in results] == [
+            [doc.doc_id for doc in docs] for docs in expected
+        ]
+        assert memory.search_many([]) == []
+
+    def test_bulk_batches_and_max_documents(self, make_chroma_memory, monkeypatch):
+        """Test bulk loads embed once per batch, write upserts and trim once"""
+        from react_agent_framework.core.memory.knowledge.chroma import ChromaKnowledgeMemory
+
+        memory = make_chroma_memory(max_documents=20)
+        embed_calls = []
+        original_embed = ChromaKnowledgeMemory._embed_batch
+        monkeypatch.setattr(
+            ChromaKnowledgeMemory,
+            "_embed_batch",
+            lambda self, contents: embed_calls.append(len(contents))
+            or original_embed(self, contents),
+        )
+        progress = []
+
+        doc_ids = memory.add_documents(
+            [f"document about topic{i}" for i in range(25)],
+            metadata_list=[{"n": i} for i in range(25)],
+            batch_size=10,
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+
+        assert embed_calls == [10, 10, 5]
+        assert progress == [(10, 25), (20, 25), (25, 25)]
+        assert memory.collection.count() == 20
+        assert memory.get_document(doc_ids[0]) is None
+        assert memory.get_document(doc_ids[7]).metadata == {"n": 7}
+        assert memory.search("document about topic12", top_k=1)[0].doc_id == doc_ids[12]
+
+        # Writes are upserts, so replaying a batch doesn't fail or duplicate
+        memory.add_documents(["document about topic7 revised"], doc_ids=[doc_ids[7]])
+        assert memory.get_document(doc_ids[7]).content == "document about topic7 revised"
+        assert memory.collection.count() == 20
+
+    def test_chunks_search_and_expand(self, make_chroma_memory, monkeypatch):
+        """Test chunks are stored, expanded to the parent and duplicates not embedded"""
+        from react_agent_framework.core.memory.knowledge.chroma import ChromaKnowledgeMemory
+
+        pipeline = IngestionPipeline(TextChunker(chunk_size=8, chunk_overlap=2, encoding_name=None))
+        memory = make_chroma_memory(ingestion=pipeline)
+        manual = " ".join(f"step{i}" for i in range(30))
+
+        assert memory.add_document(manual, metadata={"kind": "manual"}, doc_id="manual") == "manual"
+        assert memory.get_document("manual#0").metadata["parent_id"] == "manual"
+
+        chunk = memory.search("step17 step18", top_k=1)[0]
+        assert chunk.doc_id.startswith("manual#")
+        parent = memory.expand(chunk)
+        assert parent.doc_id == "manual"
+        assert parent.content == manual
+        assert parent.metadata == {"kind": "manual"}
+
+        embedded = []
+        original_embed = ChromaKnowledgeMemory._embed_batch
+        monkeypatch.setattr(
+            ChromaKnowledgeMemory,
+            "_embed_batch",
+            lambda self, contents: embedded.extend(contents) or original_embed(self, contents),
+        )
+        assert memory.add_documents([manual, "brand new text"], doc_ids=["copy", "new"]) == [
+            "copy",
+            "new",
+        ]
+        assert embedded == ["brand new text"]
+        # A document dropped entirely as a duplicate keeps its ID but stores nothing
+        assert memory.get_document("copy") is None
+
+        # A reopened memory seeds deduplication page by page from the collection
+        monkeypatch.setattr("react_agent_framework.core.memory.knowledge.chroma._PAGE_SIZE", 2)
+        reopened = make_chroma_memory(
+            ingestion=IngestionPipeline(
+                TextChunker(chunk_size=8, chunk_overlap=2, encoding_name=None)
+            )
+        )
+        embedded.clear()
+        reopened.add_documents([manual, "brand new text"], doc_ids=["again", "newer"])
+        assert embedded == []
+
+        # Re-adding a document replaces its chunks
+        memory.add_document("short replacement", doc_id="manual")
+        assert memory.expand(memory.get_document("manual#0")).content == "short replacement"
+        assert memory.get_document("manual#1") is None
+
+        # Parent IDs resolve to their chunks
+        guide = " ".join(f"part{i}" for i in range(30))
+        memory.add_document(guide, doc_id="guide")
+        assert memory.get_document("guide").content == guide
+        assert memory.delete(doc_id="guide") == 5
+        assert memory.get_document("guide") is None
+        assert memory.get_document("guide#0") is None
+        assert memory.delete(doc_id="guide") == 0
@@ -38,11 +38,7 @@ class TestMemoryMessage:
 
     def test_from_dict(self):
         """Test creating MemoryMessage from dict"""
-        data = {
-            "content": "Test message",
-            "role": "assistant",
-            "metadata": {"key": "value"}
-        }
+        data = {"content": "Test message", "role": "assistant", "metadata": {"key": "value"}}
         msg = MemoryMessage.from_dict(data)
 
         assert msg.content == "Test message"
@@ -253,38 +249,479 @@ class TestSimpleMemory:
         assert "1" in repr_str  # 1 message
         assert "50" in repr_str  # max 50
 
+    def test_search_ranks_by_relevance_after_eviction(self):
+        """Test keyword search ranks matches and forgets evicted messages"""
+        memory = SimpleMemory(max_messages=3)
+        memory.add("error E1042 in the parser")
+        memory.add("the weather is nice")
+        memory.add("parser warning, nothing serious")
+        memory.add("E1042 again: E1042 means a missing token in the parser")
+
+        results = memory.search("E1042 parser", top_k=2)
+        assert [msg.content for msg in results] == [
+            "E1042 again: E1042 means a missing token in the parser",
+            "parser warning, nothing serious",
+        ]
+        assert memory.search("weath")[0].content == "the weather is nice"
+
+
+class TestBM25:
+    """Test the BM25 keyword index and rank fusion"""
+
+    def test_scores_and_incremental_updates(self):
+        """Test rare terms weigh more and removed items stop matching"""
+        from react_agent_framework.core.memory.bm25 import BM25Index
+
+        index = BM25Index()
+        index.add(1, "connection refused ECONNREFUSED")
+        index.add(2, "connection reset by peer")
+        index.add(3, "connection timed out")
+
+        assert [item for item, _ in index.search("connection ECONNREFUSED")][0] == 1
+        assert index.search("nothing matches") == []
+
+        index.remove(1)
+        index.add(2, "ECONNREFUSED after retry")
+        assert [item for item, _ in index.search("econnrefused")] == [2]
+        assert [item for item, _ in index.search("connection", accept=lambda i: i != 3)] == []
+        assert len(index) == 2
+
+    def test_reciprocal_rank_fusion(self):
+        """Test items ranked well by both retrievers win"""
+        from react_agent_framework.core.memory.bm25 import reciprocal_rank_fusion
+
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "c", "d"]], k=60)
+
+        assert [item for item, _ in fused] == ["b", "c", "a", "d"]
+
+
+class TestCompactMessages:
+    """Test slotted messages and their compact variants"""
+
+    def test_compact_message_is_slotted_subclass(self):
+        """Test compact messages behave like the dataclass they derive from"""
+        import dataclasses
+
+        from react_agent_framework.core.memory import ChatMessage, CompactChatMessage
+
+        assert not hasattr(ChatMessage("plain"), "__dict__")
+
+        msg = CompactChatMessage("hello", "user", session_id="s1")
+        assert isinstance(msg, ChatMessage)
+        assert not hasattr(msg, "__dict__")
+        with pytest.raises(AttributeError):
+            msg.foo = 1
+        assert not msg.has_metadata and msg._metadata is None
+        assert msg == ChatMessage("hello", "user", msg.timestamp, "s1")
+        assert msg.to_dict()["session_id"] == "s1"
+        assert abs(msg.created - msg.timestamp.timestamp()) < 1e-6
+
+        msg.metadata["tag"] = "x"
+        assert msg.has_metadata
+        assert repr(msg).startswith("CompactChatMessage(content='hello', role='user'")
+
+        msg.content = "changed"
+        copy = dataclasses.replace(msg, role="assistant")
+        assert isinstance(copy, CompactChatMessage)
+        assert (copy.content, copy.role, copy.metadata) == ("changed", "assistant", {"tag": "x"})
+        assert dataclasses.asdict(msg)["metadata"] == {"tag": "x"}
+
+    def test_adapters_share_fields(self):
+        """Test adapters convert without copying content or metadata"""
+        from react_agent_framework.core.memory import SimpleChatMemory
+        from react_agent_framework.core.memory.adapters import (
+            ChatToLegacyAdapter,
+            LegacyMemoryAdapter,
+        )
+
+        chat = SimpleChatMemory(session_id="s1")
+        legacy = ChatToLegacyAdapter(chat)
+        legacy.add("hello", metadata={"k": 1})
+
+        message = legacy.get_recent()[0]
+        assert isinstance(message, MemoryMessage)
+        assert not hasattr(message, "__dict__")
+        assert message.metadata is chat.get_recent()[0].metadata
+        assert message.to_dict() == {
+            "content": "hello",
+            "role": "user",
+            "timestamp": message.timestamp.isoformat(),
+            "metadata": {"k": 1},
+        }
+
+        memory = SimpleMemory()
+        memory.add("hi")
+        chat_message = LegacyMemoryAdapter(memory).get_recent()[0]
+        assert chat_message.session_id == "default"
+        assert chat_message.content is memory.get_all()[0].content
+
+    def test_compact_agent_message(self):
+        """Test the multi-agent Message has a compact variant the bus accepts"""
+        from react_agent_framework.core.memory import CompactMessage
+        from react_agent_framework.multi_agent.communication import (
+            Message,
+            MessageBus,
+            MessageType,
+        )
+
+        msg = CompactMessage("a1", "a2", MessageType.REQUEST, {"q": 1}, conversation_id="c1")
+        assert isinstance(msg, Message)
+        assert not hasattr(msg, "__dict__") and not msg.has_metadata
+        assert msg == Message.from_dict(msg.to_dict())
+        assert isinstance(CompactMessage.from_dict(msg.to_dict()), CompactMessage)
+        assert msg.create_reply("a2", "done").reply_to == msg.message_id
+
+        # The bus stamps the expiry in place
+        bus = MessageBus(message_ttl=60)
+        bus.register_agent("a2")
+        assert bus.send(msg)
+        assert bus.receive("a2")[0] is msg
+        assert msg.expires_at is not None
+
+
+class TestContextAssembler:
+    """Test relevance-ranked context assembly"""
+
+    def test_packs_best_candidates_in_chronological_order(self):
+        """Test a relevant old message beats recent filler within the budget"""
+        from react_agent_framework.core.memory.context import ContextAssembler
+
+        candidates = [MemoryMessage(f"filler message number {i}") for i in range(20)]
+        candidates[2] = MemoryMessage("the deploy failed with error E1042")
+
+        assembler = ContextAssembler()
+        context = assembler.assemble(candidates, query="E1042 deploy", max_tokens=20)
+
+        assert context[0].content == "the deploy failed with error E1042"
+        assert context[-1].content == "filler message number 19"
+        assert sum(len(m.content) + 3 for m in context) // 4 <= 20
+
+        # Without a query, pure recency keeps the newest messages
+        recent = assembler.assemble(candidates, max_tokens=1000, max_messages=3)
+        assert [m.content for m in recent] == [f"filler message number {i}" for i in (17, 18, 19)]
+
+    def test_chat_get_context_and_adapter(self):
+        """Test get_context mixes search hits with recent messages"""
+        from react_agent_framework.core.memory import SimpleChatMemory
+        from react_agent_framework.core.memory.adapters import ChatToLegacyAdapter
+
+        chat = SimpleChatMemory()
+        chat.add_message("my favourite colour is teal")
+        for i in range(30):
+            chat.add_message(f"small talk {i}")
+
+        context = chat.get_context(query="favourite colour", max_messages=4)
+        assert [m.content for m in context] == [
+            "my favourite colour is teal",
+            "small talk 27",
+            "small talk 28",
+            "small talk 29",
+        ]
+
+        legacy_context = ChatToLegacyAdapter(chat).get_context("favourite colour")
+        assert legacy_context[0].content == "my favourite colour is teal"
+        assert all(isinstance(msg, MemoryMessage) for msg in legacy_context)
+
+    def test_assembler_is_per_memory(self):
+        """Test tuning one memory's assembler leaves the others alone"""
+        from react_agent_framework.core.memory import SimpleChatMemory
+
+        first, second = SimpleChatMemory(), SimpleChatMemory()
+        first.context_assembler.keyword_weight = 0.9
+
+        assert second.context_assembler.keyword_weight == 0.4
+        assert SimpleMemory().context_assembler is not SimpleMemory().context_assembler
+
+
+class TestMemoryBenchmark:
+    """Test the memory benchmark harness"""
+
+    def test_suite_reports_json_results(self, tmp_path):
+        """Test a small run covers every metric and serializes to JSON"""
+        import json
+
+        from react_agent_framework.core.memory.benchmark import SyntheticCorpus, run_suite
+
+        assert SyntheticCorpus(seed=1).texts(3, 5) == SyntheticCorpus(seed=1).texts(3, 5)
+
+        report = run_suite(
+            ["simple_memory", "sqlite_chat"],
+            ["50"],
+            directory=str(tmp_path),
+            num_queries=5,
+            threads=[1, 2],
+            ops_per_thread=10,
+        )
+        json.dumps(report)
+
+        assert report["meta"]["seed"] == 0
+        for result in report["results"]:
+            assert result["size"] == 50
+            assert result["insert"]["items_per_sec"] > 0
+            assert result["search"]["count"] == 5
+            assert result["get_recent"]["p50_ms"] >= 0
+            assert [sweep["threads"] for sweep in result["concurrency"]] == [1, 2]
+        assert report["results"][1]["footprint"]["disk_bytes"] > 0
+
+        with pytest.raises(ValueError):
+            run_suite(["nope"], ["1k"])
+
+    def test_sweep_threads_keep_their_sessions(self, tmp_path):
+        """Test concurrent sweep writes land in each thread's own session"""
+        from react_agent_framework.core.memory import benchmark
+
+        backend = benchmark.BACKENDS["simple_chat"](tmp_path, benchmark.FakeEmbedder())
+        corpus = benchmark.SyntheticCorpus()
+        benchmark._concurrency_sweep(
+            backend, corpus, corpus.queries(3), 0, [4], 25, write_ratio=1.0, top_k=3
+        )
+
+        for worker_id in range(4):
+            history = backend.memory.get_history(session_id=corpus.session(worker_id))
+            assert [m.content for m in history] == corpus.texts(25, worker_id * 25)
+
 
 class TestChromaMemory:
     """Test ChromaDB memory (if available)"""
 
-    def test_import_without_chromadb(self):
+    def test_import_without_chromadb(self, tmp_path):
         """Test ChromaMemory import fails gracefully without package"""
         try:
             from react_agent_framework.core.memory import ChromaMemory
 
             # If import succeeds, creating instance should fail
             with pytest.raises(ImportError, match="ChromaDB not installed"):
-                ChromaMemory()
+                ChromaMemory(persist_directory=str(tmp_path))
         except ImportError:
             # OK if import itself fails
             pass
 
+    @pytest.fixture
+    def chroma_memory_class(self, monkeypatch, chroma_embedding_function):
+        """ChromaMemory with the fake embedding function"""
+        from react_agent_framework.core.memory import ChromaMemory
+
+        monkeypatch.setattr(
+            ChromaMemory, "_get_embedding_function", lambda self, *args: chroma_embedding_function
+        )
+        return ChromaMemory
+
+    def test_recent_and_eviction_use_sequence_numbers(self, tmp_path, chroma_memory_class):
+        """Test get_recent returns the latest messages and eviction drops the oldest"""
+        ChromaMemory = chroma_memory_class
+
+        memory = ChromaMemory(persist_directory=str(tmp_path), max_messages=5, session_id="s1")
+        for i in range(8):
+            memory.add(f"message {i}", role="user" if i % 2 == 0 else "assistant")
+
+        assert [m.content for m in memory.get_recent(2)] == ["message 6", "message 7"]
+        assert [m.content for m in memory.get_recent(10)] == [f"message {i}" for i in range(3, 8)]
+        assert [m.content for m in memory.get_recent(2, filters={"role": "user"})] == [
+            "message 4",
+            "message 6",
+        ]
+        assert memory.get_stats()["session_messages"] == 5
+
+        # The sidecar index survives a restart
+        reopened = ChromaMemory(persist_directory=str(tmp_path), session_id="s1")
+        assert [m.content for m in reopened.get_recent(1)] == ["message 7"]
+
+    def test_stale_sidecar_is_reconciled(self, tmp_path, chroma_memory_class):
+        """Test messages missing from the sidecar are found on load and numbers never repeat"""
+        ChromaMemory = chroma_memory_class
+        memory = ChromaMemory(persist_directory=str(tmp_path), session_id="s1")
+        for i in range(3):
+            memory.add(f"message {i}")
+
+        # Roll the sidecar back, as if it had not been written after the last add
+        memory._recency_db.execute("UPDATE sessions SET next_seq = 1")
+        memory._recency_db.execute("DELETE FROM messages WHERE seq >= 1")
+
+        reopened = ChromaMemory(persist_directory=str(tmp_path), session_id="s1")
+        reopened.add("message 3")
+
+        seqs = reopened.collection.get(include=["metadatas"])["metadatas"]
+        assert sorted(metadata["seq"] for metadata in seqs) == [0, 1, 2, 3]
+        assert [m.content for m in reopened.get_recent(2)] == ["message 2", "message 3"]
+        assert reopened.get_stats()["session_messages"] == 4
+
+    def test_stats_and_eviction_with_sequence_gaps(self, tmp_path, chroma_memory_class):
+        """Test counts and eviction do not assume contiguous sequence numbers"""
+        ChromaMemory = chroma_memory_class
+        memory = ChromaMemory(persist_directory=str(tmp_path), max_messages=4, session_id="s1")
+        for i in range(3):
+            memory.add(f"message {i}")
+
+        # Numbers reserved by writes that never landed are not given back
+        memory._recency_db.execute("UPDATE sessions SET next_seq = next_seq + 5")
+        for i in range(3, 6):
+            memory.add(f"message {i}")
+
+        assert memory.get_stats()["session_messages"] == 4
+        assert [m.content for m in memory.get_recent(10)] == [f"message {i}" for i in range(2, 6)]
+        assert memory.collection.count() == 4
+
+    def test_embedding_caches_stay_per_memory(
+        self, tmp_path, chroma_memory_class, chroma_embedding_function
+    ):
+        """Test a cached memory doesn't leak its cache or model into later collections"""
+        from chromadb.utils.embedding_functions import known_embedding_functions
+
+        from react_agent_framework.core.memory import EmbeddingCache
+
+        ChromaMemory = chroma_memory_class
+        first_cache = EmbeddingCache(str(tmp_path / "first.db"))
+        first = ChromaMemory(
+            persist_directory=str(tmp_path / "a"),
+            embedding_model="model-a",
+            embedding_cache=first_cache,
+        )
+        first.add("shared text")
+        first_cache.close()
+
+        second_cache = EmbeddingCache(str(tmp_path / "second.db"))
+        second = ChromaMemory(
+            persist_directory=str(tmp_path / "b"),
+            embedding_model="model-b",
+            embedding_cache=second_cache,
+        )
+        second.add("shared text")
+        assert second.search("shared text", top_k=1)[0].content == "shared text"
+        assert second_cache.get_many(["shared text"], "default:model-b")[0] is not None
+        assert second_cache.get_many(["shared text"], "default:model-a")[0] is None
+
+        # Collections opened without a cache rebuild the plain function
+        rebuilt = known_embedding_functions["fake-embedder"].build_from_config({})
+        assert type(rebuilt) is type(chroma_embedding_function)
+        assert ChromaMemory(persist_directory=str(tmp_path / "a")).search("shared text")
+
+    def test_direct_deletes_are_reconciled(self, tmp_path, monkeypatch, chroma_memory_class):
+        """Test messages deleted from the collection leave the sidecar on request"""
+        ChromaMemory = chroma_memory_class
+        monkeypatch.setattr("react_agent_framework.core.memory.chroma._PAGE_SIZE", 3)
+        memory = ChromaMemory(persist_directory=str(tmp_path), max_messages=4, session_id="s1")
+        for i in range(4):
+            memory.add(f"message {i}")
+
+        memory.collection.delete(where={"seq": {"$lt": 2}})
+
+        # Only checked on request: by default the sidecar is trusted
+        trusting = ChromaMemory(persist_directory=str(tmp_path), session_id="s1")
+        assert trusting.get_stats()["session_messages"] == 4
+
+        reopened = ChromaMemory(
+            persist_directory=str(tmp_path),
+            max_messages=4,
+            session_id="s1",
+            reconcile_deletes=True,
+        )
+        assert reopened.get_stats()["session_messages"] == 2
+        assert [m.content for m in reopened.get_recent(2)] == ["message 2", "message 3"]
+
+        for i in range(4, 7):
+            reopened.add(f"message {i}")
+        assert [m.content for m in reopened.get_recent(10)] == [f"message {i}" for i in range(3, 7)]
+
 
 class TestFAISSMemory:
     """Test FAISS memory (if available)"""
 
-    def test_import_without_faiss(self):
+    def test_import_without_faiss(self, tmp_path):
         """Test FAISSMemory import fails gracefully without package"""
         try:
             from react_agent_framework.core.memory import FAISSMemory
 
             # If import succeeds, creating instance should fail
             with pytest.raises(ImportError, match="FAISS not installed"):
-                FAISSMemory()
+                FAISSMemory(index_path=str(tmp_path))
         except ImportError:
             # OK if import itself fails
             pass
 
+    def test_persistence_and_eviction(self, tmp_path, monkeypatch, fake_embedder):
+        """Test messages survive a reload and eviction removes the oldest vector"""
+        pytest.importorskip("faiss")
+        pytest.importorskip("openai")
+        from react_agent_framework.core.memory.faiss import FAISSMemory
+
+        monkeypatch.setattr(FAISSMemory, "_get_embedding", lambda self, text: fake_embedder(text))
+        index_path = str(tmp_path / "faiss")
+
+        memory = FAISSMemory(index_path=index_path, dimension=32, max_messages=2, api_key="test")
+        memory.add("python programming language", role="user")
+        memory.add("java virtual machine", role="assistant")
+        memory.add("rust ownership borrow checker", role="user")
+        assert memory.index.ntotal == 2
+
+        reloaded = FAISSMemory(index_path=index_path, dimension=32, api_key="test")
+        assert [msg.content.split()[0] for msg in reloaded.get_recent(5)] == ["java", "rust"]
+        assert reloaded.search("java virtual machine", top_k=1)[0].role == "assistant"
+
+    def test_eviction_compacts_vector_file(self, tmp_path, monkeypatch, fake_embedder):
+        """Test evicted vectors are reclaimed at checkpoints instead of piling up"""
+        pytest.importorskip("faiss")
+        pytest.importorskip("openai")
+        from react_agent_framework.core.memory.faiss import FAISSMemory
+
+        monkeypatch.setattr(FAISSMemory, "_get_embedding", lambda self, text: fake_embedder(text))
+        index_path = str(tmp_path / "faiss")
+
+        memory = FAISSMemory(
+            index_path=index_path,
+            dimension=32,
+            max_messages=3,
+            checkpoint_interval=5,
+            api_key="test",
+        )
+        for i in range(40):
+            memory.add(f"message number {i}")
+
+        vectors_file = tmp_path / "faiss" / "vectors.f32"
+        assert memory.store.num_rows < 15
+        assert vectors_file.stat().st_size == memory.store.num_rows * 32 * 4
+
+        memory.compact()
+        assert memory.store.num_rows == 3
+        assert vectors_file.stat().st_size == 3 * 32 * 4
+        live = {f"message number {i}" for i in (37, 38, 39)}
+        assert {msg.content for msg in memory.search("message number", top_k=3)} == live
+
+        memory.close()
+        reloaded = FAISSMemory(index_path=index_path, dimension=32, api_key="test")
+        assert [msg.content for msg in reloaded.get_recent(5)] == [
+            f"message number {i}" for i in (37, 38, 39)
+        ]
+        assert {msg.content for msg in reloaded.search("message number", top_k=3)} == live
+
+    def test_ivf_eviction_after_training(self, tmp_path, monkeypatch, fake_embedder):
+        """Test a trained IVF index keeps evicting the oldest messages"""
+        pytest.importorskip("faiss")
+        pytest.importorskip("openai")
+        from react_agent_framework.core.memory.faiss import FAISSMemory
+
+        monkeypatch.setattr(FAISSMemory, "_get_embedding", lambda self, text: fake_embedder(text))
+        index_path = str(tmp_path / "faiss")
+
+        memory = FAISSMemory(
+            index_path=index_path,
+            dimension=32,
+            index_type="IVF",
+            nlist=2,
+            max_messages=100,
+            api_key="test",
+        )
+        for i in range(130):
+            memory.add(f"message number {i} word{i % 17}")
+
+        assert memory.get_stats()["trained"]
+        assert memory.index.ntotal == 100
+        assert memory.get_recent(1)[0].content == "message number 129 word10"
+
+        reloaded = FAISSMemory(
+            index_path=index_path, dimension=32, index_type="IVF", nlist=2, api_key="test"
+        )
+        assert reloaded.index.ntotal == 100
+
 
 class TestMemoryIntegration:
     """Test memory integration with Message objects"""
@@ -0,0 +1,315 @@
+"""
+Test built-in tools
+"""
+
+import json
+import os
+import pytest
+from react_agent_framework.tools.filesystem import ReadFile, Grep, ReadFiles, WriteFiles
+from react_agent_framework.tools.computation import Calculator
+from react_agent_framework.tools.computation import calculator
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """Log file with an error every 100 lines"""
+    path = tmp_path / "app.log"
+    with open(path, "w") as f:
+        for i in range(1, 1001):
+            status = "ERROR 500 failed" if i % 100 == 0 else "ok"
+            f.write(f"line {i} {status}\n")
+    return path
+
+
+class TestReadFile:
+    """Test ReadFile tool"""
+
+    def test_read_small_file_whole(self, tmp_path):
+        """Test small files are returned unchanged"""
+        path = tmp_path / "notes.txt"
+        path.write_text("hello\nworld\n")
+
+        assert ReadFile()(str(path)) == "hello\nworld\n"
+
+    def test_head_and_tail(self, log_file):
+        """Test head/tail return only the requested lines"""
+        tool = ReadFile()
+
+        head = tool(f"{log_file}|||head=2")
+        assert "line 1 ok\nline 2 ok\n" in head
+        assert "line 3 " not in head
+
+        tail = tool(f"{log_file}|||tail=2")
+        assert "line 999 ok\nline 1000 ERROR" in tail
+        assert "line 998 " not in tail
+
+    def test_line_range(self, log_file):
+        """Test lines=START-END selects an inclusive range"""
+        result = ReadFile()(f"{log_file}|||lines=10-12")
+
+        assert "lines 10-12" in result
+        assert "line 10 ok\nline 11 ok\nline 12 ok\n" in result
+        assert "line 13 " not in result
+
+    def test_line_range_edges(self, tmp_path):
+        """Test an end line of 0 and a last line without a trailing newline"""
+        path = tmp_path / "short.txt"
+        path.write_text("a\nb\nc")
+        tool = ReadFile()
+
+        assert tool(f"{path}|||lines=2-").startswith(f"[{path}: bytes 2-4 of 5B, lines 2-3]")
+        assert "a\n" not in tool(f"{path}|||lines=0-0")
+
+    def test_excerpt_headers_at_edges(self, tmp_path):
+        """Test empty and clamped ranges are reported as such"""
+        path = tmp_path / "five.txt"
+        path.write_text("1\n2\n3\n4\n5\n")
+        unterminated = tmp_path / "short.txt"
+        unterminated.write_text("a\nb\nc")
+        tool = ReadFile()
+
+        assert tool(f"{unterminated}|||tail=0") == f"[{unterminated}: empty range at byte 5 of 5B]"
+        assert tool(f"{path}|||head=0") == f"[{path}: empty range at byte 0 of 10B]"
+        assert tool(f"{path}|||lines=5-9") == (
+            f"[{path}: bytes 8-9 of 10B, lines 5-5 (clamped from 5-9: end of file)]\n5\n"
+        )
+        assert tool(f"{path}|||lines=7-9") == (
+            f"[{path}: empty range at byte 10 of 10B, file ends at line 5]"
+        )
+        assert tool(f"{unterminated}|||bytes=9-12") == (
+            f"[{unterminated}: empty range at byte 5 of 5B]"
+        )
+
+    def test_large_file_is_excerpted_with_cursor(self, log_file):
+        """Test files over max size return a bounded excerpt and continuation"""
+        tool = ReadFile(max_size_mb=0, max_excerpt_kb=1)
+        result = tool(str(log_file))
+
+        assert "[truncated:" in result
+        assert "|||bytes=" in result
+        assert len(result) < 1500
+
+        # Following the cursor continues where the excerpt stopped
+        next_input = result.rsplit('Continue with "', 1)[1].rstrip('"]')
+        continued = tool(next_input)
+        last_line = result.split("\n[truncated")[0].rstrip("\n").split("\n")[-1]
+        first_line = continued.split("\n")[1]
+        assert int(first_line.split()[1]) == int(last_line.split()[1]) + 1
+
+    def test_grep_with_limit_and_cursor(self, log_file):
+        """Test grep returns matched lines and a cursor to the remaining matches"""
+        tool = ReadFile(max_matches=3)
+        result = tool(f"{log_file}|||grep=ERROR \\d+")
+
+        assert "3 match(es)" in result
+        assert "--- line 100 " in result
+        assert "--- line 300 " in result
+        assert "|||cursor=" in result
+
+        next_input = result.rsplit('Continue with "', 1)[1].rstrip('"]')
+        continued = tool(next_input)
+        assert "--- line 400 " in continued
+
+    def test_invalid_option(self, log_file):
+        """Test unknown options return an error"""
+        assert ReadFile()(f"{log_file}|||foo=1").startswith("Error: Unknown option")
+
+
+@pytest.fixture
+def source_tree(tmp_path):
+    """Source tree with a .gitignore"""
+    (tmp_path / ".gitignore").write_text("build/\n*.log\n!keep.log\n")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out.py").write_text("TODO: generated\n")
+    (tmp_path / "debug.log").write_text("TODO: ignored\n")
+    (tmp_path / "keep.log").write_text("TODO: kept\n")
+    (tmp_path / "src").mkdir()
+    for i in range(200):
+        (tmp_path / "src" / f"mod{i:03d}.py").write_text(f"x = {i}\n# TODO: item {i}\n")
+    return tmp_path
+
+
+class TestGrep:
+    """Test Grep tool"""
+
+    def test_respects_gitignore(self, source_tree):
+        """Test ignored files are skipped and negated patterns re-included"""
+        result = Grep(max_results=1000, max_workers=1)(f"TODO|||{source_tree}")
+
+        assert "Found 201 match(es)" in result
+        assert "keep.log:1: TODO: kept" in result
+        assert "debug.log" not in result
+        assert "build" not in result
+        assert os.path.join("src", "mod007.py") + ":2: # TODO: item 7" in result
+
+    def test_glob_and_ignore_case(self, source_tree):
+        """Test glob and ignore_case options"""
+        result = Grep(max_workers=1)(f"todo: kept|||{source_tree}|||glob=*.log|||ignore_case=true")
+
+        assert "Found 1 match(es)" in result
+
+    def test_result_limit(self, source_tree):
+        """Test the result limit stops the search"""
+        result = Grep(max_results=5, max_workers=1)(f"TODO|||{source_tree}")
+
+        assert "Found 5 match(es)" in result
+        assert "[limit reached" in result
+
+        # Exactly max_results matches is not a truncation
+        result = Grep(max_results=1, max_workers=1)(f"TODO|||{source_tree}|||glob=keep.log")
+        assert "Found 1 match(es)" in result
+        assert "[limit reached" not in result
+
+    def test_parallel_workers(self, source_tree):
+        """Test worker processes return the same matches as in-process search"""
+        tool = Grep(max_results=1000, max_workers=2)
+        try:
+            matches = list(tool.stream(r"item \d+", str(source_tree)))
+        finally:
+            tool.close()
+
+        assert len(matches) == 200
+        assert {m.line for m in matches} == {2}
+
+    def test_single_file_checks(self, tmp_path):
+        """Test a file named directly is still skipped when sensitive or oversized"""
+        env = tmp_path / ".env"
+        env.write_text("API_KEY=secret\n")
+        big = tmp_path / "big.log"
+        big.write_text("ERROR 500\n")
+
+        # execute() and stream() skip the input validation done by __call__
+        assert list(Grep(max_workers=1).stream("API_KEY", str(env))) == []
+        assert "0 files searched" in Grep(max_workers=1).execute(f"API_KEY|||{env}")
+        assert "Found 1 match(es)" in Grep(safe_mode=False, max_workers=1)(f"API_KEY|||{env}")
+        assert "0 files searched" in Grep(max_file_size_mb=0, max_workers=1)(f"ERROR|||{big}")
+
+    def test_invalid_regex(self, source_tree):
+        """Test invalid regex returns an error"""
+        assert Grep()(f"(|||{source_tree}").startswith("Error: Invalid regex")
+
+
+class TestBatchFiles:
+    """Test ReadFiles and WriteFiles tools"""
+
+    def test_read_batch_expands_globs(self, tmp_path):
+        """Test globs are expanded and each file gets a status header"""
+        (tmp_path / "a.py").write_text("A = 1\n")
+        (tmp_path / "b.py").write_text("B = 2\n")
+        missing = tmp_path / "missing.txt"
+
+        result = ReadFiles()(json.dumps([str(tmp_path / "*.py"), str(missing)]))
+
+        assert result.startswith("Read 2 of 3 file(s) (1 failed)")
+        assert f"=== {tmp_path / 'a.py'} (ok, 6 chars) ===\nA = 1" in result
+        assert f"=== {tmp_path / 'b.py'} (ok, 6 chars) ===\nB = 2" in result
+        assert f"=== {missing} (error) ===" in result
+
+    def test_read_batch_status_is_not_inferred_from_content(self, tmp_path):
+        """Test a file whose text starts with "Error" still reads as ok"""
+        log = tmp_path / "errors.txt"
+        log.write_text("Error: disk full\n")
+
+        result = ReadFiles()(str(log))
+
+        assert result.startswith("Read 1 of 1 file(s)")
+        assert f"=== {log} (ok, 17 chars) ===\nError: disk full" in result
+
+        ok, message = ReadFile().read(f"{log}|||grep=(")
+        assert not ok and message.startswith("Error: Invalid regex")
+
+    def test_read_batch_caps_total_size(self, tmp_path, log_file):
+        """Test the combined observation stays within the size budget"""
+        small = tmp_path / "small.txt"
+        small.write_text("tiny\n")
+
+        result = ReadFiles(max_total_kb=1)(f"{small}\n{log_file}")
+
+        assert "tiny" in result
+        assert "[truncated:" in result
+        assert len(result) < 1500
+
+    def test_read_batch_stops_expanding_at_max_files(self, tmp_path, monkeypatch):
+        """Test a glob is consumed only one match past the file cap"""
+        from react_agent_framework.tools.filesystem import read_batch
+
+        for i in range(10):
+            (tmp_path / f"{i}.txt").write_text(str(i))
+        consumed = []
+        iglob = read_batch.glob.iglob
+
+        def counting_iglob(*args, **kwargs):
+            for match in iglob(*args, **kwargs):
+                consumed.append(match)
+                yield match
+
+        monkeypatch.setattr(read_batch.glob, "iglob", counting_iglob)
+        result = ReadFiles(max_files=3)(json.dumps([str(tmp_path / "*.txt"), "unread.txt"]))
+
+        assert result.startswith("Read 3 of 3 file(s); more files skipped (max 3 per call)")
+        assert len(consumed) == 4
+
+    def test_write_batch(self, tmp_path):
+        """Test several files are written with per-file status"""
+        files = {str(tmp_path / "x.txt"): "x", str(tmp_path / "sub" / "y.txt"): "yy"}
+        result = WriteFiles()(json.dumps(files))
+
+        assert result.startswith("Wrote 2 of 2 file(s)")
+        assert (tmp_path / "sub" / "y.txt").read_text() == "yy"
+
+    def test_write_batch_rejects_duplicates(self, tmp_path):
+        """Test duplicate paths are rejected before anything is written"""
+        path = str(tmp_path / "x.txt")
+        payload = json.dumps([{"path": path, "content": "1"}, {"path": path, "content": "2"}])
+
+        assert WriteFiles()(payload).startswith("Error: Duplicate path")
+        assert not os.path.exists(path)
+
+
+class TestCalculator:
+    """Test Calculator tool"""
+
+    def test_scalar_expressions(self):
+        """Test operators, math functions and constants"""
+        tool = Calculator()
+
+        assert tool("10 * (5 + 3)") == "80"
+        assert tool("sqrt(16) + max(1, 2, 3)") == "7"
+        assert tool("round(pi, 2)") == "3.14"
+        assert tool("1 / 0") == "Error: Division by zero"
+        assert tool("__import__('os')").startswith("Error: Unsupported function")
+
+    def test_compiled_expressions_are_cached(self):
+        """Test repeated expressions reuse the compiled form"""
+        tool = Calculator()
+        calculator._compile.cache_clear()
+
+        tool("2 ** 10")
+        tool("2 ** 10")
+
+        assert calculator._compile.cache_info().hits == 1
+
+    def test_vectorized(self):
+        """Test expressions over ranges and value lists"""
+        tool = Calculator()
+
+        assert tool("x ** 2|||x=1:6") == "[1, 4, 9, 16, 25]"
+        assert tool("x * y|||x=[1, 2]|||y=[3, 4]") == "[3, 8]"
+        assert tool("sum(x)|||x=1:1001") == "500500"
+        assert tool("z + 1").startswith("Error: Unbound variable")
+
+    def test_long_results_are_summarized(self):
+        """Test long array results return a summary instead of every value"""
+        result = Calculator()("x * 2|||x=0:10000")
+
+        assert result.startswith("10000 values: [0, 2, 4, 6, 8, ..., 19994, 19996, 19998]")
+        assert "sum=99990000" in result
+
+    def test_pure_python_fallback(self, monkeypatch):
+        """Test vectorized mode works element by element without NumPy"""
+        monkeypatch.setattr(calculator, "NUMPY_AVAILABLE", False)
+        tool = Calculator()
+        tool._numpy_ns = None
+
+        assert tool("x ** 2|||x=1:6") == "[1, 4, 9, 16, 25]"
+        assert tool("sum(x)|||x=1:6").startswith("Error: sum() requires")